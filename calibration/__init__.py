@@ -1,6 +1,8 @@
 from .conformal import (
     ConformalAdjustment,
+    ConformalParameterTable,
     apply_conformal_adjustment,
+    apply_conformal_adjustment_array,
     apply_conformal_adjustment_many,
     coverage_report,
     fit_conformal_adjustment,
@@ -10,15 +12,19 @@ from .conformal_state import (
     load_conformal_adjustment,
     save_conformal_adjustment,
 )
+from .online_conformal import OnlineConformalCalibrator
 
 __all__ = [
     "ConformalAdjustment",
     "fit_conformal_adjustment",
     "apply_conformal_adjustment",
     "apply_conformal_adjustment_many",
+    "apply_conformal_adjustment_array",
+    "ConformalParameterTable",
     "coverage_report",
     "DEFAULT_CONFORMAL_STATE_PATH",
     "load_conformal_adjustment",
     "save_conformal_adjustment",
+    "OnlineConformalCalibrator",
 ]
 
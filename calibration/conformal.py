@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from typing import Mapping, Optional, Sequence, Tuple
+from typing import Any, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
 
 
 def _empirical_quantile(values: list[float], quantile: float) -> float:
@@ -39,6 +41,29 @@ def _as_float(value: object, *, name: str) -> float:
     return result
 
 
+def _calibration_sample(
+    band: Mapping[str, object],
+    actual: object,
+    *,
+    index: int,
+    lower_key: str,
+    median_key: str,
+    upper_key: str,
+    min_half_width: float,
+) -> tuple[float, float, float]:
+    """(observation, band center, floored half width) of one calibration sample."""
+    low = _as_float(band[lower_key], name=f"{lower_key}[{index}]")
+    high = _as_float(band[upper_key], name=f"{upper_key}[{index}]")
+    if low > high:
+        low, high = high, low
+
+    if median_key in band:
+        center = _as_float(band[median_key], name=f"{median_key}[{index}]")
+    else:
+        center = (low + high) / 2
+    return _as_float(actual, name=f"actual[{index}]"), center, max((high - low) / 2, min_half_width)
+
+
 @dataclass(frozen=True)
 class ConformalAdjustment:
     """Quantile interval adjustment parameters learned from calibration data."""
@@ -77,19 +102,18 @@ def fit_conformal_adjustment(
     observations: list[float] = []
 
     for idx, (band, actual) in enumerate(zip(historical_bands, actuals)):
-        low = _as_float(band[lower_key], name=f"{lower_key}[{idx}]")
-        high = _as_float(band[upper_key], name=f"{upper_key}[{idx}]")
-        if low > high:
-            low, high = high, low
-
-        if median_key in band:
-            center = _as_float(band[median_key], name=f"{median_key}[{idx}]")
-        else:
-            center = (low + high) / 2
-
+        observation, center, half_width = _calibration_sample(
+            band,
+            actual,
+            index=idx,
+            lower_key=lower_key,
+            median_key=median_key,
+            upper_key=upper_key,
+            min_half_width=min_half_width,
+        )
         centers.append(center)
-        half_widths.append(max((high - low) / 2, min_half_width))
-        observations.append(_as_float(actual, name=f"actual[{idx}]"))
+        half_widths.append(half_width)
+        observations.append(observation)
 
     residuals = [obs - center for obs, center in zip(observations, centers)]
     center_shift = _empirical_quantile(residuals, 0.5)
@@ -153,6 +177,34 @@ def apply_conformal_adjustment(
     return adjusted
 
 
+def _adjust_band_batch(
+    bands: Sequence[Mapping[str, object]],
+    adjustment: ConformalAdjustment,
+    *,
+    lower_key: str,
+    median_key: str,
+    upper_key: str,
+    clip_range: Optional[Tuple[float, float]],
+) -> np.ndarray | None:
+    """Array-path adjustment of band dicts, or ``None`` when the scalar path must decide."""
+    if not bands or adjustment.width_scale < 0:
+        return None
+    try:
+        has_median = [median_key in band for band in bands]
+        matrix = np.array(
+            [
+                (band[lower_key], band[median_key] if present else math.nan, band[upper_key])
+                for band, present in zip(bands, has_median)
+            ],
+            dtype=np.float64,
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not np.isfinite(matrix[:, [0, 2]]).all() or not np.isfinite(matrix[has_median, 1]).all():
+        return None
+    return apply_conformal_adjustment_array(matrix, adjustment, clip_range=clip_range)
+
+
 def apply_conformal_adjustment_many(
     bands: Sequence[Mapping[str, object]],
     adjustment: ConformalAdjustment,
@@ -162,6 +214,32 @@ def apply_conformal_adjustment_many(
     upper_key: str = "q90",
     clip_range: Optional[Tuple[float, float]] = (0.0, 1.0),
 ) -> list[dict[str, object]]:
+    adjusted = _adjust_band_batch(
+        bands,
+        adjustment,
+        lower_key=lower_key,
+        median_key=median_key,
+        upper_key=upper_key,
+        clip_range=clip_range,
+    )
+    if adjusted is not None:
+        annotations = {
+            "band_calibration": "conformal",
+            "conformal_target_coverage": adjustment.target_coverage,
+            "conformal_quantile_level": adjustment.quantile_level,
+            "conformal_center_shift": adjustment.center_shift,
+            "conformal_width_scale": adjustment.width_scale,
+        }
+        rows: list[dict[str, object]] = []
+        for band, (low, center, high) in zip(bands, adjusted.tolist()):
+            row = dict(band)
+            row[lower_key] = low
+            row[median_key] = center
+            row[upper_key] = high
+            row.update(annotations)
+            rows.append(row)
+        return rows
+    # Invalid bands go through the scalar path for its per-key error messages.
     return [
         apply_conformal_adjustment(
             band,
@@ -175,6 +253,115 @@ def apply_conformal_adjustment_many(
     ]
 
 
+@dataclass(frozen=True)
+class ConformalParameterTable:
+    """Adjustment parameters stacked by segment, addressed by row segment indices."""
+
+    keys: tuple[str, ...]
+    center_shift: np.ndarray
+    width_scale: np.ndarray
+
+    @classmethod
+    def from_adjustments(cls, adjustments: Mapping[str, ConformalAdjustment]) -> "ConformalParameterTable":
+        keys = tuple(str(key) for key in adjustments)
+        values = list(adjustments.values())
+        return cls(
+            keys=keys,
+            center_shift=np.array([value.center_shift for value in values], dtype=np.float64),
+            width_scale=np.array([value.width_scale for value in values], dtype=np.float64),
+        )
+
+    def index_of(self, keys: Sequence[str], *, default: str | None = None) -> np.ndarray:
+        """Row segment indices for ``keys``; unknown keys map to ``default``."""
+        positions = {key: idx for idx, key in enumerate(self.keys)}
+        fallback = positions[default] if default is not None else None
+        indices = np.empty(len(keys), dtype=np.int64)
+        for row, key in enumerate(keys):
+            position = positions.get(key, fallback)
+            if position is None:
+                raise ValueError(f"no conformal adjustment for segment {key!r}")
+            indices[row] = position
+        return indices
+
+
+def _quantile_matrix(quantiles: Any) -> np.ndarray:
+    """``(n, k)`` float64 matrix from a 2-D array, an Arrow table, or a sequence of Arrow columns."""
+    if hasattr(quantiles, "num_rows") and hasattr(quantiles, "columns"):
+        quantiles = list(quantiles.columns)
+    if isinstance(quantiles, (list, tuple)) and quantiles and hasattr(quantiles[0], "to_numpy"):
+        matrix = np.column_stack([np.asarray(column, dtype=np.float64) for column in quantiles])
+    else:
+        matrix = np.array(quantiles, dtype=np.float64)
+    if matrix.ndim != 2 or matrix.shape[1] < 2:
+        raise ValueError("quantiles must be an (n, n_quantiles) array with at least two quantiles")
+    return matrix
+
+
+def apply_conformal_adjustment_array(
+    quantiles: Any,
+    adjustment: ConformalAdjustment | ConformalParameterTable,
+    *,
+    segment_index: Sequence[int] | np.ndarray | None = None,
+    clip_range: Optional[Tuple[float, float]] = (0.0, 1.0),
+) -> np.ndarray:
+    """Apply conformal adjustments to a batch of bands in one vectorized pass.
+
+    ``quantiles`` holds one band per row with quantile columns in ascending
+    level order (e.g. q10/q50/q90): a 2-D array, an Arrow table or a sequence
+    of Arrow columns. Columns pair up around the middle (first with
+    last, ...); each pair keeps its half width scaled by ``width_scale``
+    around the shifted center, which is the middle column for an odd count
+    (the outer pair's midpoint when that value is NaN or the count is even).
+    Rows are sorted afterwards so the result never crosses. With three
+    columns this is :func:`apply_conformal_adjustment` row by row.
+
+    With a :class:`ConformalParameterTable`, ``segment_index`` selects the
+    parameters of each row.
+    """
+    matrix = _quantile_matrix(quantiles)
+    n_rows, n_quantiles = matrix.shape
+    if isinstance(adjustment, ConformalParameterTable):
+        if segment_index is None:
+            raise ValueError("segment_index is required with a ConformalParameterTable")
+        index = np.asarray(segment_index, dtype=np.int64)
+        if index.shape != (n_rows,):
+            raise ValueError("segment_index must have one entry per row")
+        if n_rows and (index.min() < 0 or index.max() >= len(adjustment.keys)):
+            raise ValueError("segment_index out of range for the parameter table")
+        shift = adjustment.center_shift[index]
+        scale = adjustment.width_scale[index]
+    else:
+        shift = np.full(n_rows, adjustment.center_shift, dtype=np.float64)
+        scale = np.full(n_rows, adjustment.width_scale, dtype=np.float64)
+
+    pairs = n_quantiles // 2
+    lower = matrix[:, :pairs]
+    upper = matrix[:, ::-1][:, :pairs]
+    if not (np.isfinite(lower).all() and np.isfinite(upper).all()):
+        row = int(np.flatnonzero(~(np.isfinite(lower).all(axis=1) & np.isfinite(upper).all(axis=1)))[0])
+        raise ValueError(f"Non-finite quantile value in row {row}")
+    low = np.minimum(lower, upper)
+    high = np.maximum(lower, upper)
+    center = (low[:, 0] + high[:, 0]) / 2
+    if n_quantiles % 2:
+        middle = matrix[:, pairs]
+        if np.isinf(middle).any():
+            raise ValueError(f"Non-finite quantile value in row {int(np.flatnonzero(np.isinf(middle))[0])}")
+        center = np.where(np.isnan(middle), center, middle)
+
+    adjusted_center = center + shift
+    adjusted_half = (high - low) / 2 * scale[:, None]
+    result = np.empty_like(matrix)
+    result[:, :pairs] = adjusted_center[:, None] - adjusted_half
+    result[:, n_quantiles - pairs :] = (adjusted_center[:, None] + adjusted_half)[:, ::-1]
+    if n_quantiles % 2:
+        result[:, pairs] = adjusted_center
+    result.sort(axis=1)
+    if clip_range is not None:
+        np.clip(result, clip_range[0], clip_range[1], out=result)
+    return result
+
+
 def coverage_report(
     bands: Sequence[Mapping[str, object]],
     actuals: Sequence[float],
@@ -214,5 +401,7 @@ __all__ = [
     "fit_conformal_adjustment",
     "apply_conformal_adjustment",
     "apply_conformal_adjustment_many",
+    "apply_conformal_adjustment_array",
+    "ConformalParameterTable",
     "coverage_report",
 ]
@@ -1,7 +1,22 @@
+"""Persisted conformal (and CPTC) state files.
+
+State files are decoded once per file version: :func:`read_state_file` keeps
+a process-wide cache keyed by resolved path and file signature (inode, size,
+mtime), and the loaders below are views over the cached decode. Saves write a
+temporary file next to the target and ``os.replace`` it, so readers see
+either the old or the new file, never a partial one, and the new inode
+invalidates cached decodes. :class:`ConformalStateWatcher` polls the
+signature so long-lived services can pick up a new state without restarting.
+"""
+
 from __future__ import annotations
 
+import copy
 import json
-from dataclasses import asdict
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Mapping
@@ -10,6 +25,136 @@ from calibration.conformal import ConformalAdjustment
 
 DEFAULT_CONFORMAL_STATE_PATH = Path("data/derived/calibration/conformal_state.json")
 
+FileSignature = tuple[int, int, int]
+
+
+@dataclass
+class StateFile:
+    """One decoded version of a state file; adjustment views are decoded on first use."""
+
+    path: Path
+    signature: FileSignature
+    payload: Any
+    _views: dict[str, tuple[Any, str | None]] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def _view(self, name: str, decode: Any) -> Any:
+        with self._lock:
+            if name not in self._views:
+                try:
+                    self._views[name] = (decode(self.path, self.payload), None)
+                except ValueError as exc:
+                    self._views[name] = (None, str(exc))
+            value, error = self._views[name]
+        if error is not None:
+            raise ValueError(error)
+        return value
+
+    def default_adjustment(self) -> ConformalAdjustment:
+        return self._view("default", _decode_default_adjustment)
+
+    def segment_adjustments(self) -> dict[str, ConformalAdjustment]:
+        return dict(self._view("segments", _decode_segment_adjustments))
+
+
+_STATE_CACHE: dict[Path, StateFile] = {}
+_STATE_CACHE_LOCK = threading.Lock()
+
+
+def _signature(stat: os.stat_result) -> FileSignature:
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def state_file_signature(path: str | Path) -> FileSignature | None:
+    try:
+        return _signature(os.stat(path))
+    except FileNotFoundError:
+        return None
+
+
+def read_state_file(path: str | Path) -> StateFile | None:
+    """Decoded state file, parsed at most once per file version (``None`` if missing)."""
+    resolved = Path(path).resolve()
+    signature = state_file_signature(resolved)
+    if signature is None:
+        with _STATE_CACHE_LOCK:
+            _STATE_CACHE.pop(resolved, None)
+        return None
+    with _STATE_CACHE_LOCK:
+        cached = _STATE_CACHE.get(resolved)
+    if cached is not None and cached.signature == signature:
+        return cached
+    try:
+        with resolved.open("rb") as handle:
+            # Signature of the inode actually read, in case the file was replaced since stat().
+            signature = _signature(os.fstat(handle.fileno()))
+            raw = handle.read()
+    except FileNotFoundError:
+        return None
+    state = StateFile(path=resolved, signature=signature, payload=json.loads(raw.decode("utf-8")))
+    with _STATE_CACHE_LOCK:
+        _STATE_CACHE[resolved] = state
+    return state
+
+
+def clear_state_cache() -> None:
+    with _STATE_CACHE_LOCK:
+        _STATE_CACHE.clear()
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with temp_path.open("w", encoding="utf-8") as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+class ConformalStateWatcher:
+    """Polls a state file and reports new versions.
+
+    ``poll()`` checks the file signature at most once per ``interval_s``
+    seconds and returns the newly decoded :class:`StateFile` when the file
+    changed (``None`` otherwise). A deleted file is reported once via
+    ``missing``; the previous state is left to the caller.
+    """
+
+    def __init__(self, path: str | Path, *, interval_s: float = 5.0, clock: Any = time.monotonic) -> None:
+        self.path = Path(path)
+        self.interval_s = float(interval_s)
+        self._clock = clock
+        self._signature: FileSignature | None = None
+        self._checked_at: float | None = None
+        self.missing = False
+        self.reload_count = 0
+
+    def current(self) -> StateFile | None:
+        """Read the state now and remember its version."""
+        state = read_state_file(self.path)
+        self._signature = state.signature if state is not None else None
+        self.missing = state is None
+        self._checked_at = self._clock()
+        return state
+
+    def poll(self) -> StateFile | None:
+        now = self._clock()
+        if self._checked_at is not None and now - self._checked_at < self.interval_s:
+            return None
+        self._checked_at = now
+        signature = state_file_signature(self.path)
+        if signature == self._signature:
+            return None
+        state = read_state_file(self.path)
+        self._signature = state.signature if state is not None else None
+        self.missing = state is None
+        if state is not None:
+            self.reload_count += 1
+        return state
+
 
 def _to_float(value: Any, *, field: str) -> float:
     try:
@@ -32,11 +177,20 @@ def _normalize_path(path: str | Path | None) -> Path:
 
 
 def load_conformal_adjustment(path: str | Path | None = None) -> ConformalAdjustment | None:
-    resolved = _normalize_path(path)
-    if not resolved.exists():
+    state = read_state_file(_normalize_path(path))
+    if state is None:
         return None
+    return state.default_adjustment()
+
 
-    payload = json.loads(resolved.read_text(encoding="utf-8"))
+def load_conformal_adjustments_by_segment(path: str | Path | None = None) -> dict[str, ConformalAdjustment]:
+    state = read_state_file(_normalize_path(path))
+    if state is None:
+        return {}
+    return state.segment_adjustments()
+
+
+def _decode_default_adjustment(resolved: Path, payload: Any) -> ConformalAdjustment:
     if not isinstance(payload, Mapping):
         raise ValueError(f"Invalid conformal state payload at {resolved}")
 
@@ -47,12 +201,7 @@ def load_conformal_adjustment(path: str | Path | None = None) -> ConformalAdjust
     return _decode_adjustment(adjustment_payload)
 
 
-def load_conformal_adjustments_by_segment(path: str | Path | None = None) -> dict[str, ConformalAdjustment]:
-    resolved = _normalize_path(path)
-    if not resolved.exists():
-        return {}
-
-    payload = json.loads(resolved.read_text(encoding="utf-8"))
+def _decode_segment_adjustments(resolved: Path, payload: Any) -> dict[str, ConformalAdjustment]:
     if not isinstance(payload, Mapping):
         raise ValueError(f"Invalid conformal state payload at {resolved}")
 
@@ -89,7 +238,7 @@ def save_conformal_adjustment(
     if segment_adjustments:
         payload["segment_fields"] = list(segment_fields or [])
         payload["segments"] = {str(key): asdict(value) for key, value in segment_adjustments.items()}
-    resolved.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    _atomic_write_text(resolved, json.dumps(payload, indent=2, sort_keys=True))
     return resolved
 
 
@@ -109,14 +258,14 @@ DEFAULT_CPTC_STATE_PATH = Path("data/derived/calibration/cptc_state.json")
 def load_cptc_state(path: str | Path | None = None) -> dict[str, Any] | None:
     """Load persisted CPTC change-point state from disk."""
     resolved = Path(path) if path is not None else DEFAULT_CPTC_STATE_PATH
-    if not resolved.exists():
+    state = read_state_file(resolved)
+    if state is None:
         return None
 
-    payload = json.loads(resolved.read_text(encoding="utf-8"))
-    if not isinstance(payload, Mapping):
+    if not isinstance(state.payload, Mapping):
         raise ValueError(f"Invalid CPTC state payload at {resolved}")
 
-    return dict(payload)
+    return copy.deepcopy(dict(state.payload))
 
 
 def save_cptc_state(
@@ -149,16 +298,21 @@ def save_cptc_state(
         },
         "metadata": dict(metadata or {}),
     }
-    resolved.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    _atomic_write_text(resolved, json.dumps(payload, indent=2, sort_keys=True))
     return resolved
 
 
 __all__ = [
+    "ConformalStateWatcher",
     "DEFAULT_CONFORMAL_STATE_PATH",
     "DEFAULT_CPTC_STATE_PATH",
+    "StateFile",
+    "clear_state_cache",
     "load_conformal_adjustment",
     "load_conformal_adjustments_by_segment",
     "load_cptc_state",
+    "read_state_file",
     "save_conformal_adjustment",
     "save_cptc_state",
+    "state_file_signature",
 ]
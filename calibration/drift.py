@@ -5,6 +5,9 @@ from collections import defaultdict
 from collections.abc import Sequence
 from typing import Any, Mapping
 
+import numpy as np
+
+from calibration.metrics import LABEL_KEYS, PREDICTION_KEYS, factorize_keys, window_drift_summary
 from calibration.metrics import base_rate_drift as _base_rate_drift
 
 DEFAULT_TARGET_COVERAGE = 0.80
@@ -177,6 +180,176 @@ def evaluate_retraining_need(
     }
 
 
+def _column(rows: Sequence[Mapping[str, Any]], keys: Sequence[str]) -> list[object] | None:
+    """First present key per row, or ``None`` when a row has none of ``keys``."""
+    try:
+        return [row[keys[0]] for row in rows]
+    except KeyError:
+        pass
+    values: list[object] = []
+    for row in rows:
+        for key in keys:
+            if key in row:
+                values.append(row[key])
+                break
+        else:
+            return None
+    return values
+
+
+def _time_order(ts: list[object]) -> np.ndarray | None:
+    """Stable argsort of the raw time values, or ``None`` if they do not order cleanly."""
+    kinds = set(map(type, ts))
+    if kinds and kinds <= {int, float}:
+        values = np.array(ts, dtype=np.int64 if kinds == {int} else np.float64)
+        if values.dtype.kind == "f" and np.isnan(values).any():
+            return None
+        return np.argsort(values, kind="stable")
+    # Strings and datetimes: Python's sort beats a NumPy string argsort here.
+    try:
+        return np.array(sorted(range(len(ts)), key=ts.__getitem__), dtype=np.int64)
+    except TypeError:
+        return None
+
+
+def _segment_codes(rows: Sequence[Mapping[str, Any]], fields: Sequence[str]) -> tuple[np.ndarray, list[str]]:
+    """Segment code per row and the ``field=value|...`` key of each code."""
+    columns = [[str(row.get(field, "unknown")) for row in rows] for field in fields]
+    values = list(zip(*columns)) if columns else [()] * len(rows)
+    index = {value: code for code, value in enumerate(dict.fromkeys(values))}
+    codes = np.fromiter(map(index.__getitem__, values), dtype=np.int64, count=len(values))
+    keys = ["|".join(f"{field}={part}" for field, part in zip(fields, value)) for value in index]
+    # Distinct value tuples can still format to the same key; merge those like the row-wise path.
+    key_codes, segment_keys = factorize_keys(keys)
+    return key_codes[codes], [str(key) for key in segment_keys]
+
+
+def _segment_drift_columnar(
+    rows: Sequence[Mapping[str, Any]],
+    *,
+    segment_fields: tuple[str, ...],
+    time_key: str,
+    min_segment_rows: int,
+    n_windows: int,
+) -> dict[str, dict[str, object]] | None:
+    """Per-segment window drift with one sort and grouped reductions.
+
+    Returns ``None`` when a row is missing fields or holds values the strict
+    validation would reject, so the caller can reproduce the row-wise errors.
+    """
+    try:
+        ts = [row[time_key] for row in rows]
+    except KeyError:
+        return None
+    raw_preds = _column(rows, PREDICTION_KEYS)
+    raw_labels = _column(rows, LABEL_KEYS)
+    if raw_preds is None or raw_labels is None:
+        return None
+    try:
+        preds = np.asarray(raw_preds, dtype=np.float64)
+        labels = np.asarray(raw_labels, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+    if (
+        not np.isfinite(preds).all()
+        or ((preds < 0.0) | (preds > 1.0)).any()
+        or not ((labels == 0.0) | (labels == 1.0)).all()
+    ):
+        return None
+    order = _time_order(ts)
+    if order is None:
+        return None
+
+    codes, segment_keys = _segment_codes(rows, segment_fields)
+    counts = np.bincount(codes, minlength=len(segment_keys))
+    order = order[np.argsort(codes[order], kind="stable")]
+    eligible = counts >= min_segment_rows
+    order = order[eligible[codes[order]]]
+
+    results: dict[str, dict[str, object]] = {}
+    for code in np.flatnonzero(~eligible).tolist():
+        results[segment_keys[code]] = {
+            "drift_detected": False,
+            "sample_size": int(counts[code]),
+            "reason": REASON_INSUFFICIENT_SAMPLES,
+        }
+    if not order.size:
+        return results
+
+    # Window bounds for every eligible segment at once; segments are contiguous in ``order``.
+    sizes = counts[eligible]
+    offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    window_size = np.maximum(1, sizes // n_windows)[:, None]
+    window_index = np.arange(n_windows)[None, :]
+    starts = window_size * window_index
+    ends = np.where(window_index < n_windows - 1, starts + window_size, sizes[:, None])
+    nonempty = starts < sizes[:, None]
+    bounds_start = (offsets[:, None] + starts)[nonempty]
+    bounds_end = (offsets[:, None] + np.minimum(ends, sizes[:, None]))[nonempty]
+
+    sorted_preds = preds[order]
+    sorted_labels = labels[order]
+    window_rows = (bounds_end - bounds_start).tolist()
+    label_sums = np.add.reduceat(sorted_labels, bounds_start).tolist()
+    pred_sums = np.add.reduceat(sorted_preds, bounds_start).tolist()
+    sq_err_sums = np.add.reduceat((sorted_preds - sorted_labels) ** 2, bounds_start).tolist()
+    first_rows = order[bounds_start].tolist()
+    last_rows = order[bounds_end - 1].tolist()
+
+    cursor = 0
+    for code, size, window_count in zip(
+        np.flatnonzero(eligible).tolist(), sizes.tolist(), nonempty.sum(axis=1).tolist()
+    ):
+        windows: list[dict[str, object]] = []
+        for i in range(window_count):
+            n = window_rows[cursor]
+            base_rate = label_sums[cursor] / n
+            mean_pred = pred_sums[cursor] / n
+            windows.append({
+                "window_index": i,
+                "sample_size": n,
+                "base_rate": base_rate,
+                "mean_pred": mean_pred,
+                "pred_base_gap": abs(mean_pred - base_rate),
+                "brier": sq_err_sums[cursor] / n,
+                "ts_min": ts[first_rows[cursor]],
+                "ts_max": ts[last_rows[cursor]],
+            })
+            cursor += 1
+        drift = window_drift_summary(windows)
+        drift["sample_size"] = size
+        results[segment_keys[code]] = drift
+    return results
+
+
+def _segment_drift_rowwise(
+    rows: Sequence[Mapping[str, Any]],
+    *,
+    segment_fields: tuple[str, ...],
+    time_key: str,
+    min_segment_rows: int,
+    n_windows: int,
+) -> dict[str, dict[str, object]]:
+    grouped: dict[str, list[Mapping[str, Any]]] = defaultdict(list)
+    for row in rows:
+        key_parts = [f"{field}={row.get(field, 'unknown')}" for field in segment_fields]
+        grouped["|".join(key_parts)].append(row)
+
+    segment_results: dict[str, dict[str, object]] = {}
+    for segment_key, segment_rows in sorted(grouped.items()):
+        if len(segment_rows) < min_segment_rows:
+            segment_results[segment_key] = {
+                "drift_detected": False,
+                "sample_size": len(segment_rows),
+                "reason": REASON_INSUFFICIENT_SAMPLES,
+            }
+            continue
+        drift = dict(_base_rate_drift(segment_rows, time_key=time_key, n_windows=n_windows))
+        drift["sample_size"] = len(segment_rows)
+        segment_results[segment_key] = drift
+    return segment_results
+
+
 def detect_segment_base_rate_drift(
     rows: Sequence[Mapping[str, Any]],
     *,
@@ -185,6 +358,15 @@ def detect_segment_base_rate_drift(
     min_segment_rows: int = 20,
     n_windows: int = 4,
 ) -> dict[str, object]:
+    """Run :func:`calibration.metrics.base_rate_drift` for every segment.
+
+    Segments are keyed ``field=value|...`` over ``segment_fields``. Segment
+    keys are factorized once and rows sorted by (segment, time) once; window
+    base rates, mean predictions and Brier scores come from grouped sums.
+    Inputs the columnar path cannot take as-is (missing or invalid fields,
+    unorderable times) go through the per-segment row-wise path, so results
+    and errors are the same either way.
+    """
     if not rows:
         return {
             "evaluated_segment_count": 0,
@@ -197,30 +379,21 @@ def detect_segment_base_rate_drift(
     if n_windows < 2:
         raise ValueError("n_windows must be >= 2")
 
-    grouped: dict[str, list[Mapping[str, Any]]] = defaultdict(list)
-    active_segment_fields = tuple(str(field) for field in segment_fields if field)
     for idx, row in enumerate(rows):
-        if not isinstance(row, Mapping):
+        if type(row) is not dict and not isinstance(row, Mapping):
             raise ValueError(f"rows[{idx}] must be a mapping")
-        key_parts = [f"{field}={row.get(field, 'unknown')}" for field in active_segment_fields]
-        grouped["|".join(key_parts)].append(row)
-
-    segment_results: dict[str, dict[str, object]] = {}
-    triggered_segments: list[str] = []
-    for segment_key, segment_rows in sorted(grouped.items()):
-        if len(segment_rows) < min_segment_rows:
-            segment_results[segment_key] = {
-                "drift_detected": False,
-                "sample_size": len(segment_rows),
-                "reason": REASON_INSUFFICIENT_SAMPLES,
-            }
-            continue
-        drift = dict(_base_rate_drift(segment_rows, time_key=time_key, n_windows=n_windows))
-        drift["sample_size"] = len(segment_rows)
-        segment_results[segment_key] = drift
-        if bool(drift.get("drift_detected")):
-            triggered_segments.append(segment_key)
+    options = {
+        "segment_fields": tuple(str(field) for field in segment_fields if field),
+        "time_key": time_key,
+        "min_segment_rows": min_segment_rows,
+        "n_windows": n_windows,
+    }
+    computed = _segment_drift_columnar(rows, **options)
+    if computed is None:
+        computed = _segment_drift_rowwise(rows, **options)
 
+    segment_results = {key: computed[key] for key in sorted(computed)}
+    triggered_segments = [key for key, result in segment_results.items() if bool(result.get("drift_detected"))]
     return {
         "evaluated_segment_count": sum(
             1 for result in segment_results.values() if result.get("reason") != REASON_INSUFFICIENT_SAMPLES
@@ -1,8 +1,22 @@
+"""Quantile-band metrics: coverage, width, pinball loss and interval score.
+
+The scalar functions validate element by element. The array kernels
+(:func:`pinball_loss_matrix`, :func:`interval_summary` and their grouped
+variants) score an ``(n, q)`` quantile matrix in one pass with NumPy; sums
+are accumulated in row order, so they reproduce the scalar results exactly.
+The scalar entry points use the kernels when the whole input is finite and
+keep the element-by-element path (and its error messages) otherwise.
+"""
+
 from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from typing import Iterable, Mapping, Sequence
+from typing import Hashable, Iterable, Mapping, Sequence
+
+import numpy as np
+
+from calibration.metrics import factorize_keys
 
 
 def _as_float(value: object, *, name: str) -> float:
@@ -26,6 +40,196 @@ class IntervalMetrics:
     pinball_q50: float
     pinball_q90: float
     pinball_mean: float
+    winkler_80: float
+    winkler_90: float | None
+
+
+@dataclass(frozen=True)
+class IntervalSummary:
+    samples: int
+    coverage: float
+    mean_width: float
+    winkler: float
+
+
+def _finite_array(values: object) -> np.ndarray | None:
+    """``values`` as a float array, or ``None`` when any element is not a finite number."""
+    try:
+        array = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+    if not np.isfinite(array).all():
+        return None
+    return array
+
+
+def _as_float_array(values: object, *, name: str, ndim: int) -> np.ndarray:
+    array = _finite_array(values)
+    if array is None:
+        raw = np.asarray(values, dtype=object)
+        for idx in np.ndindex(raw.shape):
+            label = ",".join(str(part) for part in idx)
+            _as_float(raw[idx], name=f"{name}[{label}]")
+        array = raw.astype(np.float64)
+    if array.ndim != ndim:
+        raise ValueError(f"{name} must be {ndim}-dimensional")
+    return array
+
+
+def _row_sums(values: np.ndarray) -> np.ndarray:
+    """Column sums accumulated in row order (same rounding as a running total)."""
+    return np.cumsum(values, axis=0)[-1]
+
+
+def _pinball_matrix(actuals: np.ndarray, preds: np.ndarray, quantiles: np.ndarray) -> np.ndarray:
+    err = actuals[:, None] - preds
+    return np.where(err >= 0, quantiles * err, (quantiles - 1.0) * err)
+
+
+def _interval_terms(
+    actuals: np.ndarray, lower: np.ndarray, upper: np.ndarray, alpha: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    lo = np.minimum(lower, upper)
+    hi = np.maximum(lower, upper)
+    covered = (lo <= actuals) & (actuals <= hi)
+    width = hi - lo
+    penalty = np.where(actuals < lo, lo - actuals, 0.0) + np.where(actuals > hi, actuals - hi, 0.0)
+    return covered, width, width + (2.0 / alpha) * penalty
+
+
+def _check_quantiles(quantiles: Sequence[float]) -> np.ndarray:
+    levels = _as_float_array(quantiles, name="quantiles", ndim=1)
+    if ((levels < 0) | (levels > 1)).any():
+        raise ValueError("quantile must be in [0,1]")
+    return levels
+
+
+def _check_alpha(alpha: float) -> float:
+    if not 0 < alpha < 1:
+        raise ValueError("alpha must be in (0,1)")
+    return float(alpha)
+
+
+def _prepare_quantile_matrix(
+    actuals: Sequence[float], quantile_preds: object, quantiles: Sequence[float]
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    y = _as_float_array(actuals, name="actual", ndim=1)
+    preds = _as_float_array(quantile_preds, name="pred", ndim=2)
+    levels = _check_quantiles(quantiles)
+    if preds.shape[0] != y.shape[0]:
+        raise ValueError("actuals and preds must have equal length")
+    if preds.shape[1] != levels.shape[0]:
+        raise ValueError("quantile_preds must have one column per quantile")
+    if not y.size:
+        raise ValueError("At least one sample is required")
+    return y, preds, levels
+
+
+def _prepare_interval(
+    actuals: Sequence[float], lower: Sequence[float], upper: Sequence[float]
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    y = _as_float_array(actuals, name="actual", ndim=1)
+    lo = _as_float_array(lower, name="lower", ndim=1)
+    hi = _as_float_array(upper, name="upper", ndim=1)
+    if not y.shape == lo.shape == hi.shape:
+        raise ValueError("actuals, lower, and upper must have equal length")
+    if not y.size:
+        raise ValueError("At least one sample is required")
+    return y, lo, hi
+
+
+def _group_codes(group_ids: Sequence[Hashable], size: int) -> tuple[np.ndarray, list[object]]:
+    if len(group_ids) != size:
+        raise ValueError("group_ids must have one entry per sample")
+    return factorize_keys(group_ids, name="group_ids")
+
+
+def pinball_loss_matrix(
+    actuals: Sequence[float],
+    quantile_preds: object,
+    quantiles: Sequence[float],
+) -> np.ndarray:
+    """Mean pinball loss of each column of an ``(n, q)`` prediction matrix.
+
+    Column ``j`` holds predictions for level ``quantiles[j]``; the result has
+    shape ``(q,)`` and matches :func:`pinball_loss` column by column.
+    """
+    y, preds, levels = _prepare_quantile_matrix(actuals, quantile_preds, quantiles)
+    return _row_sums(_pinball_matrix(y, preds, levels)) / y.shape[0]
+
+
+def grouped_pinball_loss(
+    actuals: Sequence[float],
+    quantile_preds: object,
+    quantiles: Sequence[float],
+    group_ids: Sequence[Hashable],
+) -> dict[object, np.ndarray]:
+    """:func:`pinball_loss_matrix` per group id, in first-appearance order."""
+    y, preds, levels = _prepare_quantile_matrix(actuals, quantile_preds, quantiles)
+    codes, groups = _group_codes(group_ids, y.shape[0])
+    losses = _pinball_matrix(y, preds, levels)
+    counts = np.bincount(codes, minlength=len(groups))
+    sums = np.column_stack(
+        [np.bincount(codes, weights=losses[:, col], minlength=len(groups)) for col in range(losses.shape[1])]
+    ).reshape(len(groups), losses.shape[1])
+    means = sums / counts[:, None]
+    return {group: means[idx] for idx, group in enumerate(groups)}
+
+
+def interval_summary(
+    actuals: Sequence[float],
+    lower: Sequence[float],
+    upper: Sequence[float],
+    *,
+    alpha: float,
+) -> IntervalSummary:
+    """Coverage, mean width and mean interval (Winkler) score of a central band.
+
+    ``alpha`` is the nominal miss rate of the band (``0.2`` for q10/q90). The
+    interval score of a sample is the width plus ``2 / alpha`` times the
+    distance by which the actual falls outside the band. Swapped bounds are
+    reordered, as in :func:`coverage_rate`.
+    """
+    alpha = _check_alpha(alpha)
+    y, lo, hi = _prepare_interval(actuals, lower, upper)
+    covered, width, score = _interval_terms(y, lo, hi, alpha)
+    n = y.shape[0]
+    sums = _row_sums(np.column_stack([width, score]))
+    return IntervalSummary(
+        samples=n,
+        coverage=int(np.count_nonzero(covered)) / n,
+        mean_width=float(sums[0]) / n,
+        winkler=float(sums[1]) / n,
+    )
+
+
+def grouped_interval_summary(
+    actuals: Sequence[float],
+    lower: Sequence[float],
+    upper: Sequence[float],
+    group_ids: Sequence[Hashable],
+    *,
+    alpha: float,
+) -> dict[object, IntervalSummary]:
+    """:func:`interval_summary` per group id, in first-appearance order."""
+    alpha = _check_alpha(alpha)
+    y, lo, hi = _prepare_interval(actuals, lower, upper)
+    codes, groups = _group_codes(group_ids, y.shape[0])
+    covered, width, score = _interval_terms(y, lo, hi, alpha)
+    size = len(groups)
+    counts = np.bincount(codes, minlength=size)
+    hits = np.bincount(codes, weights=covered.astype(np.float64), minlength=size)
+    widths = np.bincount(codes, weights=width, minlength=size)
+    scores = np.bincount(codes, weights=score, minlength=size)
+    return {
+        group: IntervalSummary(
+            samples=int(counts[idx]),
+            coverage=int(hits[idx]) / int(counts[idx]),
+            mean_width=float(widths[idx]) / int(counts[idx]),
+            winkler=float(scores[idx]) / int(counts[idx]),
+        )
+        for idx, group in enumerate(groups)
+    }
 
 
 def pinball_loss(actuals: Sequence[float], preds: Sequence[float], quantile: float) -> float:
@@ -36,6 +240,12 @@ def pinball_loss(actuals: Sequence[float], preds: Sequence[float], quantile: flo
     if not actuals:
         raise ValueError("At least one sample is required")
 
+    y = _finite_array(actuals)
+    q = _finite_array(preds)
+    if y is not None and q is not None and y.ndim == q.ndim == 1:
+        losses = _pinball_matrix(y, q[:, None], np.array([float(quantile)]))
+        return float(_row_sums(losses)[0]) / len(actuals)
+
     total = 0.0
     for idx, (actual, pred) in enumerate(zip(actuals, preds)):
         y = _as_float(actual, name=f"actual[{idx}]")
@@ -51,6 +261,11 @@ def coverage_rate(actuals: Sequence[float], lower: Sequence[float], upper: Seque
     if not actuals:
         raise ValueError("At least one sample is required")
 
+    arrays = [_finite_array(values) for values in (actuals, lower, upper)]
+    if all(array is not None and array.ndim == 1 for array in arrays):
+        covered, _, _ = _interval_terms(*arrays, alpha=1.0)
+        return int(np.count_nonzero(covered)) / len(actuals)
+
     covered = 0
     for idx, (actual, lo, hi) in enumerate(zip(actuals, lower, upper)):
         y = _as_float(actual, name=f"actual[{idx}]")
@@ -68,6 +283,12 @@ def mean_interval_width(lower: Sequence[float], upper: Sequence[float]) -> float
         raise ValueError("lower and upper must have equal length")
     if not lower:
         raise ValueError("At least one sample is required")
+
+    lo = _finite_array(lower)
+    hi = _finite_array(upper)
+    if lo is not None and hi is not None and lo.ndim == hi.ndim == 1:
+        return float(_row_sums(np.abs(hi - lo)[:, None])[0]) / len(lower)
+
     widths = []
     for idx, (lo, hi) in enumerate(zip(lower, upper)):
         l = _as_float(lo, name=f"lower[{idx}]")
@@ -78,7 +299,165 @@ def mean_interval_width(lower: Sequence[float], upper: Sequence[float]) -> float
     return sum(widths) / len(widths)
 
 
+def _metrics_from_sums(
+    samples: int,
+    *,
+    pinball: np.ndarray,
+    covered_80: int,
+    width_80: float,
+    winkler_80: float,
+    covered_90: int | None,
+    width_90: float | None,
+    winkler_90: float | None,
+) -> IntervalMetrics:
+    p10, p50, p90 = (float(value) / samples for value in pinball)
+    return IntervalMetrics(
+        samples=samples,
+        coverage_80=covered_80 / samples,
+        coverage_90=covered_90 / samples if covered_90 is not None else None,
+        mean_width_80=width_80 / samples,
+        mean_width_90=width_90 / samples if width_90 is not None else None,
+        pinball_q10=p10,
+        pinball_q50=p50,
+        pinball_q90=p90,
+        pinball_mean=(p10 + p50 + p90) / 3.0,
+        winkler_80=winkler_80 / samples,
+        winkler_90=winkler_90 / samples if winkler_90 is not None else None,
+    )
+
+
+_BAND_LEVELS = np.array([0.1, 0.5, 0.9])
+
+
+def _band_terms(
+    y: np.ndarray, band: np.ndarray, outer: np.ndarray | None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+    """Per-sample pinball losses and (covered, width, score) columns of the 80/90 bands."""
+    pinball = _pinball_matrix(y, band, _BAND_LEVELS)
+    inner = np.column_stack(_interval_terms(y, band[:, 0], band[:, 2], 0.2))
+    wide = np.column_stack(_interval_terms(y, outer[:, 0], outer[:, 1], 0.1)) if outer is not None else None
+    return pinball, inner, wide
+
+
+def _prepare_band(
+    actuals: Sequence[float],
+    q10: Sequence[float],
+    q50: Sequence[float],
+    q90: Sequence[float],
+    q05: Sequence[float] | None,
+    q95: Sequence[float] | None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+    y = _as_float_array(actuals, name="actual", ndim=1)
+    band = np.column_stack(
+        [_as_float_array(values, name=name, ndim=1) for name, values in (("q10", q10), ("q50", q50), ("q90", q90))]
+    )
+    outer = None
+    if q05 is not None and q95 is not None:
+        outer = np.column_stack([_as_float_array(q05, name="q05", ndim=1), _as_float_array(q95, name="q95", ndim=1)])
+    if band.shape[0] != y.shape[0] or (outer is not None and outer.shape[0] != y.shape[0]):
+        raise ValueError("actuals and quantile columns must have equal length")
+    return y, band, outer
+
+
+def compute_interval_metrics_arrays(
+    actuals: Sequence[float],
+    q10: Sequence[float],
+    q50: Sequence[float],
+    q90: Sequence[float],
+    q05: Sequence[float] | None = None,
+    q95: Sequence[float] | None = None,
+) -> IntervalMetrics:
+    """:func:`compute_interval_metrics` over columns instead of row mappings."""
+    y, band, outer = _prepare_band(actuals, q10, q50, q90, q05, q95)
+    if not y.size:
+        raise ValueError("At least one sample is required")
+
+    pinball, inner, wide = _band_terms(y, band, outer)
+    pinball_sums = _row_sums(pinball)
+    inner_sums = _row_sums(inner[:, 1:])
+    wide_sums = _row_sums(wide[:, 1:]) if wide is not None else None
+    return _metrics_from_sums(
+        y.shape[0],
+        pinball=pinball_sums,
+        covered_80=int(np.count_nonzero(inner[:, 0])),
+        width_80=float(inner_sums[0]),
+        winkler_80=float(inner_sums[1]),
+        covered_90=int(np.count_nonzero(wide[:, 0])) if wide is not None else None,
+        width_90=float(wide_sums[0]) if wide_sums is not None else None,
+        winkler_90=float(wide_sums[1]) if wide_sums is not None else None,
+    )
+
+
+def compute_interval_metrics_grouped(
+    actuals: Sequence[float],
+    q10: Sequence[float],
+    q50: Sequence[float],
+    q90: Sequence[float],
+    group_ids: Sequence[Hashable],
+    q05: Sequence[float] | None = None,
+    q95: Sequence[float] | None = None,
+) -> dict[object, IntervalMetrics]:
+    """:func:`compute_interval_metrics_arrays` per group id, in first-appearance order."""
+    y, band, outer = _prepare_band(actuals, q10, q50, q90, q05, q95)
+    codes, groups = _group_codes(group_ids, y.shape[0])
+
+    pinball, inner, wide = _band_terms(y, band, outer)
+    columns = [pinball, inner] if wide is None else [pinball, inner, wide]
+    stacked = np.column_stack(columns)
+    size = len(groups)
+    counts = np.bincount(codes, minlength=size)
+    sums = np.column_stack(
+        [np.bincount(codes, weights=stacked[:, col], minlength=size) for col in range(stacked.shape[1])]
+    ).reshape(size, stacked.shape[1])
+
+    results: dict[object, IntervalMetrics] = {}
+    for idx, group in enumerate(groups):
+        row = sums[idx]
+        results[group] = _metrics_from_sums(
+            int(counts[idx]),
+            pinball=row[0:3],
+            covered_80=int(row[3]),
+            width_80=float(row[4]),
+            winkler_80=float(row[5]),
+            covered_90=int(row[6]) if wide is not None else None,
+            width_90=float(row[7]) if wide is not None else None,
+            winkler_90=float(row[8]) if wide is not None else None,
+        )
+    return results
+
+
+def _interval_columns(rows: Sequence[Mapping[str, object]]) -> IntervalMetrics | None:
+    """Array path for :func:`compute_interval_metrics`; ``None`` defers to the row loop."""
+    try:
+        base = [(row["actual"], row["q10"], row["q50"], row["q90"]) for row in rows]
+        outer = [(row.get("q05"), row.get("q95")) for row in rows]
+    except (KeyError, TypeError, AttributeError):
+        return None
+    present = [lo is not None and hi is not None for lo, hi in outer]
+    has_90 = all(present)
+    if any(present) and not has_90:
+        return None
+    values = _finite_array(base)
+    wide = _finite_array(outer) if has_90 else None
+    if values is None or values.ndim != 2 or (has_90 and wide is None):
+        return None
+    return compute_interval_metrics_arrays(
+        values[:, 0],
+        values[:, 1],
+        values[:, 2],
+        values[:, 3],
+        wide[:, 0] if wide is not None else None,
+        wide[:, 1] if wide is not None else None,
+    )
+
+
 def compute_interval_metrics(rows: Iterable[Mapping[str, object]]) -> IntervalMetrics:
+    rows = list(rows)
+    if rows:
+        fast = _interval_columns(rows)
+        if fast is not None:
+            return fast
+
     actuals: list[float] = []
     q10: list[float] = []
     q50: list[float] = []
@@ -119,13 +498,22 @@ def compute_interval_metrics(rows: Iterable[Mapping[str, object]]) -> IntervalMe
         pinball_q50=p50,
         pinball_q90=p90,
         pinball_mean=(p10 + p50 + p90) / 3.0,
+        winkler_80=interval_summary(actuals, q10, q90, alpha=0.2).winkler,
+        winkler_90=interval_summary(actuals, q05, q95, alpha=0.1).winkler if has_90 else None,
     )
 
 
 __all__ = [
     "IntervalMetrics",
+    "IntervalSummary",
     "pinball_loss",
     "coverage_rate",
     "mean_interval_width",
     "compute_interval_metrics",
+    "compute_interval_metrics_arrays",
+    "compute_interval_metrics_grouped",
+    "pinball_loss_matrix",
+    "grouped_pinball_loss",
+    "interval_summary",
+    "grouped_interval_summary",
 ]
@@ -1,8 +1,19 @@
+"""Label-status filtering for calibration rows.
+
+Row sequences and columnar frames share one implementation: the status column
+is mapped through a lookup built once per distinct raw value, and
+multi-outcome rows are found with boolean masks over the flag, count and
+outcome columns. ``*_indices`` functions return row positions, so callers can
+filter frames (``to_binary_label_frame``) without copying row dicts.
+"""
+
 from __future__ import annotations
 
-from collections.abc import Mapping, Sequence
+from collections.abc import Iterable, Mapping, Sequence
 from typing import Any
 
+import numpy as np
+
 RESOLVED_TRUE = "RESOLVED_TRUE"
 RESOLVED_FALSE = "RESOLVED_FALSE"
 VOID = "VOID"
@@ -27,50 +38,155 @@ def _effective_status_key(status_key: object) -> str:
     return _DEFAULT_STATUS_KEY
 
 
-def _status_from_row(row: object, *, status_key: str) -> str | None:
-    if not isinstance(row, Mapping):
-        return None
-    return _normalize_status(row.get(status_key))
+_SPLIT_GROUPS = ("resolved_true", "resolved_false", "void", "unresolved")
+_STATUS_GROUP_CODES = {RESOLVED_TRUE: 0, RESOLVED_FALSE: 1, VOID: 2}
+_UNRESOLVED_CODE = 3
+_MULTI_OUTCOME_KEYS = ("is_multi_outcome", "outcome_count", "outcomes")
 
 
-def _is_multi_outcome_row(row: Mapping[object, object]) -> bool:
-    if row.get("is_multi_outcome") is True:
-        return True
+def _is_frame(rows: object) -> bool:
+    return hasattr(rows, "columns") and hasattr(rows, "iloc")
 
-    outcome_count = row.get("outcome_count")
-    if (
-        isinstance(outcome_count, (int, float))
-        and not isinstance(outcome_count, bool)
-        and outcome_count > 2
-    ):
-        return True
 
-    outcomes = row.get("outcomes")
-    if isinstance(outcomes, Sequence) and not isinstance(outcomes, (str, bytes, bytearray)):
-        return len(outcomes) > 2
+def _dtype_kind(column: object) -> str | None:
+    return getattr(getattr(column, "dtype", None), "kind", None)
 
-    return False
 
+def _status_group_codes(statuses: Iterable[object], size: int) -> np.ndarray:
+    """Group code (index into ``_SPLIT_GROUPS``) of every raw status value."""
+    categories = getattr(statuses, "cat", None)
+    if categories is not None:
+        # Categorical column: normalize each category once, then take by code (-1 is missing).
+        lookup = np.array(
+            [_STATUS_GROUP_CODES.get(_normalize_status(value), _UNRESOLVED_CODE) for value in categories.categories]
+            + [_UNRESOLVED_CODE],  # missing values
+            dtype=np.int8,
+        )
+        return lookup[np.asarray(categories.codes)]
 
-def split_by_label_status(rows: Sequence[object]) -> dict[str, list[object]]:
-    grouped: dict[str, list[object]] = {
-        "resolved_true": [],
-        "resolved_false": [],
-        "void": [],
-        "unresolved": [],
-    }
+    memo: dict[tuple[type, object], int] = {}
+
+    def _code(value: object) -> int:
+        try:
+            key = (type(value), value)
+            cached = memo.get(key)
+        except TypeError:  # unhashable status value
+            return _STATUS_GROUP_CODES.get(_normalize_status(value), _UNRESOLVED_CODE)
+        if cached is None:
+            cached = memo[key] = _STATUS_GROUP_CODES.get(_normalize_status(value), _UNRESOLVED_CODE)
+        return cached
 
-    for row in rows:
-        status = _status_from_row(row, status_key=_DEFAULT_STATUS_KEY)
-        if status == RESOLVED_TRUE:
-            grouped["resolved_true"].append(row)
-        elif status == RESOLVED_FALSE:
-            grouped["resolved_false"].append(row)
-        elif status == VOID:
-            grouped["void"].append(row)
+    return np.fromiter(map(_code, statuses), dtype=np.int8, count=size)
+
+
+def _is_multi_outcome_count(value: object) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 2
+
+
+def _is_multi_outcome_list(value: object) -> bool:
+    if value is None:
+        return False
+    return isinstance(value, Sequence) and not isinstance(value, (str, bytes, bytearray)) and len(value) > 2
+
+
+def _multi_outcome_mask(
+    flags: object | None,
+    counts: object | None,
+    outcomes: object | None,
+    size: int,
+) -> np.ndarray:
+    """Multi-outcome mask over the flag, count and outcomes columns (``None`` = absent column)."""
+    mask = np.zeros(size, dtype=bool)
+    if flags is not None:
+        kind = _dtype_kind(flags)
+        if kind == "b":
+            mask |= np.asarray(flags, dtype=bool)
+        elif kind not in ("i", "u", "f"):
+            mask |= np.fromiter((value is True for value in flags), dtype=bool, count=size)
+    if counts is not None:
+        kind = _dtype_kind(counts)
+        if kind in ("i", "u", "f"):
+            with np.errstate(invalid="ignore"):
+                mask |= np.asarray(counts, dtype=np.float64) > 2
+        elif kind != "b":
+            mask |= np.fromiter(map(_is_multi_outcome_count, counts), dtype=bool, count=size)
+    if outcomes is not None and _dtype_kind(outcomes) not in ("b", "i", "u", "f"):
+        mask |= np.fromiter(map(_is_multi_outcome_list, outcomes), dtype=bool, count=size)
+    return mask
+
+
+class _LabelColumns:
+    """Status column plus positional access to other columns of rows or a frame."""
+
+    def __init__(self, rows: object, *, status_key: str) -> None:
+        if _is_frame(rows):
+            self._frame: Any = rows
+            self.size = len(self._frame.index)
+            self.is_mapping = np.ones(self.size, dtype=bool)
+            status = self.column(status_key)
+            self.status = status if status is not None else [None] * self.size
+            return
+        self._frame = None
+        sequence: Sequence[Any] = rows  # type: ignore[assignment]
+        self.size = len(sequence)
+        self.is_mapping = np.fromiter(
+            (type(row) is dict or isinstance(row, Mapping) for row in sequence), dtype=bool, count=self.size
+        )
+        if self.is_mapping.all():
+            self._rows: Sequence[Any] = sequence
         else:
-            grouped["unresolved"].append(row)
-    return grouped
+            self._rows = [row if ok else {} for row, ok in zip(sequence, self.is_mapping)]
+        self.status = [row.get(status_key) for row in self._rows]
+
+    def column(self, key: str, positions: np.ndarray | None = None) -> object | None:
+        """Values of *key* (at *positions*), or ``None`` when no row carries it."""
+        if self._frame is not None:
+            if key not in self._frame.columns:
+                return None
+            column = self._frame[key]
+            if positions is not None:
+                column = column.iloc[positions]
+            if _dtype_kind(column) in ("b", "i", "u", "f") or hasattr(column, "cat"):
+                return column
+            return column.tolist()
+        rows = self._rows if positions is None else [self._rows[idx] for idx in positions.tolist()]
+        values = [row.get(key) for row in rows]
+        return values if any(key in row for row in rows) else None
+
+
+def split_by_label_status_indices(rows: object) -> dict[str, np.ndarray]:
+    """Row positions per label-status group of a row sequence or frame."""
+    columns = _LabelColumns(rows, status_key=_DEFAULT_STATUS_KEY)
+    codes = _status_group_codes(columns.status, columns.size)  # type: ignore[arg-type]
+    return {name: np.flatnonzero(codes == code) for code, name in enumerate(_SPLIT_GROUPS)}
+
+
+def binary_label_indices(
+    rows: object,
+    *,
+    status_key: str = _DEFAULT_STATUS_KEY,
+    include_multi_outcome: bool = False,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Positions of binary-resolved rows and their ``y`` labels (1 true / 0 false).
+
+    Multi-outcome columns are only read for rows whose status is binary.
+    """
+    columns = _LabelColumns(rows, status_key=_effective_status_key(status_key))
+    codes = _status_group_codes(columns.status, columns.size)  # type: ignore[arg-type]
+    positions = np.flatnonzero(columns.is_mapping & (codes <= 1))
+    if not include_multi_outcome and positions.size:
+        multi = _multi_outcome_mask(
+            *(columns.column(key, positions) for key in _MULTI_OUTCOME_KEYS), positions.size
+        )
+        positions = positions[~multi]
+    return positions, (codes[positions] == 0).astype(np.int64)
+
+
+def split_by_label_status(rows: Sequence[object]) -> dict[str, list[object]]:
+    return {
+        name: [rows[position] for position in positions.tolist()]
+        for name, positions in split_by_label_status_indices(rows).items()
+    }
 
 
 def to_binary_label_rows(
@@ -79,35 +195,38 @@ def to_binary_label_rows(
     status_key: str = _DEFAULT_STATUS_KEY,
     include_multi_outcome: bool = False,
 ) -> list[dict[str, Any]]:
-    resolved_key = _effective_status_key(status_key)
+    positions, labels = binary_label_indices(
+        rows, status_key=status_key, include_multi_outcome=include_multi_outcome
+    )
     converted: list[dict[str, Any]] = []
-
-    for row in rows:
-        if not isinstance(row, Mapping):
-            continue
-        if not include_multi_outcome and _is_multi_outcome_row(row):
-            continue
-
-        status = _status_from_row(row, status_key=resolved_key)
-        if status == RESOLVED_TRUE:
-            y = 1
-        elif status == RESOLVED_FALSE:
-            y = 0
-        else:
-            continue
-
-        enriched = dict(row)
+    for position, y in zip(positions.tolist(), labels.tolist()):
+        enriched = dict(rows[position])  # type: ignore[call-overload]
         enriched["y"] = y
         converted.append(enriched)
-
     return converted
 
 
+def to_binary_label_frame(
+    frame: Any,
+    *,
+    status_key: str = _DEFAULT_STATUS_KEY,
+    include_multi_outcome: bool = False,
+) -> Any:
+    """Binary-resolved rows of a pandas DataFrame with an added ``y`` column."""
+    positions, labels = binary_label_indices(
+        frame, status_key=status_key, include_multi_outcome=include_multi_outcome
+    )
+    return frame.iloc[positions].assign(y=labels)
+
+
 __all__ = [
     "RESOLVED_TRUE",
     "RESOLVED_FALSE",
     "VOID",
     "UNRESOLVED",
+    "binary_label_indices",
     "split_by_label_status",
+    "split_by_label_status_indices",
+    "to_binary_label_frame",
     "to_binary_label_rows",
 ]
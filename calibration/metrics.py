@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import math
-from typing import Mapping, Sequence
+from typing import Any, Mapping, Sequence
+
+import numpy as np
 
 DEFAULT_BINS = 10
 DEFAULT_EPS = 1e-6
 DEFAULT_MIN_CONFIDENCE_SAMPLES = 30
 
-_PREDICTION_KEYS = ("pred", "prediction", "p_yes", "probability", "prob", "score")
-_LABEL_KEYS = ("label", "target", "y")
+PREDICTION_KEYS = ("pred", "prediction", "p_yes", "probability", "prob", "score")
+LABEL_KEYS = ("label", "target", "y")
 
 
 def _as_finite_float(value: object, *, name: str) -> float:
@@ -52,6 +54,134 @@ def _validate_inputs(
     return norm_preds, norm_labels
 
 
+def _as_list(values: Any) -> list[object]:
+    to_pylist = getattr(values, "to_pylist", None)
+    if callable(to_pylist):
+        return list(to_pylist())
+    if isinstance(values, np.ndarray):
+        return values.tolist()
+    return list(values)
+
+
+def _as_float_array(values: Any) -> np.ndarray:
+    if isinstance(values, np.ndarray):
+        return values.astype(np.float64, copy=False)
+    to_numpy = getattr(values, "to_numpy", None)
+    if callable(to_numpy) and hasattr(values, "to_pylist"):  # pyarrow Array / ChunkedArray
+        return np.asarray(to_numpy(zero_copy_only=False), dtype=np.float64)
+    return np.asarray(values, dtype=np.float64)
+
+
+def _validate_arrays(preds: Any, labels: Any) -> tuple[np.ndarray, np.ndarray]:
+    """Validate once and return float64 ``(preds, labels)`` arrays.
+
+    Accepts sequences, NumPy arrays and Arrow arrays/chunked arrays. Invalid
+    input is re-validated element by element, so the error message names the
+    first offending index exactly as :func:`_validate_inputs` does.
+    """
+    try:
+        pred_array = _as_float_array(preds)
+        label_array = _as_float_array(labels)
+    except (TypeError, ValueError):
+        pred_array = label_array = None
+    if (
+        pred_array is None
+        or label_array is None
+        or pred_array.ndim != 1
+        or label_array.ndim != 1
+        or pred_array.shape != label_array.shape
+        or pred_array.size == 0
+        or not (
+            np.isfinite(pred_array).all()
+            and np.isfinite(label_array).all()
+            and ((pred_array >= 0.0) & (pred_array <= 1.0)).all()
+            and ((label_array == 0.0) | (label_array == 1.0)).all()
+        )
+    ):
+        _validate_inputs(_as_list(preds), _as_list(labels))
+        raise ValueError("preds and labels must be one-dimensional")
+    return pred_array, label_array
+
+
+def _brier(preds: np.ndarray, labels: np.ndarray) -> float:
+    return float(np.sum((preds - labels) ** 2) / preds.size)
+
+
+def _log_loss(preds: np.ndarray, labels: np.ndarray, eps: float) -> float:
+    clipped = np.clip(preds, eps, 1.0 - eps)
+    total = np.sum(labels * np.log(clipped) + (1.0 - labels) * np.log(1.0 - clipped))
+    return float(-total / preds.size)
+
+
+def _ece(preds: np.ndarray, labels: np.ndarray, n_bins: int) -> float:
+    bin_index = np.minimum((preds * n_bins).astype(np.int64), n_bins - 1)
+    counts = np.bincount(bin_index, minlength=n_bins)
+    pred_sums = np.bincount(bin_index, weights=preds, minlength=n_bins)
+    label_sums = np.bincount(bin_index, weights=labels, minlength=n_bins)
+    occupied = counts > 0
+    count = counts[occupied]
+    gaps = np.abs(pred_sums[occupied] / count - label_sums[occupied] / count)
+    return float(np.sum(gaps * (count / preds.size)))
+
+
+def _slope_intercept(preds: np.ndarray, labels: np.ndarray) -> dict[str, float]:
+    mean_pred = float(np.sum(preds) / preds.size)
+    mean_label = float(np.sum(labels) / labels.size)
+    centered = preds - mean_pred
+    ss_xx = float(np.dot(centered, centered))
+    if ss_xx == 0.0:
+        return {"slope": 0.0, "intercept": mean_label}
+    slope = float(np.dot(centered, labels - mean_label)) / ss_xx
+    return {"slope": slope, "intercept": mean_label - slope * mean_pred}
+
+
+def factorize_keys(keys: Sequence[object], *, name: str = "key") -> tuple[np.ndarray, list[object]]:
+    """Integer codes in first-appearance order (dict semantics: ``1 == 1.0 == True``).
+
+    An unhashable key raises ``ValueError`` naming its row, with the same
+    wording as :func:`segment_metrics` (``name`` is the segment key).
+    """
+    index: dict[object, int] = {}
+    try:
+        codes = np.fromiter((index.setdefault(key, len(index)) for key in keys), dtype=np.int64, count=len(keys))
+    except TypeError as exc:
+        for idx, key in enumerate(keys):
+            try:
+                hash(key)
+            except TypeError:
+                raise ValueError(f"rows[{idx}] segment value for '{name}' must be hashable") from exc
+        raise
+    return codes, list(index)
+
+
+def _grouped_stats(
+    codes: np.ndarray,
+    n_groups: int,
+    *,
+    sq_err: np.ndarray,
+    log_terms: np.ndarray,
+    preds: np.ndarray,
+    labels: np.ndarray,
+    bin_index: np.ndarray,
+    n_bins: int,
+) -> dict[str, np.ndarray]:
+    counts = np.bincount(codes, minlength=n_groups).astype(np.float64)
+    cells = codes * n_bins + bin_index
+    cell_counts = np.bincount(cells, minlength=n_groups * n_bins).reshape(n_groups, n_bins).astype(np.float64)
+    cell_preds = np.bincount(cells, weights=preds, minlength=n_groups * n_bins).reshape(n_groups, n_bins)
+    cell_labels = np.bincount(cells, weights=labels, minlength=n_groups * n_bins).reshape(n_groups, n_bins)
+    occupied = cell_counts > 0
+    safe_counts = np.where(occupied, cell_counts, 1.0)
+    gaps = np.abs(cell_preds / safe_counts - cell_labels / safe_counts) * (cell_counts / counts[:, None])
+    return {
+        "sample_size": counts,
+        "brier": np.bincount(codes, weights=sq_err, minlength=n_groups) / counts,
+        "log_loss": -np.bincount(codes, weights=log_terms, minlength=n_groups) / counts,
+        "ece": np.where(occupied, gaps, 0.0).sum(axis=1),
+        "base_rate": np.bincount(codes, weights=labels, minlength=n_groups) / counts,
+    }
+
+
 def _validate_eps(eps: float) -> float:
     clipped_eps = _as_finite_float(eps, name="eps")
     if clipped_eps <= 0.0 or clipped_eps >= 0.5:
@@ -81,9 +211,8 @@ def _extract_row_value(
 
 def brier_score(preds: Sequence[object], labels: Sequence[object]) -> float:
     """Return mean squared error between predicted probabilities and binary labels."""
-    norm_preds, norm_labels = _validate_inputs(preds, labels)
-    n = len(norm_preds)
-    return sum((pred - label) ** 2 for pred, label in zip(norm_preds, norm_labels)) / n
+    pred_array, label_array = _validate_arrays(preds, labels)
+    return _brier(pred_array, label_array)
 
 
 def log_loss(
@@ -92,14 +221,8 @@ def log_loss(
     eps: float = DEFAULT_EPS,
 ) -> float:
     """Return binary cross-entropy for probability predictions."""
-    norm_preds, norm_labels = _validate_inputs(preds, labels)
-    clipped_eps = _validate_eps(eps)
-    n = len(norm_preds)
-    total = 0.0
-    for pred, label in zip(norm_preds, norm_labels):
-        clipped = min(max(pred, clipped_eps), 1.0 - clipped_eps)
-        total -= label * math.log(clipped) + (1 - label) * math.log(1.0 - clipped)
-    return total / n
+    pred_array, label_array = _validate_arrays(preds, labels)
+    return _log_loss(pred_array, label_array, _validate_eps(eps))
 
 
 def expected_calibration_error(
@@ -113,28 +236,8 @@ def expected_calibration_error(
     Bin index is computed as min(int(pred * bins), bins - 1), which ensures 1.0
     is always assigned to the final bin.
     """
-    norm_preds, norm_labels = _validate_inputs(preds, labels)
-    n_bins = _validate_bins(bins)
-
-    counts = [0] * n_bins
-    pred_sums = [0.0] * n_bins
-    label_sums = [0.0] * n_bins
-    total_count = len(norm_preds)
-
-    for pred, label in zip(norm_preds, norm_labels):
-        idx = min(int(pred * n_bins), n_bins - 1)
-        counts[idx] += 1
-        pred_sums[idx] += pred
-        label_sums[idx] += label
-
-    ece = 0.0
-    for idx, count in enumerate(counts):
-        if count == 0:
-            continue
-        avg_pred = pred_sums[idx] / count
-        avg_label = label_sums[idx] / count
-        ece += abs(avg_pred - avg_label) * (count / total_count)
-    return ece
+    pred_array, label_array = _validate_arrays(preds, labels)
+    return _ece(pred_array, label_array, _validate_bins(bins))
 
 
 def calibration_slope_intercept(
@@ -142,23 +245,8 @@ def calibration_slope_intercept(
     labels: Sequence[object],
 ) -> dict[str, float]:
     """Return least-squares slope/intercept for label ~ pred."""
-    norm_preds, norm_labels = _validate_inputs(preds, labels)
-
-    n = len(norm_preds)
-    mean_pred = sum(norm_preds) / n
-    mean_label = sum(norm_labels) / n
-
-    ss_xx = sum((pred - mean_pred) ** 2 for pred in norm_preds)
-    if ss_xx == 0.0:
-        return {"slope": 0.0, "intercept": mean_label}
-
-    ss_xy = sum(
-        (pred - mean_pred) * (label - mean_label)
-        for pred, label in zip(norm_preds, norm_labels)
-    )
-    slope = ss_xy / ss_xx
-    intercept = mean_label - slope * mean_pred
-    return {"slope": slope, "intercept": intercept}
+    pred_array, label_array = _validate_arrays(preds, labels)
+    return _slope_intercept(pred_array, label_array)
 
 
 def assess_confidence(
@@ -182,11 +270,16 @@ def summarize_metrics(
     preds: Sequence[object],
     labels: Sequence[object],
 ) -> dict[str, float]:
-    """Return the standard calibration metric bundle for one prediction set."""
+    """Return the standard calibration metric bundle for one prediction set.
+
+    Inputs may be sequences, NumPy arrays or Arrow columns; they are
+    validated once and every metric is computed from the same arrays.
+    """
+    pred_array, label_array = _validate_arrays(preds, labels)
     return {
-        "brier": brier_score(preds, labels),
-        "log_loss": log_loss(preds, labels, eps=DEFAULT_EPS),
-        "ece": expected_calibration_error(preds, labels, bins=DEFAULT_BINS),
+        "brier": _brier(pred_array, label_array),
+        "log_loss": _log_loss(pred_array, label_array, DEFAULT_EPS),
+        "ece": _ece(pred_array, label_array, DEFAULT_BINS),
     }
 
 
@@ -195,13 +288,65 @@ def summarize_metrics_extended(
     labels: Sequence[object],
 ) -> dict[str, float]:
     """Return standard calibration metrics plus slope/intercept."""
+    pred_array, label_array = _validate_arrays(preds, labels)
     return {
-        "brier": brier_score(preds, labels),
-        "log_loss": log_loss(preds, labels, eps=DEFAULT_EPS),
-        "ece": expected_calibration_error(preds, labels, bins=DEFAULT_BINS),
-        **calibration_slope_intercept(preds, labels),
+        "brier": _brier(pred_array, label_array),
+        "log_loss": _log_loss(pred_array, label_array, DEFAULT_EPS),
+        "ece": _ece(pred_array, label_array, DEFAULT_BINS),
+        **_slope_intercept(pred_array, label_array),
+    }
+
+
+def grouped_metrics(
+    preds: Sequence[object],
+    labels: Sequence[object],
+    groupings: Mapping[str, Sequence[object]],
+    *,
+    bins: int = DEFAULT_BINS,
+    eps: float = DEFAULT_EPS,
+) -> dict[str, dict[object, dict[str, float]]]:
+    """Per-group metrics for several grouping dimensions in one call.
+
+    ``groupings`` maps a dimension name to one hashable key per prediction.
+    Inputs are validated once; each dimension's keys are factorized once and
+    Brier, log loss, ECE bins, sample size and base rate for all of its
+    groups come from ``np.bincount`` passes over per-element terms shared by
+    every dimension. Groups appear in first-appearance order and each group's
+    values match :func:`summarize_metrics` on that group's rows.
+    """
+    pred_array, label_array = _validate_arrays(preds, labels)
+    n_bins = _validate_bins(bins)
+    clipped_eps = _validate_eps(eps)
+    clipped = np.clip(pred_array, clipped_eps, 1.0 - clipped_eps)
+    shared = {
+        "sq_err": (pred_array - label_array) ** 2,
+        "log_terms": label_array * np.log(clipped) + (1.0 - label_array) * np.log(1.0 - clipped),
+        "preds": pred_array,
+        "labels": label_array,
+        "bin_index": np.minimum((pred_array * n_bins).astype(np.int64), n_bins - 1),
     }
 
+    result: dict[str, dict[object, dict[str, float]]] = {}
+    for name, keys in groupings.items():
+        if len(keys) != pred_array.size:
+            raise ValueError(f"grouping {name!r} must have one key per prediction")
+        codes, group_keys = factorize_keys(keys, name=name)
+        stats = _grouped_stats(codes, len(group_keys), n_bins=n_bins, **shared)
+        result[name] = {
+            key: {
+                "brier": float(stats["brier"][code]),
+                "log_loss": float(stats["log_loss"][code]),
+                "ece": float(stats["ece"][code]),
+                "sample_size": int(stats["sample_size"][code]),
+                "base_rate": float(stats["base_rate"][code]),
+            }
+            for code, key in enumerate(group_keys)
+        }
+    return result
+
+
+_SUMMARY_KEYS = ("brier", "log_loss", "ece")
+
 
 def segment_metrics(
     rows: Sequence[Mapping[str, object]],
@@ -219,8 +364,9 @@ def segment_metrics(
     if not isinstance(segment_key, str) or not segment_key:
         raise ValueError("segment_key must be a non-empty string")
 
-    grouped_preds: dict[object, list[object]] = {}
-    grouped_labels: dict[object, list[object]] = {}
+    segments: list[object] = []
+    preds: list[object] = []
+    labels: list[object] = []
 
     for idx, row in enumerate(rows):
         if not isinstance(row, Mapping):
@@ -238,23 +384,36 @@ def segment_metrics(
 
         pred = _extract_row_value(
             row,
-            keys=_PREDICTION_KEYS,
+            keys=PREDICTION_KEYS,
             row_index=idx,
             value_name="prediction field",
         )
         label = _extract_row_value(
             row,
-            keys=_LABEL_KEYS,
+            keys=LABEL_KEYS,
             row_index=idx,
             value_name="label field",
         )
 
-        grouped_preds.setdefault(segment_value, []).append(pred)
-        grouped_labels.setdefault(segment_value, []).append(label)
+        segments.append(segment_value)
+        preds.append(pred)
+        labels.append(label)
 
+    try:
+        grouped = grouped_metrics(preds, labels, {segment_key: segments})[segment_key]
+    except ValueError:
+        # Re-validate per segment so errors keep their segment-relative indexes.
+        grouped_preds: dict[object, list[object]] = {}
+        grouped_labels: dict[object, list[object]] = {}
+        for segment_value, pred, label in zip(segments, preds, labels):
+            grouped_preds.setdefault(segment_value, []).append(pred)
+            grouped_labels.setdefault(segment_value, []).append(label)
+        for segment_value in grouped_preds:
+            summarize_metrics(grouped_preds[segment_value], grouped_labels[segment_value])
+        raise
     return {
-        segment_value: summarize_metrics(grouped_preds[segment_value], grouped_labels[segment_value])
-        for segment_value in grouped_preds
+        segment_value: {key: metrics[key] for key in _SUMMARY_KEYS}
+        for segment_value, metrics in grouped.items()
     }
 
 
@@ -286,10 +445,10 @@ def base_rate_drift(
         if time_key not in row:
             raise ValueError(f"rows[{idx}] missing time key: {time_key}")
         pred = _extract_row_value(
-            row, keys=_PREDICTION_KEYS, row_index=idx, value_name="prediction field",
+            row, keys=PREDICTION_KEYS, row_index=idx, value_name="prediction field",
         )
         label = _extract_row_value(
-            row, keys=_LABEL_KEYS, row_index=idx, value_name="label field",
+            row, keys=LABEL_KEYS, row_index=idx, value_name="label field",
         )
         decorated.append((row[time_key], pred, label))
 
@@ -325,6 +484,11 @@ def base_rate_drift(
             "ts_max": chunk[-1][0],
         })
 
+    return window_drift_summary(windows)
+
+
+def window_drift_summary(windows: list[dict[str, object]]) -> dict[str, object]:
+    """Drift verdict over chronological window summaries (see :func:`base_rate_drift`)."""
     base_rates = [float(w["base_rate"]) for w in windows]  # type: ignore[arg-type]
     brier_values = [float(w["brier"]) for w in windows]  # type: ignore[arg-type]
 
@@ -398,8 +562,11 @@ __all__ = [
     "log_loss",
     "expected_calibration_error",
     "calibration_slope_intercept",
+    "factorize_keys",
+    "grouped_metrics",
     "recalibrate_predictions",
     "segment_metrics",
     "summarize_metrics",
     "summarize_metrics_extended",
+    "window_drift_summary",
 ]
@@ -0,0 +1,315 @@
+"""Sliding-window conformal calibration maintained online.
+
+:class:`OnlineConformalCalibrator` keeps the last ``window_size`` calibration
+samples and two order-statistic indexes over them: band residuals (for the
+median center shift) and normalized errors (for the width-scale quantile).
+Adding or evicting a sample and querying a quantile are logarithmic in the
+window size, so the conformal state can be refreshed every realtime cycle
+instead of refitting the whole window with :func:`fit_conformal_adjustment`.
+
+Normalized errors depend on the center shift. They are indexed against a
+reference shift that is moved to the current residual median (re-indexing the
+window) only when the median drifts more than ``rebase_tolerance`` away.
+Between rebases the adjustment uses the reference shift with errors measured
+against that same shift, so it remains a valid split-conformal band. With
+``rebase_tolerance=0`` the result equals ``fit_conformal_adjustment`` on the
+window.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+from calibration.conformal import (
+    ConformalAdjustment,
+    _calibration_sample,
+    _conformal_quantile_level,
+)
+
+DEFAULT_WINDOW_SIZE = 2000
+DEFAULT_REBASE_TOLERANCE = 1e-3
+_BLOCK_LOAD = 256
+
+
+class OrderStatisticIndex:
+    """Sorted multiset of floats with positional access.
+
+    Values live in sorted blocks of at most ``2 * load`` items; a Fenwick tree
+    over block sizes finds the block holding the k-th value. Insert, remove
+    and ``kth`` cost a logarithmic search plus a bounded in-block move.
+    """
+
+    def __init__(self, values: Iterable[float] = (), *, load: int = _BLOCK_LOAD) -> None:
+        if load <= 0:
+            raise ValueError("load must be positive")
+        self._load = load
+        ordered = sorted(values)
+        self._blocks: list[list[float]] = [ordered[i : i + load] for i in range(0, len(ordered), load)]
+        self._maxes: list[float] = [block[-1] for block in self._blocks]
+        self._size = len(ordered)
+        self._rebuild_tree()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _rebuild_tree(self) -> None:
+        tree = [0] * (len(self._blocks) + 1)
+        for idx, block in enumerate(self._blocks, start=1):
+            tree[idx] += len(block)
+            parent = idx + (idx & -idx)
+            if parent < len(tree):
+                tree[parent] += tree[idx]
+        self._tree = tree
+
+    def _tree_add(self, block_index: int, delta: int) -> None:
+        idx = block_index + 1
+        while idx < len(self._tree):
+            self._tree[idx] += delta
+            idx += idx & -idx
+
+    def add(self, value: float) -> None:
+        if not self._blocks:
+            self._blocks.append([value])
+            self._maxes.append(value)
+            self._size = 1
+            self._rebuild_tree()
+            return
+        pos = min(bisect_right(self._maxes, value), len(self._blocks) - 1)
+        block = self._blocks[pos]
+        insort(block, value)
+        self._maxes[pos] = block[-1]
+        self._size += 1
+        if len(block) > 2 * self._load:
+            self._blocks[pos : pos + 1] = [block[: self._load], block[self._load :]]
+            self._maxes[pos : pos + 1] = [block[self._load - 1], block[-1]]
+            self._rebuild_tree()
+        else:
+            self._tree_add(pos, 1)
+
+    def remove(self, value: float) -> None:
+        pos = bisect_left(self._maxes, value)
+        if pos < len(self._blocks):
+            block = self._blocks[pos]
+            idx = bisect_left(block, value)
+            if idx < len(block) and block[idx] == value:
+                del block[idx]
+                self._size -= 1
+                if block:
+                    self._maxes[pos] = block[-1]
+                    self._tree_add(pos, -1)
+                else:
+                    del self._blocks[pos]
+                    del self._maxes[pos]
+                    self._rebuild_tree()
+                return
+        raise ValueError(f"value not in index: {value!r}")
+
+    def kth(self, k: int) -> float:
+        """The ``k``-th smallest value (0-based)."""
+        if k < 0 or k >= self._size:
+            raise IndexError("order statistic out of range")
+        position = 0
+        remaining = k
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            nxt = position + step
+            if nxt < len(self._tree) and self._tree[nxt] <= remaining:
+                position = nxt
+                remaining -= self._tree[nxt]
+            step >>= 1
+        return self._blocks[position][remaining]
+
+    def quantile(self, quantile: float) -> float:
+        """Same interpolation as ``calibration.conformal._empirical_quantile``."""
+        if not self._size:
+            raise ValueError("Cannot compute quantiles from an empty sequence")
+        if quantile <= 0:
+            return self._blocks[0][0]
+        if quantile >= 1:
+            return self._maxes[-1]
+        rank = (self._size - 1) * quantile
+        lo = int(rank)
+        hi = lo if rank == lo else lo + 1
+        if lo == hi:
+            return self.kth(lo)
+        weight = rank - lo
+        return self.kth(lo) * (1 - weight) + self.kth(hi) * weight
+
+
+class OnlineConformalCalibrator:
+    """Conformal center-shift/width-scale fit over a sliding sample window."""
+
+    def __init__(
+        self,
+        *,
+        window_size: int = DEFAULT_WINDOW_SIZE,
+        target_coverage: float = 0.8,
+        rebase_tolerance: float = DEFAULT_REBASE_TOLERANCE,
+        min_half_width: float = 1e-6,
+        lower_key: str = "q10",
+        median_key: str = "q50",
+        upper_key: str = "q90",
+    ) -> None:
+        if isinstance(window_size, bool) or not isinstance(window_size, int) or window_size <= 0:
+            raise ValueError("window_size must be a positive integer")
+        if not 0 < target_coverage <= 1:
+            raise ValueError("target_coverage must be in (0, 1]")
+        if rebase_tolerance < 0:
+            raise ValueError("rebase_tolerance must be non-negative")
+        self.window_size = window_size
+        self.target_coverage = float(target_coverage)
+        self.rebase_tolerance = float(rebase_tolerance)
+        self.min_half_width = min_half_width
+        self._keys = {"lower_key": lower_key, "median_key": median_key, "upper_key": upper_key}
+        # (observation, center, half_width) in arrival order.
+        self._samples: deque[tuple[float, float, float]] = deque()
+        self._residuals = OrderStatisticIndex()
+        self._scores = OrderStatisticIndex()
+        self._shift = 0.0
+        self.rebase_count = 0
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    @property
+    def center_shift(self) -> float:
+        return self._shift
+
+    def _score(self, sample: tuple[float, float, float]) -> float:
+        observation, center, half_width = sample
+        return abs(observation - (center + self._shift)) / half_width
+
+    def _push(self, sample: tuple[float, float, float]) -> None:
+        self._samples.append(sample)
+        self._residuals.add(sample[0] - sample[1])
+        self._scores.add(self._score(sample))
+        if len(self._samples) > self.window_size:
+            oldest = self._samples.popleft()
+            self._residuals.remove(oldest[0] - oldest[1])
+            self._scores.remove(self._score(oldest))
+
+    def _rebase(self, shift: float) -> None:
+        self._shift = shift
+        self._scores = OrderStatisticIndex(self._score(sample) for sample in self._samples)
+        self.rebase_count += 1
+
+    def update(
+        self,
+        bands: Sequence[Mapping[str, object]],
+        actuals: Sequence[float],
+    ) -> "OnlineConformalCalibrator":
+        """Add samples (oldest first), evicting beyond ``window_size``."""
+        if len(bands) != len(actuals):
+            raise ValueError("historical_bands and actuals must have equal length")
+        parsed = [
+            _calibration_sample(band, actual, index=idx, min_half_width=self.min_half_width, **self._keys)
+            for idx, (band, actual) in enumerate(zip(bands, actuals))
+        ]
+        for sample in parsed[-self.window_size :]:
+            self._push(sample)
+        if self._samples:
+            median = self._residuals.quantile(0.5)
+            if abs(median - self._shift) > self.rebase_tolerance:
+                self._rebase(median)
+        return self
+
+    def adjustment(self) -> ConformalAdjustment:
+        if not self._samples:
+            raise ValueError("At least one calibration sample is required")
+        quantile_level = _conformal_quantile_level(len(self._samples), self.target_coverage)
+        return ConformalAdjustment(
+            target_coverage=self.target_coverage,
+            quantile_level=float(quantile_level),
+            center_shift=float(self._shift),
+            width_scale=float(self._scores.quantile(quantile_level)),
+            sample_size=len(self._samples),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "window_size": self.window_size,
+            "target_coverage": self.target_coverage,
+            "rebase_tolerance": self.rebase_tolerance,
+            "min_half_width": self.min_half_width,
+            **self._keys,
+            "center_shift": self._shift,
+            "samples": [list(sample) for sample in self._samples],
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any]) -> "OnlineConformalCalibrator":
+        calibrator = cls(
+            window_size=int(payload["window_size"]),
+            target_coverage=float(payload["target_coverage"]),
+            rebase_tolerance=float(payload["rebase_tolerance"]),
+            min_half_width=float(payload["min_half_width"]),
+            lower_key=str(payload.get("lower_key", "q10")),
+            median_key=str(payload.get("median_key", "q50")),
+            upper_key=str(payload.get("upper_key", "q90")),
+        )
+        samples = [(float(obs), float(center), float(width)) for obs, center, width in payload.get("samples", [])]
+        calibrator._samples = deque(samples[-calibrator.window_size :])
+        calibrator._residuals = OrderStatisticIndex(obs - center for obs, center, _ in calibrator._samples)
+        calibrator._shift = float(payload.get("center_shift", 0.0))
+        calibrator._scores = OrderStatisticIndex(calibrator._score(sample) for sample in calibrator._samples)
+        return calibrator
+
+
+class SegmentedOnlineConformal:
+    """One :class:`OnlineConformalCalibrator` for all rows plus one per segment.
+
+    Segment keys are ``field=value|...`` over ``segment_fields``, as written
+    by ``pipelines.update_conformal_calibration``.
+    """
+
+    def __init__(self, *, segment_fields: Sequence[str] = (), min_samples: int = 100, **calibrator_options: Any) -> None:
+        self.segment_fields = [str(field) for field in segment_fields if field]
+        self.min_samples = min_samples
+        self._options = calibrator_options
+        self.overall = OnlineConformalCalibrator(**calibrator_options)
+        self.segments: dict[str, OnlineConformalCalibrator] = {}
+
+    def segment_key(self, row: Mapping[str, Any]) -> str:
+        return "|".join(f"{field}={row.get(field, 'unknown')}" for field in self.segment_fields)
+
+    def update(
+        self,
+        bands: Sequence[Mapping[str, object]],
+        actuals: Sequence[float],
+        rows: Sequence[Mapping[str, Any]] | None = None,
+    ) -> "SegmentedOnlineConformal":
+        """Add samples; segment fields are read from ``rows`` (default: the bands)."""
+        self.overall.update(bands, actuals)
+        if not self.segment_fields:
+            return self
+        grouped: dict[str, tuple[list[Mapping[str, object]], list[float]]] = {}
+        for band, actual, row in zip(bands, actuals, rows if rows is not None else bands):
+            segment_bands, segment_actuals = grouped.setdefault(self.segment_key(row), ([], []))
+            segment_bands.append(band)
+            segment_actuals.append(actual)
+        for key, (segment_bands, segment_actuals) in grouped.items():
+            calibrator = self.segments.get(key)
+            if calibrator is None:
+                calibrator = self.segments[key] = OnlineConformalCalibrator(**self._options)
+            calibrator.update(segment_bands, segment_actuals)
+        return self
+
+    def adjustments(self) -> tuple[ConformalAdjustment, dict[str, ConformalAdjustment]]:
+        """Overall adjustment and those of segments with at least ``min_samples`` samples."""
+        return self.overall.adjustment(), {
+            key: calibrator.adjustment()
+            for key, calibrator in sorted(self.segments.items())
+            if len(calibrator) >= self.min_samples
+        }
+
+
+__all__ = [
+    "DEFAULT_REBASE_TOLERANCE",
+    "DEFAULT_WINDOW_SIZE",
+    "OnlineConformalCalibrator",
+    "OrderStatisticIndex",
+    "SegmentedOnlineConformal",
+]
@@ -0,0 +1,362 @@
+"""Mergeable streaming accumulators for calibration metrics.
+
+:class:`CalibrationAccumulator` keeps the sufficient statistics of
+:func:`calibration.metrics.summarize_metrics_extended` (squared-error and
+log-loss sums, ECE histogram bins, and mean/co-moment terms for the
+slope/intercept fit), so metrics can be updated as labels arrive and
+accumulators built on different shards or days can be merged. Means and
+co-moments are combined with the pairwise (Chan et al.) update, which stays
+accurate for long streams.
+
+:class:`WindowedCalibrationAccumulator` holds one accumulator per time bucket
+(one day by default). Rolling windows (e.g. 30d and 90d scoreboards) are the
+merge of the buckets they cover; buckets older than the retention horizon
+are evicted. Both serialize to small JSON documents.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from calibration.metrics import (
+    DEFAULT_BINS,
+    DEFAULT_EPS,
+    _validate_arrays,
+    _validate_bins,
+    _validate_eps,
+)
+
+DAY_SECONDS = 86_400
+STATE_FORMAT = "calibration-accumulator"
+STATE_VERSION = 1
+
+
+@dataclass
+class CalibrationAccumulator:
+    bins: int = DEFAULT_BINS
+    eps: float = DEFAULT_EPS
+    count: int = 0
+    sq_err_sum: float = 0.0
+    log_loss_sum: float = 0.0
+    mean_pred: float = 0.0
+    mean_label: float = 0.0
+    pred_m2: float = 0.0
+    co_moment: float = 0.0
+    bin_counts: list[int] = field(default_factory=list)
+    bin_pred_sums: list[float] = field(default_factory=list)
+    bin_label_sums: list[float] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.bins = _validate_bins(self.bins)
+        self.eps = _validate_eps(self.eps)
+        for name, zero in (("bin_counts", 0), ("bin_pred_sums", 0.0), ("bin_label_sums", 0.0)):
+            values = getattr(self, name)
+            if not values:
+                setattr(self, name, [zero] * self.bins)
+            elif len(values) != self.bins:
+                raise ValueError(f"{name} must have {self.bins} entries")
+
+    def _combine(
+        self,
+        *,
+        count: int,
+        mean_pred: float,
+        mean_label: float,
+        pred_m2: float,
+        co_moment: float,
+    ) -> None:
+        if count == 0:
+            return
+        if self.count == 0:
+            self.mean_pred, self.mean_label = mean_pred, mean_label
+            self.pred_m2, self.co_moment = pred_m2, co_moment
+            self.count = count
+            return
+        total = self.count + count
+        delta_pred = mean_pred - self.mean_pred
+        delta_label = mean_label - self.mean_label
+        weight = self.count * count / total
+        self.pred_m2 += pred_m2 + delta_pred * delta_pred * weight
+        self.co_moment += co_moment + delta_pred * delta_label * weight
+        self.mean_pred += delta_pred * count / total
+        self.mean_label += delta_label * count / total
+        self.count = total
+
+    def update(self, preds: Sequence[object], labels: Sequence[object]) -> "CalibrationAccumulator":
+        """Add a batch of predictions with resolved binary labels."""
+        pred_array, label_array = _validate_arrays(preds, labels)
+        clipped = np.clip(pred_array, self.eps, 1.0 - self.eps)
+        self.sq_err_sum += float(np.sum((pred_array - label_array) ** 2))
+        self.log_loss_sum -= float(
+            np.sum(label_array * np.log(clipped) + (1.0 - label_array) * np.log(1.0 - clipped))
+        )
+        bin_index = np.minimum((pred_array * self.bins).astype(np.int64), self.bins - 1)
+        counts = np.bincount(bin_index, minlength=self.bins)
+        pred_sums = np.bincount(bin_index, weights=pred_array, minlength=self.bins)
+        label_sums = np.bincount(bin_index, weights=label_array, minlength=self.bins)
+        for idx in range(self.bins):
+            self.bin_counts[idx] += int(counts[idx])
+            self.bin_pred_sums[idx] += float(pred_sums[idx])
+            self.bin_label_sums[idx] += float(label_sums[idx])
+
+        mean_pred = float(np.sum(pred_array) / pred_array.size)
+        mean_label = float(np.sum(label_array) / label_array.size)
+        centered = pred_array - mean_pred
+        self._combine(
+            count=int(pred_array.size),
+            mean_pred=mean_pred,
+            mean_label=mean_label,
+            pred_m2=float(np.dot(centered, centered)),
+            co_moment=float(np.dot(centered, label_array - mean_label)),
+        )
+        return self
+
+    def merge(self, other: "CalibrationAccumulator") -> "CalibrationAccumulator":
+        """Fold ``other`` into this accumulator (bins and eps must match)."""
+        if other.bins != self.bins or other.eps != self.eps:
+            raise ValueError("cannot merge accumulators with different bins or eps")
+        self.sq_err_sum += other.sq_err_sum
+        self.log_loss_sum += other.log_loss_sum
+        for idx in range(self.bins):
+            self.bin_counts[idx] += other.bin_counts[idx]
+            self.bin_pred_sums[idx] += other.bin_pred_sums[idx]
+            self.bin_label_sums[idx] += other.bin_label_sums[idx]
+        self._combine(
+            count=other.count,
+            mean_pred=other.mean_pred,
+            mean_label=other.mean_label,
+            pred_m2=other.pred_m2,
+            co_moment=other.co_moment,
+        )
+        return self
+
+    def copy(self) -> "CalibrationAccumulator":
+        return CalibrationAccumulator.from_dict(self.to_dict())
+
+    def metrics(self, *, extended: bool = False) -> dict[str, float]:
+        """Current metrics; same keys and values as ``summarize_metrics(_extended)``."""
+        if self.count == 0:
+            raise ValueError("accumulator is empty")
+        ece = 0.0
+        for count, pred_sum, label_sum in zip(self.bin_counts, self.bin_pred_sums, self.bin_label_sums):
+            if count:
+                ece += abs(pred_sum / count - label_sum / count) * (count / self.count)
+        result = {
+            "brier": self.sq_err_sum / self.count,
+            "log_loss": self.log_loss_sum / self.count,
+            "ece": ece,
+        }
+        if extended:
+            if self.pred_m2 == 0.0:
+                result.update(slope=0.0, intercept=self.mean_label)
+            else:
+                slope = self.co_moment / self.pred_m2
+                result.update(slope=slope, intercept=self.mean_label - slope * self.mean_pred)
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "bins": self.bins,
+            "eps": self.eps,
+            "count": self.count,
+            "sq_err_sum": self.sq_err_sum,
+            "log_loss_sum": self.log_loss_sum,
+            "mean_pred": self.mean_pred,
+            "mean_label": self.mean_label,
+            "pred_m2": self.pred_m2,
+            "co_moment": self.co_moment,
+            "bin_counts": list(self.bin_counts),
+            "bin_pred_sums": list(self.bin_pred_sums),
+            "bin_label_sums": list(self.bin_label_sums),
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any]) -> "CalibrationAccumulator":
+        try:
+            return cls(
+                bins=int(payload["bins"]),
+                eps=float(payload["eps"]),
+                count=int(payload["count"]),
+                sq_err_sum=float(payload["sq_err_sum"]),
+                log_loss_sum=float(payload["log_loss_sum"]),
+                mean_pred=float(payload["mean_pred"]),
+                mean_label=float(payload["mean_label"]),
+                pred_m2=float(payload["pred_m2"]),
+                co_moment=float(payload["co_moment"]),
+                bin_counts=[int(value) for value in payload["bin_counts"]],
+                bin_pred_sums=[float(value) for value in payload["bin_pred_sums"]],
+                bin_label_sums=[float(value) for value in payload["bin_label_sums"]],
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid calibration accumulator payload: {exc}") from exc
+
+
+def _epoch_seconds(values: Iterable[object]) -> np.ndarray:
+    """Event times as float epoch seconds (numbers, datetimes or ISO-8601 strings)."""
+    array = np.asarray(values if isinstance(values, np.ndarray) else list(values))
+    if np.issubdtype(array.dtype, np.datetime64):
+        return array.astype("datetime64[ns]").astype(np.int64) / 1e9
+    if np.issubdtype(array.dtype, np.number):
+        return array.astype(np.float64)
+    seconds = np.empty(array.size, dtype=np.float64)
+    for idx, value in enumerate(array.tolist()):
+        if isinstance(value, datetime):
+            moment = value
+        elif isinstance(value, str):
+            moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        else:
+            seconds[idx] = float(value)
+            continue
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        seconds[idx] = moment.timestamp()
+    return seconds
+
+
+@dataclass
+class WindowedCalibrationAccumulator:
+    """Time-bucketed accumulators with rolling-window views and eviction.
+
+    ``retention_s`` bounds how far back buckets are kept (e.g. 90 days for
+    30d and 90d scoreboard windows); ``None`` keeps everything.
+    """
+
+    bucket_s: int = DAY_SECONDS
+    retention_s: int | None = None
+    bins: int = DEFAULT_BINS
+    eps: float = DEFAULT_EPS
+    buckets: dict[int, CalibrationAccumulator] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if isinstance(self.bucket_s, bool) or int(self.bucket_s) <= 0:
+            raise ValueError("bucket_s must be a positive number of seconds")
+        self.bucket_s = int(self.bucket_s)
+        self.bins = _validate_bins(self.bins)
+        self.eps = _validate_eps(self.eps)
+
+    def _bucket(self, seconds: float) -> int:
+        return int(math.floor(seconds / self.bucket_s)) * self.bucket_s
+
+    def update(
+        self,
+        preds: Sequence[object],
+        labels: Sequence[object],
+        ts: Sequence[object],
+    ) -> "WindowedCalibrationAccumulator":
+        """Add a batch; each prediction lands in the bucket of its timestamp."""
+        pred_array, label_array = _validate_arrays(preds, labels)
+        seconds = _epoch_seconds(ts)
+        if seconds.size != pred_array.size:
+            raise ValueError("ts must have one timestamp per prediction")
+        starts = np.floor(seconds / self.bucket_s).astype(np.int64) * self.bucket_s
+        order = np.argsort(starts, kind="stable")
+        sorted_starts = starts[order]
+        boundaries = np.flatnonzero(np.diff(sorted_starts)) + 1
+        for chunk in np.split(order, boundaries):
+            start = int(starts[chunk[0]])
+            bucket = self.buckets.get(start)
+            if bucket is None:
+                bucket = self.buckets[start] = CalibrationAccumulator(bins=self.bins, eps=self.eps)
+            bucket.update(pred_array[chunk], label_array[chunk])
+        if self.retention_s is not None:
+            self.evict(now=float(seconds.max()))
+        return self
+
+    def merge(self, other: "WindowedCalibrationAccumulator") -> "WindowedCalibrationAccumulator":
+        if other.bucket_s != self.bucket_s:
+            raise ValueError("cannot merge windowed accumulators with different bucket_s")
+        for start, bucket in other.buckets.items():
+            if start in self.buckets:
+                self.buckets[start].merge(bucket)
+            else:
+                self.buckets[start] = bucket.copy()
+        return self
+
+    def evict(self, *, now: float | None = None) -> int:
+        """Drop buckets outside the retention horizon; returns how many were dropped."""
+        if self.retention_s is None or not self.buckets:
+            return 0
+        reference = max(self.buckets) if now is None else self._bucket(now)
+        cutoff = reference - self.retention_s + self.bucket_s
+        stale = [start for start in self.buckets if start < cutoff]
+        for start in stale:
+            del self.buckets[start]
+        return len(stale)
+
+    def window(self, window_s: int | None = None, *, now: object = None) -> CalibrationAccumulator:
+        """Merge of the buckets in the last ``window_s`` seconds up to ``now``.
+
+        ``now`` defaults to the newest bucket; ``window_s=None`` merges all.
+        """
+        merged = CalibrationAccumulator(bins=self.bins, eps=self.eps)
+        if not self.buckets:
+            return merged
+        reference = max(self.buckets) if now is None else self._bucket(float(_epoch_seconds([now])[0]))
+        lower = -math.inf if window_s is None else reference - int(window_s) + self.bucket_s
+        for start in sorted(self.buckets):
+            if lower <= start <= reference:
+                merged.merge(self.buckets[start])
+        return merged
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "format": STATE_FORMAT,
+            "version": STATE_VERSION,
+            "bucket_s": self.bucket_s,
+            "retention_s": self.retention_s,
+            "bins": self.bins,
+            "eps": self.eps,
+            "buckets": {str(start): bucket.to_dict() for start, bucket in sorted(self.buckets.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any]) -> "WindowedCalibrationAccumulator":
+        if payload.get("format") != STATE_FORMAT:
+            raise ValueError("Invalid calibration accumulator state: unexpected format")
+        retention = payload.get("retention_s")
+        buckets = payload.get("buckets") or {}
+        if not isinstance(buckets, Mapping):
+            raise ValueError("Invalid calibration accumulator state: buckets must be a mapping")
+        return cls(
+            bucket_s=int(payload["bucket_s"]),
+            retention_s=None if retention is None else int(retention),
+            bins=int(payload["bins"]),
+            eps=float(payload["eps"]),
+            buckets={int(start): CalibrationAccumulator.from_dict(value) for start, value in buckets.items()},
+        )
+
+
+def save_accumulator_state(accumulator: WindowedCalibrationAccumulator, path: str | Path) -> Path:
+    """Write the accumulator state as JSON (atomically replacing ``path``)."""
+    resolved = Path(path)
+    resolved.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = resolved.with_name(f".{resolved.name}.tmp")
+    temp_path.write_text(json.dumps(accumulator.to_dict(), separators=(",", ":")), encoding="utf-8")
+    temp_path.replace(resolved)
+    return resolved
+
+
+def load_accumulator_state(path: str | Path) -> WindowedCalibrationAccumulator | None:
+    resolved = Path(path)
+    if not resolved.exists():
+        return None
+    payload = json.loads(resolved.read_text(encoding="utf-8"))
+    if not isinstance(payload, Mapping):
+        raise ValueError(f"Invalid calibration accumulator state at {resolved}")
+    return WindowedCalibrationAccumulator.from_dict(payload)
+
+
+__all__ = [
+    "CalibrationAccumulator",
+    "WindowedCalibrationAccumulator",
+    "load_accumulator_state",
+    "save_accumulator_state",
+]
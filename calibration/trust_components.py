@@ -6,13 +6,16 @@ value so that the trust score pipeline never fails on incomplete data.
 
 The ``derive_trust_components`` orchestrator calls all four functions and
 returns a dict compatible with ``calibration.trust_score.compute_trust_score``.
+``derive_trust_components_frame`` applies the same rules to whole columns.
 """
 
 from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from typing import Mapping
+from typing import Any, Mapping
+
+import numpy as np
 
 _BUCKET_BASE: dict[str, float] = {
     "LOW": 0.2,
@@ -191,11 +194,153 @@ def derive_trust_components(
     }
 
 
+# ---- columnar variants ----
+
+TRUST_FEATURE_KEYS: tuple[str, ...] = (
+    "liquidity_bucket",
+    "volume_24h",
+    "open_interest",
+    "vol",
+    "ambiguity_score",
+    "resolution_risk_score",
+    "oi_change",
+    "volume_velocity",
+)
+
+
+def _frame_length(frame: Any) -> int:
+    if hasattr(frame, "columns") and hasattr(frame, "index"):
+        return len(frame.index)
+    for values in frame.values():
+        return len(values)
+    return 0
+
+
+def _float_or_nan(value: object) -> float:
+    try:
+        return float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _safe_float_column(frame: Any, key: str, size: int) -> np.ndarray:
+    """``_safe_float(value, default=nan)`` for every value of column *key*."""
+    if key not in frame:
+        return np.full(size, np.nan)
+    values = frame[key]
+    try:
+        column = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        column = np.fromiter(map(_float_or_nan, values), dtype=np.float64, count=size)
+    if column.shape != (size,):
+        raise ValueError(f"column {key!r} must have one value per row")
+    return np.where(np.isfinite(column), column, np.nan)
+
+
+def _clip_column(values: np.ndarray) -> np.ndarray:
+    return np.maximum(0.0, np.minimum(1.0, values))
+
+
+def _bucket_base_column(frame: Any, size: int) -> np.ndarray:
+    if "liquidity_bucket" not in frame:
+        return np.full(size, np.nan)
+    cache: dict[object, float] = {}
+
+    def _base(value: object) -> float:
+        try:
+            return cache[value]
+        except KeyError:
+            base = cache[value] = _BUCKET_BASE.get(str(value).upper(), float("nan"))
+            return base
+        except TypeError:  # unhashable
+            return _BUCKET_BASE.get(str(value).upper(), float("nan"))
+
+    return np.fromiter((_base(value) for value in frame["liquidity_bucket"]), dtype=np.float64, count=size)
+
+
+def derive_trust_components_frame(
+    frame: Any,
+    *,
+    config: TrustComponentConfig | None = None,
+) -> dict[str, np.ndarray]:
+    """Derive all four trust components for every row of a columnar frame.
+
+    *frame* is a pandas DataFrame or a mapping of equal-length columns keyed
+    like the row fields (see ``TRUST_FEATURE_KEYS``); absent columns count as
+    missing values. Clipping, fallbacks and per-row results match
+    :func:`derive_trust_components`.
+    """
+    cfg = config if config is not None else _DEFAULT_CONFIG
+    size = _frame_length(frame)
+
+    bucket_base = _bucket_base_column(frame, size)
+    volume = _safe_float_column(frame, "volume_24h", size)
+    oi = _safe_float_column(frame, "open_interest", size)
+    has_bucket = ~np.isnan(bucket_base)
+    has_volume = ~np.isnan(volume)
+    has_oi = ~np.isnan(oi)
+    has_size = has_volume | has_oi
+    base = np.where(has_bucket, bucket_base, 0.5)
+    raw = np.maximum(np.where(has_volume, volume, 0.0), np.where(has_oi, oi, 0.0))
+    normalized = np.minimum(raw / cfg.liquidity_high, 1.0) if cfg.liquidity_high > 0 else np.ones(size)
+    liquidity_depth = np.where(
+        has_size,
+        _clip_column(0.4 * base + 0.6 * normalized),
+        np.where(has_bucket, _clip_column(base), 0.5),
+    )
+
+    vol = _safe_float_column(frame, "vol", size)
+    if cfg.volatility_ceiling <= 0:
+        stability = np.full(size, 0.5)
+    else:
+        stability = np.where(
+            np.isnan(vol), 0.5, _clip_column(1.0 - np.minimum(np.abs(vol) / cfg.volatility_ceiling, 1.0))
+        )
+
+    ambiguity = _safe_float_column(frame, "ambiguity_score", size)
+    resolution_risk = _safe_float_column(frame, "resolution_risk_score", size)
+    has_ambiguity = ~np.isnan(ambiguity)
+    has_risk = ~np.isnan(resolution_risk)
+    question_quality = np.select(
+        [has_ambiguity & has_risk, has_ambiguity, has_risk],
+        [
+            _clip_column(1.0 - (0.6 * ambiguity + 0.4 * resolution_risk)),
+            _clip_column(1.0 - ambiguity),
+            _clip_column(1.0 - resolution_risk),
+        ],
+        default=0.5,
+    )
+
+    oi_change = _safe_float_column(frame, "oi_change", size)
+    velocity = _safe_float_column(frame, "volume_velocity", size)
+    zeros = np.zeros(size)
+    oi_anomaly = (
+        np.where(np.isnan(oi_change), 0.0, np.minimum(np.abs(oi_change) / cfg.oi_spike_threshold, 1.0))
+        if cfg.oi_spike_threshold > 0
+        else zeros
+    )
+    vel_anomaly = (
+        np.where(np.isnan(velocity), 0.0, np.minimum(np.abs(velocity) / cfg.velocity_spike_threshold, 1.0))
+        if cfg.velocity_spike_threshold > 0
+        else zeros
+    )
+    manipulation_suspect = _clip_column(np.maximum(oi_anomaly, vel_anomaly))
+
+    return {
+        "liquidity_depth": liquidity_depth,
+        "stability": stability,
+        "question_quality": question_quality,
+        "manipulation_suspect": manipulation_suspect,
+    }
+
+
 __all__ = [
+    "TRUST_FEATURE_KEYS",
     "TrustComponentConfig",
     "derive_liquidity_depth",
     "derive_manipulation_suspect",
     "derive_question_quality",
     "derive_stability",
     "derive_trust_components",
+    "derive_trust_components_frame",
 ]
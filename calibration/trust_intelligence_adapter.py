@@ -110,7 +110,8 @@ def run_trust_intelligence_for_market(
     Parameters
     ----------
     pipeline
-        A ``TrustIntelligencePipeline`` instance.
+        A ``TrustIntelligencePipeline`` instance, or any object with the same
+        ``run`` signature (e.g. ``StubTrustIntelligencePipeline``).
     market_rows
         All rows for this market (from feature frame).
     v1_trust_score
@@ -121,9 +122,9 @@ def run_trust_intelligence_for_market(
     Returns
     -------
     PipelineResult or None
-        Full pipeline output, or None if pipeline unavailable.
+        Full pipeline output, or None if no pipeline is available.
     """
-    if not HAS_TRUST_INTELLIGENCE:
+    if pipeline is None or not callable(getattr(pipeline, "run", None)):
         return None
 
     if not market_rows:
@@ -3,6 +3,8 @@ from __future__ import annotations
 import math
 from typing import Mapping
 
+import numpy as np
+
 W_LIQUIDITY = 0.35
 W_STABILITY = 0.25
 W_QUESTION_QUALITY = 0.25
@@ -105,6 +107,49 @@ def compute_trust_score(
     return max(0.0, min(100.0, score))
 
 
+def _unit_column(values: object, *, name: str) -> np.ndarray:
+    """``_clip_unit`` for every value; invalid values raise the same error."""
+    try:
+        column = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        column = None
+    if column is None or not np.isfinite(column).all():
+        column = np.array([_as_float(value, name=name) for value in values], dtype=np.float64)
+    if column.ndim != 1:
+        raise ValueError(f"Trust component {name} must be one-dimensional")
+    return np.where(column <= 0.0, 0.0, np.where(column >= 1.0, 1.0, column))
+
+
+def compute_trust_components_frame(components: Mapping[str, object]) -> dict[str, np.ndarray]:
+    """Clip every component column into ``[0, 1]`` (see :func:`compute_trust_components`)."""
+    normalized: dict[str, np.ndarray] = {}
+    for key in _COMPONENT_KEYS:
+        if key not in components:
+            raise ValueError(f"Missing trust component: {key}")
+        normalized[key] = _unit_column(components[key], name=key)
+    sizes = {len(column) for column in normalized.values()}
+    if len(sizes) > 1:
+        raise ValueError("trust component columns must have equal length")
+    return normalized
+
+
+def compute_trust_score_frame(
+    components: Mapping[str, object],
+    weights: Mapping[str, object] | None = None,
+) -> np.ndarray:
+    """Trust scores for component columns; elementwise equal to :func:`compute_trust_score`."""
+    normalized_components = compute_trust_components_frame(components)
+    normalized_weights = _normalize_weights(weights)
+
+    adjusted = dict(normalized_components)
+    adjusted["manipulation_suspect"] = 1.0 - adjusted["manipulation_suspect"]
+
+    score = np.zeros(len(adjusted["liquidity_depth"]))
+    for key in _COMPONENT_KEYS:
+        score = score + normalized_weights[key] * adjusted[key]
+    return np.maximum(0.0, np.minimum(100.0, 100.0 * score))
+
+
 def build_trust_score_row(
     market_id: object,
     ts: object,
@@ -146,6 +191,8 @@ __all__ = [
     "W_QUESTION_QUALITY",
     "W_MANIPULATION",
     "compute_trust_components",
+    "compute_trust_components_frame",
     "compute_trust_score",
+    "compute_trust_score_frame",
     "build_trust_score_row",
 ]
@@ -1,11 +1,37 @@
-"""Deterministic intraday OHLC aggregation helpers."""
+"""Deterministic intraday OHLC aggregation helpers.
+
+``build_time_bars``/``resample_bars`` aggregate a complete batch of ticks or
+bars. :class:`BarAggregator` produces the same bars incrementally: ticks are
+ingested as they arrive, bars stay open until the watermark passes their end
+plus the allowed lateness, and coarser intervals are rolled up from the
+closed bars of the next finer interval. ``build_time_bars_columnar`` builds
+``build_time_bars`` output for several intervals at once from columns, for
+historical backfills.
+"""
 
 from __future__ import annotations
 
 from datetime import datetime, timezone
+import heapq
 import math
+import re
+from bisect import insort
+from collections.abc import Iterable, Mapping, Sequence
 from typing import Any
 
+import numpy as np
+import pandas as pd
+
+_TICK_VOLUME_KEYS: tuple[str, ...] = ("volume_sum", "volume", "size", "qty", "quantity", "amount")
+_BAR_VOLUME_KEYS: tuple[str, ...] = ("volume_sum", "volume")
+_INTERVAL_UNITS: dict[str, int] = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_INTERVAL_PATTERN = re.compile(r"^\s*(\d+)\s*([smhd])\s*$", re.IGNORECASE)
+_ISO_TIMESTAMP_PATTERN = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d{1,6})?(Z|[+-]\d{2}:\d{2})?"
+)
+_NUMERIC_TYPES = (int, float)
+_INT64_SAFE = float(2**62)
+
 
 def build_time_bars(
     rows: list[dict[str, Any]],
@@ -18,16 +44,10 @@ def build_time_bars(
 
     parsed_rows: list[tuple[str, int, int, float, float, int]] = []
     for row_index, row in enumerate(rows):
-        market_id = row.get("market_id")
-        ts = _coerce_epoch_seconds(row.get("ts"))
-        price = _coerce_float(row.get("p_yes"))
-        volume = _coerce_volume(
-            row,
-            candidates=("volume_sum", "volume", "size", "qty", "quantity", "amount"),
-        )
-        if not isinstance(market_id, str) or ts is None or price is None:
+        parsed = _parse_tick(row)
+        if parsed is None:
             continue
-
+        market_id, ts, price, volume = parsed
         bucket_start = _bucket_start(ts, interval_seconds)
         parsed_rows.append((market_id, bucket_start, ts, price, volume, row_index))
 
@@ -43,32 +63,11 @@ def build_time_bars(
             if active_bar is not None:
                 bars.append(_finalize_1m_bar(active_bar))
             active_key = key
-            active_bar = {
-                "market_id": market_id,
-                "start_ts": bucket_start,
-                "end_ts": bucket_start + interval_seconds - 1,
-                "open": price,
-                "high": price,
-                "low": price,
-                "close": price,
-                "count": 1,
-                "trade_count": 1,
-                "volume_sum": volume,
-                "_rv_sq_sum": 0.0,
-            }
+            active_bar = _new_tick_bar(market_id, bucket_start, interval_seconds, price, volume)
             continue
 
         assert active_bar is not None
-        previous_price = active_bar["close"]
-        if previous_price > 0.0 and price > 0.0:
-            log_return = math.log(price / previous_price)
-            active_bar["_rv_sq_sum"] += log_return * log_return
-        active_bar["high"] = max(active_bar["high"], price)
-        active_bar["low"] = min(active_bar["low"], price)
-        active_bar["close"] = price
-        active_bar["count"] += 1
-        active_bar["trade_count"] += 1
-        active_bar["volume_sum"] += volume
+        _add_tick(active_bar, price, volume)
 
     if active_bar is not None:
         bars.append(_finalize_1m_bar(active_bar))
@@ -78,104 +77,551 @@ def build_time_bars(
 
 def resample_to_5m(bars_1m: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Roll up 1-minute bars into deterministic 5-minute OHLC bars."""
-    interval_seconds = 300
-    parsed_rows: list[tuple[str, int, int, float, float, float, float, int, float, float, int]] = []
-
-    for row_index, bar in enumerate(bars_1m):
-        market_id = bar.get("market_id")
-        start_ts = _coerce_epoch_seconds(bar.get("start_ts"))
-        open_price = _coerce_float(bar.get("open"))
-        high_price = _coerce_float(bar.get("high"))
-        low_price = _coerce_float(bar.get("low"))
-        close_price = _coerce_float(bar.get("close"))
-        trade_count = _coerce_int(bar.get("trade_count"))
-        if trade_count is None:
-            trade_count = _coerce_int(bar.get("count"))
-        volume_sum = _coerce_volume(bar, candidates=("volume_sum", "volume"))
-        realized_vol = _coerce_float(bar.get("realized_vol"))
-        if realized_vol is None:
-            realized_vol = 0.0
-
-        if (
-            not isinstance(market_id, str)
-            or start_ts is None
-            or open_price is None
-            or high_price is None
-            or low_price is None
-            or close_price is None
-            or trade_count is None
-        ):
-            continue
+    return resample_bars(bars_1m, interval_seconds=300)
+
+
+def resample_bars(
+    bars: list[dict[str, Any]],
+    *,
+    interval_seconds: int,
+) -> list[dict[str, Any]]:
+    """Roll up finer bars into deterministic OHLC bars of ``interval_seconds``."""
+    if interval_seconds <= 0:
+        raise ValueError("interval_seconds must be positive")
 
+    parsed_rows: list[tuple[str, int, int, tuple[float, float, float, float, int, float, float], int]] = []
+    for row_index, bar in enumerate(bars):
+        parsed = _parse_child_bar(bar)
+        if parsed is None:
+            continue
+        market_id, start_ts, values = parsed
         bucket_start = _bucket_start(start_ts, interval_seconds)
-        parsed_rows.append(
-            (
-                market_id,
-                bucket_start,
-                start_ts,
-                open_price,
-                high_price,
-                low_price,
-                close_price,
-                trade_count,
-                volume_sum,
-                realized_vol,
-                row_index,
-            )
-        )
+        parsed_rows.append((market_id, bucket_start, start_ts, values, row_index))
 
-    parsed_rows.sort(key=lambda item: (item[0], item[1], item[2], item[10]))
+    parsed_rows.sort(key=lambda item: (item[0], item[1], item[2], item[4]))
 
-    bars: list[dict[str, Any]] = []
+    rolled: list[dict[str, Any]] = []
     active_key: tuple[str, int] | None = None
     active_bar: dict[str, Any] | None = None
 
-    for (
-        market_id,
-        bucket_start,
-        _start_ts,
-        open_price,
-        high_price,
-        low_price,
-        close_price,
-        trade_count,
-        volume_sum,
-        realized_vol,
-        _row_index,
-    ) in parsed_rows:
+    for market_id, bucket_start, _start_ts, values, _row_index in parsed_rows:
         key = (market_id, bucket_start)
         if key != active_key:
             if active_bar is not None:
-                bars.append(_finalize_5m_bar(active_bar))
+                rolled.append(_finalize_5m_bar(active_bar))
             active_key = key
-            active_bar = {
-                "market_id": market_id,
-                "start_ts": bucket_start,
-                "end_ts": bucket_start + interval_seconds - 1,
-                "open": open_price,
-                "high": high_price,
-                "low": low_price,
-                "close": close_price,
-                "count": trade_count,
-                "trade_count": trade_count,
-                "volume_sum": volume_sum,
-                "_rv_sq_sum": realized_vol * realized_vol,
-            }
+            active_bar = _new_rollup_bar(market_id, bucket_start, interval_seconds, values)
             continue
 
         assert active_bar is not None
-        active_bar["high"] = max(active_bar["high"], high_price)
-        active_bar["low"] = min(active_bar["low"], low_price)
-        active_bar["close"] = close_price
-        active_bar["count"] += trade_count
-        active_bar["trade_count"] += trade_count
-        active_bar["volume_sum"] += volume_sum
-        active_bar["_rv_sq_sum"] += realized_vol * realized_vol
+        _add_child(active_bar, values)
 
     if active_bar is not None:
-        bars.append(_finalize_5m_bar(active_bar))
+        rolled.append(_finalize_5m_bar(active_bar))
 
-    return bars
+    return rolled
+
+
+def parse_interval(value: str | int) -> int:
+    """Interval length in seconds from ``60``, ``"1m"``, ``"15m"``, ``"1h"``, ``"1d"``, ..."""
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid bar interval: {value!r}")
+    if isinstance(value, int):
+        seconds = value
+    else:
+        match = _INTERVAL_PATTERN.match(str(value))
+        if match is None:
+            raise ValueError(f"Invalid bar interval: {value!r}")
+        seconds = int(match.group(1)) * _INTERVAL_UNITS[match.group(2).lower()]
+    if seconds <= 0:
+        raise ValueError(f"Invalid bar interval: {value!r}")
+    return seconds
+
+
+class BarAggregator:
+    """Incremental OHLC bars for several intervals with watermarks and allowed lateness.
+
+    Ticks update open bars of the finest interval, keyed by (market, bucket).
+    A bar closes once the watermark (the latest tick ``ts`` seen, or a value
+    passed to :meth:`advance_watermark`) reaches its end plus
+    ``allowed_lateness_s``; until then late ticks are still merged in
+    tick-time order. Ticks whose bucket ended more than
+    ``allowed_lateness_s`` before the watermark are dropped and counted in
+    ``dropped_late_ticks``. Each coarser interval must be a multiple of the
+    next finer one and is rolled up from that interval's closed bars, so one
+    pass yields every interval. Emitted bars match ``build_time_bars`` and
+    repeated ``resample_bars`` over the same ticks.
+    """
+
+    def __init__(
+        self,
+        intervals: Sequence[str | int] = ("1m", "5m"),
+        *,
+        allowed_lateness_s: int = 0,
+    ) -> None:
+        if not intervals:
+            raise ValueError("at least one interval is required")
+        if allowed_lateness_s < 0:
+            raise ValueError("allowed_lateness_s must be non-negative")
+        by_seconds = {parse_interval(interval): str(interval) for interval in intervals}
+        self.interval_seconds: list[int] = sorted(by_seconds)
+        for finer, coarser in zip(self.interval_seconds, self.interval_seconds[1:]):
+            if coarser % finer:
+                raise ValueError(f"interval {coarser}s is not a multiple of {finer}s")
+        self.interval_names: list[str] = [by_seconds[seconds] for seconds in self.interval_seconds]
+        self.allowed_lateness_s = int(allowed_lateness_s)
+        self.watermark: int | None = None
+        self.dropped_late_ticks = 0
+        self._sequence = 0
+        # Finest interval: buffered (ts, sequence, price, volume) ticks per open bar.
+        self._open_ticks: dict[tuple[str, int], list[tuple[int, int, float, float]]] = {}
+        # Coarser intervals: running roll-up bars per open bucket.
+        self._open_rollups: list[dict[tuple[str, int], dict[str, Any]]] = [{} for _ in self.interval_seconds[1:]]
+        self._deadlines: list[list[tuple[int, str, int]]] = [[] for _ in self.interval_seconds]
+
+    def ingest(self, ticks: Iterable[Mapping[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+        """Add ticks (any order), advance the watermark to the latest ``ts`` and return closed bars."""
+        interval = self.interval_seconds[0]
+        latest = self.watermark
+        cutoff = self.watermark - self.allowed_lateness_s if self.watermark is not None else None
+        for tick in ticks:
+            parsed = _parse_tick(tick)
+            if parsed is None:
+                continue
+            market_id, ts, price, volume = parsed
+            bucket_start = _bucket_start(ts, interval)
+            if cutoff is not None and bucket_start + interval <= cutoff:
+                self.dropped_late_ticks += 1
+                continue
+            key = (market_id, bucket_start)
+            buffered = self._open_ticks.get(key)
+            if buffered is None:
+                buffered = self._open_ticks[key] = []
+                heapq.heappush(self._deadlines[0], (bucket_start + interval, market_id, bucket_start))
+            entry = (ts, self._sequence, price, volume)
+            self._sequence += 1
+            if buffered and entry < buffered[-1]:
+                insort(buffered, entry)
+            else:
+                buffered.append(entry)
+            latest = ts if latest is None else max(latest, ts)
+        if latest is None:
+            return self._empty()
+        return self.advance_watermark(latest)
+
+    def advance_watermark(self, watermark: int) -> dict[str, list[dict[str, Any]]]:
+        """Move the watermark forward (it never moves back) and return the bars that closed."""
+        if self.watermark is None or watermark > self.watermark:
+            self.watermark = int(watermark)
+        return self._close(self.watermark - self.allowed_lateness_s)
+
+    def flush(self) -> dict[str, list[dict[str, Any]]]:
+        """Close and return every open bar (end of stream)."""
+        return self._close(None)
+
+    def open_bar_count(self) -> int:
+        return len(self._open_ticks) + sum(len(level) for level in self._open_rollups)
+
+    def _empty(self) -> dict[str, list[dict[str, Any]]]:
+        return {name: [] for name in self.interval_names}
+
+    def _close(self, cutoff: int | None) -> dict[str, list[dict[str, Any]]]:
+        closed = self._empty()
+        for level, interval in enumerate(self.interval_seconds):
+            deadlines = self._deadlines[level]
+            due: list[tuple[str, int]] = []
+            while deadlines and (cutoff is None or deadlines[0][0] <= cutoff):
+                _, market_id, bucket_start = heapq.heappop(deadlines)
+                due.append((market_id, bucket_start))
+            due.sort()
+            bars = closed[self.interval_names[level]]
+            for market_id, bucket_start in due:
+                if level == 0:
+                    bar = self._close_tick_bar(market_id, bucket_start, interval)
+                else:
+                    bar = _finalize_5m_bar(self._open_rollups[level - 1].pop((market_id, bucket_start)))
+                bars.append(bar)
+                if level + 1 < len(self.interval_seconds):
+                    self._roll_up(level + 1, bar)
+        return closed
+
+    def _close_tick_bar(self, market_id: str, bucket_start: int, interval: int) -> dict[str, Any]:
+        ticks = self._open_ticks.pop((market_id, bucket_start))
+        _, _, price, volume = ticks[0]
+        bar = _new_tick_bar(market_id, bucket_start, interval, price, volume)
+        for _, _, price, volume in ticks[1:]:
+            _add_tick(bar, price, volume)
+        return _finalize_1m_bar(bar)
+
+    def _roll_up(self, level: int, child: dict[str, Any]) -> None:
+        parsed = _parse_child_bar(child)
+        assert parsed is not None
+        market_id, start_ts, values = parsed
+        interval = self.interval_seconds[level]
+        bucket_start = _bucket_start(start_ts, interval)
+        open_bars = self._open_rollups[level - 1]
+        bar = open_bars.get((market_id, bucket_start))
+        if bar is None:
+            open_bars[(market_id, bucket_start)] = _new_rollup_bar(market_id, bucket_start, interval, values)
+            heapq.heappush(self._deadlines[level], (bucket_start + interval, market_id, bucket_start))
+        else:
+            _add_child(bar, values)
+
+
+def build_time_bars_columnar(
+    ticks: Sequence[Mapping[str, Any]] | pd.DataFrame,
+    *,
+    intervals: Sequence[str | int] = (60,),
+) -> dict[str, list[dict[str, Any]]]:
+    """``build_time_bars(ticks, interval_seconds=...)`` for every interval, from columns.
+
+    Timestamps, prices and volumes are coerced column-wise with the row
+    builder's rules (including the volume-candidate fallback). Ticks are
+    sorted once by (market, ts, position), which orders every interval's
+    buckets. OHLC values come from group boundaries and ``reduceat``, and the
+    volume and realized-variance sums from ``np.bincount``, which adds in row
+    order. The result is keyed by ``str(interval)`` and equals the row
+    builder's output exactly; epochs beyond int64 range fall back to it.
+    """
+    seconds = [parse_interval(interval) for interval in intervals]
+    columns = _TickColumns(ticks)
+    market_values = columns.get("market_id")
+    epochs = _epoch_seconds_column(columns.get("ts"))
+    if epochs is None:
+        rows = ticks.to_dict("records") if isinstance(ticks, pd.DataFrame) else ticks
+        return {str(interval): build_time_bars(rows, interval_seconds=k) for interval, k in zip(intervals, seconds)}
+    ts, has_ts = epochs
+    price, has_price = _float_column(columns.get("p_yes"))
+    has_market = np.fromiter((isinstance(value, str) for value in market_values), dtype=bool, count=columns.size)
+    volume = _volume_column(columns, _TICK_VOLUME_KEYS)
+
+    keep = np.flatnonzero(has_market & has_ts & has_price)
+    markets = [market_values[idx] for idx in keep.tolist()]
+    market_names = sorted(set(markets))
+    market_code_of = {name: code for code, name in enumerate(market_names)}
+    market_codes = np.fromiter(map(market_code_of.__getitem__, markets), dtype=np.int64, count=len(markets))
+    ts = ts[keep]
+    order = np.lexsort((keep, ts, market_codes))
+    market_codes, ts, price, volume = market_codes[order], ts[order], price[keep][order], volume[keep][order]
+
+    return {
+        str(interval): _bars_from_sorted_ticks(market_names, market_codes, ts, price, volume, interval_seconds)
+        for interval, interval_seconds in zip(intervals, seconds)
+    }
+
+
+class _TickColumns:
+    """Column access over tick rows or a DataFrame (absent keys read as ``None``)."""
+
+    def __init__(self, ticks: Sequence[Mapping[str, Any]] | pd.DataFrame) -> None:
+        self._frame = ticks if isinstance(ticks, pd.DataFrame) else None
+        self._rows = None if self._frame is not None else ticks
+        self.size = len(ticks)
+
+    def get(self, key: str, positions: np.ndarray | None = None) -> Any:
+        """Values of *key* as a numeric Series (numeric dtypes) or a list."""
+        if self._frame is not None:
+            if key not in self._frame.columns:
+                return [None] * (self.size if positions is None else len(positions))
+            column = self._frame[key]
+            if positions is not None:
+                column = column.iloc[positions]
+            if column.dtype.kind in "iufb":
+                return column
+            return column.tolist()
+        rows = self._rows if positions is None else [self._rows[idx] for idx in positions.tolist()]
+        return [row.get(key) for row in rows]
+
+
+def _type_groups(values: list[Any]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Positions of plain int/float values, of strings and of everything else."""
+    kinds = np.fromiter(
+        (0 if type(value) in _NUMERIC_TYPES else 1 if type(value) is str else 2 for value in values),
+        dtype=np.int8,
+        count=len(values),
+    )
+    return np.flatnonzero(kinds == 0), np.flatnonzero(kinds == 1), np.flatnonzero(kinds == 2)
+
+
+def _numeric_array(values: Any) -> tuple[np.ndarray, np.ndarray] | None:
+    """Float64 values of a numeric column plus its finite mask (``None`` for bool columns)."""
+    if getattr(values, "dtype", None) is not None and values.dtype.kind == "b":
+        return None
+    try:
+        array = np.asarray(values, dtype=np.float64)
+    except OverflowError:  # ints beyond int64; float() raises like the row builder for ints beyond float range
+        array = np.array([float(value) for value in values], dtype=np.float64)
+    return array, np.isfinite(array)
+
+
+def _float_column(values: Any) -> tuple[np.ndarray, np.ndarray]:
+    """``_coerce_float`` for a whole column: (values, valid mask)."""
+    size = len(values)
+    out = np.zeros(size, dtype=np.float64)
+    valid = np.zeros(size, dtype=bool)
+    if not isinstance(values, list):
+        numeric = _numeric_array(values)
+        if numeric is not None:
+            out, valid = numeric
+            out = np.where(valid, out, 0.0)
+        return out, valid
+
+    numeric_idx, _, _ = _type_groups(values)
+    if numeric_idx.size:
+        array, finite = _numeric_array([values[idx] for idx in numeric_idx.tolist()])  # type: ignore[misc]
+        out[numeric_idx] = np.where(finite, array, 0.0)
+        valid[numeric_idx] = finite
+    for idx in np.flatnonzero(~np.isin(np.arange(size), numeric_idx)).tolist():
+        coerced = _coerce_float(values[idx])
+        if coerced is not None:
+            out[idx] = coerced
+            valid[idx] = True
+    return out, valid
+
+
+def _floor_epoch(array: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    finite = np.isfinite(array) & (np.abs(array) < _INT64_SAFE)
+    return np.floor(np.where(finite, array, 0.0)).astype(np.int64), finite
+
+
+def _epoch_seconds_column(values: Any) -> tuple[np.ndarray, np.ndarray] | None:
+    """``_coerce_epoch_seconds`` for a whole column: (int64 epochs, valid mask).
+
+    ``None`` when an epoch does not fit comfortably in int64.
+    """
+    size = len(values)
+    out = np.zeros(size, dtype=np.int64)
+    valid = np.zeros(size, dtype=bool)
+    elementwise: list[int] = []
+
+    if not isinstance(values, list):
+        numeric = _numeric_array(values)
+        if numeric is None:
+            return out, valid
+        array, _ = numeric
+        out, valid = _floor_epoch(array)
+        elementwise = np.flatnonzero(np.isfinite(array) & ~valid).tolist()
+        values = list(values) if elementwise else values
+    else:
+        numeric_idx, string_idx, other_idx = _type_groups(values)
+        if numeric_idx.size:
+            array, _ = _numeric_array([values[idx] for idx in numeric_idx.tolist()])  # type: ignore[misc]
+            floored, ok = _floor_epoch(array)
+            out[numeric_idx] = floored
+            valid[numeric_idx] = ok
+            elementwise.extend(numeric_idx[np.isfinite(array) & ~ok].tolist())
+        if string_idx.size:
+            stripped = [values[idx].strip() for idx in string_idx.tolist()]
+            # 0: not canonical ISO, 1: naive (UTC), 2: with offset. Naive and offset strings are
+            # parsed separately because pandas applies the first offset to naive strings.
+            kinds = np.fromiter(
+                (
+                    0 if match is None else 1 if match.group(1) is None else 2
+                    for match in map(_ISO_TIMESTAMP_PATTERN.fullmatch, stripped)
+                ),
+                dtype=np.int8,
+                count=len(stripped),
+            )
+            for kind in (1, 2):
+                selected = np.flatnonzero(kinds == kind)
+                if not selected.size:
+                    continue
+                parsed = pd.to_datetime(
+                    pd.Series([stripped[pos] for pos in selected.tolist()], dtype=object),
+                    utc=True,
+                    format="ISO8601",
+                    errors="coerce",
+                )
+                parsed_ok = parsed.notna().to_numpy()
+                nanos = parsed.to_numpy(dtype="datetime64[ns]", na_value=np.datetime64("NaT")).view(np.int64)
+                iso_idx = string_idx[selected]
+                out[iso_idx[parsed_ok]] = np.floor_divide(nanos[parsed_ok], 1_000_000_000)
+                valid[iso_idx[parsed_ok]] = True
+                elementwise.extend(iso_idx[~parsed_ok].tolist())
+            elementwise.extend(string_idx[kinds == 0].tolist())
+        elementwise.extend(other_idx.tolist())
+
+    for idx in elementwise:
+        coerced = _coerce_epoch_seconds(values[idx])
+        if coerced is not None:
+            if abs(coerced) >= _INT64_SAFE:
+                return None
+            out[idx] = coerced
+            valid[idx] = True
+    return out, valid
+
+
+def _volume_column(columns: _TickColumns, candidates: tuple[str, ...]) -> np.ndarray:
+    """``_coerce_volume``: first candidate that coerces to a finite float, else 0.0."""
+    volume = np.zeros(columns.size, dtype=np.float64)
+    pending = np.arange(columns.size)
+    for key in candidates:
+        if not pending.size:
+            break
+        values, ok = _float_column(columns.get(key, pending))
+        volume[pending[ok]] = values[ok]
+        pending = pending[~ok]
+    return volume
+
+
+def _bars_from_sorted_ticks(
+    market_names: list[str],
+    market_codes: np.ndarray,
+    ts: np.ndarray,
+    price: np.ndarray,
+    volume: np.ndarray,
+    interval_seconds: int,
+) -> list[dict[str, Any]]:
+    size = len(ts)
+    if not size:
+        return []
+    buckets = np.floor_divide(ts, interval_seconds) * interval_seconds
+    boundary = np.ones(size, dtype=bool)
+    boundary[1:] = (market_codes[1:] != market_codes[:-1]) | (buckets[1:] != buckets[:-1])
+    starts = np.flatnonzero(boundary)
+    ends = np.append(starts[1:] - 1, size - 1)
+    group_ids = np.cumsum(boundary) - 1
+    n_groups = len(starts)
+
+    # Squared log returns between consecutive ticks of the same bar, in tick order.
+    pairs = np.flatnonzero(~boundary)
+    pairs = pairs[(price[pairs - 1] > 0.0) & (price[pairs] > 0.0)]
+    ratios = price[pairs] / price[pairs - 1]
+    log_returns = np.fromiter(map(math.log, ratios.tolist()), dtype=np.float64, count=len(pairs))
+    rv_sq_sum = np.bincount(group_ids[pairs], weights=log_returns * log_returns, minlength=n_groups)
+    realized_vol = np.where(rv_sq_sum > 0.0, np.sqrt(np.where(rv_sq_sum > 0.0, rv_sq_sum, 0.0)), 0.0)
+
+    counts = (ends - starts + 1).tolist()
+    return [
+        {
+            "market_id": market_names[market_code],
+            "start_ts": start_ts,
+            "end_ts": start_ts + interval_seconds - 1,
+            "open": open_price,
+            "high": high_price,
+            "low": low_price,
+            "close": close_price,
+            "count": count,
+            "trade_count": count,
+            "volume_sum": volume_sum,
+            "realized_vol": vol,
+        }
+        for market_code, start_ts, open_price, high_price, low_price, close_price, count, volume_sum, vol in zip(
+            market_codes[starts].tolist(),
+            buckets[starts].tolist(),
+            price[starts].tolist(),
+            np.maximum.reduceat(price, starts).tolist(),
+            np.minimum.reduceat(price, starts).tolist(),
+            price[ends].tolist(),
+            counts,
+            np.bincount(group_ids, weights=volume, minlength=n_groups).tolist(),
+            realized_vol.tolist(),
+        )
+    ]
+
+
+def _parse_tick(row: Mapping[str, Any]) -> tuple[str, int, float, float] | None:
+    market_id = row.get("market_id")
+    ts = _coerce_epoch_seconds(row.get("ts"))
+    price = _coerce_float(row.get("p_yes"))
+    volume = _coerce_volume(row, candidates=_TICK_VOLUME_KEYS)
+    if not isinstance(market_id, str) or ts is None or price is None:
+        return None
+    return market_id, ts, price, volume
+
+
+def _new_tick_bar(
+    market_id: str, bucket_start: int, interval_seconds: int, price: float, volume: float
+) -> dict[str, Any]:
+    return {
+        "market_id": market_id,
+        "start_ts": bucket_start,
+        "end_ts": bucket_start + interval_seconds - 1,
+        "open": price,
+        "high": price,
+        "low": price,
+        "close": price,
+        "count": 1,
+        "trade_count": 1,
+        "volume_sum": volume,
+        "_rv_sq_sum": 0.0,
+    }
+
+
+def _add_tick(bar: dict[str, Any], price: float, volume: float) -> None:
+    previous_price = bar["close"]
+    if previous_price > 0.0 and price > 0.0:
+        log_return = math.log(price / previous_price)
+        bar["_rv_sq_sum"] += log_return * log_return
+    bar["high"] = max(bar["high"], price)
+    bar["low"] = min(bar["low"], price)
+    bar["close"] = price
+    bar["count"] += 1
+    bar["trade_count"] += 1
+    bar["volume_sum"] += volume
+
+
+def _parse_child_bar(
+    bar: Mapping[str, Any],
+) -> tuple[str, int, tuple[float, float, float, float, int, float, float]] | None:
+    market_id = bar.get("market_id")
+    start_ts = _coerce_epoch_seconds(bar.get("start_ts"))
+    open_price = _coerce_float(bar.get("open"))
+    high_price = _coerce_float(bar.get("high"))
+    low_price = _coerce_float(bar.get("low"))
+    close_price = _coerce_float(bar.get("close"))
+    trade_count = _coerce_int(bar.get("trade_count"))
+    if trade_count is None:
+        trade_count = _coerce_int(bar.get("count"))
+    volume_sum = _coerce_volume(bar, candidates=_BAR_VOLUME_KEYS)
+    realized_vol = _coerce_float(bar.get("realized_vol"))
+    if realized_vol is None:
+        realized_vol = 0.0
+
+    if (
+        not isinstance(market_id, str)
+        or start_ts is None
+        or open_price is None
+        or high_price is None
+        or low_price is None
+        or close_price is None
+        or trade_count is None
+    ):
+        return None
+    return market_id, start_ts, (open_price, high_price, low_price, close_price, trade_count, volume_sum, realized_vol)
+
+
+def _new_rollup_bar(
+    market_id: str,
+    bucket_start: int,
+    interval_seconds: int,
+    values: tuple[float, float, float, float, int, float, float],
+) -> dict[str, Any]:
+    open_price, high_price, low_price, close_price, trade_count, volume_sum, realized_vol = values
+    return {
+        "market_id": market_id,
+        "start_ts": bucket_start,
+        "end_ts": bucket_start + interval_seconds - 1,
+        "open": open_price,
+        "high": high_price,
+        "low": low_price,
+        "close": close_price,
+        "count": trade_count,
+        "trade_count": trade_count,
+        "volume_sum": volume_sum,
+        "_rv_sq_sum": realized_vol * realized_vol,
+    }
+
+
+def _add_child(bar: dict[str, Any], values: tuple[float, float, float, float, int, float, float]) -> None:
+    _open_price, high_price, low_price, close_price, trade_count, volume_sum, realized_vol = values
+    bar["high"] = max(bar["high"], high_price)
+    bar["low"] = min(bar["low"], low_price)
+    bar["close"] = close_price
+    bar["count"] += trade_count
+    bar["trade_count"] += trade_count
+    bar["volume_sum"] += volume_sum
+    bar["_rv_sq_sum"] += realized_vol * realized_vol
 
 
 def _finalize_1m_bar(bar: dict[str, Any]) -> dict[str, Any]:
@@ -0,0 +1,262 @@
+"""Parallel, resumable backfill of the daily job over a range of days.
+
+The range is split into one ``run_daily_job`` run per data-interval day, each
+with its own stage checkpoint, and the days run on a bounded thread pool::
+
+    <work_dir>/backfill.json        # manifest: status of every day
+    <work_dir>/days/2026-02-20.json # per-day stage checkpoint (+ .stages/)
+
+Days are independent unless they share day-ordered state: every day whose
+state sets one of ``ordered_state_keys`` (by default the conformal state file)
+to the same value depends on the previous such day, and ``day_dependencies``
+adds explicit edges (e.g. registry history built day by day). Days that run
+Trust Intelligence under the same ``root_path`` also share an output: every
+publish stage overwrites ``data/derived/trust_intelligence/results.json``, so
+they run in date order and the latest day's results are the ones left behind.
+Scheduling goes
+through :func:`pipelines.stage_graph.run_stage_graph` with each day as a
+graph node, so ready days start in date order. A day whose upstream day did
+not succeed is marked ``blocked`` instead of running.
+
+With ``resume=True`` days already recorded as successful in the manifest are
+skipped and the rest resume from their own checkpoints, so an interrupted
+backfill only redoes unfinished days.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+from storage.writers import normalize_dt
+
+from .common import PipelineStage
+from .stage_checkpoint import atomic_write, dump_json
+from .stage_graph import run_stage_graph, stage_dependencies
+
+MANIFEST_NAME = "backfill.json"
+MANIFEST_FORMAT = "backfill"
+DEFAULT_ORDERED_STATE_KEYS: tuple[str, ...] = ("conformal_state_path",)
+
+DayRunner = Callable[..., Mapping[str, Any]]
+
+
+@dataclass
+class BackfillDay:
+    dt: str
+    status: str = "pending"
+    run_id: str | None = None
+    checkpoint: str | None = None
+    error: str | None = None
+    blocked_by: tuple[str, ...] = ()
+
+
+def backfill_dates(start: Any, end: Any) -> list[str]:
+    """ISO days in ``[start, end]``."""
+    first = date.fromisoformat(normalize_dt(start))
+    last = date.fromisoformat(normalize_dt(end))
+    days: list[str] = []
+    day = first
+    while day <= last:
+        days.append(day.isoformat())
+        day += timedelta(days=1)
+    return days
+
+
+def missing_dates(root: str | Path, dataset: str, start: Any, end: Any) -> list[str]:
+    """Days in ``[start, end]`` with no catalogued ``derived/<dataset>`` files."""
+    from storage.catalog import DatasetCatalog
+
+    return DatasetCatalog(Path(root) / "derived" / dataset).missing_dts(start, end)
+
+
+def _shared_outputs(state: Mapping[str, Any]) -> tuple[str, ...]:
+    """Day-independent files the daily job overwrites for this day's state."""
+    if not state.get("enable_trust_intelligence"):
+        return ()
+    from .daily_job import trust_intelligence_results_path
+
+    path = trust_intelligence_results_path(state.get("root_path") or ".")
+    return (f"trust_intelligence_results={path.resolve()}",)
+
+
+def day_stages(
+    days: Sequence[str],
+    day_states: Mapping[str, Mapping[str, Any]],
+    *,
+    ordered_state_keys: Sequence[str] = DEFAULT_ORDERED_STATE_KEYS,
+    day_dependencies: Mapping[str, Sequence[str]] | None = None,
+) -> list[PipelineStage]:
+    """One graph node per day; shared ordered state and explicit edges become key conflicts."""
+    explicit = {dt: tuple(upstream) for dt, upstream in (day_dependencies or {}).items()}
+    position = {dt: index for index, dt in enumerate(days)}
+    for dt, upstream in explicit.items():
+        # Days outside this run (already built, or filtered by only_missing) impose no ordering.
+        explicit[dt] = tuple(dependency for dependency in upstream if dependency in position)
+        for dependency in explicit[dt]:
+            if dt in position and position[dependency] >= position[dt]:
+                raise ValueError(f"day {dt!r} can only depend on earlier backfill days, got {dependency!r}")
+
+    stages: list[PipelineStage] = []
+    for dt in days:
+        state = day_states.get(dt) or {}
+        shared = tuple(
+            f"{key}={state[key]}" for key in ordered_state_keys if state.get(key) is not None
+        ) + _shared_outputs(state)
+        stages.append(
+            PipelineStage(
+                name=dt,  # type: ignore[arg-type]
+                handler=lambda context: {},
+                inputs=(*shared, *(f"day={dependency}" for dependency in explicit.get(dt, ()))),
+                outputs=(*shared, f"day={dt}"),
+            )
+        )
+    return stages
+
+
+def _load_manifest(path: Path) -> dict[str, Any]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(payload, dict) or payload.get("format") != MANIFEST_FORMAT:
+        return {}
+    return payload
+
+
+def run_backfill(
+    start: Any,
+    end: Any,
+    *,
+    work_dir: str | Path,
+    state: Mapping[str, Any] | None = None,
+    day_state: Callable[[str], Mapping[str, Any]] | None = None,
+    workers: int = 1,
+    resume: bool = False,
+    only_missing: tuple[str | Path, str] | None = None,
+    ordered_state_keys: Sequence[str] = DEFAULT_ORDERED_STATE_KEYS,
+    day_dependencies: Mapping[str, Sequence[str]] | None = None,
+    run_day: DayRunner | None = None,
+    run_id_prefix: str = "backfill",
+    **job_kwargs: Any,
+) -> dict[str, Any]:
+    """Run the daily job once per day in ``[start, end]`` on ``workers`` threads.
+
+    ``state`` is copied into every day; ``day_state(dt)`` adds per-day values.
+    ``only_missing=(root, dataset)`` restricts the range to days that dataset
+    has no catalogued partition for. Remaining keyword arguments are passed
+    to ``run_daily_job`` (or ``run_day``) for every day.
+    """
+    if job_kwargs.get("cprofile") and int(workers) > 1:
+        # Concurrent days would each start a cProfile profiler in the same process.
+        raise ValueError("cprofile=True requires workers=1")
+    if run_day is None:
+        from .daily_job import run_daily_job as run_day
+
+    work_path = Path(work_dir)
+    manifest_path = work_path / MANIFEST_NAME
+    if only_missing is not None:
+        days = missing_dates(only_missing[0], only_missing[1], start, end)
+    else:
+        days = backfill_dates(start, end)
+
+    previous = _load_manifest(manifest_path).get("days", {}) if resume else {}
+    records = {
+        dt: BackfillDay(
+            dt=dt,
+            run_id=f"{run_id_prefix}-{dt}",
+            checkpoint=str(work_path / "days" / f"{dt}.json"),
+        )
+        for dt in days
+    }
+    day_states: dict[str, dict[str, Any]] = {}
+    for dt in days:
+        merged = dict(state or {})
+        if day_state is not None:
+            merged.update(day_state(dt))
+        day_states[dt] = merged
+
+    stages = day_stages(
+        days,
+        day_states,
+        ordered_state_keys=ordered_state_keys,
+        day_dependencies=day_dependencies,
+    )
+    dependencies = stage_dependencies(stages)
+    lock = threading.Lock()
+
+    def _save() -> None:
+        atomic_write(
+            manifest_path,
+            dump_json(
+                {
+                    "format": MANIFEST_FORMAT,
+                    "start": normalize_dt(start),
+                    "end": normalize_dt(end),
+                    "days": {dt: asdict(record) for dt, record in records.items()},
+                }
+            ),
+        )
+
+    for dt, record in records.items():
+        if (previous.get(dt) or {}).get("status") == "success":
+            record.status = "success"
+    with lock:
+        _save()
+
+    def _run(stage: PipelineStage) -> bool:
+        dt = str(stage.name)
+        record = records[dt]
+        if record.status == "success":
+            return True
+        with lock:
+            failed_upstream = tuple(
+                dependency for dependency in dependencies[dt] if records[dependency].status != "success"
+            )
+            if failed_upstream:
+                record.status = "blocked"
+                record.blocked_by = failed_upstream
+                _save()
+                return True
+            record.status = "running"
+            _save()
+        following = (date.fromisoformat(dt) + timedelta(days=1)).isoformat()
+        try:
+            result = run_day(
+                run_id=record.run_id,
+                state=day_states[dt],
+                data_interval_start=f"{dt}T00:00:00Z",
+                data_interval_end=f"{following}T00:00:00Z",
+                checkpoint_path=record.checkpoint,
+                resume_from_checkpoint=resume and Path(str(record.checkpoint)).exists(),
+                **job_kwargs,
+            )
+        except Exception as exc:
+            status, error = "failed", str(exc)
+        else:
+            status = "success" if result.get("success") else "failed"
+            error = None if status == "success" else f"stopped on stage {result.get('stopped_on_stage')!r}"
+        with lock:
+            record.status = status
+            record.error = error
+            _save()
+        # Keep scheduling independent days; dependents of a failed day become blocked.
+        return True
+
+    run_stage_graph(stages, _run, max_workers=workers)
+
+    statuses = [record.status for record in records.values()]
+    return {
+        "manifest": str(manifest_path),
+        "days": {dt: asdict(record) for dt, record in records.items()},
+        "succeeded": statuses.count("success"),
+        "failed": statuses.count("failed"),
+        "blocked": statuses.count("blocked"),
+        "skipped": sum(1 for dt in days if (previous.get(dt) or {}).get("status") == "success"),
+        "success": all(status == "success" for status in statuses),
+    }
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import argparse
+import math
+import time
+from collections.abc import Callable
+
+import numpy as np
+import pyarrow as pa
+
+from calibration.metrics import _validate_inputs, summarize_metrics_extended
+
+
+def _loop_summary(preds: list[float], labels: list[int], *, eps: float = 1e-6, bins: int = 10) -> dict[str, float]:
+    """Per-element Python loops, validating the inputs once per metric as the old path did."""
+    for _ in range(4):
+        _validate_inputs(preds, labels)
+    n = len(preds)
+    brier = sum((p - y) ** 2 for p, y in zip(preds, labels)) / n
+    total = 0.0
+    for p, y in zip(preds, labels):
+        clipped = min(max(p, eps), 1.0 - eps)
+        total -= y * math.log(clipped) + (1 - y) * math.log(1.0 - clipped)
+    counts = [0] * bins
+    pred_sums = [0.0] * bins
+    label_sums = [0.0] * bins
+    for p, y in zip(preds, labels):
+        idx = min(int(p * bins), bins - 1)
+        counts[idx] += 1
+        pred_sums[idx] += p
+        label_sums[idx] += y
+    ece = sum(abs(pred_sums[i] / c - label_sums[i] / c) * (c / n) for i, c in enumerate(counts) if c)
+    mean_pred = sum(preds) / n
+    mean_label = sum(labels) / n
+    ss_xx = sum((p - mean_pred) ** 2 for p in preds)
+    ss_xy = sum((p - mean_pred) * (y - mean_label) for p, y in zip(preds, labels))
+    slope = ss_xy / ss_xx if ss_xx else 0.0
+    return {"brier": brier, "log_loss": total / n, "ece": ece, "slope": slope}
+
+
+def _best_of(repeats: int, fn: Callable[[], object]) -> float:
+    best = math.inf
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Calibration metric bundle: vectorized arrays vs per-element loops")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument(
+        "--loop-rows",
+        type=int,
+        default=1_000_000,
+        help="rows timed with the per-element loops (extrapolated to --rows)",
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    preds = rng.random(args.rows)
+    labels = (rng.random(args.rows) < preds).astype(np.int8)
+    arrow_preds = pa.array(preds)
+    arrow_labels = pa.array(labels)
+
+    numpy_s = _best_of(args.repeats, lambda: summarize_metrics_extended(preds, labels))
+    arrow_s = _best_of(args.repeats, lambda: summarize_metrics_extended(arrow_preds, arrow_labels))
+
+    loop_rows = min(args.loop_rows, args.rows)
+    loop_preds = preds[:loop_rows].tolist()
+    loop_labels = labels[:loop_rows].tolist()
+    loop_s = _best_of(1, lambda: _loop_summary(loop_preds, loop_labels)) * (args.rows / loop_rows)
+
+    vectorized = summarize_metrics_extended(preds[:loop_rows], labels[:loop_rows])
+    reference = _loop_summary(loop_preds, loop_labels)
+    max_abs_diff = max(abs(vectorized[key] - reference[key]) for key in reference)
+
+    print(f"rows={args.rows}")
+    print(f"numpy_s={numpy_s:.3f}")
+    print(f"arrow_s={arrow_s:.3f}")
+    print(f"loop_s_estimated={loop_s:.3f}")
+    print(f"speedup={loop_s / max(numpy_s, 1e-9):.1f}")
+    print(f"max_abs_diff={max_abs_diff:.3e}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
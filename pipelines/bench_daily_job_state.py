@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .common import PipelineRunContext
+from .daily_job import build_daily_stages
+from .tabular_state import ARROW_STATE_KEY
+
+_CATEGORIES = np.asarray(["crypto", "sports", "politics", "economics"], dtype=object)
+
+
+def _make_cutoff_rows(markets: int, rows_per_market: int, seed: int) -> list[dict[str, Any]]:
+    """Synthetic cutoff snapshot rows with every column the default stages read."""
+    rng = np.random.default_rng(seed)
+    total = markets * rows_per_market
+    market_idx = np.repeat(np.arange(markets), rows_per_market)
+    step = np.tile(np.arange(rows_per_market), markets)
+    base = pd.Timestamp("2026-02-20T00:00:00Z")
+    offset_s = step * 300 + market_idx % 3600
+    p_yes = rng.uniform(0.05, 0.95, size=total)
+    # Base rate rises through the day so the drift and conformal stages run too.
+    base_rate = 0.2 + 0.6 * offset_s / max(int(offset_s.max()), 1)
+    q50 = p_yes + rng.normal(0.0, 0.02, size=total)
+    frame = pd.DataFrame(
+        {
+            "market_id": np.char.add("m-", market_idx.astype(str)).astype(object),
+            "ts": (base + pd.to_timedelta(offset_s, unit="s")).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "end_ts": (base + pd.Timedelta(days=7)).isoformat(),
+            "category": _CATEGORIES[market_idx % len(_CATEGORIES)],
+            "p_yes": p_yes,
+            "pred": p_yes,
+            "label": (rng.random(total) < base_rate).astype(int),
+            "volume_24h": rng.exponential(50_000.0, size=total),
+            "open_interest": rng.exponential(20_000.0, size=total),
+            "q10": q50 - 0.1,
+            "q50": q50,
+            "q90": q50 + 0.1,
+            "actual": p_yes + rng.normal(0.0, 0.05, size=total),
+        }
+    )
+    return frame.to_dict(orient="records")
+
+
+def _run_stages(state: dict[str, Any], *, trace_memory: bool) -> list[tuple[str, float, float]]:
+    context = PipelineRunContext(run_id="bench-daily-state", state=dict(state))
+    report: list[tuple[str, float, float]] = []
+    for stage in build_daily_stages():
+        gc.collect()
+        if trace_memory:
+            tracemalloc.start()
+        t0 = time.perf_counter()
+        stage.handler(context)
+        elapsed = time.perf_counter() - t0
+        peak_mb = 0.0
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            peak_mb = peak / 1_048_576
+        report.append((stage.name, elapsed, peak_mb))
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Daily job per-stage time/memory: row dicts vs Arrow state")
+    parser.add_argument("--markets", type=int, default=100_000)
+    parser.add_argument("--rows-per-market", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--skip-memory", action="store_true", help="skip the tracemalloc pass")
+    args = parser.parse_args()
+
+    rows = _make_cutoff_rows(args.markets, args.rows_per_market, args.seed)
+    base_state = {
+        "market_ids": [f"m-{idx}" for idx in range(args.markets)],
+        "cutoff_snapshot_rows": rows,
+    }
+
+    print(f"markets={args.markets}")
+    print(f"rows={len(rows)}")
+    totals: dict[str, float] = {}
+    for mode, enabled in (("rows", False), ("arrow", True)):
+        state = dict(base_state)
+        if enabled:
+            state[ARROW_STATE_KEY] = True
+        timings = _run_stages(state, trace_memory=False)
+        memory = {} if args.skip_memory else {name: peak for name, _, peak in _run_stages(state, trace_memory=True)}
+        for name, elapsed, _ in timings:
+            print(f"{mode}_{name}_s={elapsed:.3f}")
+            if memory:
+                print(f"{mode}_{name}_peak_mb={memory[name]:.1f}")
+        totals[mode] = sum(elapsed for _, elapsed, _ in timings)
+        print(f"{mode}_total_s={totals[mode]:.3f}")
+    print(f"speedup={totals['rows'] / max(totals['arrow'], 1e-9):.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from pipelines.aggregate_intraday_bars import build_time_bars, build_time_bars_columnar, parse_interval
+
+
+def _ticks(n: int, seed: int) -> list[dict[str, object]]:
+    rng = np.random.default_rng(seed)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    offsets = np.sort(rng.integers(0, 7 * 24 * 3600, size=n)).tolist()
+    markets = rng.choice([f"MKT-{idx:03d}" for idx in range(200)], size=n).tolist()
+    prices = np.round(rng.uniform(0.02, 0.98, size=n), 4).tolist()
+    sizes = rng.choice([1.0, 2.5, 10.0], size=n).tolist()
+    return [
+        {
+            "market_id": markets[idx],
+            # Mix epoch seconds and ISO strings, as raw realtime partitions do.
+            "ts": offsets[idx] + 1_767_225_600 if idx % 2 else (base + timedelta(seconds=offsets[idx])).isoformat(),
+            "p_yes": prices[idx],
+            "size": sizes[idx],
+        }
+        for idx in range(n)
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Intraday bar building: columnar vs row-wise path")
+    parser.add_argument("--ticks", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--interval", action="append", dest="intervals", default=[])
+    parser.add_argument("--skip-rowwise", action="store_true")
+    args = parser.parse_args()
+
+    intervals = args.intervals or ["1m", "5m", "1h"]
+    ticks = _ticks(args.ticks, args.seed)
+
+    t0 = time.perf_counter()
+    result = build_time_bars_columnar(ticks, intervals=intervals)
+    columnar_s = time.perf_counter() - t0
+    print(f"ticks={args.ticks}")
+    print(f"bars={sum(len(bars) for bars in result.values())}")
+    print(f"columnar_s={columnar_s:.3f}")
+    if not args.skip_rowwise:
+        t0 = time.perf_counter()
+        for interval in intervals:
+            build_time_bars(ticks, interval_seconds=parse_interval(interval))
+        rowwise_s = time.perf_counter() - t0
+        print(f"rowwise_s={rowwise_s:.3f}")
+        print(f"speedup={rowwise_s / max(columnar_s, 1e-9):.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from storage.readers import ParquetReader
+from storage.writers import DEFAULT_DICTIONARY_COLUMNS, DEFAULT_SORT_COLUMNS, ParquetWriter
+
+_CATEGORIES = ("crypto", "sports", "politics", "economics", "science")
+_PLATFORMS = ("polymarket", "kalshi", "manifold")
+_LIQUIDITY_BUCKETS = ("low", "mid", "high")
+
+
+def _make_frame(rows: int, markets: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    market_idx = rng.integers(0, markets, size=rows)
+    return pd.DataFrame(
+        {
+            "market_id": np.char.add("m-", market_idx.astype(str)).astype(object),
+            "ts": pd.Timestamp("2026-02-20", tz="UTC")
+            + pd.to_timedelta(rng.integers(0, 86_400, size=rows), unit="s"),
+            "category": np.asarray(_CATEGORIES, dtype=object)[market_idx % len(_CATEGORIES)],
+            "platform": np.asarray(_PLATFORMS, dtype=object)[market_idx % len(_PLATFORMS)],
+            "liquidity_bucket": np.asarray(_LIQUIDITY_BUCKETS, dtype=object)[market_idx % len(_LIQUIDITY_BUCKETS)],
+            "p_yes": rng.random(rows),
+            "volume": rng.exponential(1_000.0, size=rows),
+        }
+    )
+
+
+def _measure(
+    root: Path,
+    frame: pd.DataFrame,
+    writer: ParquetWriter,
+    *,
+    dataset: str,
+    target_markets: list[str],
+    repeats: int,
+) -> dict[str, float]:
+    t0 = time.perf_counter()
+    path = writer.write(frame, dataset=dataset, dt="2026-02-20")
+    write_s = time.perf_counter() - t0
+
+    reader = ParquetReader(root)
+    latencies_ms: list[float] = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        reader.read(
+            dataset=dataset,
+            dt="2026-02-20",
+            columns=["market_id", "ts", "p_yes"],
+            filters=[("market_id", "in", target_markets)],
+        )
+        latencies_ms.append((time.perf_counter() - t0) * 1000)
+    return {
+        "file_bytes": float(path.stat().st_size),
+        "write_s": write_s,
+        "read_p50_ms": statistics.median(latencies_ms),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Parquet writer layout benchmark (size and filtered-read latency)")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--markets", type=int, default=5_000)
+    parser.add_argument(
+        "--target-markets",
+        type=int,
+        default=5,
+        help="adjacent (in sort order) markets selected by the filtered read",
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--compression", default="zstd", help="compression for the tuned layout")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    frame = _make_frame(args.rows, args.markets, args.seed)
+    target_markets = sorted(frame["market_id"].unique())[: args.target_markets]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        baseline = _measure(
+            root,
+            frame,
+            ParquetWriter(root, row_group_size=None, update_catalog=False),
+            dataset="baseline",
+            target_markets=target_markets,
+            repeats=args.repeats,
+        )
+        tuned = _measure(
+            root,
+            frame,
+            ParquetWriter(
+                root,
+                compression=args.compression,
+                sort_by=DEFAULT_SORT_COLUMNS,
+                dictionary_columns=DEFAULT_DICTIONARY_COLUMNS,
+                update_catalog=False,
+            ),
+            dataset="tuned",
+            target_markets=target_markets,
+            repeats=args.repeats,
+        )
+
+    print(f"rows={args.rows}")
+    print(f"markets={args.markets}")
+    for label, result in (("baseline", baseline), ("tuned", tuned)):
+        print(f"{label}_file_bytes={int(result['file_bytes'])}")
+        print(f"{label}_write_s={result['write_s']:.3f}")
+        print(f"{label}_filtered_read_p50_ms={result['read_p50_ms']:.2f}")
+    print(f"size_ratio={tuned['file_bytes'] / max(baseline['file_bytes'], 1.0):.3f}")
+    print(f"read_speedup={baseline['read_p50_ms'] / max(tuned['read_p50_ms'], 1e-9):.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
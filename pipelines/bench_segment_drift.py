@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from calibration.drift import _segment_drift_rowwise, detect_segment_base_rate_drift
+
+
+def _rows(n: int, seed: int) -> list[dict[str, object]]:
+    rng = np.random.default_rng(seed)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    minutes = rng.integers(0, 90 * 24 * 60, size=n).tolist()
+    categories = rng.choice(["politics", "sports", "crypto", "weather", "economics"], size=n).tolist()
+    liquidity = rng.choice(["low", "mid", "high"], size=n).tolist()
+    tte = rng.choice(["0_24h", "24_72h", "72h_plus"], size=n).tolist()
+    preds = rng.random(n)
+    labels = (rng.random(n) < preds).astype(int).tolist()
+    stamps = {offset: (base + timedelta(minutes=offset)).isoformat() for offset in set(minutes)}
+    return [
+        {
+            "ts": stamps[minutes[idx]],
+            "pred": pred,
+            "label": labels[idx],
+            "category": categories[idx],
+            "liquidity_bucket": liquidity[idx],
+            "tte_bucket": tte[idx],
+        }
+        for idx, pred in enumerate(preds.tolist())
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Segment base-rate drift: columnar vs per-segment row-wise path")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--skip-rowwise", action="store_true")
+    args = parser.parse_args()
+
+    rows = _rows(args.rows, args.seed)
+    options = {
+        "segment_fields": ("category", "liquidity_bucket", "tte_bucket"),
+        "time_key": "ts",
+        "min_segment_rows": 20,
+        "n_windows": 4,
+    }
+
+    t0 = time.perf_counter()
+    result = detect_segment_base_rate_drift(rows)
+    columnar_s = time.perf_counter() - t0
+    print(f"rows={args.rows}")
+    print(f"segments={len(result['segments'])}")
+    print(f"columnar_s={columnar_s:.3f}")
+    if not args.skip_rowwise:
+        t0 = time.perf_counter()
+        _segment_drift_rowwise(rows, **options)
+        rowwise_s = time.perf_counter() - t0
+        print(f"rowwise_s={rowwise_s:.3f}")
+        print(f"speedup={rowwise_s / max(columnar_s, 1e-9):.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:  # pragma: no cover - type checking only
@@ -18,6 +19,8 @@ CUTOFF_TYPES = DEFAULT_CUTOFF_TYPES
 
 _DEFAULT_PLACEHOLDER_SELECTED_TS = "1970-01-01T00:00:00+00:00"
 _STAGE_SOURCE_KEYS = ("snapshot_rows", "normalized_records")
+# The only snapshot columns cutoff selection reads; used for parquet pushdown.
+CUTOFF_SOURCE_COLUMNS = ("market_id", "ts", "cutoff_type", "cutoff_ts", "end_ts", "event_end_ts")
 
 
 @dataclass
@@ -181,6 +184,65 @@ def _resolve_stage_source_rows(state: dict[str, Any]) -> list[dict[str, Any]] |
     return None
 
 
+def load_cutoff_source_rows(
+    root: str | Path,
+    *,
+    dataset: str,
+    market_ids: list[str] | None = None,
+    dt_range: tuple[str | None, str | None] | None = None,
+    cutoff_types: tuple[str, ...] = DEFAULT_CUTOFF_TYPES,
+) -> list[dict[str, Any]]:
+    """Load cutoff source rows from a derived parquet snapshot dataset.
+
+    Only ``CUTOFF_SOURCE_COLUMNS`` are decoded and the market filter is pushed
+    down to row-group statistics, so wide snapshot tables stay cheap to scan.
+    """
+    from storage.readers import ParquetReader
+
+    filters = [("market_id", "in", list(market_ids))] if market_ids else None
+    frame = ParquetReader(root).read_range(
+        dataset=dataset,
+        dt_range=dt_range,
+        columns=CUTOFF_SOURCE_COLUMNS,
+        filters=filters,
+    )
+    if frame.empty:
+        return []
+    return _build_stage_source_rows(
+        rows=frame.to_dict(orient="records"),
+        cutoff_types=cutoff_types,
+    )
+
+
+def _resolve_stored_source_rows(
+    context: PipelineRunContext,
+    market_ids_value: Any,
+) -> list[dict[str, Any]] | None:
+    dataset = context.state.get("snapshot_dataset")
+    root = context.state.get("root_path")
+    if not isinstance(dataset, str) or not dataset or root is None:
+        return None
+
+    from pipelines.common import interval_dt_range
+
+    if isinstance(market_ids_value, str):
+        market_ids = [market_ids_value]
+    elif isinstance(market_ids_value, (list, tuple, set, frozenset)):
+        market_ids = [market_id for market_id in market_ids_value if isinstance(market_id, str)]
+    else:
+        market_ids = []
+    source_rows = load_cutoff_source_rows(
+        root,
+        dataset=dataset,
+        market_ids=market_ids or None,
+        dt_range=interval_dt_range(
+            getattr(context, "data_interval_start", None),
+            getattr(context, "data_interval_end", None),
+        ),
+    )
+    return source_rows or None
+
+
 def _resolve_market_ids(
     *,
     market_ids_value: Any,
@@ -254,6 +316,8 @@ def stage_build_cutoff_snapshots(context: PipelineRunContext) -> dict[str, objec
     """Pipeline stage hook for cutoff snapshot generation."""
 
     source_rows = _resolve_stage_source_rows(context.state)
+    if source_rows is None:
+        source_rows = _resolve_stored_source_rows(context, context.state.get("market_ids"))
     market_ids = _resolve_market_ids(
         market_ids_value=context.state.get("market_ids"),
         source_rows=source_rows,
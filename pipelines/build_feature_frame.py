@@ -9,6 +9,7 @@ from typing import Any, Protocol
 import os
 
 import pandas as pd
+import pyarrow as pa
 import yaml
 
 from features import build_features
@@ -27,8 +28,13 @@ class _HasState(Protocol):
 
 def stage_build_features(context: _HasState) -> dict[str, int]:
     """Build features from cutoff snapshot rows and store them in context.state."""
-    cutoff_snapshot_rows = _get_cutoff_snapshot_rows(context)
-    cutoff_snapshot_frame = _rows_to_frame(cutoff_snapshot_rows)
+    cutoff_snapshot_table = _get_cutoff_snapshot_table(context)
+    if cutoff_snapshot_table is not None:
+        cutoff_snapshot_frame = cutoff_snapshot_table.to_pandas()
+    elif cutoff_snapshot_rows := _get_cutoff_snapshot_rows(context):
+        cutoff_snapshot_frame = _rows_to_frame(cutoff_snapshot_rows)
+    else:
+        cutoff_snapshot_frame = _load_stored_cutoff_snapshot_frame(context)
 
     if cutoff_snapshot_frame.empty:
         context.state["feature_frame"] = pd.DataFrame()
@@ -113,6 +119,17 @@ def _get_mapping_value(container: object, key: str) -> object:
     return None
 
 
+def _get_cutoff_snapshot_table(context: _HasState) -> pa.Table | None:
+    """Return cutoff snapshots when state carries them as a ``pyarrow.Table``."""
+    if "cutoff_snapshot_rows" in context.state:
+        source = context.state.get("cutoff_snapshot_rows")
+    else:
+        source = context.state.get("cutoff_snapshots")
+    if isinstance(source, pa.Table) and source.num_rows:
+        return source
+    return None
+
+
 def _get_cutoff_snapshot_rows(context: _HasState) -> list[Any]:
     if "cutoff_snapshot_rows" in context.state:
         source = context.state.get("cutoff_snapshot_rows")
@@ -130,6 +147,33 @@ def _get_cutoff_snapshot_rows(context: _HasState) -> list[Any]:
     return [source]
 
 
+def _load_stored_cutoff_snapshot_frame(context: _HasState) -> pd.DataFrame:
+    """Read cutoff snapshots from the derived store when none are in state.
+
+    Enabled by ``cutoff_snapshot_dataset`` plus ``root_path``. The market and
+    data-interval restrictions are pushed down to the parquet scan.
+    """
+    dataset = context.state.get("cutoff_snapshot_dataset")
+    root = context.state.get("root_path")
+    if not isinstance(dataset, str) or not dataset or root is None:
+        return pd.DataFrame()
+
+    from pipelines.common import interval_dt_range
+    from storage.readers import ParquetReader
+
+    market_ids = [
+        market_id for market_id in (context.state.get("market_ids") or []) if isinstance(market_id, str)
+    ]
+    return ParquetReader(root).read_range(
+        dataset=dataset,
+        dt_range=interval_dt_range(
+            getattr(context, "data_interval_start", None),
+            getattr(context, "data_interval_end", None),
+        ),
+        filters=[("market_id", "in", market_ids)] if market_ids else None,
+    )
+
+
 def _rows_to_frame(rows: list[Any]) -> pd.DataFrame:
     normalized_rows: list[dict[str, Any]] = []
     for row in rows:
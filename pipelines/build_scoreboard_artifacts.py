@@ -7,11 +7,22 @@ from collections.abc import Mapping, Sequence
 from pathlib import Path
 from typing import Any
 
-from calibration.labeling import to_binary_label_rows
+import numpy as np
+
+from calibration.labeling import binary_label_indices
 from calibration import metrics as calibration_metrics
-from calibration.metrics import assess_confidence, segment_metrics, summarize_metrics
-from calibration.trust_components import derive_trust_components
-from calibration.trust_score import compute_trust_components, compute_trust_score
+from calibration.metrics import assess_confidence, factorize_keys, grouped_metrics, summarize_metrics
+from calibration.trust_components import (
+    TRUST_FEATURE_KEYS,
+    derive_trust_components,
+    derive_trust_components_frame,
+)
+from calibration.trust_score import (
+    compute_trust_components,
+    compute_trust_components_frame,
+    compute_trust_score,
+    compute_trust_score_frame,
+)
 from storage.writers import ParquetWriter, normalize_dt
 
 _REQUIRED_ROW_KEYS = ("pred", "label", "market_id", "liquidity_bucket", "category")
@@ -31,25 +42,42 @@ def build_scoreboard_rows(
     rows: Sequence[Mapping[str, object]],
     trust_weights: Mapping[str, object] | None = None,
 ) -> tuple[list[dict[str, object]], dict[str, object]]:
-    """Build per-market scoreboard rows plus global/segment summary metrics."""
+    """Build per-market scoreboard rows plus global/segment summary metrics.
+
+    Segment and per-market metrics come from one grouped pass
+    (:func:`calibration.metrics.grouped_metrics`) over all grouping
+    dimensions instead of re-running the metric suite per group.
+    """
     normalized_rows = _normalize_rows(rows)
     preds = [row["pred"] for row in normalized_rows]
     labels = [row["label"] for row in normalized_rows]
-
-    summary_metrics: dict[str, object] = {
-        "global": _summarize_global_metrics(preds, labels),
-        "by_category": segment_metrics(normalized_rows, "category"),
-        "by_liquidity_bucket": segment_metrics(normalized_rows, "liquidity_bucket"),
-        "by_category_liquidity_tte": segment_metrics(
-            _rows_with_category_liquidity_tte_key(normalized_rows),
-            _CATEGORY_LIQUIDITY_TTE_KEY,
-        ),
-    }
+    global_metrics = _summarize_global_metrics(preds, labels)
 
     market_rows: dict[str, list[dict[str, object]]] = defaultdict(list)
     for row in normalized_rows:
         market_rows[str(row["market_id"])].append(row)
 
+    grouped = grouped_metrics(
+        np.asarray(preds, dtype=np.float64),
+        np.asarray(labels, dtype=np.float64),
+        {
+            "category": [row["category"] for row in normalized_rows],
+            "liquidity_bucket": [row["liquidity_bucket"] for row in normalized_rows],
+            _CATEGORY_LIQUIDITY_TTE_KEY: [
+                (row["category"], row["liquidity_bucket"], row[_TTE_BUCKET_KEY]) for row in normalized_rows
+            ],
+            "market_id": [str(row["market_id"]) for row in normalized_rows],
+        },
+    )
+    summary_metrics: dict[str, object] = {
+        "global": global_metrics,
+        "by_category": _segment_summaries(grouped["category"]),
+        "by_liquidity_bucket": _segment_summaries(grouped["liquidity_bucket"]),
+        "by_category_liquidity_tte": _segment_summaries(grouped[_CATEGORY_LIQUIDITY_TTE_KEY]),
+    }
+    market_metrics_by_id = grouped["market_id"]
+    market_trust = _market_trust_scores(normalized_rows, trust_weights=trust_weights)
+
     score_rows: list[dict[str, object]] = []
     for market_id in sorted(market_rows):
         grouped = market_rows[market_id]
@@ -62,12 +90,13 @@ def build_scoreboard_rows(
             liquidity_bucket=liquidity_bucket,
         )
 
-        market_preds = [row["pred"] for row in grouped]
-        market_labels = [row["label"] for row in grouped]
-        market_metrics = summarize_metrics(market_preds, market_labels)
+        market_metrics = market_metrics_by_id[market_id]
 
-        averaged_components = _average_trust_components(grouped)
-        trust_score = compute_trust_score(averaged_components, weights=trust_weights)
+        if market_trust is not None:
+            averaged_components, trust_score = market_trust[market_id]
+        else:
+            averaged_components = _average_trust_components(grouped)
+            trust_score = compute_trust_score(averaged_components, weights=trust_weights)
         confidence = assess_confidence(len(grouped))
 
         score_rows.append(
@@ -106,19 +135,13 @@ def _summarize_global_metrics(
     return summarize_metrics(preds, labels)
 
 
-def _rows_with_category_liquidity_tte_key(
-    rows: Sequence[Mapping[str, object]],
-) -> list[dict[str, object]]:
-    segment_rows: list[dict[str, object]] = []
-    for row in rows:
-        copied = dict(row)
-        copied[_CATEGORY_LIQUIDITY_TTE_KEY] = (
-            copied["category"],
-            copied["liquidity_bucket"],
-            copied.get(_TTE_BUCKET_KEY, _UNKNOWN_TTE_BUCKET),
-        )
-        segment_rows.append(copied)
-    return segment_rows
+def _segment_summaries(
+    grouped: Mapping[object, Mapping[str, float]],
+) -> dict[object, dict[str, float]]:
+    return {
+        segment: {key: metrics[key] for key in ("brier", "log_loss", "ece")}
+        for segment, metrics in grouped.items()
+    }
 
 
 def render_scoreboard_markdown(
@@ -228,6 +251,9 @@ def _normalize_rows(rows: Sequence[Mapping[str, object]]) -> list[dict[str, obje
     if not rows:
         raise ValueError("rows must be non-empty")
 
+    positions, labels = binary_label_indices(rows)
+    binary_labels = dict(zip(positions.tolist(), labels.tolist()))
+
     normalized_rows: list[dict[str, object]] = []
     for idx, row in enumerate(rows):
         if not isinstance(row, Mapping):
@@ -237,11 +263,11 @@ def _normalize_rows(rows: Sequence[Mapping[str, object]]) -> list[dict[str, obje
         if "label" in copied:
             _validate_required_row_keys(copied, idx=idx)
         elif _LABEL_STATUS_KEY in copied:
-            converted = to_binary_label_rows([copied])
-            if not converted:
+            y = binary_labels.get(idx)
+            if y is None:
                 continue
-            copied = dict(converted[0])
-            copied["label"] = copied["y"]
+            copied["y"] = y
+            copied["label"] = y
             _validate_required_row_keys(copied, idx=idx)
         else:
             raise ValueError(f"rows[{idx}] missing required key: label")
@@ -261,6 +287,54 @@ def _validate_required_row_keys(row: Mapping[str, object], *, idx: int) -> None:
             raise ValueError(f"rows[{idx}] missing required key: {required_key}")
 
 
+def _market_trust_scores(
+    rows: Sequence[Mapping[str, object]],
+    *,
+    trust_weights: Mapping[str, object] | None,
+) -> dict[str, tuple[dict[str, float], float]] | None:
+    """Averaged trust components and trust score per market, from whole columns.
+
+    Rows with explicit component values use them (missing ones default to
+    0.5); other rows derive components from feature columns. Returns ``None``
+    when a value is invalid, so the per-market path raises its usual error.
+    """
+    _COMPONENT_KEYS = ("liquidity_depth", "stability", "question_quality", "manipulation_suspect")
+
+    explicit = np.fromiter(
+        (any(key in row for key in _COMPONENT_KEYS) for row in rows), dtype=bool, count=len(rows)
+    )
+    explicit_idx = np.flatnonzero(explicit)
+    derived_idx = np.flatnonzero(~explicit)
+    derived = derive_trust_components_frame(
+        {key: [rows[idx].get(key) for idx in derived_idx] for key in TRUST_FEATURE_KEYS}
+    )
+    resolved: dict[str, np.ndarray] = {}
+    for key in _COMPONENT_KEYS:
+        column = np.empty(len(rows), dtype=object)
+        column[explicit_idx] = [rows[idx].get(key, _TRUST_COMPONENT_DEFAULTS[key]) for idx in explicit_idx]
+        column[derived_idx] = derived[key]
+        resolved[key] = column
+    try:
+        components = compute_trust_components_frame(resolved)
+    except ValueError:
+        return None
+
+    codes, market_ids = factorize_keys([str(row["market_id"]) for row in rows])
+    counts = np.bincount(codes, minlength=len(market_ids)).astype(np.float64)
+    averaged = {
+        key: np.bincount(codes, weights=components[key], minlength=len(market_ids)) / counts
+        for key in _COMPONENT_KEYS
+    }
+    try:
+        scores = compute_trust_score_frame(averaged, weights=trust_weights)
+    except ValueError:
+        return None
+    return {
+        str(market_id): ({key: float(averaged[key][idx]) for key in _COMPONENT_KEYS}, float(scores[idx]))
+        for idx, market_id in enumerate(market_ids)
+    }
+
+
 def _average_trust_components(rows: Sequence[Mapping[str, object]]) -> dict[str, float]:
     _COMPONENT_KEYS = ("liquidity_depth", "stability", "question_quality", "manipulation_suspect")
 
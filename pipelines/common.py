@@ -5,7 +5,7 @@ from __future__ import annotations
 import json
 from collections.abc import Iterable, Iterator, Mapping, MutableMapping
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Callable, Literal, Optional
 
@@ -17,6 +17,7 @@ StageName = Literal[
     "cutoff",
     "features",
     "metrics",
+    "trust_intelligence",
     "drift",
     "conformal",
     "publish",
@@ -148,10 +149,17 @@ class PipelineRunContext:
 
 @dataclass
 class PipelineStage:
-    """A single named pipeline stage."""
+    """A single named pipeline stage.
+
+    ``inputs``/``outputs`` name the ``context.state`` keys the handler reads
+    and writes; the dependency-graph scheduler (``pipelines.stage_graph``)
+    uses them to find stages that can run concurrently.
+    """
 
     name: StageName
     handler: StageHandler
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
 
 
 @dataclass
@@ -162,6 +170,7 @@ class StageResult:
     status: StageStatus
     output: dict[str, Any] = field(default_factory=dict)
     error: Optional[str] = None
+    profile: list[dict[str, Any]] = field(default_factory=list)
 
 
 @dataclass
@@ -178,6 +187,26 @@ class PipelineResult:
         return all(stage.status == "success" for stage in self.stages)
 
 
+def interval_dt_range(start: Optional[str], end: Optional[str]) -> tuple[Optional[str], Optional[str]]:
+    """Inclusive ``dt`` partition range for the data interval ``[start, end)``.
+
+    ``data_interval_end`` is exclusive: an end at midnight (or a bare date)
+    stops at the previous day's partition. Values that do not parse are
+    returned unchanged for the reader to reject.
+    """
+    if not end:
+        return start, end
+    candidate = end.strip()
+    try:
+        parsed = datetime.fromisoformat(f"{candidate[:-1]}+00:00" if candidate.endswith("Z") else candidate)
+    except ValueError:
+        return start, end
+    last_day: date = parsed.date()
+    if len(candidate) == 10 or parsed.time() == datetime.min.time():
+        last_day -= timedelta(days=1)
+    return start, last_day.isoformat()
+
+
 def generate_run_id(prefix: str = "daily") -> str:
     """Generate a deterministic-looking timestamped run id."""
 
@@ -195,7 +224,11 @@ def save_checkpoint(path: str, payload: dict[str, Any]) -> None:
 
 
 def load_checkpoint(path: str) -> dict[str, Any]:
-    """Load a checkpoint payload from disk if it exists."""
+    """Load a checkpoint payload from disk if it exists.
+
+    Per-stage checkpoint indexes (``pipelines.stage_checkpoint``) are returned
+    with each stage's ``output`` read back inline.
+    """
 
     checkpoint_path = Path(path)
     if not checkpoint_path.exists():
@@ -209,6 +242,12 @@ def load_checkpoint(path: str) -> dict[str, Any]:
 
     if not isinstance(payload, dict):
         return {}
+    from .stage_checkpoint import StageCheckpoint, is_checkpoint_index
+
+    if is_checkpoint_index(payload):
+        checkpoint = StageCheckpoint(checkpoint_path)
+        checkpoint.load()
+        return checkpoint.inflated()
     return payload
 
 
@@ -219,11 +258,21 @@ def run_stages(
 ) -> PipelineResult:
     """Run stages in order and stop on the first failure."""
 
+    from .stage_profile import profile_attempt
+
     results: list[StageResult] = []
     for stage in stages:
         try:
-            output = stage.handler(context)
-            results.append(StageResult(name=stage.name, status="success", output=output))
+            with profile_attempt(
+                stage.name,
+                state=context.state,
+                inputs=stage.inputs,
+                outputs=stage.outputs,
+            ) as profile:
+                output = stage.handler(context)
+            results.append(
+                StageResult(name=stage.name, status="success", output=output, profile=[profile.to_dict()])
+            )
         except Exception as exc:  # pragma: no cover - defensive skeleton behavior
             results.append(
                 StageResult(name=stage.name, status="failed", output={}, error=str(exc))
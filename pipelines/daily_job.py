@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+import pickle
+import threading
+import time
 from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import asdict, is_dataclass
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any, Optional
 
 import pandas as pd
+import pyarrow as pa
 
 from calibration.drift import detect_segment_base_rate_drift as _segment_base_rate_drift_fn
 from calibration.metrics import base_rate_drift as _base_rate_drift_fn
@@ -19,8 +25,18 @@ from .common import (
     PipelineStage,
     StageResult,
     generate_run_id,
-    load_checkpoint,
-    save_checkpoint,
+    interval_dt_range,
+)
+from .stage_cache import StageCache, StateFingerprints, dataset_fingerprint, file_fingerprint
+from .stage_checkpoint import StageCheckpoint
+from .stage_graph import critical_path, run_stage_graph, stage_dependencies
+from .stage_profile import StageProfile, build_run_report, profile_attempt, write_run_report
+from .tabular_state import ARROW_STATE_KEY, as_table, column_values, state_views
+from .trust_intelligence_pool import (
+    MarketTask,
+    resolve_pool_settings,
+    run_markets,
+    trust_intelligence_pipeline_factory,
 )
 
 
@@ -80,6 +96,9 @@ def _rows_to_dicts(value: Any) -> list[dict[str, Any]]:
     if value is None:
         return []
 
+    if isinstance(value, pa.Table):
+        return value.to_pylist()
+
     to_dict = getattr(value, "to_dict", None)
     if callable(to_dict):
         try:
@@ -118,9 +137,58 @@ def _normalize_market_ids(value: Any) -> list[str]:
 
 
 def _infer_market_ids(rows: Any) -> list[str]:
+    if isinstance(rows, pa.Table):
+        return _normalize_market_ids(
+            [market_id for market_id in column_values(rows, "market_id") if market_id is not None]
+        )
     return _normalize_market_ids([row.get("market_id") for row in _rows_to_dicts(rows)])
 
 
+def _arrow_state_enabled(context: PipelineRunContext) -> bool:
+    return bool(context.state.get(ARROW_STATE_KEY))
+
+
+def _state_rows(context: PipelineRunContext, value: Any) -> Any:
+    """Normalize a row set for storage in state.
+
+    In ``arrow_state`` mode this is an Arrow table (passed through unchanged
+    when it already is one); otherwise, or when the rows are not tabular, a
+    list of row dicts.
+    """
+    if not _arrow_state_enabled(context):
+        return _row_dicts(context, value)
+    table = as_table(value)
+    if table is not None:
+        return table
+    rows = _row_dicts(context, value)
+    table = as_table(rows) if rows else None
+    return table if table is not None else rows
+
+
+def _row_dicts(context: PipelineRunContext, value: Any) -> list[dict[str, Any]]:
+    """Row dicts for row-based consumers, converted once per state value.
+
+    Tables, frames and row-object lists share one normalized row list per
+    object (see ``pipelines.tabular_state.StateViews``); the rows are shared
+    between stages and must be treated as read-only.
+    """
+    if value is None:
+        return []
+    return state_views(context.state).rows(value, _rows_to_dicts)
+
+
+def _state_market_ids(context: PipelineRunContext, rows: Any) -> list[str]:
+    """Distinct market ids of a state row set, computed once per value."""
+    if rows is None:
+        return []
+    if isinstance(rows, pa.Table):
+        return state_views(context.state).market_ids(rows, _infer_market_ids)
+    return state_views(context.state).market_ids(
+        rows,
+        lambda value: _normalize_market_ids([row.get("market_id") for row in _row_dicts(context, value)]),
+    )
+
+
 def _fallback_stage_output(stage: str, reason: str, **fields: Any) -> dict[str, Any]:
     payload: dict[str, Any] = {
         "stage": stage,
@@ -457,8 +525,8 @@ def _stage_ingest(context: PipelineRunContext) -> dict[str, Any]:
             raw_records = context.state.get("ingest_rows")
         if raw_records is None:
             raw_records = context.state.get("gamma_markets")
-        normalized_raw_records = _rows_to_dicts(raw_records)
-        if normalized_raw_records:
+        normalized_raw_records = _state_rows(context, raw_records)
+        if _count_items(normalized_raw_records):
             context.state["raw_records"] = normalized_raw_records
         else:
             context.state.setdefault("raw_records", [])
@@ -469,10 +537,10 @@ def _stage_ingest(context: PipelineRunContext) -> dict[str, Any]:
         if events is None:
             events = context.state.get("gamma_events")
         if events is not None:
-            context.state["events"] = _rows_to_dicts(events)
+            context.state["events"] = _row_dicts(context, events)
 
         if _count_items(context.state.get("market_ids")) == 0:
-            inferred_market_ids = _infer_market_ids(context.state.get("raw_records"))
+            inferred_market_ids = _state_market_ids(context, context.state.get("raw_records"))
             if inferred_market_ids:
                 context.state["market_ids"] = inferred_market_ids
         output = {}
@@ -488,13 +556,13 @@ def _stage_ingest(context: PipelineRunContext) -> dict[str, Any]:
 def _stage_normalize(context: PipelineRunContext) -> dict[str, Any]:
     normalized_records = context.state.get("normalized_records")
     if normalized_records is None:
-        normalized_records = _rows_to_dicts(context.state.get("raw_records"))
+        normalized_records = _state_rows(context, context.state.get("raw_records"))
     else:
-        normalized_records = _rows_to_dicts(normalized_records)
+        normalized_records = _state_rows(context, normalized_records)
     context.state["normalized_records"] = normalized_records
 
     if _count_items(context.state.get("market_ids")) == 0:
-        inferred_market_ids = _infer_market_ids(normalized_records)
+        inferred_market_ids = _state_market_ids(context, normalized_records)
         if inferred_market_ids:
             context.state["market_ids"] = inferred_market_ids
     return {
@@ -505,16 +573,17 @@ def _stage_normalize(context: PipelineRunContext) -> dict[str, Any]:
 
 
 def _stage_snapshots(context: PipelineRunContext) -> dict[str, Any]:
-    snapshot_rows = _rows_to_dicts(context.state.get("snapshots"))
-    if not snapshot_rows:
-        snapshot_rows = _rows_to_dicts(context.state.get("normalized_records"))
+    snapshot_rows = _state_rows(context, context.state.get("snapshots"))
+    if not _count_items(snapshot_rows):
+        snapshot_rows = _state_rows(context, context.state.get("normalized_records"))
 
-    registry_rows = _rows_to_dicts(context.state.get("registry_rows"))
+    registry_rows = _row_dicts(context, context.state.get("registry_rows"))
     enriched_snapshot_rows = snapshot_rows
-    if snapshot_rows and registry_rows:
+    if _count_items(snapshot_rows) and registry_rows:
         try:
-            enriched_snapshot_rows = _rows_to_dicts(
-                link_registry_to_snapshots(snapshot_rows, registry_rows)
+            enriched_snapshot_rows = _state_rows(
+                context,
+                link_registry_to_snapshots(_row_dicts(context, snapshot_rows), registry_rows),
             )
         except Exception:  # pragma: no cover - optional integration fallback
             enriched_snapshot_rows = snapshot_rows
@@ -530,23 +599,23 @@ def _stage_snapshots(context: PipelineRunContext) -> dict[str, Any]:
 
 def _stage_cutoff(context: PipelineRunContext) -> dict[str, Any]:
     hook = _resolve_stage_hook(context, "cutoff_fn")
-    source_snapshot_rows = _rows_to_dicts(context.state.get("snapshots"))
+    source_snapshot_rows = _state_rows(context, context.state.get("snapshots"))
     market_ids = _normalize_market_ids(context.state.get("market_ids"))
     if not market_ids:
-        market_ids = _infer_market_ids(source_snapshot_rows)
+        market_ids = _state_market_ids(context, source_snapshot_rows)
         if market_ids:
             context.state["market_ids"] = market_ids
 
     if hook is not None:
         output = dict(hook(context))
-    elif source_snapshot_rows:
+    elif _count_items(source_snapshot_rows):
         try:
             cutoff_snapshots = build_cutoff_snapshots(
                 market_ids=market_ids,
-                source_rows=source_snapshot_rows,
+                source_rows=_row_dicts(context, source_snapshot_rows),
             )
             context.state["cutoff_snapshots"] = cutoff_snapshots
-            context.state["cutoff_snapshot_rows"] = _rows_to_dicts(cutoff_snapshots)
+            context.state["cutoff_snapshot_rows"] = _state_rows(context, cutoff_snapshots)
             output = {"source_snapshot_count": _count_items(source_snapshot_rows)}
         except Exception:  # pragma: no cover - optional integration fallback
             output = dict(stage_build_cutoff_snapshots(context))
@@ -554,7 +623,7 @@ def _stage_cutoff(context: PipelineRunContext) -> dict[str, Any]:
         output = dict(stage_build_cutoff_snapshots(context))
 
     if "cutoff_snapshot_rows" not in context.state:
-        context.state["cutoff_snapshot_rows"] = _rows_to_dicts(context.state.get("cutoff_snapshots"))
+        context.state["cutoff_snapshot_rows"] = _state_rows(context, context.state.get("cutoff_snapshots"))
 
     output.setdefault("stage", "cutoff")
     output.setdefault("market_count", _count_items(context.state.get("market_ids")))
@@ -572,14 +641,14 @@ def _stage_features(context: PipelineRunContext) -> dict[str, Any]:
     if feature_rows is None:
         feature_rows = context.state.get("feature_rows")
     if feature_rows is None:
-        feature_rows = _rows_to_dicts(context.state.get("feature_frame"))
-        if feature_rows:
+        feature_rows = _state_rows(context, context.state.get("feature_frame"))
+        if _count_items(feature_rows):
             context.state["feature_rows"] = feature_rows
 
     if feature_rows is None:
         feature_rows = []
     else:
-        feature_rows = _rows_to_dicts(feature_rows)
+        feature_rows = _state_rows(context, feature_rows)
         if "feature_rows" not in context.state:
             context.state["feature_rows"] = feature_rows
     if "features" not in context.state:
@@ -600,16 +669,16 @@ def _stage_metrics(context: PipelineRunContext) -> dict[str, Any]:
     context.state.setdefault("alert_policy_loaded", False)
     hook = _resolve_stage_hook(context, "metric_fn")
     if hook is None:
-        metric_source_rows = _rows_to_dicts(context.state.get("metric_rows"))
+        metric_source_rows = _row_dicts(context, context.state.get("metric_rows"))
         if not metric_source_rows:
             feature_rows = context.state.get("features")
             if feature_rows is None:
                 feature_rows = context.state.get("feature_rows")
             if feature_rows is None:
-                feature_rows = _rows_to_dicts(context.state.get("feature_frame"))
-                if feature_rows:
+                feature_rows = _state_rows(context, context.state.get("feature_frame"))
+                if _count_items(feature_rows):
                     context.state["feature_rows"] = feature_rows
-            metric_source_rows = _rows_to_dicts(feature_rows)
+            metric_source_rows = _row_dicts(context, feature_rows)
 
         trust_config_path_raw = context.state.get("trust_config_path")
         trust_config_path = (
@@ -662,7 +731,7 @@ def _stage_metrics(context: PipelineRunContext) -> dict[str, Any]:
                     raw_scoreboard_rows, raw_summary_metrics = build_scoreboard_rows(
                         metric_source_rows
                     )
-                scoreboard_rows = _rows_to_dicts(raw_scoreboard_rows)
+                scoreboard_rows = _row_dicts(context, raw_scoreboard_rows)
                 if isinstance(raw_summary_metrics, Mapping):
                     summary_metrics = dict(raw_summary_metrics)
             except Exception:  # pragma: no cover - optional integration fallback
@@ -682,7 +751,7 @@ def _stage_metrics(context: PipelineRunContext) -> dict[str, Any]:
                     )
                 except TypeError:
                     raw_alert_feed_rows = build_alert_feed_rows(metric_source_rows)
-                alert_feed_rows = _rows_to_dicts(raw_alert_feed_rows)
+                alert_feed_rows = _row_dicts(context, raw_alert_feed_rows)
             except Exception:  # pragma: no cover - optional integration fallback
                 alert_feed_rows = []
         context.state["alert_feed_rows"] = alert_feed_rows
@@ -762,19 +831,26 @@ def _stage_trust_intelligence(context: PipelineRunContext) -> dict[str, Any]:
             market_count=0,
         )
 
-    try:
-        has_trust_intelligence, run_trust_intelligence_for_market = _load_trust_intelligence_runtime()
-    except Exception:
-        has_trust_intelligence = False
-        run_trust_intelligence_for_market = lambda *args, **kwargs: None
+    # A picklable pipeline factory (e.g. ``stub_pipeline_factory``) replaces the
+    # external package and routes the stage through the sharded runner.
+    pipeline_factory = context.state.get("trust_intelligence_pipeline_factory")
+    if not callable(pipeline_factory):
+        pipeline_factory = None
 
-    if not has_trust_intelligence:
-        context.state["trust_intelligence_results"] = {}
-        return _fallback_stage_output(
-            "trust_intelligence",
-            "trust_intelligence package not installed",
-            market_count=0,
-        )
+    if pipeline_factory is None:
+        try:
+            has_trust_intelligence, run_trust_intelligence_for_market = _load_trust_intelligence_runtime()
+        except Exception:
+            has_trust_intelligence = False
+            run_trust_intelligence_for_market = lambda *args, **kwargs: None
+
+        if not has_trust_intelligence:
+            context.state["trust_intelligence_results"] = {}
+            return _fallback_stage_output(
+                "trust_intelligence",
+                "trust_intelligence package not installed",
+                market_count=0,
+            )
 
     hook = _resolve_stage_hook(context, "trust_intelligence_fn")
     if hook is not None:
@@ -782,11 +858,11 @@ def _stage_trust_intelligence(context: PipelineRunContext) -> dict[str, Any]:
         output.setdefault("stage", "trust_intelligence")
         return output
 
-    scoreboard_rows = _rows_to_dicts(context.state.get("scoreboard_rows"))
+    scoreboard_rows = _row_dicts(context, context.state.get("scoreboard_rows"))
     feature_rows = context.state.get("features")
     if feature_rows is None:
         feature_rows = context.state.get("feature_rows")
-    feature_rows = _rows_to_dicts(feature_rows)
+    feature_rows = _row_dicts(context, feature_rows)
 
     if not scoreboard_rows:
         context.state["trust_intelligence_results"] = {}
@@ -807,6 +883,21 @@ def _stage_trust_intelligence(context: PipelineRunContext) -> dict[str, Any]:
     audit_config = ti_config.get("audit") or {}
     audit_enabled = audit_config.get("enabled", True) if isinstance(audit_config, dict) else True
     agent_id = audit_config.get("agent_id", "mca-daily-pipeline") if isinstance(audit_config, dict) else "mca-daily-pipeline"
+    workers, batch_size, market_timeout_s = resolve_pool_settings(ti_config)
+
+    if pipeline_factory is not None or workers > 1:
+        return _run_trust_intelligence_sharded(
+            context,
+            scoreboard_rows=scoreboard_rows,
+            market_feature_rows=market_feature_rows,
+            ti_config=ti_config,
+            factory=pipeline_factory or trust_intelligence_pipeline_factory,
+            audit_enabled=bool(audit_enabled),
+            agent_id=agent_id,
+            workers=workers,
+            batch_size=batch_size,
+            market_timeout_s=market_timeout_s,
+        )
 
     try:
         from trust_intelligence.pipeline.trust_pipeline import TrustIntelligencePipeline
@@ -833,6 +924,35 @@ def _stage_trust_intelligence(context: PipelineRunContext) -> dict[str, Any]:
     succeeded = 0
     failed = 0
 
+    for task in _trust_intelligence_tasks(scoreboard_rows, market_feature_rows):
+        ti_result = run_trust_intelligence_for_market(
+            pipeline,
+            market_rows=task.rows,
+            v1_trust_score=task.v1_trust_score,
+        )
+
+        if ti_result is not None:
+            results[task.market_id] = ti_result
+            succeeded += 1
+        else:
+            failed += 1
+
+    context.state["trust_intelligence_results"] = results
+
+    return {
+        "stage": "trust_intelligence",
+        "market_count": len(scoreboard_rows),
+        "succeeded": succeeded,
+        "failed": failed,
+        "config_loaded": bool(ti_config),
+    }
+
+
+def _trust_intelligence_tasks(
+    scoreboard_rows: list[dict[str, Any]],
+    market_feature_rows: Mapping[str, list[dict[str, Any]]],
+) -> list[MarketTask]:
+    tasks: list[MarketTask] = []
     for sb_row in scoreboard_rows:
         market_id = str(sb_row.get("market_id", ""))
         if not market_id:
@@ -848,26 +968,64 @@ def _stage_trust_intelligence(context: PipelineRunContext) -> dict[str, Any]:
         # If no feature rows, build a synthetic row from scoreboard data
         if not rows_for_market:
             rows_for_market = [dict(sb_row)]
+        tasks.append(MarketTask(market_id=market_id, rows=rows_for_market, v1_trust_score=v1_trust_score))
+    return tasks
 
-        ti_result = run_trust_intelligence_for_market(
-            pipeline,
-            market_rows=rows_for_market,
-            v1_trust_score=v1_trust_score,
-        )
 
-        if ti_result is not None:
-            results[market_id] = ti_result
-            succeeded += 1
-        else:
-            failed += 1
+def _run_trust_intelligence_sharded(
+    context: PipelineRunContext,
+    *,
+    scoreboard_rows: list[dict[str, Any]],
+    market_feature_rows: Mapping[str, list[dict[str, Any]]],
+    ti_config: Mapping[str, Any],
+    factory: Any,
+    audit_enabled: bool,
+    agent_id: str,
+    workers: int,
+    batch_size: int,
+    market_timeout_s: float | None,
+) -> dict[str, Any]:
+    """Per-market runs on a process pool; audit entries are written afterwards in scoreboard order."""
+    audit_logger = context.state.get("trust_intelligence_audit_logger") if audit_enabled else None
+    if audit_enabled and audit_logger is None and factory is trust_intelligence_pipeline_factory:
+        try:
+            from trust_intelligence.audit.chain_of_trust import ChainOfTrustLogger
 
+            audit_logger = ChainOfTrustLogger(agent_id=agent_id)
+        except Exception:
+            audit_logger = None
+
+    try:
+        outcomes = run_markets(
+            _trust_intelligence_tasks(scoreboard_rows, market_feature_rows),
+            factory=factory,
+            ti_config=ti_config,
+            workers=workers,
+            batch_size=batch_size,
+            timeout_s=market_timeout_s,
+        )
+    except Exception:
+        context.state["trust_intelligence_results"] = {}
+        return _fallback_stage_output(
+            "trust_intelligence",
+            "failed to initialize Trust Intelligence Pipeline",
+            market_count=0,
+        )
+
+    results = {outcome.market_id: outcome.result for outcome in outcomes if outcome.status == "success"}
+    if audit_logger is not None:
+        for outcome in outcomes:
+            if outcome.status == "success":
+                audit_logger.record(outcome.audit_inputs, outcome.result)
     context.state["trust_intelligence_results"] = results
 
     return {
         "stage": "trust_intelligence",
         "market_count": len(scoreboard_rows),
-        "succeeded": succeeded,
-        "failed": failed,
+        "succeeded": len(results),
+        "failed": len(outcomes) - len(results),
+        "timed_out": sum(1 for outcome in outcomes if outcome.status == "timeout"),
+        "workers": workers,
         "config_loaded": bool(ti_config),
     }
 
@@ -884,12 +1042,12 @@ def _stage_drift(context: PipelineRunContext) -> dict[str, Any]:
         output.setdefault("stage", "drift")
         return output
 
-    metric_source_rows = _rows_to_dicts(context.state.get("metric_rows"))
+    metric_source_rows = _row_dicts(context, context.state.get("metric_rows"))
     if not metric_source_rows:
         feature_rows = context.state.get("features")
         if feature_rows is None:
             feature_rows = context.state.get("feature_rows")
-        metric_source_rows = _rows_to_dicts(feature_rows)
+        metric_source_rows = _row_dicts(context, feature_rows)
 
     if not metric_source_rows:
         context.state["drift_result"] = {"drift_detected": False, "reason": "no_rows"}
@@ -970,12 +1128,12 @@ def _stage_conformal(context: PipelineRunContext) -> dict[str, Any]:
             "reason": "no drift detected — conformal update skipped",
         }
 
-    metric_source_rows = _rows_to_dicts(context.state.get("metric_rows"))
+    metric_source_rows = _row_dicts(context, context.state.get("metric_rows"))
     if not metric_source_rows:
         feature_rows = context.state.get("features")
         if feature_rows is None:
             feature_rows = context.state.get("feature_rows")
-        metric_source_rows = _rows_to_dicts(feature_rows)
+        metric_source_rows = _row_dicts(context, feature_rows)
 
     conformal_state_path = context.state.get("conformal_state_path")
     conformal_state_path_str = str(conformal_state_path) if conformal_state_path is not None else None
@@ -1012,16 +1170,16 @@ def _stage_publish(context: PipelineRunContext) -> dict[str, Any]:
     hook = _resolve_stage_hook(context, "publish_fn")
     if hook is None:
         if "published_records" not in context.state:
-            published_records = _rows_to_dicts(context.state.get("metrics"))
+            published_records = _row_dicts(context, context.state.get("metrics"))
             if not published_records:
-                published_records = _rows_to_dicts(context.state.get("scoreboard_rows"))
+                published_records = _row_dicts(context, context.state.get("scoreboard_rows"))
             context.state["published_records"] = published_records
 
         events = context.state.get("events")
         if events is None:
             events = context.state.get("event_rows")
         postmortem_payload: dict[str, Any] | None = None
-        event_rows = _rows_to_dicts(events)
+        event_rows = _row_dicts(context, events)
         if event_rows:
             root = context.state.get("postmortem_root")
             if root is None:
@@ -1076,6 +1234,11 @@ def _stage_publish(context: PipelineRunContext) -> dict[str, Any]:
     return output
 
 
+def trust_intelligence_results_path(root: str | Path) -> Path:
+    """The single ``results.json`` every publish stage under ``root`` overwrites."""
+    return Path(root) / "data" / "derived" / "trust_intelligence" / "results.json"
+
+
 def _write_trust_intelligence_results(
     results: dict[str, Any],
     *,
@@ -1083,12 +1246,9 @@ def _write_trust_intelligence_results(
 ) -> int:
     """Persist Trust Intelligence Pipeline results to JSON."""
     import json
-    from pathlib import Path
 
-    root_path = Path(root)
-    ti_dir = root_path / "data" / "derived" / "trust_intelligence"
-    ti_dir.mkdir(parents=True, exist_ok=True)
-    output_path = ti_dir / "results.json"
+    output_path = trust_intelligence_results_path(root)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
 
     rows: list[dict[str, Any]] = []
     for market_id, ti_result in results.items():
@@ -1140,41 +1300,153 @@ def _persist_cptc_state(ti_results: dict[str, Any]) -> None:
     # Individual per-market results are already in results.json
 
 
-def build_daily_stages() -> list[PipelineStage]:
-    """Return the canonical daily stage order."""
+# State keys each stage reads and writes, used by the dependency-graph
+# scheduler. Stage hooks (``*_fn``) must stay within their stage's keys when
+# stages run concurrently.
+DAILY_STAGE_IO: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "discover": (("market_ids",), ("market_ids",)),
+    "ingest": (
+        (
+            "ingest_fn",
+            "raw_records",
+            "ingest_rows",
+            "gamma_markets",
+            "events",
+            "event_rows",
+            "gamma_events",
+            "market_ids",
+        ),
+        ("raw_records", "events", "market_ids"),
+    ),
+    "normalize": (
+        ("normalized_records", "raw_records", "market_ids"),
+        ("normalized_records", "market_ids"),
+    ),
+    "snapshots": (("snapshots", "normalized_records", "registry_rows"), ("snapshots",)),
+    "cutoff": (
+        (
+            "cutoff_fn",
+            "snapshots",
+            "snapshot_rows",
+            "normalized_records",
+            "snapshot_dataset",
+            "root_path",
+            "market_ids",
+            "cutoff_snapshots",
+            "cutoff_snapshot_rows",
+        ),
+        ("cutoff_snapshots", "cutoff_snapshot_rows", "market_ids"),
+    ),
+    "features": (
+        (
+            "feature_fn",
+            "cutoff_snapshots",
+            "cutoff_snapshot_rows",
+            "cutoff_snapshot_dataset",
+            "root_path",
+            "market_ids",
+            "features",
+            "feature_rows",
+            "feature_frame",
+            "feature_config_path",
+            "liquidity_low",
+            "liquidity_high",
+            "build_resolved_dataset",
+        ),
+        ("feature_frame", "feature_rows", "features", "resolved_training_dataset"),
+    ),
+    "metrics": (
+        (
+            "metric_fn",
+            "metric_rows",
+            "features",
+            "feature_rows",
+            "feature_frame",
+            "trust_config_path",
+            "alert_config_path",
+            "train_resolved_model",
+            "resolved_training_dataset",
+            "backtest_report_dir",
+        ),
+        (
+            "trust_policy_loaded",
+            "alert_policy_loaded",
+            "scoreboard_rows",
+            "summary_metrics",
+            "alert_feed_rows",
+            "metrics",
+            "feature_rows",
+            "resolved_model_predictions",
+            "resolved_model_summary",
+            "backtest_report_summary",
+        ),
+    ),
+    "trust_intelligence": (
+        (
+            "trust_intelligence_fn",
+            "trust_intelligence_pipeline_factory",
+            "trust_intelligence_audit_logger",
+            "trust_config_path",
+            "enable_trust_intelligence",
+            "scoreboard_rows",
+            "features",
+            "feature_rows",
+        ),
+        ("ti_config", "trust_intelligence_results"),
+    ),
+    "drift": (("drift_fn", "metric_rows", "features", "feature_rows"), ("drift_result",)),
+    "conformal": (
+        ("conformal_fn", "drift_result", "metric_rows", "features", "feature_rows", "conformal_state_path"),
+        ("conformal_result",),
+    ),
+    "publish": (
+        (
+            "publish_fn",
+            "published_records",
+            "metrics",
+            "scoreboard_rows",
+            "alert_feed_rows",
+            "events",
+            "event_rows",
+            "postmortem_root",
+            "root_path",
+            "trust_intelligence_results",
+            "ti_config",
+        ),
+        ("published_records", "postmortem_artifacts", "ti_written_count"),
+    ),
+}
 
+
+def build_daily_stages() -> list[PipelineStage]:
+    """Return the canonical daily stage order with declared state inputs/outputs."""
+
+    handlers = {
+        "discover": _stage_discover,
+        "ingest": _stage_ingest,
+        "normalize": _stage_normalize,
+        "snapshots": _stage_snapshots,
+        "cutoff": _stage_cutoff,
+        "features": _stage_features,
+        "metrics": _stage_metrics,
+        "trust_intelligence": _stage_trust_intelligence,
+        "drift": _stage_drift,
+        "conformal": _stage_conformal,
+        "publish": _stage_publish,
+    }
     return [
-        PipelineStage(name="discover", handler=_stage_discover),
-        PipelineStage(name="ingest", handler=_stage_ingest),
-        PipelineStage(name="normalize", handler=_stage_normalize),
-        PipelineStage(name="snapshots", handler=_stage_snapshots),
-        PipelineStage(name="cutoff", handler=_stage_cutoff),
-        PipelineStage(name="features", handler=_stage_features),
-        PipelineStage(name="metrics", handler=_stage_metrics),
-        PipelineStage(name="trust_intelligence", handler=_stage_trust_intelligence),
-        PipelineStage(name="drift", handler=_stage_drift),
-        PipelineStage(name="conformal", handler=_stage_conformal),
-        PipelineStage(name="publish", handler=_stage_publish),
+        PipelineStage(
+            name=name,
+            handler=handlers[name],
+            inputs=DAILY_STAGE_IO[name][0],
+            outputs=DAILY_STAGE_IO[name][1],
+        )
+        for name in DAILY_STAGE_NAMES
     ]
 
 
-def _checkpoint_stage_payload(
-    *,
-    context: PipelineRunContext,
-    stage_results: list[StageResult],
-    backfill_days: int,
-) -> dict[str, Any]:
-    payload: dict[str, Any] = {
-        "run_id": context.run_id,
-        "stages": {
-            stage.name: {
-                "status": stage.status,
-                "output": stage.output,
-                "error": stage.error,
-            }
-            for stage in stage_results
-        },
-    }
+def _checkpoint_header(*, context: PipelineRunContext, backfill_days: int) -> dict[str, Any]:
+    payload: dict[str, Any] = {"run_id": context.run_id}
     if context.data_interval_start is not None:
         payload["data_interval_start"] = context.data_interval_start
     if context.data_interval_end is not None:
@@ -1184,28 +1456,21 @@ def _checkpoint_stage_payload(
     return payload
 
 
-def _checkpoint_stage_lookup(path: str | None, resume_from_checkpoint: bool) -> dict[str, dict[str, Any]]:
-    if path is None or not resume_from_checkpoint:
-        return {}
-
-    payload = load_checkpoint(path)
-    raw_stages = payload.get("stages")
-    if not isinstance(raw_stages, dict):
-        return {}
-
-    stages: dict[str, dict[str, Any]] = {}
-    for stage_name, stage_payload in raw_stages.items():
-        if not isinstance(stage_name, str):
-            continue
-        if not isinstance(stage_payload, dict):
-            continue
-        output = stage_payload.get("output")
-        stages[stage_name] = {
-            "status": stage_payload.get("status"),
-            "output": dict(output) if isinstance(output, dict) else {},
-            "error": stage_payload.get("error"),
-        }
-    return stages
+def _open_checkpoint(
+    *,
+    path: str | None,
+    resume_from_checkpoint: bool,
+    context: PipelineRunContext,
+    backfill_days: int,
+) -> StageCheckpoint | None:
+    if path is None:
+        return None
+    checkpoint = StageCheckpoint(path)
+    checkpoint.start(
+        _checkpoint_header(context=context, backfill_days=backfill_days),
+        resume=resume_from_checkpoint,
+    )
+    return checkpoint
 
 
 def _normalize_stage_status(value: Any) -> str:
@@ -1307,6 +1572,125 @@ def _build_stage_failure_output(
     return output
 
 
+STAGE_EXECUTORS = ("thread", "process")
+
+# Config-path inputs are fingerprinted by file content; None resolves to the
+# file the loaders fall back to.
+_CONFIG_INPUT_DEFAULTS = {
+    "trust_config_path": "configs/default.yaml",
+    "alert_config_path": "configs/alerts.yaml",
+    "feature_config_path": "configs/default.yaml",
+}
+# Stages that scan a stored dataset named by a state key under ``root_path``.
+_DATASET_INPUTS = {"cutoff": "snapshot_dataset", "features": "cutoff_snapshot_dataset"}
+# Path inputs naming state files a stage reads; fingerprinted by file content.
+_STATE_FILE_INPUTS = ("conformal_state_path",)
+# Stages whose point is a side effect outside ``context.state`` (raw ingest
+# writes, conformal state, postmortems and Trust Intelligence results). A
+# cache hit would skip those writes, so they always run.
+_UNCACHEABLE_STAGES = frozenset({"ingest", "conformal", "publish"})
+
+
+def _stage_fingerprint(
+    cache: StageCache,
+    fingerprints: StateFingerprints,
+    context: PipelineRunContext,
+    stage: PipelineStage,
+) -> str | None:
+    """Fingerprint ``stage`` for memoization, or None when it must run.
+
+    None means an input is not hashable or the stage has side effects
+    (see ``_UNCACHEABLE_STAGES``).
+    """
+    if stage.name in _UNCACHEABLE_STAGES:
+        return None
+    inputs: dict[str, str] = {}
+    configs: dict[str, str] = {}
+    for key in stage.inputs:
+        if key not in context.state:
+            continue
+        value = context.state.get(key)
+        if key in _CONFIG_INPUT_DEFAULTS:
+            configs[key] = file_fingerprint(value if value is not None else _CONFIG_INPUT_DEFAULTS[key])
+        elif key in _STATE_FILE_INPUTS:
+            configs[key] = file_fingerprint(value)
+        fingerprint = fingerprints.get(key, value)
+        if fingerprint is None:
+            return None
+        inputs[key] = fingerprint
+    dt_range = interval_dt_range(context.data_interval_start, context.data_interval_end)
+    extra: dict[str, Any] = {
+        "data_interval": list(dt_range),
+        "arrow_state": _arrow_state_enabled(context),
+    }
+    dataset = context.state.get(_DATASET_INPUTS.get(stage.name, ""))
+    root = context.state.get("root_path")
+    if isinstance(dataset, str) and dataset and root is not None:
+        extra["dataset"] = dataset_fingerprint(root, dataset, dt_range)
+    return cache.fingerprint(stage.name, inputs=inputs, configs=configs, extra=extra)
+
+
+def _invoke_stage_isolated(
+    handler: Any,
+    run_id: str,
+    data_interval_start: str | None,
+    data_interval_end: str | None,
+    inputs: dict[str, Any],
+    outputs: tuple[str, ...],
+) -> tuple[Any, dict[str, Any]]:
+    """Run one stage handler in a worker process on its declared inputs.
+
+    Returns the raw handler output plus the declared output keys the handler
+    assigned, for the parent to merge back into ``context.state``.
+    """
+    context = PipelineRunContext(
+        run_id=run_id,
+        data_interval_start=data_interval_start,
+        data_interval_end=data_interval_end,
+        state=dict(inputs),
+    )
+    raw_output = handler(context)
+    updates: dict[str, Any] = {}
+    for key in outputs:
+        if key in context.state and context.state.get(key) is not inputs.get(key):
+            updates[key] = context.state[key]
+    return raw_output, updates
+
+
+def _stage_runner(
+    context: PipelineRunContext,
+    pool: ProcessPoolExecutor | None,
+) -> Any:
+    """Return a callable that executes one handler attempt for ``stage``."""
+
+    def _run(stage: PipelineStage) -> Any:
+        if pool is None:
+            return stage.handler(context)
+        inputs = {key: context.state[key] for key in stage.inputs if key in context.state}
+        # Run-wide mode flag: workers must build the same Arrow/row-dict state.
+        if ARROW_STATE_KEY in context.state:
+            inputs[ARROW_STATE_KEY] = context.state[ARROW_STATE_KEY]
+        try:
+            pickle.dumps((stage.handler, inputs), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # Hooks such as lambdas or open handles cannot cross a process boundary.
+            return stage.handler(context)
+        raw_output, updates = pool.submit(
+            _invoke_stage_isolated,
+            stage.handler,
+            context.run_id,
+            context.data_interval_start,
+            context.data_interval_end,
+            inputs,
+            stage.outputs,
+        ).result()
+        for key, value in updates.items():
+            context.state[key] = value
+        return raw_output
+
+    return _run
+
+
 def _run_daily_stages(
     *,
     context: PipelineRunContext,
@@ -1315,37 +1699,112 @@ def _run_daily_stages(
     backfill_days: int,
     stage_retry_limit: int,
     continue_on_stage_failure: bool,
-) -> PipelineResult:
-    checkpoint_stages = _checkpoint_stage_lookup(checkpoint_path, resume_from_checkpoint)
+    max_parallel_stages: int = 1,
+    stage_executor: str = "thread",
+    stage_cache_dir: str | None = None,
+    report_dir: str | None = None,
+    cprofile: bool = False,
+) -> tuple[PipelineResult, dict[str, Any]]:
+    if stage_executor not in STAGE_EXECUTORS:
+        raise ValueError(f"stage_executor must be one of {STAGE_EXECUTORS}, got {stage_executor!r}")
+    if cprofile and report_dir is None:
+        raise ValueError("cprofile=True requires report_dir for the profile dumps")
+    if cprofile and int(max_parallel_stages) > 1:
+        # Python 3.12 allows one active profiler per process; overlapping stages would fail.
+        raise ValueError("cprofile=True requires max_parallel_stages=1")
+    checkpoint = _open_checkpoint(
+        path=checkpoint_path,
+        resume_from_checkpoint=resume_from_checkpoint,
+        context=context,
+        backfill_days=backfill_days,
+    )
     stage_results: list[StageResult] = []
+    results_lock = threading.Lock()
     retry_limit = max(0, stage_retry_limit)
-
-    for stage in build_daily_stages():
-        checkpoint_stage = checkpoint_stages.get(stage.name)
-        if (
-            checkpoint_stage is not None
-            and resume_from_checkpoint
-            and checkpoint_stage.get("status") == "success"
-        ):
-            stage_results.append(
-                StageResult(
-                    name=stage.name,
-                    status="success",
-                    output=checkpoint_stage.get("output", {}),
-                    error=None,
+    workers = max(1, int(max_parallel_stages))
+    stages = build_daily_stages()
+    stage_index = {stage.name: index for index, stage in enumerate(stages)}
+    stage_cache = StageCache(stage_cache_dir) if stage_cache_dir is not None else None
+    fingerprints = StateFingerprints()
+    cache_report: dict[str, list[str]] = {"hits": [], "misses": [], "uncacheable": []}
+
+    def _record(stage_result: StageResult, written: Mapping[str, Any] | None = None) -> None:
+        with results_lock:
+            stage_results.append(stage_result)
+            stage_results.sort(key=lambda item: stage_index[item.name])
+            if checkpoint is not None and written is not None:
+                checkpoint.record(
+                    stage_result.name,
+                    status=stage_result.status,
+                    output=stage_result.output,
+                    error=stage_result.error,
+                    state=written,
+                    profile=stage_result.profile,
                 )
-            )
-            continue
+
+    def _resume_stage(stage: PipelineStage) -> bool:
+        if checkpoint is None or not resume_from_checkpoint:
+            return False
+        with results_lock:
+            entry = checkpoint.stages().get(stage.name)
+            if entry is None or entry.get("status") != "success":
+                return False
+            restored = checkpoint.state(stage.name)
+            output = checkpoint.output(stage.name)
+        if restored is None:
+            # Side files are missing or the stage wrote values they cannot hold.
+            return False
+        for key, value in restored.items():
+            context.state[key] = value
+        _record(StageResult(name=stage.name, status="success", output=output, error=None))
+        return True
+
+    def _run_stage(stage: PipelineStage, invoke: Any) -> bool:
+        if _resume_stage(stage):
+            return True
 
         stage_result: StageResult | None = None
         failed = False
         recoverable = False
+        fingerprint = (
+            _stage_fingerprint(stage_cache, fingerprints, context, stage) if stage_cache is not None else None
+        )
+        cached = stage_cache.load(fingerprint) if stage_cache is not None and fingerprint is not None else None
+        raw_output: Any = None
+        written: dict[str, Any] = {}
+        attempt_profiles: list[StageProfile] = []
 
         for attempt in range(retry_limit + 1):
             try:
+                with profile_attempt(
+                    stage.name,
+                    attempt=attempt,
+                    state=context.state,
+                    inputs=stage.inputs,
+                    outputs=stage.outputs,
+                    profile_path=(
+                        Path(report_dir) / context.run_id / f"{stage.name}.attempt{attempt}.prof"
+                        if cprofile and report_dir is not None
+                        else None
+                    ),
+                ) as attempt_profile:
+                    attempt_profiles.append(attempt_profile)
+                    if cached is not None:
+                        for key, value in cached["updates"].items():
+                            context.state[key] = value
+                        raw_output = cached["output"]
+                        written = dict(cached["updates"])
+                    else:
+                        before = {key: context.state.get(key) for key in stage.outputs}
+                        raw_output = invoke(stage)
+                        written = {
+                            key: context.state[key]
+                            for key in stage.outputs
+                            if key in context.state and context.state.get(key) is not before[key]
+                        }
                 output, failed, recoverable = _normalize_stage_output(
                     stage.name,
-                    stage.handler(context),
+                    raw_output,
                     attempt=attempt,
                 )
                 stage_result = StageResult(
@@ -1388,6 +1847,21 @@ def _run_daily_stages(
                 error="stage execution did not produce a result",
             )
             failed = True
+        stage_result.profile = [attempt_profile.to_dict() for attempt_profile in attempt_profiles]
+
+        if stage_cache is not None:
+            if fingerprint is None:
+                cache_report["uncacheable"].append(stage.name)
+            elif cached is not None:
+                cache_report["hits"].append(stage.name)
+            else:
+                cache_report["misses"].append(stage.name)
+                # Failures and no-op fallbacks are retried on the next run.
+                if not failed and stage_result.output.get("status") == "success":
+                    stage_cache.store(fingerprint, stage=stage.name, output=raw_output, updates=written)
+            if fingerprint is not None:
+                for key in written:
+                    fingerprints.derive(fingerprint, key, context.state.get(key))
 
         should_continue = continue_on_stage_failure or not failed or recoverable
         if failed:
@@ -1405,26 +1879,52 @@ def _run_daily_stages(
             stage_result.output.setdefault("stopped", True)
             stage_result.output.setdefault("stop_condition", "continue_on_stage_failure=false")
 
-        stage_results.append(stage_result)
-        if checkpoint_path is not None:
-            save_checkpoint(
-                checkpoint_path,
-                _checkpoint_stage_payload(
-                    context=context,
-                    stage_results=stage_results,
-                    backfill_days=backfill_days,
-                ),
-            )
-
-        if not should_continue:
-            break
+        _record(stage_result, written)
+        return should_continue
 
-    return PipelineResult(
+    started = time.perf_counter()
+    pool = ProcessPoolExecutor(max_workers=workers) if stage_executor == "process" else None
+    try:
+        invoke = _stage_runner(context, pool)
+        timings = run_stage_graph(
+            stages,
+            lambda stage: _run_stage(stage, invoke),
+            max_workers=workers,
+        )
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    wall_time = time.perf_counter() - started
+
+    path, path_seconds = critical_path(
+        stage_dependencies(stages),
+        {name: timing.duration for name, timing in timings.items()},
+    )
+    report: dict[str, Any] = {}
+    report["schedule"] = {
+        "max_parallel_stages": workers,
+        "stage_executor": stage_executor,
+        "wall_time_s": round(wall_time, 6),
+        "critical_path": path,
+        "critical_path_s": round(path_seconds, 6),
+    }
+    if stage_cache is not None:
+        report["stage_cache"] = {"path": str(stage_cache.root), **cache_report}
+    profiles = [
+        StageProfile(**attempt_profile)
+        for stage_result in stage_results
+        for attempt_profile in stage_result.profile
+    ]
+    report["profile"] = build_run_report(context.run_id, profiles)
+    if report_dir is not None:
+        report["run_report"] = write_run_report(report_dir, context.run_id, profiles)
+    result = PipelineResult(
         run_id=context.run_id,
         started_at=context.started_at,
         finished_at=datetime.now(timezone.utc),
         stages=stage_results,
     )
+    return result, report
 
 
 def run_daily_job(
@@ -1440,8 +1940,36 @@ def run_daily_job(
     continue_on_stage_failure: bool = False,
     trust_config_path: str | None = None,
     alert_config_path: str | None = None,
+    arrow_state: bool = False,
+    max_parallel_stages: int = 1,
+    stage_executor: str = "thread",
+    stage_cache_dir: str | None = None,
+    report_dir: str | None = None,
+    cprofile: bool = False,
 ) -> dict[str, Any]:
-    """Execute the minimal daily orchestrator skeleton."""
+    """Execute the minimal daily orchestrator skeleton.
+
+    With ``arrow_state=True`` bulk row sets travel between stages as
+    ``pyarrow.Table`` objects (see ``pipelines.tabular_state``).
+
+    Stages run as a dependency graph over their declared state keys (see
+    ``DAILY_STAGE_IO``); ``max_parallel_stages > 1`` lets independent stages
+    overlap on a thread pool, or in worker processes with
+    ``stage_executor="process"``. The payload's ``schedule`` entry reports
+    wall time and the critical path.
+
+    With ``stage_cache_dir`` set, stages are memoized by content fingerprint
+    (see ``pipelines.stage_cache``): a stage whose code, configs, inputs and
+    scanned partitions are unchanged restores its cached output and state
+    writes instead of running. Ingest, conformal and publish write files
+    outside the run state and always run.
+
+    Every stage attempt is profiled (wall/CPU time, peak RSS growth, rows,
+    storage bytes; see ``pipelines.stage_profile``) and summarized under the
+    payload's ``profile`` entry. ``report_dir`` also writes JSON and
+    Prometheus-text run reports there; ``cprofile=True`` dumps a ``cProfile``
+    file per stage attempt next to them and needs ``max_parallel_stages=1``.
+    """
 
     context = PipelineRunContext(
         run_id=run_id or generate_run_id(prefix="daily"),
@@ -1452,16 +1980,23 @@ def run_daily_job(
         context.state.update(dict(state))
     context.state["trust_config_path"] = trust_config_path
     context.state["alert_config_path"] = alert_config_path
+    if arrow_state:
+        context.state[ARROW_STATE_KEY] = True
     if backfill_days > 0:
         context.state["backfill_days"] = backfill_days
 
-    result = _run_daily_stages(
+    result, report = _run_daily_stages(
         context=context,
         checkpoint_path=checkpoint_path,
         resume_from_checkpoint=resume_from_checkpoint,
         backfill_days=backfill_days,
         stage_retry_limit=stage_retry_limit,
         continue_on_stage_failure=continue_on_stage_failure,
+        max_parallel_stages=max_parallel_stages,
+        stage_executor=stage_executor,
+        stage_cache_dir=stage_cache_dir,
+        report_dir=report_dir,
+        cprofile=cprofile,
     )
     stage_payloads = [
         {
@@ -1493,11 +2028,20 @@ def run_daily_job(
     if stopped_early:
         payload["stopped_early"] = True
         payload["stop_condition"] = "continue_on_stage_failure=false"
-        payload["stopped_on_stage"] = stage_payloads[-1]["name"]
+        stopped_on = next(
+            (
+                stage
+                for stage in stage_payloads
+                if isinstance(stage.get("output"), Mapping) and stage["output"].get("stopped")
+            ),
+            stage_payloads[-1],
+        )
+        payload["stopped_on_stage"] = stopped_on["name"]
     if checkpoint_path is not None:
         payload["checkpoint_path"] = checkpoint_path
     if resume_from_checkpoint:
         payload["resume_from_checkpoint"] = True
     if backfill_days > 0:
         payload["backfill_days"] = backfill_days
+    payload.update(report)
     return payload
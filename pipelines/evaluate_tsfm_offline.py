@@ -9,7 +9,7 @@ from typing import Any
 
 import pandas as pd
 
-from calibration.interval_metrics import compute_interval_metrics
+from calibration.interval_metrics import compute_interval_metrics_arrays
 
 
 REQUIRED_BASE_COLUMNS = ("market_id", "event_id", "category", "ts", "actual")
@@ -249,7 +249,16 @@ def _build_metrics_row(
     }
 
     if {"q10", "q50", "q90"}.issubset(frame.columns):
-        metric_obj = compute_interval_metrics(frame.to_dict("records"))
+        # Like the row-wise path, 90% metrics need q05/q95 on every row.
+        has_90 = {"q05", "q95"}.issubset(frame.columns) and bool(frame[["q05", "q95"]].notna().all(axis=None))
+        metric_obj = compute_interval_metrics_arrays(
+            frame["actual"].to_numpy(),
+            frame["q10"].to_numpy(),
+            frame["q50"].to_numpy(),
+            frame["q90"].to_numpy(),
+            frame["q05"].to_numpy() if has_90 else None,
+            frame["q95"].to_numpy() if has_90 else None,
+        )
         q10 = frame["q10"].astype(float)
         q90 = frame["q90"].astype(float)
         actual = df["actual"].astype(float)
@@ -276,6 +285,8 @@ def _build_metrics_row(
                 "pinball_q50": float("nan"),
                 "pinball_q90": float("nan"),
                 "pinball_mean": float("nan"),
+                "winkler_80": float("nan"),
+                "winkler_90": float("nan"),
                 "breach_rate": float("nan"),
                 "breach_followthrough_rate": float("nan"),
                 "samples": point_metrics["samples"],
@@ -372,7 +372,15 @@ async def run_realtime_ws_job(
     run_id: str | None = None,
     subscribe_message: Mapping[str, Any] | None = None,
     message_limit: int = 1000,
+    append_segments: bool = False,
 ) -> dict[str, Any]:
+    if append_segments:
+        write_rows = getattr(raw_writer, "append", None)
+        if not callable(write_rows):
+            raise TypeError("append_segments=True requires a raw_writer with an append(...) method.")
+    else:
+        write_rows = raw_writer.write
+
     messages = await _collect_stream_messages(
         ws_connector=ws_connector,
         url=url,
@@ -381,7 +389,7 @@ async def run_realtime_ws_job(
     )
     resolved_run_id = run_id or generate_run_id(prefix="realtime-ws")
 
-    ticks_path = raw_writer.write(
+    ticks_path = write_rows(
         messages,
         dataset="realtime_ticks",
         dt=dt,
@@ -393,13 +401,13 @@ async def run_realtime_ws_job(
     bars_1m = _to_records(_call_build_time_bars(build_time_bars, deduped_ticks))
     bars_5m = _to_records(_call_resample_to_5m(resample_to_5m, bars_1m, deduped_ticks))
 
-    bars_1m_path = raw_writer.write(
+    bars_1m_path = write_rows(
         bars_1m,
         dataset="realtime_bars_1m",
         dt=dt,
         dedupe_key="bar_id",
     )
-    bars_5m_path = raw_writer.write(
+    bars_5m_path = write_rows(
         bars_5m,
         dataset="realtime_bars_5m",
         dt=dt,
@@ -416,7 +424,7 @@ async def run_realtime_ws_job(
     }
     if last_stats is not None:
         run_metrics_record["last_stats"] = last_stats
-    raw_writer.write(
+    write_rows(
         [run_metrics_record],
         dataset="realtime_run_metrics",
         dt=dt,
@@ -450,6 +458,7 @@ def run_realtime_ws_job_sync(
     run_id: str | None = None,
     subscribe_message: Mapping[str, Any] | None = None,
     message_limit: int = 1000,
+    append_segments: bool = False,
 ) -> dict[str, Any]:
     return asyncio.run(
         run_realtime_ws_job(
@@ -460,5 +469,6 @@ def run_realtime_ws_job_sync(
             run_id=run_id,
             subscribe_message=subscribe_message,
             message_limit=message_limit,
+            append_segments=append_segments,
         )
     )
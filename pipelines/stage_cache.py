@@ -0,0 +1,217 @@
+"""Content-addressed memoization for pipeline stages.
+
+A stage fingerprint hashes the pipeline code version, the contents of the
+config files the stage reads, the fingerprints of its declared state inputs
+and any external dataset partitions it scans. The cache stores the stage
+output plus the state keys it wrote under ``<root>/<fp[:2]>/<fp>.pkl``; a
+later run with the same fingerprint restores them instead of running the
+handler.
+
+Values a stage writes get a derived fingerprint (stage fingerprint + key), so
+downstream stages are invalidated exactly when an upstream fingerprint
+changes, without re-hashing large tables between stages. Only values supplied
+from outside the run are hashed by content.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import io
+import json
+import os
+import pickle
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+
+CACHE_FORMAT_VERSION = 1
+CODE_PACKAGES = ("pipelines", "calibration", "features", "storage")
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _digest(*parts: Any) -> str:
+    hasher = hashlib.sha256()
+    for part in parts:
+        payload = part if isinstance(part, bytes) else str(part).encode("utf-8")
+        hasher.update(len(payload).to_bytes(8, "little"))
+        hasher.update(payload)
+    return hasher.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def code_version(packages: tuple[str, ...] = CODE_PACKAGES) -> str:
+    """Hash of the Python sources of ``packages``; any code edit changes it."""
+    hasher = hashlib.sha256()
+    for package in packages:
+        for path in sorted((_REPO_ROOT / package).rglob("*.py")):
+            hasher.update(path.relative_to(_REPO_ROOT).as_posix().encode("utf-8"))
+            hasher.update(path.read_bytes())
+    return hasher.hexdigest()
+
+
+def file_fingerprint(path: Any) -> str:
+    """Content hash of a file, or a marker for a missing/unset path."""
+    if path is None:
+        return "unset"
+    candidate = Path(path)
+    if not candidate.is_file():
+        return _digest("missing", candidate.as_posix())
+    return _digest("file", candidate.read_bytes())
+
+
+def dataset_fingerprint(root: Any, dataset: str, dt_range: tuple[Any, Any]) -> str:
+    """Fingerprint of the ``dt=`` partitions of a derived dataset in ``dt_range``.
+
+    Uses the dataset catalog entries (rows, bytes, schema hash, stats) when a
+    catalog exists, plus file sizes and modification times of the partitions
+    it does not list (all of them without a catalog).
+    """
+    from storage.catalog import DatasetCatalog
+
+    dataset_dir = Path(root) / "derived" / dataset
+    catalog = DatasetCatalog(dataset_dir)
+    if catalog.exists():
+        payload = catalog.load()
+        entries = {dt: catalog.files(dt, catalog=payload) for dt in catalog.partitions(dt_range=dt_range, catalog=payload)}
+        uncatalogued = catalog.uncatalogued_partitions(dt_range=dt_range, catalog=payload)
+        listing = _file_listing(dataset_dir, [dataset_dir / f"dt={dt}" for dt in uncatalogued])
+        return _digest("catalog", json.dumps([entries, listing], sort_keys=True, default=str))
+    return _digest("listing", json.dumps(_file_listing(dataset_dir, [dataset_dir])))
+
+
+def _file_listing(dataset_dir: Path, directories: list[Path]) -> list[list[Any]]:
+    listing = []
+    for directory in directories:
+        if not directory.is_dir():
+            continue
+        for path in sorted(directory.rglob("*")):
+            if path.is_file():
+                stat = path.stat()
+                listing.append([path.relative_to(dataset_dir).as_posix(), stat.st_size, stat.st_mtime_ns])
+    return listing
+
+
+def value_fingerprint(value: Any) -> str | None:
+    """Content fingerprint of a state value, or None when it cannot be hashed.
+
+    Callables are fingerprinted by source; closures return None because their
+    captured state is not part of the source.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return _digest("scalar", type(value).__name__, repr(value))
+    if isinstance(value, pa.Table):
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, value.schema) as writer:
+            writer.write_table(value)
+        return _digest("arrow", sink.getvalue())
+    if isinstance(value, pd.DataFrame):
+        try:
+            hashed = pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes()
+        except TypeError:
+            return _pickle_fingerprint(value)
+        return _digest("frame", list(value.columns), [str(dtype) for dtype in value.dtypes], hashed)
+    if callable(value):
+        if getattr(value, "__closure__", None):
+            return None
+        try:
+            source = inspect.getsource(value)
+        except (OSError, TypeError):
+            return None
+        return _digest("callable", getattr(value, "__module__", ""), getattr(value, "__qualname__", ""), source)
+    return _pickle_fingerprint(value)
+
+
+def _pickle_fingerprint(value: Any) -> str | None:
+    try:
+        return _digest("pickle", pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return None
+
+
+class StateFingerprints:
+    """Tracks the fingerprint of each state value, keyed by object identity."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[Any, str | None]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, value: Any) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] is value:
+            return entry[1]
+        fingerprint = value_fingerprint(value)
+        with self._lock:
+            self._entries[key] = (value, fingerprint)
+        return fingerprint
+
+    def derive(self, stage_fingerprint: str, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (value, _digest("derived", stage_fingerprint, key))
+
+
+class StageCache:
+    """Local content-addressed store of stage outputs."""
+
+    def __init__(self, root: str | Path, *, version: str | None = None) -> None:
+        self.root = Path(root)
+        self.version = version if version is not None else code_version()
+
+    def fingerprint(
+        self,
+        stage: str,
+        *,
+        inputs: Mapping[str, str],
+        configs: Mapping[str, str] | None = None,
+        extra: Mapping[str, Any] | None = None,
+    ) -> str:
+        document = {
+            "format": CACHE_FORMAT_VERSION,
+            "stage": stage,
+            "code_version": self.version,
+            "configs": dict(configs or {}),
+            "inputs": dict(inputs),
+            "extra": dict(extra or {}),
+        }
+        return _digest(json.dumps(document, sort_keys=True, default=str))
+
+    def _path(self, fingerprint: str) -> Path:
+        return self.root / fingerprint[:2] / f"{fingerprint}.pkl"
+
+    def load(self, fingerprint: str) -> dict[str, Any] | None:
+        path = self._path(fingerprint)
+        if not path.is_file():
+            return None
+        try:
+            with path.open("rb") as handle:
+                entry = pickle.load(handle)
+        except Exception:
+            return None
+        if not isinstance(entry, dict) or entry.get("fingerprint") != fingerprint:
+            return None
+        return entry
+
+    def store(self, fingerprint: str, *, stage: str, output: Any, updates: Mapping[str, Any]) -> bool:
+        """Persist one stage result; returns False when it cannot be pickled."""
+        entry = {"fingerprint": fingerprint, "stage": stage, "output": output, "updates": dict(updates)}
+        try:
+            payload = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return False
+        path = self._path(fingerprint)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            temp_path.write_bytes(payload)
+            temp_path.replace(path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+        return True
@@ -0,0 +1,253 @@
+"""Per-stage checkpoint files behind a small JSON index.
+
+The checkpoint path holds an index; each stage writes its own files to a
+sibling ``<name>.stages/`` directory::
+
+    daily-checkpoint.json                      # index: run header + per-stage entries
+    daily-checkpoint.stages/
+        discover.json                          # stage output
+        discover.market_ids.json               # small state values (pickle if not JSON)
+        cutoff.cutoff_snapshot_rows.arrow      # row sets / tables (Arrow IPC)
+        cutoff.market_rows.pkl                 # row sets Arrow would not restore exactly
+        features.feature_frame.arrow           # DataFrames (pandas metadata kept)
+
+Recording a stage writes only that stage's files plus the index, so a
+checkpoint write costs O(size of that stage) rather than re-serializing the
+whole run. On resume the state values a stage wrote are read back from its
+side files. Row sets are stored as Arrow only when reading the table back
+gives the same rows (keys, order, value types); otherwise they are pickled,
+so a resumed run sees exactly the state an uninterrupted run would. Index
+files written before this layout (one JSON document with inline ``output``
+dicts) are still read.
+"""
+
+from __future__ import annotations
+
+import json
+import pickle
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from .tabular_state import as_table
+
+CHECKPOINT_FORMAT = "stage-checkpoint"
+CHECKPOINT_VERSION = 2
+
+
+def atomic_write(path: Path, payload: bytes) -> None:
+    """Write ``payload`` to ``path`` through a temp file and rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        temp_path.write_bytes(payload)
+        temp_path.replace(path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+
+def dump_json(value: Any) -> bytes:
+    """Deterministic JSON bytes (sorted keys, ASCII, ``str`` fallback)."""
+    return json.dumps(value, ensure_ascii=True, sort_keys=True, default=str).encode("utf-8")
+
+
+def _write_table(path: Path, table: pa.Table) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with pa.OSFile(str(temp_path), "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        temp_path.replace(path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+
+def _read_table(path: Path) -> pa.Table:
+    with pa.OSFile(str(path), "rb") as source:
+        return ipc.open_file(source).read_all()
+
+
+def _same_value(left: Any, right: Any) -> bool:
+    """Equality that also requires matching types, key order and NaN positions."""
+    if type(left) is not type(right):
+        return False
+    if isinstance(left, dict):
+        return list(left) == list(right) and all(_same_value(left[key], right[key]) for key in left)
+    if isinstance(left, (list, tuple)):
+        return len(left) == len(right) and all(_same_value(a, b) for a, b in zip(left, right))
+    if isinstance(left, float) and left != left:
+        return right != right
+    return bool(left == right)
+
+
+def _rows_table(rows: list[Any]) -> pa.Table | None:
+    """Arrow table for ``rows`` when it round-trips exactly, else None."""
+    table = as_table(rows)
+    if table is None or not _same_value(rows, table.to_pylist()):
+        return None
+    return table
+
+
+def is_checkpoint_index(payload: Any) -> bool:
+    return isinstance(payload, Mapping) and payload.get("format") == CHECKPOINT_FORMAT
+
+
+class StageCheckpoint:
+    """Index plus per-stage side files for one checkpoint path.
+
+    Not thread-safe; callers serialize :meth:`record` calls.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.stage_dir = self.path.with_name(f"{self.path.stem}.stages")
+        self._index: dict[str, Any] = {"format": CHECKPOINT_FORMAT, "version": CHECKPOINT_VERSION, "stages": {}}
+
+    def load(self) -> dict[str, Any]:
+        """Read the index from disk; a missing or unreadable file reads as empty."""
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            payload = {}
+        if not isinstance(payload, dict):
+            payload = {}
+        stages = payload.get("stages")
+        payload["stages"] = dict(stages) if isinstance(stages, dict) else {}
+        payload["format"] = CHECKPOINT_FORMAT
+        payload["version"] = CHECKPOINT_VERSION
+        self._index = payload
+        return payload
+
+    def start(self, header: Mapping[str, Any], *, resume: bool) -> None:
+        """Begin a run: keep recorded stages when resuming, otherwise start empty."""
+        stages = self.load()["stages"] if resume else {}
+        self._index = {"format": CHECKPOINT_FORMAT, "version": CHECKPOINT_VERSION, **header, "stages": stages}
+
+    def stages(self) -> dict[str, dict[str, Any]]:
+        return self._index["stages"]
+
+    def _save_index(self) -> None:
+        atomic_write(self.path, dump_json(self._index))
+
+    def record(
+        self,
+        stage: str,
+        *,
+        status: str,
+        output: Mapping[str, Any],
+        error: str | None,
+        state: Mapping[str, Any] | None = None,
+        profile: Sequence[Mapping[str, Any]] = (),
+    ) -> None:
+        """Write one stage's output and state side files, then the index."""
+        output_file = f"{stage}.json"
+        atomic_write(self.stage_dir / output_file, dump_json(dict(output)))
+        state_entries: dict[str, dict[str, str]] = {}
+        complete = True
+        for key, value in (state or {}).items():
+            entry = self._write_state_value(stage, key, value)
+            if entry is None:
+                complete = False
+                continue
+            state_entries[key] = entry
+        self._index["stages"][stage] = {
+            "status": status,
+            "error": error,
+            "output_file": output_file,
+            "state": state_entries,
+            "state_complete": complete,
+            "profile": [dict(attempt) for attempt in profile],
+        }
+        self._save_index()
+
+    def _write_state_value(self, stage: str, key: str, value: Any) -> dict[str, str] | None:
+        stem = f"{stage}.{key}"
+        if isinstance(value, pa.Table):
+            _write_table(self.stage_dir / f"{stem}.arrow", value)
+            return {"file": f"{stem}.arrow", "format": "arrow"}
+        if isinstance(value, pd.DataFrame):
+            try:
+                table = pa.Table.from_pandas(value)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                return None
+            _write_table(self.stage_dir / f"{stem}.arrow", table)
+            return {"file": f"{stem}.arrow", "format": "pandas"}
+        is_rows = isinstance(value, list) and bool(value) and all(isinstance(row, Mapping) for row in value)
+        if is_rows:
+            table = _rows_table(value)
+            if table is not None:
+                _write_table(self.stage_dir / f"{stem}.arrow", table)
+                return {"file": f"{stem}.arrow", "format": "rows"}
+        # Row sets skip JSON too: it turns tuples into lists and non-string keys into strings.
+        if not is_rows:
+            try:
+                payload = json.dumps(value, ensure_ascii=True, sort_keys=True).encode("utf-8")
+            except (TypeError, ValueError):
+                pass
+            else:
+                atomic_write(self.stage_dir / f"{stem}.json", payload)
+                return {"file": f"{stem}.json", "format": "json"}
+        # Timestamps, tuple keys and similar non-JSON values.
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return None
+        atomic_write(self.stage_dir / f"{stem}.pkl", payload)
+        return {"file": f"{stem}.pkl", "format": "pickle"}
+
+    def output(self, stage: str) -> dict[str, Any]:
+        entry = self.stages().get(stage) or {}
+        if isinstance(entry.get("output"), dict):  # index written before per-stage files
+            return dict(entry["output"])
+        output_file = entry.get("output_file")
+        if not isinstance(output_file, str):
+            return {}
+        try:
+            payload = json.loads((self.stage_dir / output_file).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return payload if isinstance(payload, dict) else {}
+
+    def state(self, stage: str) -> dict[str, Any] | None:
+        """State values the stage wrote, or None when they cannot all be restored."""
+        entry = self.stages().get(stage) or {}
+        if "output_file" not in entry:
+            return {}
+        if not entry.get("state_complete", False):
+            return None
+        restored: dict[str, Any] = {}
+        for key, spec in (entry.get("state") or {}).items():
+            path = self.stage_dir / str(spec.get("file"))
+            try:
+                fmt = spec.get("format")
+                if fmt == "json":
+                    restored[key] = json.loads(path.read_text(encoding="utf-8"))
+                    continue
+                if fmt == "pickle":
+                    restored[key] = pickle.loads(path.read_bytes())
+                    continue
+                table = _read_table(path)
+            except (OSError, json.JSONDecodeError, pickle.UnpicklingError, pa.ArrowInvalid):
+                return None
+            if fmt == "pandas":
+                restored[key] = table.to_pandas()
+            elif fmt == "rows":
+                restored[key] = table.to_pylist()
+            else:
+                restored[key] = table
+        return restored
+
+    def inflated(self) -> dict[str, Any]:
+        """The index with each stage's ``output`` read back inline."""
+        payload = {key: value for key, value in self._index.items() if key != "stages"}
+        payload["stages"] = {
+            name: {"status": entry.get("status"), "output": self.output(name), "error": entry.get("error")}
+            for name, entry in self.stages().items()
+        }
+        return payload
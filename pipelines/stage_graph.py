@@ -0,0 +1,125 @@
+"""Dependency-graph scheduling for pipeline stages.
+
+Stages declare the ``context.state`` keys they read (``inputs``) and write
+(``outputs``). A stage depends on every earlier stage (in declared order) it
+conflicts with: read-after-write, write-after-write or write-after-read on a
+shared key. Independent stages may then run concurrently while the declared
+order stays a valid topological order, so ``max_workers=1`` reproduces the
+sequential run exactly.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any
+
+from .common import PipelineStage
+
+
+@dataclass(frozen=True)
+class StageTiming:
+    """Wall-clock window of one stage, in ``time.perf_counter`` seconds."""
+
+    name: str
+    started: float
+    finished: float
+
+    @property
+    def duration(self) -> float:
+        return max(0.0, self.finished - self.started)
+
+
+def stage_dependencies(stages: Sequence[PipelineStage]) -> dict[str, tuple[str, ...]]:
+    """Return each stage's upstream stages, derived from declared state keys."""
+    dependencies: dict[str, tuple[str, ...]] = {}
+    for index, stage in enumerate(stages):
+        reads = set(stage.inputs)
+        writes = set(stage.outputs)
+        upstream: list[str] = []
+        for earlier in stages[:index]:
+            earlier_writes = set(earlier.outputs)
+            if (
+                earlier_writes & reads
+                or earlier_writes & writes
+                or set(earlier.inputs) & writes
+            ):
+                upstream.append(earlier.name)
+        dependencies[stage.name] = tuple(upstream)
+    return dependencies
+
+
+def critical_path(
+    dependencies: Mapping[str, Sequence[str]],
+    durations: Mapping[str, float],
+) -> tuple[list[str], float]:
+    """Longest duration-weighted chain through the stage graph.
+
+    ``dependencies`` must list stages in topological order (as
+    :func:`stage_dependencies` does). Stages without a duration count as 0.
+    """
+    best: dict[str, tuple[float, list[str]]] = {}
+    for name, upstream in dependencies.items():
+        base_total, base_path = 0.0, []
+        for dependency in upstream:
+            candidate = best.get(dependency)
+            if candidate is not None and candidate[0] > base_total:
+                base_total, base_path = candidate
+        best[name] = (base_total + float(durations.get(name, 0.0)), [*base_path, name])
+    if not best:
+        return [], 0.0
+    total, path = max(best.values(), key=lambda item: item[0])
+    return path, total
+
+
+def run_stage_graph(
+    stages: Sequence[PipelineStage],
+    run_stage: Callable[[PipelineStage], bool],
+    *,
+    max_workers: int = 1,
+) -> dict[str, StageTiming]:
+    """Run ``stages`` as a dependency graph on a thread pool.
+
+    ``run_stage`` executes one stage and returns whether the run should
+    continue. Once it returns False no further stages are started; stages
+    already running are allowed to finish. Ready stages start in declared
+    order. Returns the timing of every stage that ran.
+    """
+    dependencies = stage_dependencies(stages)
+    workers = max(1, int(max_workers))
+    timings: dict[str, StageTiming] = {}
+    completed: set[str] = set()
+    started: set[str] = set()
+    running: dict[Future[Any], str] = {}
+    stopped = False
+
+    def _timed(stage: PipelineStage) -> tuple[bool, float, float]:
+        begin = time.perf_counter()
+        should_continue = run_stage(stage)
+        return should_continue, begin, time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pipeline-stage") as pool:
+        while True:
+            if not stopped:
+                for stage in stages:
+                    if len(running) >= workers:
+                        break
+                    if stage.name in started:
+                        continue
+                    if not all(dependency in completed for dependency in dependencies[stage.name]):
+                        continue
+                    started.add(stage.name)
+                    running[pool.submit(_timed, stage)] = stage.name
+            if not running:
+                break
+            finished, _ = wait(tuple(running), return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                should_continue, begin, end = future.result()
+                timings[name] = StageTiming(name=name, started=begin, finished=end)
+                completed.add(name)
+                if not should_continue:
+                    stopped = True
+    return timings
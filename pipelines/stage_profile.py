@@ -0,0 +1,165 @@
+"""Per-stage resource accounting and run reports.
+
+:func:`profile_attempt` wraps one stage attempt and fills a
+:class:`StageProfile` with wall time, CPU time of the running thread, the
+growth of the process peak RSS, rows in the stage's declared inputs/outputs
+and the bytes moved through ``storage`` readers and writers
+(``storage.io_stats``). With ``profile_path`` set the attempt also runs under
+``cProfile`` and the stats are dumped there.
+
+Peak RSS is a process-wide high-water mark, so with parallel stages the delta
+is attributed to whichever stage raised it first.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import sys
+import time
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+
+from storage.io_stats import track_io
+
+try:  # pragma: no cover - resource is POSIX-only
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+REPORT_JSON_NAME = "run_report.json"
+REPORT_PROM_NAME = "run_report.prom"
+
+
+@dataclass
+class StageProfile:
+    stage: str
+    attempt: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    peak_rss_delta_bytes: int = 0
+    rows_in: int = 0
+    rows_out: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    profile_path: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _peak_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+def count_rows(value: Any) -> int:
+    if isinstance(value, pa.Table):
+        return value.num_rows
+    if isinstance(value, pd.DataFrame):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return len(value)
+    return 0
+
+
+def _state_rows(state: Mapping[str, Any] | None, keys: Sequence[str]) -> int:
+    if state is None:
+        return 0
+    return sum(count_rows(state.get(key)) for key in keys if key in state)
+
+
+@contextmanager
+def profile_attempt(
+    stage: str,
+    *,
+    attempt: int = 0,
+    state: Mapping[str, Any] | None = None,
+    inputs: Sequence[str] = (),
+    outputs: Sequence[str] = (),
+    profile_path: str | Path | None = None,
+) -> Iterator[StageProfile]:
+    """Measure one stage attempt; the profile is complete when the block exits."""
+    profile = StageProfile(stage=stage, attempt=attempt, rows_in=_state_rows(state, inputs))
+    profiler = cProfile.Profile() if profile_path is not None else None
+    rss_before = _peak_rss_bytes()
+    cpu_before = time.thread_time()
+    wall_before = time.perf_counter()
+    with track_io() as io_counter:
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield profile
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            profile.wall_s = time.perf_counter() - wall_before
+            profile.cpu_s = time.thread_time() - cpu_before
+            profile.peak_rss_delta_bytes = max(0, _peak_rss_bytes() - rss_before)
+            profile.rows_out = _state_rows(state, outputs)
+            profile.bytes_read = io_counter.bytes_read
+            profile.bytes_written = io_counter.bytes_written
+            if profiler is not None:
+                path = Path(profile_path)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(str(path))
+                profile.profile_path = str(path)
+
+
+_METRICS: tuple[tuple[str, str, str], ...] = (
+    ("wall_s", "pipeline_stage_wall_seconds", "Stage attempt wall-clock time."),
+    ("cpu_s", "pipeline_stage_cpu_seconds", "CPU time of the thread running the stage attempt."),
+    ("peak_rss_delta_bytes", "pipeline_stage_peak_rss_delta_bytes", "Growth of process peak RSS during the attempt."),
+    ("rows_in", "pipeline_stage_rows_in", "Rows in the stage's declared state inputs."),
+    ("rows_out", "pipeline_stage_rows_out", "Rows in the stage's declared state outputs."),
+    ("bytes_read", "pipeline_stage_bytes_read", "Bytes read through storage readers."),
+    ("bytes_written", "pipeline_stage_bytes_written", "Bytes written through storage writers."),
+)
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", r"\\").replace('"', r"\"")
+
+
+def render_prometheus(run_id: str, profiles: Sequence[StageProfile]) -> str:
+    """Prometheus text exposition of the per-attempt stage metrics."""
+    lines: list[str] = []
+    for field_name, metric, help_text in _METRICS:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        for profile in profiles:
+            labels = f'attempt="{profile.attempt}",run_id="{_escape(run_id)}",stage="{_escape(profile.stage)}"'
+            lines.append(f"{metric}{{{labels}}} {float(getattr(profile, field_name))}")
+    return "\n".join(lines) + "\n"
+
+
+def build_run_report(run_id: str, profiles: Sequence[StageProfile]) -> dict[str, Any]:
+    totals = {
+        field_name: sum(getattr(profile, field_name) for profile in profiles)
+        for field_name in ("wall_s", "cpu_s", "bytes_read", "bytes_written")
+    }
+    return {
+        "run_id": run_id,
+        "stages": [profile.to_dict() for profile in profiles],
+        "totals": totals,
+    }
+
+
+def write_run_report(report_dir: str | Path, run_id: str, profiles: Sequence[StageProfile]) -> dict[str, str]:
+    """Write ``run_report.json`` and ``run_report.prom`` under ``report_dir/run_id``."""
+    target = Path(report_dir) / run_id
+    target.mkdir(parents=True, exist_ok=True)
+    json_path = target / REPORT_JSON_NAME
+    prom_path = target / REPORT_PROM_NAME
+    json_path.write_text(json.dumps(build_run_report(run_id, profiles), indent=2, sort_keys=True), encoding="utf-8")
+    prom_path.write_text(render_prometheus(run_id, profiles), encoding="utf-8")
+    return {"json": str(json_path), "prometheus": str(prom_path)}
@@ -0,0 +1,122 @@
+"""Arrow-backed tabular payloads for pipeline state.
+
+With ``arrow_state`` enabled, the daily job keeps bulk row sets (raw records,
+snapshots, cutoff snapshots, features) in ``context.state`` as
+``pyarrow.Table`` objects and hands the same table from stage to stage.
+Row-based consumers share one materialized list of row dicts per table, so a
+table is converted to dicts at most once per run; the publish stage is the
+only other place rows become dicts.
+
+The same holds without ``arrow_state``: :class:`StateViews` (kept in state
+under ``ROW_VIEWS_KEY``) caches the normalized row list and market-id index
+of every state value by identity, so stages reading the same row set share
+one conversion instead of re-walking and re-copying it.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from collections.abc import Callable, Mapping, MutableMapping
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+
+ARROW_STATE_KEY = "arrow_state"
+ROW_VIEWS_KEY = "arrow_row_views"
+
+_CONVERSION_ERRORS = (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, TypeError, ValueError)
+
+
+def as_table(value: Any) -> pa.Table | None:
+    """Return ``value`` as an Arrow table, or None when it is not tabular.
+
+    Tables pass through unchanged. DataFrames and lists of mappings are
+    converted; row sets whose columns do not have a single Arrow type return
+    None so callers can keep them as row dicts.
+    """
+    if isinstance(value, pa.Table):
+        return value
+    if isinstance(value, pd.DataFrame):
+        try:
+            return pa.Table.from_pandas(value, preserve_index=False)
+        except _CONVERSION_ERRORS:
+            return None
+    if isinstance(value, (list, tuple)) and all(isinstance(row, Mapping) for row in value):
+        try:
+            return pa.Table.from_pylist([row if isinstance(row, dict) else dict(row) for row in value])
+        except _CONVERSION_ERRORS:
+            return None
+    return None
+
+
+def column_values(table: pa.Table, column: str) -> list[Any]:
+    if column not in table.column_names:
+        return []
+    return table.column(column).to_pylist()
+
+
+class StateViews:
+    """Normalized views of state values, each computed once per value object.
+
+    Views are keyed by object identity (the source value is kept referenced so
+    its id cannot be reused); list and tuple sources are also keyed by length
+    so an in-place append is not served a stale view. A view that is itself
+    passed back in (for example rows stored in state and read by a later
+    stage) is returned as-is. Views are shared and must be treated as
+    read-only. ``conversions`` counts the conversions actually performed.
+    """
+
+    def __init__(self) -> None:
+        self._views: dict[tuple[str, int], tuple[Any, int, Any]] = {}
+        self._lock = threading.Lock()
+        self.conversions: Counter[str] = Counter()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Identity-keyed views mean nothing in another process.
+        return {}
+
+    def __setstate__(self, state: Mapping[str, Any]) -> None:
+        self.__init__()
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    def _view(self, kind: str, value: Any, convert: Callable[[Any], Any]) -> Any:
+        size = len(value) if isinstance(value, (list, tuple)) else -1
+        with self._lock:
+            cached = self._views.get((kind, id(value)))
+            if cached is not None and cached[0] is value and cached[1] == size:
+                return cached[2]
+        view = convert(value)
+        with self._lock:
+            self.conversions[f"{kind}:{type(value).__name__}"] += 1
+            self._views[(kind, id(value))] = (value, size, view)
+            if kind == "rows" and view is not value:
+                self._views[(kind, id(view))] = (view, len(view), view)
+        return view
+
+    def rows(self, value: Any, convert: Callable[[Any], list[dict[str, Any]]]) -> list[dict[str, Any]]:
+        """Row dicts for ``value``, converted with ``convert`` at most once."""
+        return self._view("rows", value, convert)
+
+    def market_ids(self, value: Any, convert: Callable[[Any], list[str]]) -> list[str]:
+        """Distinct market ids of the row set ``value``, computed at most once."""
+        return self._view("market_ids", value, convert)
+
+
+def state_views(state: MutableMapping[str, Any]) -> StateViews:
+    views = state.get(ROW_VIEWS_KEY)
+    if not isinstance(views, StateViews):
+        views = StateViews()
+        state[ROW_VIEWS_KEY] = views
+    return views
+
+
+def materialize_rows(state: MutableMapping[str, Any], table: pa.Table) -> list[dict[str, Any]]:
+    """Return row dicts for ``table``, converting it only once per run.
+
+    The rows are shared between consumers and must be treated as read-only.
+    """
+    return state_views(state).rows(table, pa.Table.to_pylist)
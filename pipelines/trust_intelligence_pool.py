@@ -0,0 +1,261 @@
+"""Sharded per-market Trust Intelligence execution.
+
+Markets are cut into fixed-size batches in scoreboard order and run on a
+process pool. Each worker builds its own pipeline once (``initializer``) from
+a picklable factory, so the SHAP/conformal/constraint steps of different
+markets run on separate cores. A market that exceeds ``timeout_s`` (enforced
+in the worker with ``SIGALRM`` where available) or raises is reported as
+failed. ``SIGALRM`` only fires on the main thread, so a timed single-worker
+run from any other thread (e.g. the stage thread pool) still goes through a
+one-process pool.
+
+Workers run their pipelines without an audit logger: concurrent writers would
+interleave the chain-of-trust log. The caller records the audit entries
+afterwards from :attr:`MarketOutcome.audit_inputs`, in scoreboard order, so
+the log is identical for any worker count.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import pickle
+import signal
+import threading
+import time
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from calibration.trust_intelligence_adapter import (
+    extract_prediction_probability,
+    run_trust_intelligence_for_market,
+)
+
+logger = logging.getLogger(__name__)
+
+PipelineFactory = Callable[[Mapping[str, Any]], Any]
+
+DEFAULT_BATCH_SIZE = 64
+
+
+@dataclass(frozen=True)
+class MarketTask:
+    market_id: str
+    rows: list[dict[str, Any]]
+    v1_trust_score: float | None = None
+
+
+@dataclass
+class MarketOutcome:
+    market_id: str
+    result: Any = None
+    status: str = "failed"
+    audit_inputs: dict[str, Any] = field(default_factory=dict)
+
+
+class MarketTimeout(BaseException):
+    """Raised inside a worker when one market exceeds its time budget.
+
+    A ``BaseException`` so the adapter's blanket ``except Exception`` around
+    ``pipeline.run`` cannot swallow it.
+    """
+
+
+class StubTrustIntelligencePipeline:
+    """Deterministic stand-in for ``TrustIntelligencePipeline``.
+
+    Mirrors the ``run`` signature and returns a plain mapping, so the stage
+    and its parallel execution can be exercised without the external package.
+    ``delay_s`` simulates slow markets.
+    """
+
+    def __init__(self, *, audit_logger: Any = None, conformal_method: str = "auto", delay_s: float = 0.0) -> None:
+        self.audit_logger = audit_logger
+        self.conformal_method = conformal_method
+        self.delay_s = delay_s
+
+    def run(
+        self,
+        *,
+        prediction_probability: float,
+        features: Mapping[str, float] | None = None,
+        historical_bands: Any = None,
+        actuals: Any = None,
+        current_band: Any = None,
+        context: Mapping[str, float] | None = None,
+    ) -> dict[str, Any]:
+        if self.delay_s > 0:
+            time.sleep(self.delay_s)
+        prior = float((context or {}).get("trust_score", 0.5))
+        trust_score = max(0.0, min(1.0, 0.5 * prior + 0.5 * (1.0 - abs(prediction_probability - 0.5) * 2.0)))
+        return {
+            "trust": {"trust_score": round(trust_score, 12)},
+            "uncertainty": {"prediction_probability": prediction_probability},
+            "features": dict(features or {}),
+            "conformal_method": self.conformal_method,
+        }
+
+
+def trust_intelligence_pipeline_factory(ti_config: Mapping[str, Any]) -> Any:
+    """Build the external pipeline without an audit logger (see module docs)."""
+    from trust_intelligence.pipeline.trust_pipeline import TrustIntelligencePipeline
+
+    conformal_method = ti_config.get("conformal_method", "auto")
+    if not isinstance(conformal_method, str):
+        conformal_method = "auto"
+    return TrustIntelligencePipeline(audit_logger=None, conformal_method=conformal_method)
+
+
+def stub_pipeline_factory(ti_config: Mapping[str, Any]) -> StubTrustIntelligencePipeline:
+    conformal_method = ti_config.get("conformal_method", "auto")
+    return StubTrustIntelligencePipeline(
+        conformal_method=conformal_method if isinstance(conformal_method, str) else "auto",
+        delay_s=float(ti_config.get("stub_delay_s", 0.0) or 0.0),
+    )
+
+
+def _alarm_available() -> bool:
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+@contextmanager
+def _time_limit(timeout_s: float | None) -> Iterator[None]:
+    if timeout_s is None or timeout_s <= 0:
+        yield
+        return
+    if not _alarm_available():
+        logger.warning("market timeout of %ss cannot be enforced outside the main thread", timeout_s)
+        yield
+        return
+
+    def _expired(signum: int, frame: Any) -> None:
+        raise MarketTimeout()
+
+    previous = signal.signal(signal.SIGALRM, _expired)
+    signal.setitimer(signal.ITIMER_REAL, float(timeout_s))
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _audit_inputs(task: MarketTask) -> dict[str, Any]:
+    prediction = None
+    for row in reversed(task.rows):
+        prediction = extract_prediction_probability(row)
+        if prediction is not None:
+            break
+    return {
+        "market_id": task.market_id,
+        "v1_trust_score": task.v1_trust_score,
+        "row_count": len(task.rows),
+        "prediction_probability": prediction,
+    }
+
+
+def run_market(pipeline: Any, task: MarketTask, *, timeout_s: float | None = None) -> MarketOutcome:
+    outcome = MarketOutcome(market_id=task.market_id, audit_inputs=_audit_inputs(task))
+    try:
+        with _time_limit(timeout_s):
+            result = run_trust_intelligence_for_market(
+                pipeline,
+                market_rows=task.rows,
+                v1_trust_score=task.v1_trust_score,
+            )
+    except MarketTimeout:
+        outcome.status = "timeout"
+        return outcome
+    except Exception:
+        return outcome
+    if result is not None:
+        outcome.result = result
+        outcome.status = "success"
+    return outcome
+
+
+_WORKER_PIPELINE: Any = None
+
+
+def _init_worker(factory: PipelineFactory, ti_config: Mapping[str, Any]) -> None:
+    global _WORKER_PIPELINE
+    _WORKER_PIPELINE = factory(ti_config)
+
+
+def _run_batch(tasks: Sequence[MarketTask], timeout_s: float | None) -> list[MarketOutcome]:
+    return [run_market(_WORKER_PIPELINE, task, timeout_s=timeout_s) for task in tasks]
+
+
+def _picklable(*values: Any) -> bool:
+    try:
+        pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return False
+    return True
+
+
+def run_markets(
+    tasks: Sequence[MarketTask],
+    *,
+    factory: PipelineFactory,
+    ti_config: Mapping[str, Any],
+    workers: int = 1,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    timeout_s: float | None = None,
+) -> list[MarketOutcome]:
+    """Run every task and return outcomes in task order.
+
+    With ``workers <= 1`` (or a factory/config that cannot be pickled) the
+    markets run in this process on a single pipeline instance, unless a
+    ``timeout_s`` is set and this thread cannot take ``SIGALRM``: then a
+    single worker process runs them so the timeout still applies.
+    """
+    if not tasks:
+        return []
+    size = max(1, int(batch_size))
+    batches = [list(tasks[start : start + size]) for start in range(0, len(tasks), size)]
+    pool_size = min(max(1, int(workers)), len(batches))
+    needs_worker = timeout_s is not None and timeout_s > 0 and not _alarm_available()
+    if (pool_size <= 1 and not needs_worker) or not _picklable(factory, dict(ti_config)):
+        if needs_worker:
+            logger.warning(
+                "market timeout of %ss not enforced: the pipeline factory cannot be sent to a worker process",
+                timeout_s,
+            )
+            timeout_s = None
+        pipeline = factory(ti_config)
+        return [run_market(pipeline, task, timeout_s=timeout_s) for task in tasks]
+
+    with ProcessPoolExecutor(
+        max_workers=pool_size,
+        initializer=_init_worker,
+        initargs=(factory, dict(ti_config)),
+    ) as pool:
+        futures = [pool.submit(_run_batch, batch, timeout_s) for batch in batches]
+        outcomes: list[MarketOutcome] = []
+        for batch, future in zip(batches, futures):
+            try:
+                outcomes.extend(future.result())
+            except Exception:
+                # A crashed worker fails its whole batch rather than the stage.
+                outcomes.extend(MarketOutcome(market_id=task.market_id, audit_inputs=_audit_inputs(task)) for task in batch)
+    return outcomes
+
+
+def resolve_pool_settings(ti_config: Mapping[str, Any]) -> tuple[int, int, float | None]:
+    """``(workers, batch_size, market_timeout_s)`` from the TI config section."""
+
+    def _number(key: str, default: float) -> float:
+        try:
+            value = float(ti_config.get(key, default))
+        except (TypeError, ValueError):
+            return default
+        return value if math.isfinite(value) else default
+
+    workers = max(1, int(_number("workers", 1)))
+    batch_size = max(1, int(_number("batch_size", DEFAULT_BATCH_SIZE)))
+    timeout = _number("market_timeout_s", 0.0)
+    return workers, batch_size, (timeout if timeout > 0 else None)
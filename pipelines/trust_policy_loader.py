@@ -103,6 +103,9 @@ _DEFAULT_TI_CONFIG: dict[str, object] = {
     "trust_threshold": 0.3,
     "max_retries": 2,
     "persist_results": True,
+    "workers": 1,
+    "batch_size": 64,
+    "market_timeout_s": 0,
     "audit": {
         "enabled": True,
         "agent_id": "mca-daily-pipeline",
@@ -129,7 +132,17 @@ def load_trust_intelligence_config(
         return dict(_DEFAULT_TI_CONFIG)
 
     config = dict(_DEFAULT_TI_CONFIG)
-    for key in ("enabled", "formula_version", "conformal_method", "trust_threshold", "max_retries", "persist_results"):
+    for key in (
+        "enabled",
+        "formula_version",
+        "conformal_method",
+        "trust_threshold",
+        "max_retries",
+        "persist_results",
+        "workers",
+        "batch_size",
+        "market_timeout_s",
+    ):
         if key in ti_section:
             config[key] = ti_section[key]
 
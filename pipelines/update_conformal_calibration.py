@@ -3,16 +3,21 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Iterable, Mapping
+from typing import Any, Iterable, Mapping, Sequence
 
 from calibration.conformal import (
+    ConformalAdjustment,
     apply_conformal_adjustment_many,
     coverage_report,
     fit_conformal_adjustment,
 )
 from calibration.conformal_state import save_conformal_adjustment
 
+Sample = tuple[dict[str, float], float]
+
 
 def _iter_rows(path: Path) -> Iterable[Mapping[str, Any]]:
     if not path.exists():
@@ -25,13 +30,14 @@ def _iter_rows(path: Path) -> Iterable[Mapping[str, Any]]:
                 yield row
         return
 
-    for line in path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        payload = json.loads(line)
-        if isinstance(payload, Mapping):
-            yield payload
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            payload = json.loads(line)
+            if isinstance(payload, Mapping):
+                yield payload
 
 
 def _as_float(raw: Any) -> float:
@@ -60,6 +66,80 @@ def _normalize_sample(row: Mapping[str, Any]) -> tuple[dict[str, float], float]
     return {k: _as_float(v) for k, v in keys.items()}, _as_float(actual)
 
 
+def _collect_samples(
+    rows: Iterable[Mapping[str, Any]],
+    *,
+    window_size: int,
+    segment_fields: Sequence[str],
+) -> tuple[list[Sample], list[str], dict[str, list[Sample]]]:
+    """One pass over ``rows``: trailing window overall and per segment.
+
+    Each distinct combination of ``segment_fields`` values keeps a ring buffer
+    of its last ``window_size`` samples (everything when ``window_size <= 0``).
+    Fields no row carries are dropped from the segment key at the end, so the
+    keys match grouping by the fields present in the input.
+    """
+    maxlen = window_size if window_size > 0 else None
+    overall: deque[Sample] = deque(maxlen=maxlen)
+    seen_fields: set[str] = set()
+    missing_fields = list(segment_fields)
+    buffers: dict[tuple[str, ...], deque[tuple[int, Sample]]] = {}
+
+    for position, row in enumerate(rows):
+        if missing_fields:
+            for field in [field for field in missing_fields if field in row]:
+                seen_fields.add(field)
+                missing_fields.remove(field)
+        parsed = _normalize_sample(row)
+        if parsed is None:
+            continue
+        overall.append(parsed)
+        if segment_fields:
+            values = tuple(f"{row.get(field, 'unknown')}" for field in segment_fields)
+            buffer = buffers.get(values)
+            if buffer is None:
+                buffer = buffers[values] = deque(maxlen=maxlen)
+            buffer.append((position, parsed))
+
+    active_fields = [field for field in segment_fields if field in seen_fields]
+    merged: dict[str, list[tuple[int, Sample]]] = {}
+    if active_fields:
+        for values, buffer in buffers.items():
+            key = "|".join(
+                f"{field}={value}" for field, value in zip(segment_fields, values) if field in seen_fields
+            )
+            merged.setdefault(key, []).extend(buffer)
+
+    segments: dict[str, list[Sample]] = {}
+    for key, positioned in merged.items():
+        positioned.sort(key=lambda item: item[0])
+        if maxlen is not None:
+            positioned = positioned[-maxlen:]
+        segments[key] = [sample for _, sample in positioned]
+    return list(overall), active_fields, segments
+
+
+def _fit_samples(samples: Sequence[Sample], target_coverage: float) -> ConformalAdjustment:
+    return fit_conformal_adjustment(
+        [band for band, _ in samples],
+        [actual for _, actual in samples],
+        target_coverage=target_coverage,
+    )
+
+
+def _fit_segments(
+    segments: Mapping[str, Sequence[Sample]],
+    *,
+    target_coverage: float,
+    workers: int,
+) -> dict[str, ConformalAdjustment]:
+    if workers <= 1 or len(segments) <= 1:
+        return {key: _fit_samples(samples, target_coverage) for key, samples in segments.items()}
+    with ProcessPoolExecutor(max_workers=min(workers, len(segments))) as pool:
+        futures = {key: pool.submit(_fit_samples, samples, target_coverage) for key, samples in segments.items()}
+        return {key: future.result() for key, future in futures.items()}
+
+
 def run(
     *,
     input_path: Path,
@@ -69,15 +149,13 @@ def run(
     min_samples: int,
     dry_run: bool,
     segment_fields: list[str] | None = None,
+    workers: int = 1,
 ) -> int:
-    samples: list[tuple[dict[str, float], float]] = []
-    for row in _iter_rows(input_path):
-        parsed = _normalize_sample(row)
-        if parsed is not None:
-            samples.append(parsed)
-
-    if window_size > 0:
-        samples = samples[-window_size:]
+    samples, active_segment_fields, segment_samples = _collect_samples(
+        _iter_rows(input_path),
+        window_size=window_size,
+        segment_fields=segment_fields or [],
+    )
 
     if len(samples) < min_samples:
         print(f"SKIP: insufficient samples ({len(samples)} < {min_samples})")
@@ -90,31 +168,11 @@ def run(
         actuals,
         target_coverage=target_coverage,
     )
-    segment_adjustments: dict[str, Any] = {}
-    active_segment_fields = [field for field in (segment_fields or []) if any(field in row for row in _iter_rows(input_path))]
-
-    if active_segment_fields:
-        grouped_rows: dict[str, list[tuple[dict[str, float], float]]] = {}
-        for row in _iter_rows(input_path):
-            parsed = _normalize_sample(row)
-            if parsed is None:
-                continue
-            key_parts = []
-            for field in active_segment_fields:
-                key_parts.append(f"{field}={row.get(field, 'unknown')}")
-            grouped_rows.setdefault("|".join(key_parts), []).append(parsed)
-        for segment_key, segment_samples in grouped_rows.items():
-            if window_size > 0:
-                segment_samples = segment_samples[-window_size:]
-            if len(segment_samples) < min_samples:
-                continue
-            segment_bands = [band for band, _ in segment_samples]
-            segment_actuals = [actual for _, actual in segment_samples]
-            segment_adjustments[segment_key] = fit_conformal_adjustment(
-                segment_bands,
-                segment_actuals,
-                target_coverage=target_coverage,
-            )
+    segment_adjustments = _fit_segments(
+        {key: values for key, values in segment_samples.items() if len(values) >= min_samples},
+        target_coverage=target_coverage,
+        workers=workers,
+    )
 
     pre_report = coverage_report(bands, actuals)
     post_report = coverage_report(apply_conformal_adjustment_many(bands, adjustment), actuals)
@@ -169,6 +227,7 @@ def main() -> int:
     parser.add_argument("--min-samples", type=int, default=100)
     parser.add_argument("--dry-run", action="store_true")
     parser.add_argument("--segment-field", action="append", dest="segment_fields", default=[])
+    parser.add_argument("--workers", type=int, default=1, help="processes used to fit segments")
     args = parser.parse_args()
 
     return run(
@@ -179,6 +238,7 @@ def main() -> int:
         min_samples=int(args.min_samples),
         dry_run=bool(args.dry_run),
         segment_fields=list(dict.fromkeys(args.segment_fields)),
+        workers=int(args.workers),
     )
 
 
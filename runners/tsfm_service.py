@@ -16,7 +16,7 @@ from typing import Any, Mapping
 import yaml
 
 from calibration.conformal import ConformalAdjustment, apply_conformal_adjustment
-from calibration.conformal_state import load_conformal_adjustment, load_conformal_adjustments_by_segment
+from calibration.conformal_state import ConformalStateWatcher, StateFile, read_state_file
 from runners.baselines import forecast_baseline_band
 from runners.tollama_adapter import TollamaAdapter, TollamaConfig
 from runners.tsfm_observability import TSFMMetricsEmitter
@@ -143,6 +143,8 @@ class TSFMServiceConfig:
     baseline_only_exit_failure_rate: float = 0.25
     degradation_probe_every_n_requests: int = 1
     conformal_state_path: str = "data/derived/calibration/conformal_state.json"
+    # Seconds between checks of the conformal state file for a new version; negative disables reloads.
+    conformal_reload_interval_s: float = 5.0
     rollout_stage: str = "unknown"
     target_coverage: float = 0.9
     route_default: str = "tsfm"
@@ -161,19 +163,24 @@ class TSFMRunnerService:
     ) -> None:
         self.adapter = adapter or TollamaAdapter(TollamaConfig())
         self.config = config or TSFMServiceConfig()
-        if conformal_adjustment is not None:
-            self.conformal_adjustment = conformal_adjustment
-            self.conformal_adjustments_by_segment: dict[str, ConformalAdjustment] = {}
-            self._conformal_loaded_from_state = False
-        else:
+        self.conformal_adjustment: ConformalAdjustment | None = conformal_adjustment
+        self.conformal_adjustments_by_segment: dict[str, ConformalAdjustment] = {}
+        self._conformal_loaded_from_state = False
+        self._conformal_watcher: ConformalStateWatcher | None = None
+        if conformal_adjustment is None:
+            if self.config.conformal_reload_interval_s >= 0:
+                self._conformal_watcher = ConformalStateWatcher(
+                    self.config.conformal_state_path,
+                    interval_s=self.config.conformal_reload_interval_s,
+                )
             try:
-                self.conformal_adjustment = load_conformal_adjustment(self.config.conformal_state_path)
-                self.conformal_adjustments_by_segment = load_conformal_adjustments_by_segment(self.config.conformal_state_path)
-                self._conformal_loaded_from_state = self.conformal_adjustment is not None
+                if self._conformal_watcher is not None:
+                    state = self._conformal_watcher.current()
+                else:
+                    state = read_state_file(self.config.conformal_state_path)
+                self._apply_conformal_state(state)
             except Exception:  # noqa: BLE001
-                self.conformal_adjustment = None
-                self.conformal_adjustments_by_segment = {}
-                self._conformal_loaded_from_state = False
+                pass
         self.metrics_emitter = metrics_emitter or TSFMMetricsEmitter()
         self._state_lock = RLock()
         self._cache: dict[str, tuple[float, float, dict[str, Any]]] = {}
@@ -248,6 +255,7 @@ class TSFMRunnerService:
             baseline_only_exit_failure_rate=float(degradation.get("baseline_only_exit_failure_rate", 0.25)),
             degradation_probe_every_n_requests=int(degradation.get("probe_every_n_requests", 1)),
             conformal_state_path=str(conformal.get("state_path", "data/derived/calibration/conformal_state.json")),
+            conformal_reload_interval_s=float(conformal.get("reload_interval_s", 5.0)),
             rollout_stage=str(tsfm.get("rollout_stage", "unknown")),
             target_coverage=float(conformal.get("target_coverage", 0.9)),
             route_default=str(routing.get("default_route", "tsfm")),
@@ -538,6 +546,36 @@ class TSFMRunnerService:
     def render_prometheus_metrics(self) -> str:
         return self.metrics_emitter.render_prometheus()
 
+    def _apply_conformal_state(self, state: StateFile | None) -> None:
+        if state is None:
+            return
+        adjustment = state.default_adjustment()
+        segments = state.segment_adjustments()
+        self.conformal_adjustment = adjustment
+        self.conformal_adjustments_by_segment = segments
+        self._conformal_loaded_from_state = True
+
+    def _maybe_reload_conformal_state(self) -> None:
+        """Swap in a new conformal state file version; an unreadable version keeps the current state."""
+        if self._conformal_watcher is None:
+            return
+        with self._state_lock:
+            try:
+                state = self._conformal_watcher.poll()
+                if state is None:
+                    return
+                self._apply_conformal_state(state)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning(
+                    "TSFM conformal state reload failed; keeping current state | path=%s reason=%s",
+                    self.config.conformal_state_path,
+                    exc,
+                )
+                return
+            # Cached responses carry the previous conformal block.
+            self._cache.clear()
+            logger.info("TSFM conformal state reloaded | path=%s", self.config.conformal_state_path)
+
     def _select_conformal_adjustment(
         self,
         request: Mapping[str, Any],
@@ -590,6 +628,7 @@ class TSFMRunnerService:
         started = time.perf_counter()
         request = self._normalize_forecast_request(request)
         self._validate_forecast_request(request)
+        self._maybe_reload_conformal_state()
         rollout_stage = str(request.get("rollout_stage") or self.config.rollout_stage)
         bucket = str(request.get("liquidity_bucket") or "unknown")
         self.metrics_emitter.set_gauge("tsfm_target_coverage", self.config.target_coverage, rollout_stage=rollout_stage, bucket=bucket)
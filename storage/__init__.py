@@ -1,4 +1,6 @@
+from .catalog import DatasetCatalog, rebuild_catalog
 from .readers import ParquetReader, RawReader
+from .segments import SegmentAppender, SegmentCompactor, compact_segments
 from .writers import ParquetWriter, RawWriter, normalize_dt
 
 __all__ = [
@@ -7,4 +9,9 @@ __all__ = [
     "ParquetWriter",
     "RawReader",
     "ParquetReader",
+    "SegmentAppender",
+    "SegmentCompactor",
+    "compact_segments",
+    "DatasetCatalog",
+    "rebuild_catalog",
 ]
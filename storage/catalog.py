@@ -0,0 +1,633 @@
+"""Per-dataset catalog of partitions and files.
+
+Each dataset directory (``<root>/raw/<dataset>`` or ``<root>/derived/<dataset>``)
+may carry a ``_catalog.json`` manifest::
+
+    {
+      "format": "dataset-catalog",
+      "version": 1,
+      "partitions": {
+        "2026-02-20": {
+          "data.parquet": {
+            "format": "parquet", "rows": 120, "bytes": 8841,
+            "schema_hash": "…", "stats": {"market_id": {"min": "m1", "max": "m9"}}
+          }
+        }
+      }
+    }
+
+Writers record every write as one line appended to ``_catalog.log``, so an
+update costs O(1) instead of rewriting the whole manifest; once the journal
+grows past ``JOURNAL_COMPACT_BYTES`` it is folded into ``_catalog.json``
+(temp file + rename). Journal lines carry increasing sequence numbers and the
+manifest records the last one it folded, so a compaction interrupted between
+its two renames never applies an update twice. Updates hold an exclusive
+``flock`` on ``_catalog.lock`` (readers a shared one), which serializes
+writers across processes as well as threads.
+
+Readers plan scans from the catalog without listing directories. The
+dataset directory is listed only when its subdirectory count (``st_nlink``)
+does not match the catalogued partitions, i.e. when ``dt=*`` partitions were
+written before the catalog existed or with ``update_catalog=False``, or when
+the filesystem does not report that count. :func:`rebuild_catalog` builds a
+catalog for an existing tree.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
+CATALOG_NAME = "_catalog.json"
+CATALOG_JOURNAL_NAME = "_catalog.log"
+CATALOG_LOCK_NAME = "_catalog.lock"
+CATALOG_FORMAT = "dataset-catalog"
+CATALOG_VERSION = 1
+DEFAULT_KEY_COLUMNS = ("market_id", "ts")
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+
+_LOCKS_GUARD = threading.Lock()
+_CATALOG_LOCKS: dict[str, threading.Lock] = {}
+
+
+def _thread_lock(dataset_dir: Path) -> threading.Lock:
+    key = str(dataset_dir.resolve())
+    with _LOCKS_GUARD:
+        lock = _CATALOG_LOCKS.get(key)
+        if lock is None:
+            lock = threading.Lock()
+            _CATALOG_LOCKS[key] = lock
+        return lock
+
+
+@contextmanager
+def _catalog_lock(dataset_dir: Path, *, shared: bool = False) -> Iterator[None]:
+    """Exclusive (writers) or shared (readers) lock on a dataset's catalog.
+
+    ``flock`` on ``_catalog.lock`` covers other processes; the in-process lock
+    covers platforms without ``fcntl``. Readers go unlocked when the lock file
+    cannot be created, e.g. on a read-only tree.
+    """
+    thread_lock = None if shared and fcntl is not None else _thread_lock(dataset_dir)
+    if thread_lock is not None:
+        thread_lock.acquire()
+    handle = None
+    try:
+        if fcntl is not None:
+            try:
+                handle = (dataset_dir / CATALOG_LOCK_NAME).open("ab")
+            except OSError:
+                if not shared:
+                    raise
+            if handle is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        yield
+    finally:
+        if handle is not None:
+            handle.close()
+        if thread_lock is not None:
+            thread_lock.release()
+
+
+def _empty_catalog() -> dict[str, Any]:
+    return {"format": CATALOG_FORMAT, "version": CATALOG_VERSION, "partitions": {}}
+
+
+def _json_safe(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    item = getattr(value, "item", None)
+    if callable(item):
+        try:
+            return item()
+        except (TypeError, ValueError):
+            pass
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def schema_hash(columns: Iterable[tuple[str, str]]) -> str:
+    """Hash ``(name, type)`` pairs into a short stable schema fingerprint."""
+    payload = json.dumps(sorted([str(name), str(kind)] for name, kind in columns))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def frame_stats(frame: Any, columns: Sequence[str]) -> dict[str, dict[str, Any]]:
+    """Min/max of ``columns`` in a pandas DataFrame, computed column-wise."""
+    stats: dict[str, dict[str, Any]] = {}
+    for column in columns:
+        if column not in frame.columns:
+            continue
+        series = frame[column].dropna()
+        if series.empty:
+            continue
+        try:
+            low, high = series.min(), series.max()
+        except TypeError:
+            continue
+        stats[column] = {"min": _json_safe(low), "max": _json_safe(high)}
+    return stats
+
+
+def column_stats(values_by_column: Mapping[str, Iterable[Any]]) -> dict[str, dict[str, Any]]:
+    """Return JSON-safe min/max per column, skipping nulls and mixed types."""
+    stats: dict[str, dict[str, Any]] = {}
+    for column, values in values_by_column.items():
+        present = [value for value in values if value is not None and value == value]
+        if not present:
+            continue
+        try:
+            low, high = min(present), max(present)
+        except TypeError:
+            continue
+        stats[column] = {"min": _json_safe(low), "max": _json_safe(high)}
+    return stats
+
+
+def merge_stats(
+    left: Mapping[str, Mapping[str, Any]],
+    right: Mapping[str, Mapping[str, Any]],
+) -> dict[str, dict[str, Any]]:
+    merged = {column: dict(bounds) for column, bounds in left.items()}
+    for column, bounds in right.items():
+        current = merged.get(column)
+        if current is None:
+            merged[column] = dict(bounds)
+            continue
+        try:
+            current["min"] = min(current["min"], bounds["min"])
+            current["max"] = max(current["max"], bounds["max"])
+        except (KeyError, TypeError):
+            merged.pop(column)
+    return merged
+
+
+def _merge_entry(previous: Mapping[str, Any], delta: Mapping[str, Any]) -> dict[str, Any]:
+    """Accumulate an appended ``delta`` entry onto ``previous``."""
+    column_pairs = {tuple(pair) for pair in previous.get("columns") or []}
+    column_pairs.update(tuple(pair) for pair in delta.get("columns") or [])
+    merged = dict(delta)
+    merged["rows"] = int(previous.get("rows", 0)) + int(delta.get("rows", 0))
+    merged["stats"] = merge_stats(previous.get("stats") or {}, delta.get("stats") or {})
+    merged["columns"] = sorted([name, kind] for name, kind in column_pairs)
+    merged["schema_hash"] = schema_hash(column_pairs)
+    return merged
+
+
+def _apply_op(catalog: dict[str, Any], op: Mapping[str, Any]) -> None:
+    partitions = catalog["partitions"]
+    dt, filename, kind = op.get("dt"), op.get("file"), op.get("op")
+    if kind in ("put", "append"):
+        partition = partitions.setdefault(dt, {})
+        previous = partition.get(filename)
+        entry = op.get("entry") or {}
+        if kind == "append" and isinstance(previous, Mapping):
+            partition[filename] = _merge_entry(previous, entry)
+        else:
+            partition[filename] = dict(entry)
+    elif kind == "update":
+        entry = partitions.get(dt, {}).get(filename)
+        if isinstance(entry, dict):
+            entry.update(op.get("fields") or {})
+    elif kind == "remove":
+        partition = partitions.get(dt)
+        if isinstance(partition, dict) and filename in partition:
+            partition.pop(filename)
+            if not partition:
+                partitions.pop(dt)
+
+
+def _parse_journal_line(line: bytes) -> dict[str, Any] | None:
+    """One journal record, or ``None`` for a torn or foreign line."""
+    try:
+        record = json.loads(line)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return None
+    if not isinstance(record, dict) or not isinstance(record.get("seq"), int):
+        return None
+    return record
+
+
+def _normalize_bound(value: Any) -> str | None:
+    if value is None:
+        return None
+    from .writers import normalize_dt
+
+    return normalize_dt(value)
+
+
+def _normalize_range(dt_range: tuple[Any, Any] | None) -> tuple[str | None, str | None]:
+    if dt_range is None:
+        return None, None
+    return _normalize_bound(dt_range[0]), _normalize_bound(dt_range[1])
+
+
+class DatasetCatalog:
+    """Read and update the ``_catalog.json`` manifest of one dataset."""
+
+    def __init__(self, dataset_dir: str | Path) -> None:
+        self.dataset_dir = Path(dataset_dir)
+
+    @property
+    def path(self) -> Path:
+        return self.dataset_dir / CATALOG_NAME
+
+    @property
+    def journal_path(self) -> Path:
+        return self.dataset_dir / CATALOG_JOURNAL_NAME
+
+    def exists(self) -> bool:
+        return self.path.exists() or self.journal_path.exists()
+
+    def load(self) -> dict[str, Any]:
+        """The manifest with every journalled update applied."""
+        if not self.exists():
+            return _empty_catalog()
+        with _catalog_lock(self.dataset_dir, shared=True):
+            return self._load_unlocked()
+
+    def _load_snapshot(self) -> dict[str, Any]:
+        if not self.path.exists():
+            return _empty_catalog()
+        try:
+            with self.path.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except json.JSONDecodeError:
+            return _empty_catalog()
+        if not isinstance(payload, dict) or payload.get("format") != CATALOG_FORMAT:
+            return _empty_catalog()
+        payload.setdefault("partitions", {})
+        return payload
+
+    def _load_unlocked(self) -> dict[str, Any]:
+        catalog = self._load_snapshot()
+        last_seq = int(catalog.get("last_seq", 0))
+        try:
+            with self.journal_path.open("rb") as handle:
+                lines = handle.read().split(b"\n")
+        except FileNotFoundError:
+            lines = []
+        for line in lines:
+            record = _parse_journal_line(line) if line else None
+            if record is None or record["seq"] <= last_seq:
+                continue
+            _apply_op(catalog, record)
+            last_seq = record["seq"]
+        catalog["last_seq"] = last_seq
+        return catalog
+
+    def _last_seq(self) -> int:
+        """Sequence number of the newest journal record (read from the tail)."""
+        try:
+            handle = self.journal_path.open("rb")
+        except FileNotFoundError:
+            return int(self._load_snapshot().get("last_seq", 0))
+        with handle:
+            size = handle.seek(0, os.SEEK_END)
+            chunk = 4096
+            while True:
+                start = max(0, size - chunk)
+                handle.seek(start)
+                lines = handle.read(size - start).split(b"\n")
+                # The first line of a partial chunk may be cut off.
+                for line in reversed(lines if start == 0 else lines[1:]):
+                    record = _parse_journal_line(line) if line else None
+                    if record is not None:
+                        return record["seq"]
+                if start == 0:
+                    return int(self._load_snapshot().get("last_seq", 0))
+                chunk *= 4
+
+    def _journal(self, op: dict[str, Any]) -> None:
+        """Append one update to the journal, compacting it when it grows large."""
+        self.dataset_dir.mkdir(parents=True, exist_ok=True)
+        with _catalog_lock(self.dataset_dir):
+            line = json.dumps({**op, "seq": self._last_seq() + 1}, ensure_ascii=True, sort_keys=True)
+            with self.journal_path.open("ab") as handle:
+                size = handle.tell()
+                prefix = b""
+                if size:
+                    with self.journal_path.open("rb") as tail:
+                        tail.seek(size - 1)
+                        if tail.read(1) != b"\n":
+                            prefix = b"\n"  # terminate a torn line left by a crashed writer
+                handle.write(prefix + line.encode("utf-8") + b"\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+                size = handle.tell()
+            if size >= JOURNAL_COMPACT_BYTES:
+                self._compact_unlocked()
+
+    def _compact_unlocked(self) -> None:
+        catalog = self._load_unlocked()
+        self._save(catalog)
+        # Keep a marker so the next update continues the sequence without reading the manifest.
+        marker = json.dumps({"seq": catalog["last_seq"]}) + "\n"
+        _atomic_write(self.journal_path, marker.encode("utf-8"))
+
+    def compact(self) -> None:
+        """Fold the journal into ``_catalog.json``."""
+        if not self.exists():
+            return
+        with _catalog_lock(self.dataset_dir):
+            self._compact_unlocked()
+
+    def _save(self, payload: Mapping[str, Any]) -> None:
+        self.dataset_dir.mkdir(parents=True, exist_ok=True)
+        _atomic_write(self.path, json.dumps(payload, ensure_ascii=True, sort_keys=True).encode("utf-8"))
+
+    def partitions(
+        self,
+        *,
+        dt_range: tuple[Any, Any] | None = None,
+        catalog: Mapping[str, Any] | None = None,
+    ) -> list[str]:
+        payload = catalog if catalog is not None else self.load()
+        start, end = _normalize_range(dt_range)
+        return sorted(
+            dt
+            for dt in payload.get("partitions", {})
+            if (start is None or dt >= start) and (end is None or dt <= end)
+        )
+
+    def listed_partitions(self, *, dt_range: tuple[Any, Any] | None = None) -> list[str]:
+        """Days of the ``dt=*`` directories on disk (one listing of the dataset directory)."""
+        start, end = _normalize_range(dt_range)
+        try:
+            children = list(self.dataset_dir.iterdir())
+        except FileNotFoundError:
+            return []
+        return sorted(
+            child.name[len("dt=") :]
+            for child in children
+            if child.name.startswith("dt=")
+            and child.is_dir()
+            and (start is None or child.name[len("dt=") :] >= start)
+            and (end is None or child.name[len("dt=") :] <= end)
+        )
+
+    def uncatalogued_partitions(
+        self,
+        *,
+        dt_range: tuple[Any, Any] | None = None,
+        catalog: Mapping[str, Any] | None = None,
+    ) -> list[str]:
+        """Days of ``dt=*`` directories the catalog has no entries for.
+
+        A directory's link count is two plus its subdirectories, so when it
+        equals two plus the catalogued partitions every directory on disk is
+        known and nothing is listed. Filesystems that do not count
+        subdirectories (``st_nlink < 2``) are always listed.
+        """
+        payload = catalog if catalog is not None else self.load()
+        known = payload.get("partitions", {})
+        try:
+            links = os.stat(self.dataset_dir).st_nlink
+        except FileNotFoundError:
+            return []
+        if links >= 2 and links - 2 == len(known):
+            return []
+        return [dt for dt in self.listed_partitions(dt_range=dt_range) if dt not in known]
+
+    def files(self, dt: str, *, catalog: Mapping[str, Any] | None = None) -> dict[str, dict[str, Any]]:
+        payload = catalog if catalog is not None else self.load()
+        entries = payload.get("partitions", {}).get(dt)
+        return dict(entries) if isinstance(entries, dict) else {}
+
+    def has_partition(self, dt: str) -> bool:
+        return bool(self.files(dt))
+
+    def file_paths(
+        self,
+        *,
+        dt_range: tuple[Any, Any] | None = None,
+        suffix: str | None = None,
+        filename: str | None = None,
+        filters: Any = None,
+    ) -> list[Path]:
+        """Files in ``dt_range`` matching ``suffix``/``filename``.
+
+        Partitions with matching catalog entries are read from the catalog,
+        skipping files whose stats rule out DNF ``filters``. Catalogued
+        partitions without a matching entry, and partitions the catalog does
+        not know (see :meth:`uncatalogued_partitions`), are listed instead.
+        """
+        catalog = self.load()
+        paths: list[Path] = []
+        dts = set(self.partitions(dt_range=dt_range, catalog=catalog))
+        dts.update(self.uncatalogued_partitions(dt_range=dt_range, catalog=catalog))
+        for dt in sorted(dts):
+            partition = self.dataset_dir / f"dt={dt}"
+            entries = {
+                name: entry
+                for name, entry in self.files(dt, catalog=catalog).items()
+                if (suffix is None or name.endswith(suffix)) and (filename is None or name == filename)
+            }
+            if not entries:
+                if filename is not None:
+                    paths.extend([partition / filename] if (partition / filename).exists() else [])
+                else:
+                    paths.extend(sorted(partition.glob(f"*{suffix or ''}")))
+                continue
+            for name, entry in sorted(entries.items()):
+                if filters is not None and not stats_may_match(entry.get("stats") or {}, filters):
+                    continue
+                paths.append(partition / name)
+        return paths
+
+    def missing_dts(self, start: Any, end: Any) -> list[str]:
+        """Return the days in ``[start, end]`` with no catalogued files."""
+        from .writers import normalize_dt
+
+        first = date.fromisoformat(normalize_dt(start))
+        last = date.fromisoformat(normalize_dt(end))
+        present = set(self.partitions(dt_range=(first, last)))
+        missing: list[str] = []
+        day = first
+        while day <= last:
+            if day.isoformat() not in present:
+                missing.append(day.isoformat())
+            day += timedelta(days=1)
+        return missing
+
+    def record_file(
+        self,
+        dt: str,
+        filename: str,
+        *,
+        fmt: str,
+        rows: int,
+        size_bytes: int,
+        columns: Iterable[tuple[str, str]] = (),
+        stats: Mapping[str, Mapping[str, Any]] | None = None,
+        append: bool = False,
+    ) -> dict[str, Any]:
+        """Insert or replace one file entry.
+
+        With ``append=True`` the entry accumulates instead: rows are added,
+        stats are widened and the column set is unioned. Appends are
+        journalled as deltas and merged when the catalog is loaded, so the
+        returned entry describes this write only.
+        """
+        column_pairs = {(str(name), str(kind)) for name, kind in columns}
+        entry: dict[str, Any] = {
+            "format": fmt,
+            "rows": int(rows),
+            "bytes": int(size_bytes),
+            "columns": sorted([name, kind] for name, kind in column_pairs),
+            "schema_hash": schema_hash(column_pairs),
+            "stats": dict(stats or {}),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self._journal({"op": "append" if append else "put", "dt": dt, "file": filename, "entry": entry})
+        return entry
+
+    def update_file(self, dt: str, filename: str, **fields: Any) -> None:
+        fields["updated_at"] = datetime.now(timezone.utc).isoformat()
+        self._journal({"op": "update", "dt": dt, "file": filename, "fields": fields})
+
+    def remove_file(self, dt: str, filename: str) -> None:
+        self._journal({"op": "remove", "dt": dt, "file": filename})
+
+
+def _atomic_write(path: Path, payload: bytes) -> None:
+    temp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with temp_path.open("wb") as handle:
+            handle.write(payload)
+            handle.flush()
+            os.fsync(handle.fileno())
+        temp_path.replace(path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+
+def stats_may_match(stats: Mapping[str, Mapping[str, Any]], filters: Any) -> bool:
+    """Return False only when catalog min/max prove DNF ``filters`` cannot match.
+
+    Supports ``[(col, op, value), ...]`` conjunctions and ``[[...], [...]]``
+    disjunctions with ``=``, ``==``, ``in``, ``<``, ``<=``, ``>``, ``>=``.
+    Anything else (including pyarrow expressions) is treated as a possible match.
+    """
+    if not isinstance(filters, (list, tuple)) or not filters:
+        return True
+    if all(isinstance(item, (list, tuple)) and item and isinstance(item[0], (list, tuple)) for item in filters):
+        return any(_conjunction_may_match(stats, clause) for clause in filters)
+    return _conjunction_may_match(stats, filters)
+
+
+def _conjunction_may_match(stats: Mapping[str, Mapping[str, Any]], clause: Sequence[Any]) -> bool:
+    for predicate in clause:
+        if not isinstance(predicate, (list, tuple)) or len(predicate) != 3:
+            continue
+        column, op, value = predicate
+        bounds = stats.get(column)
+        if not isinstance(bounds, Mapping):
+            continue
+        try:
+            if not _predicate_may_match(bounds["min"], bounds["max"], str(op), value):
+                return False
+        except (KeyError, TypeError):
+            continue
+    return True
+
+
+def _predicate_may_match(low: Any, high: Any, op: str, value: Any) -> bool:
+    if op in ("=", "=="):
+        return low <= value <= high
+    if op == "in":
+        return any(low <= item <= high for item in value)
+    if op == "<":
+        return low < value
+    if op == "<=":
+        return low <= value
+    if op == ">":
+        return high > value
+    if op == ">=":
+        return high >= value
+    return True
+
+
+def rebuild_catalog(
+    dataset_dir: str | Path,
+    *,
+    key_columns: Sequence[str] = DEFAULT_KEY_COLUMNS,
+) -> dict[str, Any]:
+    """Build a catalog for an existing dataset by listing it once."""
+    import pyarrow.parquet as pq
+
+    from .readers import list_jsonl_targets, read_jsonl_target
+
+    directory = Path(dataset_dir)
+    catalog = DatasetCatalog(directory)
+    for partition in sorted(directory.glob("dt=*")):
+        dt = partition.name[len("dt=") :]
+        for path in sorted(partition.glob("*.parquet")):
+            metadata = pq.read_metadata(path)
+            arrow_schema = metadata.schema.to_arrow_schema()
+            table = pq.read_table(path, columns=[name for name in key_columns if name in arrow_schema.names])
+            catalog.record_file(
+                dt,
+                path.name,
+                fmt="parquet",
+                rows=metadata.num_rows,
+                size_bytes=path.stat().st_size,
+                columns=[(field.name, str(field.type)) for field in arrow_schema],
+                stats=column_stats({name: table.column(name).to_pylist() for name in table.column_names}),
+            )
+        for name in list_jsonl_targets(partition):
+            path = partition / name
+            rows = read_jsonl_target(path)
+            catalog.record_file(
+                dt,
+                name,
+                fmt="jsonl",
+                rows=len(rows),
+                size_bytes=jsonl_target_bytes(path),
+                columns=[(key, "json") for key in {key for row in rows for key in row}],
+                stats=column_stats({column: [row.get(column) for row in rows] for column in key_columns}),
+            )
+    return catalog.load()
+
+
+def jsonl_target_bytes(path: Path) -> int:
+    """Committed size of a JSONL target: legacy file plus manifest segments."""
+    from .segments import load_segment_manifest, segment_dir_for
+
+    size = path.stat().st_size if path.exists() else 0
+    manifest = load_segment_manifest(segment_dir_for(path.parent, path.name))
+    if manifest is not None:
+        size += sum(int(entry.get("bytes", 0)) for entry in manifest.get("segments", []))
+    return size
+
+
+def refresh_catalog_counts(
+    catalog: DatasetCatalog,
+    target: Path,
+    compaction: Mapping[str, Any],
+) -> None:
+    """Apply a compaction summary to ``target``'s catalog entry, if catalogued."""
+    dt = target.parent.name[len("dt=") :]
+    entry = catalog.files(dt).get(target.name)
+    if entry is None:
+        return
+    catalog.update_file(
+        dt,
+        target.name,
+        rows=max(0, int(entry.get("rows", 0)) - int(compaction.get("rows_dropped", 0))),
+        bytes=jsonl_target_bytes(target),
+    )
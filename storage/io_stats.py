@@ -0,0 +1,47 @@
+"""Byte accounting for the storage readers and writers.
+
+Readers and writers report the bytes they move to every counter opened with
+:func:`track_io` in the current context. Counters live in a ``ContextVar``,
+so stages running on different threads are accounted separately; work done in
+another process is not seen.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+_ACTIVE: ContextVar[tuple["IOCounter", ...]] = ContextVar("storage_io_counters", default=())
+
+
+@dataclass
+class IOCounter:
+    bytes_read: int = 0
+    bytes_written: int = 0
+    files_read: int = 0
+    files_written: int = 0
+
+
+def record_read(nbytes: int, *, files: int = 1) -> None:
+    for counter in _ACTIVE.get():
+        counter.bytes_read += int(nbytes)
+        counter.files_read += files
+
+
+def record_write(nbytes: int, *, files: int = 1) -> None:
+    for counter in _ACTIVE.get():
+        counter.bytes_written += int(nbytes)
+        counter.files_written += files
+
+
+@contextmanager
+def track_io() -> Iterator[IOCounter]:
+    """Count storage bytes read/written inside the block (nested blocks all count)."""
+    counter = IOCounter()
+    token = _ACTIVE.set((*_ACTIVE.get(), counter))
+    try:
+        yield counter
+    finally:
+        _ACTIVE.reset(token)
@@ -3,21 +3,77 @@ from __future__ import annotations
 import json
 from datetime import date, datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Sequence
 
 import pandas as pd
 
+from .catalog import DatasetCatalog
+from .io_stats import record_read
+from .segments import (
+    SEGMENT_DIR_SUFFIX,
+    dedupe_rows,
+    load_segment_manifest,
+    read_segments,
+    segment_dir_for,
+)
 from .writers import normalize_dt
 
+# A pyarrow.dataset expression or DNF filter tuples.
+ParquetFilters = Any
+DtRange = tuple[date | datetime | str | None, date | datetime | str | None] | None
+
+
+def _read_jsonl_file(path: Path) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            cleaned = line.strip()
+            if not cleaned:
+                continue
+            rows.append(json.loads(cleaned))
+    record_read(path.stat().st_size)
+    return rows
+
+
+def list_jsonl_targets(partition: Path) -> list[str]:
+    """List ``<stem>.jsonl`` targets in a partition, including segmented ones."""
+    names = {path.name for path in partition.glob("*.jsonl")}
+    names.update(
+        f"{path.name[: -len(SEGMENT_DIR_SUFFIX)]}.jsonl" for path in partition.glob(f"*{SEGMENT_DIR_SUFFIX}")
+    )
+    return sorted(names)
+
+
+def read_jsonl_target(path: Path) -> list[dict[str, Any]]:
+    """Read a JSONL target: the legacy single file followed by its segments."""
+    segment_dir = segment_dir_for(path.parent, path.name)
+    manifest = load_segment_manifest(segment_dir) if segment_dir.exists() else None
+    if manifest is None:
+        if not path.exists() and segment_dir.exists():
+            return []
+        return _read_jsonl_file(path)
+    rows = _read_jsonl_file(path) if path.exists() else []
+    rows.extend(read_segments(segment_dir, manifest=manifest))
+    return dedupe_rows(rows, manifest.get("dedupe_key"))
+
 
 class RawReader:
-    """Read JSONL partitions under raw/<dataset>/dt=YYYY-MM-DD."""
+    """Read JSONL partitions under raw/<dataset>/dt=YYYY-MM-DD.
+
+    Segmented targets written by ``RawWriter.append`` are read through their
+    manifest and merged after the legacy single file with the same stem.
+    A partition's targets are the ones in the dataset catalog plus any found
+    on disk that it does not list (e.g. written with ``update_catalog=False``).
+    """
 
     def __init__(self, root: str | Path) -> None:
         self.root = Path(root)
 
+    def dataset_path(self, dataset: str) -> Path:
+        return self.root / "raw" / dataset
+
     def partition_path(self, dataset: str, dt: date | datetime | str | None = None) -> Path:
-        return self.root / "raw" / dataset / f"dt={normalize_dt(dt)}"
+        return self.dataset_path(dataset) / f"dt={normalize_dt(dt)}"
 
     def read(
         self,
@@ -27,8 +83,7 @@ class RawReader:
         filename: str = "data.jsonl",
     ) -> list[dict[str, Any]]:
         jsonl_name = filename if filename.endswith(".jsonl") else f"{filename}.jsonl"
-        path = self.partition_path(dataset, dt) / jsonl_name
-        return self._read_jsonl_file(path)
+        return read_jsonl_target(self.partition_path(dataset, dt) / jsonl_name)
 
     def read_partition(
         self,
@@ -37,34 +92,134 @@ class RawReader:
         dt: date | datetime | str | None = None,
     ) -> list[dict[str, Any]]:
         partition = self.partition_path(dataset, dt)
-        if not partition.exists():
-            return []
+        catalogued = DatasetCatalog(self.dataset_path(dataset)).files(normalize_dt(dt))
+        listed = list_jsonl_targets(partition) if partition.exists() else []
+        names = sorted({name for name in catalogued if name.endswith(".jsonl")}.union(listed))
 
         rows: list[dict[str, Any]] = []
-        for file_path in sorted(partition.glob("*.jsonl")):
-            rows.extend(self._read_jsonl_file(file_path))
+        for name in names:
+            rows.extend(read_jsonl_target(partition / name))
         return rows
 
-    @staticmethod
-    def _read_jsonl_file(path: Path) -> list[dict[str, Any]]:
-        rows: list[dict[str, Any]] = []
-        with path.open("r", encoding="utf-8") as handle:
-            for line in handle:
-                cleaned = line.strip()
-                if not cleaned:
-                    continue
-                rows.append(json.loads(cleaned))
-        return rows
+
+def _to_filter_expression(filters: ParquetFilters) -> Any:
+    if filters is None:
+        return None
+    import pyarrow.dataset as pa_ds
+    import pyarrow.parquet as pq
+
+    if isinstance(filters, pa_ds.Expression):
+        return filters
+    # DNF tuples: [("col", "op", value), ...] or [[...], [...]] for OR-of-ANDs.
+    clauses = list(filters)
+    if clauses and all(isinstance(clause, list) for clause in clauses):
+        return pq.filters_to_expression([_with_in_bounds(clause) for clause in clauses])
+    return pq.filters_to_expression(_with_in_bounds(clauses))
+
+
+def _with_in_bounds(clause: Sequence[Any]) -> list[Any]:
+    """Add ``>= min`` / ``<= max`` guards next to each ``in`` predicate.
+
+    pyarrow does not prune row groups on ``isin``, but it does on range
+    comparisons, so the guards let sorted files skip non-matching row groups.
+    """
+    bounded = list(clause)
+    for predicate in clause:
+        if not isinstance(predicate, tuple) or len(predicate) != 3 or predicate[1] != "in":
+            continue
+        column, _, values = predicate
+        present = [value for value in values if value is not None]
+        if not present:
+            continue
+        try:
+            low, high = min(present), max(present)
+        except TypeError:
+            continue
+        bounded.extend([(column, ">=", low), (column, "<=", high)])
+    return bounded
+
+
+def read_parquet_files(
+    paths: Sequence[str | Path],
+    *,
+    columns: Sequence[str] | None = None,
+    filters: ParquetFilters = None,
+    as_table: bool = False,
+) -> pd.DataFrame | Any:
+    """Scan parquet files as one dataset with column and predicate pushdown.
+
+    ``filters`` accepts a ``pyarrow.dataset`` expression or DNF tuples in the
+    ``pyarrow.parquet`` style. Requested columns missing from every file are
+    ignored, matching the lenient behaviour of the row-dict loaders.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:  # pragma: no cover - pyarrow is a hard dependency
+        raise RuntimeError("Parquet pushdown requires 'pyarrow'.") from exc
+
+    file_paths = [str(path) for path in paths]
+    if not file_paths:
+        return pa.table({}) if as_table else pd.DataFrame()
+
+    schemas = [pq.read_schema(path) for path in file_paths]
+    try:
+        # Partitions may disagree on a column type (int64 one day, double the next).
+        schema = pa.unify_schemas(schemas, promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        schema = None
+    filter_expression = _to_filter_expression(filters)
+    # Bytes of the files scanned; pushdown may decode less than this.
+    record_read(sum(Path(path).stat().st_size for path in file_paths), files=len(file_paths))
+    if schema is None:
+        # No common Arrow type: scan file by file and let pandas combine them.
+        frames = [
+            _scan_files([path], file_schema, columns=columns, filter_expression=filter_expression).to_pandas()
+            for path, file_schema in zip(file_paths, schemas)
+        ]
+        frame = pd.concat(frames, ignore_index=True)
+        return pa.Table.from_pandas(frame, preserve_index=False) if as_table else frame
+
+    table = _scan_files(file_paths, schema, columns=columns, filter_expression=filter_expression)
+    if as_table:
+        return table
+    return table.to_pandas()
+
+
+def _scan_files(
+    file_paths: Sequence[str],
+    schema: Any,
+    *,
+    columns: Sequence[str] | None,
+    filter_expression: Any,
+) -> Any:
+    import pyarrow.dataset as pa_ds
+
+    selected = None
+    if columns is not None:
+        selected = [column for column in columns if column in schema.names]
+    dataset = pa_ds.dataset(list(file_paths), schema=schema, format="parquet")
+    return dataset.to_table(columns=selected, filter=filter_expression)
 
 
 class ParquetReader:
-    """Read parquet partitions under derived/<dataset>/dt=YYYY-MM-DD."""
+    """Read parquet partitions under derived/<dataset>/dt=YYYY-MM-DD.
+
+    Scans are planned from the dataset catalog; ``dt=*`` partitions it does
+    not know (or all of them, without a catalog) are listed. ``columns``, ``filters`` and ``dt_range`` are pushed down into
+    ``pyarrow.dataset``: only the requested columns are decoded, and row groups
+    whose min/max statistics cannot satisfy ``filters`` are skipped. Pass
+    ``as_table=True`` to keep the result as a ``pyarrow.Table``.
+    """
 
     def __init__(self, root: str | Path) -> None:
         self.root = Path(root)
 
+    def dataset_path(self, dataset: str) -> Path:
+        return self.root / "derived" / dataset
+
     def partition_path(self, dataset: str, dt: date | datetime | str | None = None) -> Path:
-        return self.root / "derived" / dataset / f"dt={normalize_dt(dt)}"
+        return self.dataset_path(dataset) / f"dt={normalize_dt(dt)}"
 
     def read(
         self,
@@ -72,24 +227,66 @@ class ParquetReader:
         dataset: str,
         dt: date | datetime | str | None = None,
         filename: str = "data.parquet",
-    ) -> pd.DataFrame:
+        columns: Sequence[str] | None = None,
+        filters: ParquetFilters = None,
+        as_table: bool = False,
+    ) -> pd.DataFrame | Any:
         parquet_name = filename if filename.endswith(".parquet") else f"{filename}.parquet"
         path = self.partition_path(dataset, dt) / parquet_name
-        return pd.read_parquet(path)
+        if not path.exists():
+            raise FileNotFoundError(path)
+        return read_parquet_files([path], columns=columns, filters=filters, as_table=as_table)
 
     def read_partition(
         self,
         *,
         dataset: str,
         dt: date | datetime | str | None = None,
-    ) -> pd.DataFrame:
-        partition = self.partition_path(dataset, dt)
-        if not partition.exists():
-            return pd.DataFrame()
+        columns: Sequence[str] | None = None,
+        filters: ParquetFilters = None,
+        as_table: bool = False,
+    ) -> pd.DataFrame | Any:
+        day = normalize_dt(dt)
+        parquet_paths = DatasetCatalog(self.dataset_path(dataset)).file_paths(dt_range=(day, day), suffix=".parquet")
+        return read_parquet_files(parquet_paths, columns=columns, filters=filters, as_table=as_table)
+
+    def read_range(
+        self,
+        *,
+        dataset: str,
+        dt_range: DtRange = None,
+        columns: Sequence[str] | None = None,
+        filters: ParquetFilters = None,
+        as_table: bool = False,
+    ) -> pd.DataFrame | Any:
+        """Read every partition whose ``dt`` falls inside ``dt_range`` (inclusive).
 
-        parquet_paths = sorted(partition.glob("*.parquet"))
-        if not parquet_paths:
-            return pd.DataFrame()
+        ``dt_range`` is a ``(start, end)`` pair; either bound may be ``None``.
+        Partitions outside the range are never opened, and with a catalog,
+        files whose key-column min/max rule out DNF ``filters`` are skipped.
+        """
+        return read_parquet_files(
+            self.plan_files(dataset, dt_range=dt_range, filters=filters),
+            columns=columns,
+            filters=filters,
+            as_table=as_table,
+        )
+
+    def plan_files(
+        self,
+        dataset: str,
+        *,
+        dt_range: DtRange = None,
+        filters: ParquetFilters = None,
+    ) -> list[Path]:
+        return DatasetCatalog(self.dataset_path(dataset)).file_paths(
+            dt_range=dt_range,
+            suffix=".parquet",
+            filters=filters,
+        )
 
-        frames = [pd.read_parquet(path) for path in parquet_paths]
-        return pd.concat(frames, ignore_index=True)
+    def partition_files(self, dataset: str, *, dt_range: DtRange = None) -> list[Path]:
+        return DatasetCatalog(self.dataset_path(dataset)).file_paths(
+            dt_range=dt_range,
+            suffix=".parquet",
+        )
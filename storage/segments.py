@@ -0,0 +1,484 @@
+"""Append-only segmented JSONL storage for raw partitions.
+
+A segmented target lives next to the legacy single-file layout::
+
+    raw/<dataset>/dt=YYYY-MM-DD/
+      <stem>.jsonl              # legacy single file (optional)
+      <stem>.segments/
+        manifest.json
+        seg-00000001.jsonl
+        seg-00000002.jsonl
+
+The manifest is the source of truth: readers only consume the segments it
+lists, and only up to the byte length it records for each one, so a torn tail
+left by a crashed appender is never visible. Manifest updates are written to a
+temp file and renamed into place, under an exclusive ``flock`` on
+``.manifest.lock`` so appenders in different processes never lose each
+other's segment entries.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
+from .io_stats import record_read, record_write
+
+SEGMENT_DIR_SUFFIX = ".segments"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_LOCK_NAME = ".manifest.lock"
+MANIFEST_FORMAT = "segmented-jsonl"
+MANIFEST_VERSION = 1
+
+DEFAULT_BATCH_ROWS = 1000
+DEFAULT_MAX_SEGMENT_BYTES = 64 * 1024 * 1024
+DEFAULT_SMALL_SEGMENT_BYTES = 4 * 1024 * 1024
+
+_LOCKS_GUARD = threading.Lock()
+_MANIFEST_LOCKS: dict[str, threading.Lock] = {}
+
+
+def segment_dir_for(partition: Path, filename: str) -> Path:
+    """Return the segment directory that backs ``filename`` in ``partition``."""
+    stem = filename[: -len(".jsonl")] if filename.endswith(".jsonl") else filename
+    return partition / f"{stem}{SEGMENT_DIR_SUFFIX}"
+
+
+def _thread_lock(segment_dir: Path) -> threading.Lock:
+    key = str(segment_dir.resolve())
+    with _LOCKS_GUARD:
+        lock = _MANIFEST_LOCKS.get(key)
+        if lock is None:
+            lock = threading.Lock()
+            _MANIFEST_LOCKS[key] = lock
+        return lock
+
+
+@contextmanager
+def _manifest_lock(segment_dir: Path) -> Iterator[None]:
+    """Exclusive lock for a manifest read-modify-write.
+
+    ``flock`` on ``.manifest.lock`` covers other processes; the in-process
+    lock covers threads and platforms without ``fcntl``.
+    """
+    with _thread_lock(segment_dir):
+        if fcntl is None:
+            yield
+            return
+        with (segment_dir / MANIFEST_LOCK_NAME).open("ab") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            yield
+
+
+def _empty_manifest(dedupe_key: str | None) -> dict[str, Any]:
+    return {
+        "format": MANIFEST_FORMAT,
+        "version": MANIFEST_VERSION,
+        "dedupe_key": dedupe_key,
+        "next_seq": 1,
+        "segments": [],
+    }
+
+
+def load_segment_manifest(segment_dir: Path) -> dict[str, Any] | None:
+    """Load a segment manifest, returning ``None`` when it does not exist."""
+    manifest_path = segment_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        return None
+    with manifest_path.open("r", encoding="utf-8") as handle:
+        payload = json.load(handle)
+    if not isinstance(payload, dict) or payload.get("format") != MANIFEST_FORMAT:
+        raise ValueError(f"Invalid segment manifest: {manifest_path}")
+    return payload
+
+
+def _save_manifest(segment_dir: Path, manifest: Mapping[str, Any]) -> None:
+    manifest_path = segment_dir / MANIFEST_NAME
+    temp_path = manifest_path.with_name(f".{MANIFEST_NAME}.tmp")
+    try:
+        with temp_path.open("w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, ensure_ascii=True, sort_keys=True)
+            handle.flush()
+            os.fsync(handle.fileno())
+        temp_path.replace(manifest_path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+
+def _encode_rows(rows: Iterable[Mapping[str, Any]]) -> list[str]:
+    return [json.dumps(dict(row), ensure_ascii=False, separators=(",", ":")) + "\n" for row in rows]
+
+
+def _read_segment(segment_dir: Path, entry: Mapping[str, Any]) -> list[dict[str, Any]]:
+    path = segment_dir / str(entry["name"])
+    byte_count = int(entry.get("bytes", 0))
+    if byte_count <= 0:
+        return []
+    with path.open("rb") as handle:
+        payload = handle.read(byte_count)
+    record_read(len(payload))
+    rows: list[dict[str, Any]] = []
+    for line in payload.decode("utf-8").splitlines():
+        cleaned = line.strip()
+        if cleaned:
+            rows.append(json.loads(cleaned))
+    return rows
+
+
+def dedupe_rows(rows: list[dict[str, Any]], dedupe_key: str | None) -> list[dict[str, Any]]:
+    """Keep the last row per key at the position of its first occurrence."""
+    if dedupe_key is None:
+        return rows
+    deduped: list[dict[str, Any]] = []
+    index_by_key: dict[str, int] = {}
+    for row in rows:
+        key = row.get(dedupe_key)
+        if key is None:
+            deduped.append(row)
+            continue
+        normalized_key = str(key)
+        if normalized_key in index_by_key:
+            deduped[index_by_key[normalized_key]] = row
+            continue
+        index_by_key[normalized_key] = len(deduped)
+        deduped.append(row)
+    return deduped
+
+
+def read_segments(
+    segment_dir: Path,
+    *,
+    manifest: Mapping[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """Read every committed row listed by the manifest, in append order."""
+    # A concurrent compaction can delete segments between reading the manifest
+    # and opening the files; reloading the manifest once resolves that race.
+    for attempt in range(2):
+        current = manifest if manifest is not None and attempt == 0 else load_segment_manifest(segment_dir)
+        if current is None:
+            return []
+        try:
+            rows: list[dict[str, Any]] = []
+            for entry in current.get("segments", []):
+                rows.extend(_read_segment(segment_dir, entry))
+            return rows
+        except FileNotFoundError:
+            if attempt == 1:
+                raise
+    return []
+
+
+class SegmentAppender:
+    """Append rows to a segmented JSONL target with batched fsyncs.
+
+    Rows are buffered and written once ``batch_rows`` accumulate (or on
+    :meth:`flush`). Each flush writes the buffered lines, fsyncs the segment,
+    then publishes the new byte length through the manifest. A new segment is
+    started per appender session and whenever the active one grows past
+    ``max_segment_bytes``; closing the appender seals its last segment so it
+    becomes eligible for compaction.
+    """
+
+    def __init__(
+        self,
+        segment_dir: str | Path,
+        *,
+        dedupe_key: str | None = None,
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+        max_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES,
+    ) -> None:
+        if batch_rows <= 0:
+            raise ValueError("batch_rows must be > 0")
+        if max_segment_bytes <= 0:
+            raise ValueError("max_segment_bytes must be > 0")
+        self.segment_dir = Path(segment_dir)
+        self.dedupe_key = dedupe_key
+        self.batch_rows = batch_rows
+        self.max_segment_bytes = max_segment_bytes
+        self._buffer: list[str] = []
+        self._handle: Any = None
+        self._active_name: str | None = None
+        self._active_rows = 0
+        self._active_bytes = 0
+        self._closed = False
+
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        with _manifest_lock(self.segment_dir):
+            manifest = load_segment_manifest(self.segment_dir)
+            if manifest is None:
+                manifest = _empty_manifest(dedupe_key)
+                _save_manifest(self.segment_dir, manifest)
+            elif dedupe_key is not None and manifest.get("dedupe_key") not in (None, dedupe_key):
+                raise ValueError(
+                    f"dedupe_key {dedupe_key!r} does not match manifest key "
+                    f"{manifest.get('dedupe_key')!r}"
+                )
+            elif dedupe_key is not None and manifest.get("dedupe_key") is None:
+                manifest["dedupe_key"] = dedupe_key
+                _save_manifest(self.segment_dir, manifest)
+
+    @property
+    def active_segment(self) -> Path | None:
+        if self._active_name is None:
+            return None
+        return self.segment_dir / self._active_name
+
+    def append(self, records: Iterable[Mapping[str, Any]]) -> int:
+        if self._closed:
+            raise RuntimeError("SegmentAppender is closed")
+        lines = _encode_rows(records)
+        self._buffer.extend(lines)
+        if len(self._buffer) >= self.batch_rows:
+            self.flush()
+        return len(lines)
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        if self._handle is None or self._active_bytes >= self.max_segment_bytes:
+            self._roll_segment()
+
+        payload = "".join(self._buffer).encode("utf-8")
+        row_count = len(self._buffer)
+        self._handle.write(payload)
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        record_write(len(payload), files=0)
+        self._buffer.clear()
+        self._active_rows += row_count
+        self._active_bytes += len(payload)
+        self._publish(sealed=False)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.flush()
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+            self._publish(sealed=True)
+        self._closed = True
+
+    def __enter__(self) -> "SegmentAppender":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def _roll_segment(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+            self._publish(sealed=True)
+
+        with _manifest_lock(self.segment_dir):
+            manifest = load_segment_manifest(self.segment_dir) or _empty_manifest(self.dedupe_key)
+            seq = int(manifest.get("next_seq", 1))
+            name = f"seg-{seq:08d}.jsonl"
+            manifest["next_seq"] = seq + 1
+            manifest.setdefault("segments", []).append(
+                {"name": name, "rows": 0, "bytes": 0, "sealed": False}
+            )
+            self._handle = (self.segment_dir / name).open("wb")
+            _save_manifest(self.segment_dir, manifest)
+
+        self._active_name = name
+        self._active_rows = 0
+        self._active_bytes = 0
+
+    def _publish(self, *, sealed: bool) -> None:
+        with _manifest_lock(self.segment_dir):
+            manifest = load_segment_manifest(self.segment_dir) or _empty_manifest(self.dedupe_key)
+            for entry in manifest.get("segments", []):
+                if entry.get("name") == self._active_name:
+                    entry["rows"] = self._active_rows
+                    entry["bytes"] = self._active_bytes
+                    entry["sealed"] = sealed
+                    break
+            _save_manifest(self.segment_dir, manifest)
+
+
+def _plan_compaction_runs(
+    segments: list[Mapping[str, Any]],
+    *,
+    small_segment_bytes: int,
+    target_segment_bytes: int,
+) -> list[tuple[int, int]]:
+    runs: list[tuple[int, int]] = []
+    start: int | None = None
+    run_bytes = 0
+    for index, entry in enumerate(segments):
+        size = int(entry.get("bytes", 0))
+        eligible = bool(entry.get("sealed")) and size < small_segment_bytes
+        if eligible and start is not None and run_bytes + size > target_segment_bytes:
+            if index - start > 1:
+                runs.append((start, index))
+            start, run_bytes = None, 0
+        if not eligible:
+            if start is not None and index - start > 1:
+                runs.append((start, index))
+            start, run_bytes = None, 0
+            continue
+        if start is None:
+            start = index
+        run_bytes += size
+    if start is not None and len(segments) - start > 1:
+        runs.append((start, len(segments)))
+    return runs
+
+
+def compact_segments(
+    segment_dir: str | Path,
+    *,
+    small_segment_bytes: int = DEFAULT_SMALL_SEGMENT_BYTES,
+    target_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES,
+) -> dict[str, Any]:
+    """Merge runs of adjacent small sealed segments into larger ones.
+
+    Rows in a merged run are deduped by the manifest ``dedupe_key`` with the
+    same last-wins semantics readers apply, so the visible rows are unchanged.
+    Unsealed segments (still owned by an appender) are never touched.
+    """
+    directory = Path(segment_dir)
+    summary: dict[str, Any] = {
+        "segment_dir": str(directory),
+        "merged_runs": 0,
+        "segments_before": 0,
+        "segments_after": 0,
+        "rows_dropped": 0,
+    }
+    manifest = load_segment_manifest(directory)
+    if manifest is None:
+        return summary
+
+    segments = list(manifest.get("segments", []))
+    summary["segments_before"] = len(segments)
+    summary["segments_after"] = len(segments)
+    runs = _plan_compaction_runs(
+        segments,
+        small_segment_bytes=small_segment_bytes,
+        target_segment_bytes=target_segment_bytes,
+    )
+    if not runs:
+        return summary
+
+    dedupe_key = manifest.get("dedupe_key")
+    merged: list[tuple[list[str], int, bytes]] = []
+    for start, stop in runs:
+        run_entries = segments[start:stop]
+        rows: list[dict[str, Any]] = []
+        for entry in run_entries:
+            rows.extend(_read_segment(directory, entry))
+        deduped = dedupe_rows(rows, dedupe_key)
+        summary["rows_dropped"] += len(rows) - len(deduped)
+        payload = "".join(_encode_rows(deduped)).encode("utf-8")
+        merged.append(([str(entry["name"]) for entry in run_entries], len(deduped), payload))
+
+    obsolete: list[str] = []
+    with _manifest_lock(directory):
+        current = load_segment_manifest(directory) or manifest
+        current_segments = list(current.get("segments", []))
+        for replaced_names, row_count, payload in merged:
+            positions = [
+                index for index, entry in enumerate(current_segments) if entry.get("name") in replaced_names
+            ]
+            if len(positions) != len(replaced_names):
+                continue
+            seq = int(current.get("next_seq", 1))
+            current["next_seq"] = seq + 1
+            name = f"seg-{seq:08d}.jsonl"
+            segment_path = directory / name
+            with segment_path.open("wb") as handle:
+                handle.write(payload)
+                handle.flush()
+                os.fsync(handle.fileno())
+            replacement = {
+                "name": name,
+                "rows": row_count,
+                "bytes": len(payload),
+                "sealed": True,
+            }
+            current_segments = (
+                current_segments[: positions[0]] + [replacement] + current_segments[positions[-1] + 1 :]
+            )
+            obsolete.extend(replaced_names)
+            summary["merged_runs"] += 1
+        current["segments"] = current_segments
+        _save_manifest(directory, current)
+
+    for name in obsolete:
+        (directory / name).unlink(missing_ok=True)
+    summary["segments_after"] = len(current_segments)
+    return summary
+
+
+class SegmentCompactor:
+    """Periodically compact every segmented raw target under ``root``."""
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        interval_seconds: float = 60.0,
+        small_segment_bytes: int = DEFAULT_SMALL_SEGMENT_BYTES,
+        target_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES,
+    ) -> None:
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be > 0")
+        self.root = Path(root)
+        self.interval_seconds = interval_seconds
+        self.small_segment_bytes = small_segment_bytes
+        self.target_segment_bytes = target_segment_bytes
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def segment_dirs(self) -> list[Path]:
+        pattern = f"raw/*/dt=*/*{SEGMENT_DIR_SUFFIX}/{MANIFEST_NAME}"
+        return sorted(path.parent for path in self.root.glob(pattern))
+
+    def compact_once(self) -> list[dict[str, Any]]:
+        from .catalog import DatasetCatalog, refresh_catalog_counts
+
+        summaries: list[dict[str, Any]] = []
+        for segment_dir in self.segment_dirs():
+            summary = compact_segments(
+                segment_dir,
+                small_segment_bytes=self.small_segment_bytes,
+                target_segment_bytes=self.target_segment_bytes,
+            )
+            stem = segment_dir.name[: -len(SEGMENT_DIR_SUFFIX)]
+            catalog = DatasetCatalog(segment_dir.parent.parent)
+            if catalog.exists():
+                refresh_catalog_counts(catalog, segment_dir.parent / f"{stem}.jsonl", summary)
+            summaries.append(summary)
+        return summaries
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="segment-compactor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self.compact_once()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import Any
+
+
+def cutoff_rows(
+    markets: int = 4,
+    *,
+    steps: int = 2,
+    base: float = 0.2,
+    shift: float = 0.0,
+    day: str = "2026-02-20",
+    with_bands: bool = False,
+) -> list[dict[str, Any]]:
+    """Cutoff snapshot rows for ``run_daily_job(state={"cutoff_snapshot_rows": ...})``.
+
+    Market ``m<i>`` predicts ``base + 0.1 * i + shift`` at every step; labels
+    alternate by step. ``with_bands`` adds ``end_ts`` and ``q10``/``q90``.
+    """
+    rows: list[dict[str, Any]] = []
+    for idx in range(markets):
+        for step in range(steps):
+            p_yes = base + 0.1 * idx + shift
+            row: dict[str, Any] = {
+                "market_id": f"m{idx}",
+                "ts": f"{day}T0{step}:{idx:02d}:00Z",
+                "category": "crypto" if idx % 2 else "sports",
+                "p_yes": p_yes,
+                "pred": p_yes,
+                "label": step % 2,
+                "volume_24h": 20_000.0 + step,
+                "open_interest": 5_000.0 + step,
+            }
+            if with_bands:
+                row.update({"end_ts": "2026-02-27T00:00:00Z", "q10": p_yes - 0.1, "q90": p_yes + 0.1})
+            rows.append(row)
+    return rows
+
+
+def stage_outputs(result: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Stage name to output of a ``run_daily_job`` payload."""
+    return {stage["name"]: stage["output"] for stage in result["stages"]}
@@ -133,3 +133,32 @@ def test_event_holdout_pipeline_outputs_are_reproducible(tmp_path: Path) -> None
         "splits",
     ):
         assert summary_a[key] == summary_b[key]
+
+
+def test_event_holdout_pipeline_skips_90_metrics_for_all_null_outer_quantiles(tmp_path: Path) -> None:
+    csv_path = tmp_path / "offline_eval_input.csv"
+    _build_fixture(csv_path)
+    frame = pd.read_csv(csv_path)
+    frame["tsfm_raw_q05"] = pd.Series([None] * len(frame), dtype=object)
+    frame["tsfm_raw_q95"] = pd.Series([None] * len(frame), dtype=object)
+    input_path = tmp_path / "offline_eval_input.parquet"
+    frame.to_parquet(input_path)
+    output_dir = tmp_path / "artifacts"
+
+    run(
+        input_path=input_path,
+        output_dir=output_dir,
+        model_prefixes=["baseline", "tsfm_raw"],
+        validation_ratio=0.2,
+        holdout_ratio=0.25,
+        seed=7,
+        move_threshold=0.03,
+        followthrough_hours=6.0,
+    )
+
+    metrics_df = pd.read_csv(output_dir / "offline_eval_metrics.csv")
+    raw = metrics_df[metrics_df["model"] == "tsfm_raw"]
+    baseline = metrics_df[metrics_df["model"] == "baseline"]
+    assert raw["coverage_90"].isna().all()
+    assert raw["coverage_80"].notna().all()
+    assert baseline["coverage_90"].notna().all()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from pipelines.aggregate_intraday_bars import (
+    BarAggregator,
+    build_time_bars,
+    parse_interval,
+    resample_bars,
+)
+
+
+def _ticks(n: int, *, seed: int = 1) -> list[dict[str, object]]:
+    rng = random.Random(seed)
+    ticks: list[dict[str, object]] = []
+    for idx in range(n):
+        ticks.append(
+            {
+                "market_id": rng.choice(["MKT-A", "MKT-B", "MKT-C"]),
+                "ts": idx * 7 + rng.randint(-40, 40),  # mildly out of order
+                "p_yes": round(rng.uniform(0.05, 0.95), 3),
+                "size": rng.choice([1.0, 2.5, None, "3"]),
+            }
+        )
+    ticks.append({"market_id": "MKT-A", "ts": None, "p_yes": 0.5})  # unparseable, skipped
+    return ticks
+
+
+def _merge(target: dict[str, list[dict]], closed: dict[str, list[dict]]) -> None:
+    for name, bars in closed.items():
+        target.setdefault(name, []).extend(bars)
+
+
+def _sorted(bars: list[dict]) -> list[dict]:
+    return sorted(bars, key=lambda bar: (bar["market_id"], bar["start_ts"]))
+
+
+def test_streaming_bars_match_batch_builders_for_every_interval() -> None:
+    ticks = _ticks(4_000)
+    aggregator = BarAggregator(["1m", "5m", "15m", "1h", "1d"], allowed_lateness_s=120)
+    emitted: dict[str, list[dict]] = {}
+    for start in range(0, len(ticks), 37):
+        _merge(emitted, aggregator.ingest(ticks[start : start + 37]))
+    _merge(emitted, aggregator.flush())
+
+    assert aggregator.dropped_late_ticks == 0
+    assert aggregator.open_bar_count() == 0
+    expected = build_time_bars(ticks, interval_seconds=60)
+    assert _sorted(emitted["1m"]) == expected
+    for name, seconds in (("5m", 300), ("15m", 900), ("1h", 3600), ("1d", 86400)):
+        expected = resample_bars(expected, interval_seconds=seconds)
+        assert _sorted(emitted[name]) == expected
+
+
+def test_bars_close_on_watermark_and_late_ticks_respect_lateness() -> None:
+    aggregator = BarAggregator(["1m", "5m"], allowed_lateness_s=30)
+    assert aggregator.ingest([{"market_id": "M", "ts": 10, "p_yes": 0.4}]) == {"1m": [], "5m": []}
+
+    # Watermark 80 < 60 + 30: the [0, 59] bar is still open and takes a late tick.
+    assert aggregator.ingest([{"market_id": "M", "ts": 80, "p_yes": 0.5}])["1m"] == []
+    aggregator.ingest([{"market_id": "M", "ts": 5, "p_yes": 0.3}])
+
+    closed = aggregator.advance_watermark(90)
+    assert [(bar["start_ts"], bar["open"], bar["close"], bar["count"]) for bar in closed["1m"]] == [(0, 0.3, 0.4, 2)]
+
+    aggregator.ingest([{"market_id": "M", "ts": 20, "p_yes": 0.9}])  # too late now
+    assert aggregator.dropped_late_ticks == 1
+
+    closed = aggregator.advance_watermark(330)
+    assert [bar["start_ts"] for bar in closed["1m"]] == [60]
+    assert [(bar["start_ts"], bar["count"], bar["end_ts"]) for bar in closed["5m"]] == [(0, 3, 299)]
+    assert aggregator.advance_watermark(100) == {"1m": [], "5m": []}  # watermark never moves back
+    assert aggregator.watermark == 330
+
+
+def test_interval_validation() -> None:
+    assert [parse_interval(value) for value in ("30s", "1m", "15m", "1h", "1d", 120)] == [30, 60, 900, 3600, 86400, 120]
+    with pytest.raises(ValueError, match="Invalid bar interval"):
+        parse_interval("5x")
+    with pytest.raises(ValueError, match="not a multiple"):
+        BarAggregator(["2m", "5m"])
+    with pytest.raises(ValueError, match="allowed_lateness_s"):
+        BarAggregator(allowed_lateness_s=-1)
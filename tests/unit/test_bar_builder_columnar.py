@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+from pipelines.aggregate_intraday_bars import build_time_bars, build_time_bars_columnar
+
+
+def _ticks(n: int, *, seed: int = 3) -> list[dict[str, object]]:
+    rng = random.Random(seed)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    ticks: list[dict[str, object]] = []
+    for idx in range(n):
+        offset = idx * 5 + rng.randint(-30, 30)
+        ts = rng.choice(
+            [
+                1_767_225_600 + offset,
+                1_767_225_600 + offset + 0.75,
+                str(1_767_225_600 + offset),
+                (base + timedelta(seconds=offset)).isoformat().replace("+00:00", "Z"),
+                (base + timedelta(seconds=offset)).astimezone(timezone(timedelta(hours=-5))).isoformat(),
+                (base + timedelta(seconds=offset)).replace(tzinfo=None).isoformat(sep=" "),
+                base + timedelta(seconds=offset),
+                "not-a-time",
+                True,
+                None,
+            ]
+        )
+        ticks.append(
+            {
+                "market_id": rng.choice(["MKT-A", "MKT-B", "MKT-C", None]),
+                "ts": ts,
+                "p_yes": rng.choice([round(rng.uniform(0.0, 1.0), 3), "0.42", None, float("nan")]),
+                # Earlier candidates that do not coerce fall through to later ones.
+                "volume": rng.choice([None, "bad", True, 2.0]),
+                "size": rng.choice([None, "1.5", float("inf")]),
+                "qty": rng.choice([None, 3]),
+            }
+        )
+    return ticks
+
+
+def test_columnar_builder_matches_rowwise_for_each_interval() -> None:
+    ticks = _ticks(3_000)
+    result = build_time_bars_columnar(ticks, intervals=("1m", "5m", 3600))
+
+    assert list(result) == ["1m", "5m", "3600"]
+    for key, seconds in (("1m", 60), ("5m", 300), ("3600", 3600)):
+        expected = build_time_bars(ticks, interval_seconds=seconds)
+        assert expected
+        assert result[key] == expected
+
+
+def test_columnar_builder_accepts_dataframes() -> None:
+    rng = random.Random(5)
+    frame = pd.DataFrame(
+        {
+            "market_id": [rng.choice(["MKT-A", "MKT-B"]) for _ in range(500)],
+            "ts": [1_767_225_600 + idx * 3.5 for idx in range(500)],
+            "p_yes": [rng.uniform(0.1, 0.9) for _ in range(500)],
+            "volume": [True] * 500,  # bool columns never count as volume
+            "size": [rng.choice([1, 2]) for _ in range(500)],
+        }
+    )
+    expected = build_time_bars(frame.to_dict("records"), interval_seconds=60)
+
+    assert build_time_bars_columnar(frame, intervals=(60,))["60"] == expected
+    frame["ts"] = pd.to_datetime(frame["ts"], unit="s")
+    assert build_time_bars_columnar(frame, intervals=(60,))["60"] == expected
+
+
+def test_columnar_builder_edge_cases() -> None:
+    assert build_time_bars_columnar([], intervals=("1m",)) == {"1m": []}
+    huge = [{"market_id": "MKT-A", "ts": 2**70, "p_yes": 0.5}, {"market_id": "MKT-A", "ts": 10, "p_yes": 0.4}]
+    assert build_time_bars_columnar(huge, intervals=(60,))["60"] == build_time_bars(huge, interval_seconds=60)
+    with pytest.raises(ValueError):
+        build_time_bars_columnar(huge, intervals=("0m",))
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from calibration.metrics import (
+    brier_score,
+    calibration_slope_intercept,
+    expected_calibration_error,
+    grouped_metrics,
+    log_loss,
+    summarize_metrics,
+    summarize_metrics_extended,
+)
+
+
+def _loop_metrics(preds: list[float], labels: list[int], *, eps: float = 1e-6, bins: int = 10) -> dict[str, float]:
+    """Per-element reference (the previous pure-Python implementation)."""
+    n = len(preds)
+    brier = sum((p - y) ** 2 for p, y in zip(preds, labels)) / n
+    total = 0.0
+    for p, y in zip(preds, labels):
+        clipped = min(max(p, eps), 1.0 - eps)
+        total -= y * math.log(clipped) + (1 - y) * math.log(1.0 - clipped)
+    counts = [0] * bins
+    pred_sums = [0.0] * bins
+    label_sums = [0.0] * bins
+    for p, y in zip(preds, labels):
+        idx = min(int(p * bins), bins - 1)
+        counts[idx] += 1
+        pred_sums[idx] += p
+        label_sums[idx] += y
+    ece = sum(
+        abs(pred_sums[i] / c - label_sums[i] / c) * (c / n) for i, c in enumerate(counts) if c
+    )
+    mean_pred = sum(preds) / n
+    mean_label = sum(labels) / n
+    ss_xx = sum((p - mean_pred) ** 2 for p in preds)
+    ss_xy = sum((p - mean_pred) * (y - mean_label) for p, y in zip(preds, labels))
+    slope = ss_xy / ss_xx if ss_xx else 0.0
+    return {
+        "brier": brier,
+        "log_loss": total / n,
+        "ece": ece,
+        "slope": slope,
+        "intercept": mean_label - slope * mean_pred if ss_xx else mean_label,
+    }
+
+
+def _sample(size: int, seed: int = 11) -> tuple[list[float], list[int]]:
+    rng = np.random.default_rng(seed)
+    preds = rng.random(size)
+    preds[:4] = [0.0, 1.0, 0.1, 0.7]  # bin edges and clipping boundaries
+    labels = (rng.random(size) < preds).astype(int)
+    return preds.tolist(), labels.tolist()
+
+
+@pytest.mark.parametrize("container", ["list", "numpy", "arrow", "chunked"])
+def test_vectorized_metrics_match_loop_reference(container: str) -> None:
+    preds, labels = _sample(20_000)
+    expected = _loop_metrics(preds, labels)
+    wrap = {
+        "list": lambda values: values,
+        "numpy": np.asarray,
+        "arrow": pa.array,
+        "chunked": lambda values: pa.chunked_array([values[:7_000], values[7_000:]]),
+    }[container]
+
+    extended = summarize_metrics_extended(wrap(preds), wrap(labels))
+
+    for name, value in expected.items():
+        assert extended[name] == pytest.approx(value, rel=0, abs=1e-12), name
+    assert summarize_metrics(wrap(preds), wrap(labels)) == {
+        key: extended[key] for key in ("brier", "log_loss", "ece")
+    }
+    assert brier_score(wrap(preds), wrap(labels)) == extended["brier"]
+    assert log_loss(wrap(preds), wrap(labels)) == extended["log_loss"]
+    assert expected_calibration_error(wrap(preds), wrap(labels)) == extended["ece"]
+    assert calibration_slope_intercept(wrap(preds), wrap(labels))["slope"] == extended["slope"]
+
+
+def test_ece_bin_count_parity() -> None:
+    preds, labels = _sample(5_000, seed=3)
+    for bins in (1, 3, 7, 25):
+        assert expected_calibration_error(np.asarray(preds), labels, bins=bins) == pytest.approx(
+            _loop_metrics(preds, labels, bins=bins)["ece"], rel=0, abs=1e-12
+        )
+
+
+@pytest.mark.parametrize(
+    ("preds", "labels", "message"),
+    [
+        (np.array([0.2, np.nan]), [0, 1], r"Non-finite numeric value for preds\[1\]"),
+        (np.array([0.2, 1.5]), [0, 1], r"preds\[1\] must be in \[0, 1\]"),
+        (pa.array([0.2, None]), [0, 1], r"Invalid numeric value for preds\[1\]: None"),
+        ([0.2, 0.3], np.array([0, 2]), r"labels\[1\] must be 0 or 1"),
+        ([0.2, "x"], [0, 1], r"Invalid numeric value for preds\[1\]: x"),
+        (np.array([0.2]), [0, 1], "equal length"),
+        (np.array([]), np.array([]), "non-empty"),
+    ],
+)
+def test_array_inputs_raise_the_per_element_errors(preds: object, labels: object, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        summarize_metrics(preds, labels)  # type: ignore[arg-type]
+
+
+def test_grouped_metrics_match_per_group_summaries_for_every_dimension() -> None:
+    preds, labels = _sample(3_000, seed=5)
+    rng = np.random.default_rng(5)
+    category = rng.choice(["crypto", "sports", "politics"], size=len(preds)).tolist()
+    bucket = rng.choice(["low", "mid", "high"], size=len(preds)).tolist()
+    combined = list(zip(category, bucket))
+
+    grouped = grouped_metrics(preds, labels, {"category": category, "pair": combined})
+
+    for name, keys in (("category", category), ("pair", combined)):
+        assert list(grouped[name]) == list(dict.fromkeys(keys))
+        for key, metrics in grouped[name].items():
+            members = [idx for idx, value in enumerate(keys) if value == key]
+            group_preds = [preds[idx] for idx in members]
+            group_labels = [labels[idx] for idx in members]
+            expected = summarize_metrics(group_preds, group_labels)
+            for metric in ("brier", "log_loss", "ece"):
+                assert metrics[metric] == pytest.approx(expected[metric], rel=0, abs=1e-12)
+            assert metrics["sample_size"] == len(members)
+            assert metrics["base_rate"] == pytest.approx(sum(group_labels) / len(members), rel=0, abs=1e-12)
+
+
+def test_grouped_metrics_rejects_misaligned_or_unhashable_keys() -> None:
+    with pytest.raises(ValueError, match="one key per prediction"):
+        grouped_metrics([0.2, 0.4], [0, 1], {"segment": ["a"]})
+    with pytest.raises(ValueError, match=r"rows\[1\] segment value for 'segment' must be hashable"):
+        grouped_metrics([0.2, 0.4], [0, 1], {"segment": ["a", ["b"]]})
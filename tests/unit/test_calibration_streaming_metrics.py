@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from calibration.metrics import summarize_metrics_extended
+from calibration.streaming_metrics import (
+    CalibrationAccumulator,
+    WindowedCalibrationAccumulator,
+    load_accumulator_state,
+    save_accumulator_state,
+)
+
+DAY = 86_400
+
+
+def _sample(n: int, seed: int = 3) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    preds = rng.random(n)
+    labels = (rng.random(n) < preds).astype(np.int8)
+    return preds, labels
+
+
+def _assert_close(actual: dict[str, float], expected: dict[str, float]) -> None:
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        assert actual[key] == pytest.approx(value, abs=1e-12), key
+
+
+def test_chunked_updates_match_batch_metrics() -> None:
+    preds, labels = _sample(5_000)
+    accumulator = CalibrationAccumulator()
+    for start in range(0, preds.size, 777):
+        accumulator.update(preds[start : start + 777], labels[start : start + 777])
+
+    assert accumulator.count == preds.size
+    _assert_close(accumulator.metrics(extended=True), summarize_metrics_extended(preds, labels))
+
+
+def test_merge_equals_single_update() -> None:
+    preds, labels = _sample(2_000)
+    left = CalibrationAccumulator().update(preds[:300], labels[:300])
+    right = CalibrationAccumulator().update(preds[300:], labels[300:])
+    combined = CalibrationAccumulator().update(preds, labels)
+
+    _assert_close(left.merge(right).metrics(extended=True), combined.metrics(extended=True))
+    assert left.bin_counts == combined.bin_counts
+
+    with pytest.raises(ValueError, match="different bins"):
+        left.merge(CalibrationAccumulator(bins=5))
+
+
+def test_empty_accumulator_and_invalid_batch() -> None:
+    accumulator = CalibrationAccumulator()
+    with pytest.raises(ValueError, match="empty"):
+        accumulator.metrics()
+    with pytest.raises(ValueError):
+        accumulator.update([0.2, 1.3], [0, 1])
+    assert accumulator.count == 0
+
+
+def test_windowed_views_and_eviction_match_recompute() -> None:
+    preds, labels = _sample(3_000, seed=11)
+    rng = np.random.default_rng(5)
+    ts = 1_767_225_600 + rng.integers(0, 100 * DAY, size=preds.size)
+    windowed = WindowedCalibrationAccumulator(retention_s=90 * DAY)
+    for start in range(0, preds.size, 500):
+        chunk = slice(start, start + 500)
+        windowed.update(preds[chunk], labels[chunk], ts[chunk])
+
+    newest_bucket = (int(ts.max()) // DAY) * DAY
+    assert min(windowed.buckets) == newest_bucket - 89 * DAY
+
+    for days in (30, 90):
+        in_window = ts >= newest_bucket - (days - 1) * DAY
+        _assert_close(
+            windowed.window(days * DAY).metrics(extended=True),
+            summarize_metrics_extended(preds[in_window], labels[in_window]),
+        )
+
+
+def test_windowed_accepts_iso_timestamps_and_merges() -> None:
+    first = WindowedCalibrationAccumulator().update(
+        [0.2, 0.7], [0, 1], ["2026-02-20T10:00:00Z", "2026-02-21T09:00:00+00:00"]
+    )
+    second = WindowedCalibrationAccumulator().update([0.4], [1], ["2026-02-21T23:59:59Z"])
+    first.merge(second)
+
+    window = first.window(DAY, now="2026-02-21T12:00:00Z")
+    _assert_close(window.metrics(extended=True), summarize_metrics_extended([0.7, 0.4], [1, 1]))
+    assert first.window().count == 3
+
+
+def test_state_round_trip(tmp_path) -> None:
+    preds, labels = _sample(400)
+    windowed = WindowedCalibrationAccumulator(retention_s=30 * DAY, bins=5).update(
+        preds, labels, 1_767_225_600 + np.arange(preds.size) * 3_600
+    )
+    path = save_accumulator_state(windowed, tmp_path / "state" / "calibration_accumulator.json")
+
+    restored = load_accumulator_state(path)
+    assert restored is not None
+    assert restored.to_dict() == windowed.to_dict()
+    _assert_close(restored.window(7 * DAY).metrics(extended=True), windowed.window(7 * DAY).metrics(extended=True))
+    assert load_accumulator_state(tmp_path / "missing.json") is None
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from calibration.conformal import (
+    ConformalAdjustment,
+    ConformalParameterTable,
+    apply_conformal_adjustment,
+    apply_conformal_adjustment_array,
+    apply_conformal_adjustment_many,
+)
+
+ADJUSTMENTS = {
+    "default": ConformalAdjustment(0.8, 0.85, center_shift=0.02, width_scale=1.4, sample_size=300),
+    "category=politics": ConformalAdjustment(0.8, 0.82, center_shift=-0.05, width_scale=0.7, sample_size=150),
+    "category=sports": ConformalAdjustment(0.8, 0.9, center_shift=0.1, width_scale=2.5, sample_size=120),
+}
+
+
+def _bands(n: int, seed: int = 13) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    center = rng.random(n)
+    lower = center - rng.random(n) * 0.2
+    upper = center + rng.random(n) * 0.2
+    bands = np.column_stack([lower, center, upper])
+    crossed = rng.random(n) < 0.1
+    bands[crossed] = bands[crossed][:, ::-1]  # inverted bands are swapped like the scalar path
+    return bands
+
+
+def _scalar(bands: np.ndarray, adjustments: list[ConformalAdjustment], clip_range=(0.0, 1.0)) -> np.ndarray:
+    rows = []
+    for (q10, q50, q90), adjustment in zip(bands.tolist(), adjustments):
+        band = {"q10": q10, "q90": q90} if np.isnan(q50) else {"q10": q10, "q50": q50, "q90": q90}
+        adjusted = apply_conformal_adjustment(band, adjustment, clip_range=clip_range)
+        rows.append([adjusted["q10"], adjusted["q50"], adjusted["q90"]])
+    return np.array(rows)
+
+
+@pytest.mark.parametrize("clip_range", [(0.0, 1.0), None])
+def test_array_path_matches_scalar_path(clip_range) -> None:
+    bands = _bands(2_000)
+    bands[::17, 1] = np.nan  # missing median -> midpoint center
+    table = ConformalParameterTable.from_adjustments(ADJUSTMENTS)
+    keys = np.random.default_rng(1).choice(["category=politics", "category=sports", "category=crypto"], size=len(bands))
+    index = table.index_of(keys.tolist(), default="default")
+
+    result = apply_conformal_adjustment_array(bands, table, segment_index=index, clip_range=clip_range)
+    expected = _scalar(bands, [ADJUSTMENTS[table.keys[i]] for i in index], clip_range=clip_range)
+    np.testing.assert_array_equal(result, expected)
+
+    single = apply_conformal_adjustment_array(bands, ADJUSTMENTS["default"], clip_range=clip_range)
+    np.testing.assert_array_equal(single, _scalar(bands, [ADJUSTMENTS["default"]] * len(bands), clip_range))
+
+
+def test_arrow_columns_and_wider_quantile_sets() -> None:
+    bands = _bands(50)
+    arrow = pa.table({"q10": bands[:, 0], "q50": bands[:, 1], "q90": bands[:, 2]})
+    adjustment = ADJUSTMENTS["category=sports"]
+    np.testing.assert_array_equal(
+        apply_conformal_adjustment_array(arrow, adjustment),
+        apply_conformal_adjustment_array(bands, adjustment),
+    )
+    np.testing.assert_array_equal(
+        apply_conformal_adjustment_array([pa.chunked_array([bands[:, j]]) for j in range(3)], adjustment),
+        apply_conformal_adjustment_array(bands, adjustment),
+    )
+
+    five = np.array([[0.30, 0.38, 0.40, 0.45, 0.50], [0.50, 0.45, 0.40, 0.38, 0.30]])
+    result = apply_conformal_adjustment_array(five, ADJUSTMENTS["default"], clip_range=None)
+    center = 0.40 + 0.02
+    np.testing.assert_allclose(result[0], [center - 0.14, center - 0.049, center, center + 0.049, center + 0.14])
+    np.testing.assert_allclose(result[1], result[0])
+    assert (np.diff(result, axis=1) >= 0).all()
+
+
+def test_array_path_rejects_bad_input() -> None:
+    table = ConformalParameterTable.from_adjustments(ADJUSTMENTS)
+    with pytest.raises(ValueError, match="row 1"):
+        apply_conformal_adjustment_array([[0.1, 0.2, 0.3], [np.nan, 0.2, 0.3]], ADJUSTMENTS["default"])
+    with pytest.raises(ValueError, match="segment_index is required"):
+        apply_conformal_adjustment_array([[0.1, 0.2, 0.3]], table)
+    with pytest.raises(ValueError, match="out of range"):
+        apply_conformal_adjustment_array([[0.1, 0.2, 0.3]], table, segment_index=[3])
+    with pytest.raises(ValueError, match="no conformal adjustment"):
+        table.index_of(["category=crypto"])
+
+
+def test_many_uses_array_path_with_scalar_results() -> None:
+    bands = _bands(300, seed=7)
+    dicts = [
+        {"market_id": f"m{idx}", "q10": q10, "q90": str(q90)} | ({} if idx % 5 == 0 else {"q50": q50})
+        for idx, (q10, q50, q90) in enumerate(bands.tolist())
+    ]
+    adjustment = ADJUSTMENTS["category=politics"]
+
+    assert apply_conformal_adjustment_many(dicts, adjustment) == [
+        apply_conformal_adjustment(band, adjustment) for band in dicts
+    ]
+
+    dicts[3] = {**dicts[3], "q50": float("nan")}
+    with pytest.raises(ValueError, match="Non-finite value for q50"):
+        apply_conformal_adjustment_many(dicts, adjustment)
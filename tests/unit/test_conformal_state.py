@@ -6,9 +6,11 @@ import pytest
 
 from calibration.conformal import ConformalAdjustment
 from calibration.conformal_state import (
+    ConformalStateWatcher,
     load_conformal_adjustment,
     load_conformal_adjustments_by_segment,
     load_cptc_state,
+    read_state_file,
     save_conformal_adjustment,
     save_cptc_state,
 )
@@ -125,3 +127,76 @@ def test_save_cptc_state_no_change_point(tmp_path) -> None:
     assert loaded is not None
     assert loaded["change_point"]["detected"] is False
     assert loaded["change_point"]["index"] is None
+
+
+def _adjustment(shift: float) -> ConformalAdjustment:
+    return ConformalAdjustment(
+        target_coverage=0.8,
+        quantile_level=0.9,
+        center_shift=shift,
+        width_scale=1.2,
+        sample_size=150,
+    )
+
+
+def test_state_file_is_parsed_once_per_version(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "conformal_state.json"
+    save_conformal_adjustment(
+        _adjustment(0.01),
+        path=path,
+        segment_adjustments={"category=politics": _adjustment(0.2)},
+        segment_fields=["category"],
+    )
+    parses: list[object] = []
+    original_loads = json.loads
+    monkeypatch.setattr(
+        "calibration.conformal_state.json.loads",
+        lambda raw, **kwargs: parses.append(raw) or original_loads(raw, **kwargs),
+    )
+
+    assert load_conformal_adjustment(path) == _adjustment(0.01)
+    assert load_conformal_adjustments_by_segment(path) == {"category=politics": _adjustment(0.2)}
+    assert read_state_file(path) is read_state_file(str(path))
+    assert len(parses) == 1
+
+    save_conformal_adjustment(_adjustment(0.03), path=path)
+    assert load_conformal_adjustment(path) == _adjustment(0.03)
+    assert load_conformal_adjustments_by_segment(path) == {}
+    assert len(parses) == 2
+    assert [entry.name for entry in tmp_path.iterdir()] == ["conformal_state.json"]
+
+
+def test_cached_cptc_state_is_not_shared_with_callers(tmp_path) -> None:
+    path = tmp_path / "cptc_state.json"
+    save_cptc_state(
+        change_point_detected=True,
+        change_point_index=3,
+        test_statistic=2.0,
+        threshold=1.5,
+        n_pre=3,
+        n_post=7,
+        path=path,
+    )
+    load_cptc_state(path)["change_point"]["index"] = 99
+    assert load_cptc_state(path)["change_point"]["index"] == 3
+
+
+def test_watcher_reports_new_versions_after_interval(tmp_path) -> None:
+    path = tmp_path / "conformal_state.json"
+    now = [0.0]
+    watcher = ConformalStateWatcher(path, interval_s=10.0, clock=lambda: now[0])
+    assert watcher.current() is None and watcher.missing
+
+    save_conformal_adjustment(_adjustment(0.05), path=path)
+    assert watcher.poll() is None  # inside the polling interval
+    now[0] = 10.0
+    state = watcher.poll()
+    assert state is not None and state.default_adjustment() == _adjustment(0.05)
+    now[0] = 20.0
+    assert watcher.poll() is None  # unchanged file
+    assert watcher.reload_count == 1
+
+    path.unlink()
+    now[0] = 30.0
+    assert watcher.poll() is None
+    assert watcher.missing
@@ -132,3 +132,38 @@ def test_stage_build_cutoff_snapshots_falls_back_to_placeholders_without_usable_
     assert {snapshot.cutoff_type for snapshot in snapshots} == set(DEFAULT_CUTOFF_TYPES)
     assert {snapshot.selection_rule for snapshot in snapshots} == {DEFAULT_SELECTION_RULE}
     assert {snapshot.selected_ts for snapshot in snapshots} == {DEFAULT_PLACEHOLDER_SELECTED_TS}
+
+
+def test_stage_build_cutoff_snapshots_reads_snapshot_dataset_with_pushdown(tmp_path: Path) -> None:
+    from storage.writers import ParquetWriter
+
+    ParquetWriter(tmp_path).write(
+        [
+            {"market_id": "MKT-1", "ts": "2026-02-20T11:59:10Z", "end_ts": "2026-02-20T12:00:00Z", "question": "q1"},
+            {"market_id": "MKT-2", "ts": "2026-02-20T11:59:20Z", "end_ts": "2026-02-20T12:00:00Z", "question": "q2"},
+        ],
+        dataset="snapshots",
+        dt="2026-02-20",
+    )
+    # The data interval end is exclusive, so the next day's partition is not read.
+    ParquetWriter(tmp_path).write(
+        [{"market_id": "MKT-1", "ts": "2026-02-21T11:59:30Z", "end_ts": "2026-02-21T12:00:00Z", "question": "q1"}],
+        dataset="snapshots",
+        dt="2026-02-21",
+    )
+    context = _StageContext(
+        state={
+            "market_ids": ["MKT-1"],
+            "root_path": str(tmp_path),
+            "snapshot_dataset": "snapshots",
+        }
+    )
+    context.data_interval_start = "2026-02-20T00:00:00Z"
+    context.data_interval_end = "2026-02-21T00:00:00Z"
+
+    summary = stage_build_cutoff_snapshots(context)
+
+    assert summary["snapshot_count"] == 1
+    snapshot = context.state["cutoff_snapshots"][0]
+    assert (snapshot.market_id, snapshot.cutoff_type) == ("MKT-1", "DAILY")
+    assert snapshot.selected_ts == "2026-02-20T11:59:10+00:00"
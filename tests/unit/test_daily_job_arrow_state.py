@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pyarrow as pa
+
+import pipelines.daily_job as daily_job
+from pipelines.common import PipelineRunContext
+from pipelines.tabular_state import ROW_VIEWS_KEY
+from tests.helpers.daily_job_fixtures import cutoff_rows, stage_outputs
+
+
+def test_arrow_state_matches_row_dict_stage_outputs() -> None:
+    state = {"cutoff_snapshot_rows": cutoff_rows(6, steps=3, with_bands=True)}
+
+    rows_result = daily_job.run_daily_job(run_id="daily-rows", state=state)
+    arrow_result = daily_job.run_daily_job(run_id="daily-arrow", state=state, arrow_state=True)
+
+    assert rows_result["success"] is True
+    assert arrow_result["success"] is True
+    assert stage_outputs(arrow_result) == stage_outputs(rows_result)
+    assert stage_outputs(arrow_result)["metrics"]["scoreboard_count"] == 6
+
+
+def test_arrow_state_carries_tables_and_materializes_rows_once() -> None:
+    context = PipelineRunContext(
+        run_id="daily-arrow-state",
+        state={
+            "arrow_state": True,
+            "cutoff_snapshot_rows": cutoff_rows(6, steps=3, with_bands=True),
+        },
+    )
+
+    for stage in daily_job.build_daily_stages():
+        stage.handler(context)
+
+    features = context.state["features"]
+    assert isinstance(features, pa.Table)
+    assert context.state["feature_rows"] is features
+    assert features.num_rows == 18
+    # metrics and drift read the same table through one shared row view.
+    assert context.state[ROW_VIEWS_KEY].conversions["rows:Table"] == 1
+    assert isinstance(context.state["published_records"], list)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import pipelines.daily_job as daily_job
+from pipelines.backfill import run_backfill
+from pipelines.trust_intelligence_pool import stub_pipeline_factory
+from tests.helpers.daily_job_fixtures import cutoff_rows
+
+
+class _RecordingRunner:
+    def __init__(self, *, fail: set[str] = frozenset(), delay_s: float = 0.0) -> None:
+        self.fail = set(fail)
+        self.delay_s = delay_s
+        self.calls: list[dict[str, Any]] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, **kwargs: Any) -> dict[str, Any]:
+        dt = kwargs["data_interval_start"][:10]
+        with self._lock:
+            self.calls.append({"dt": dt, **kwargs})
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay_s)
+            if dt in self.fail:
+                return {"success": False, "stopped_on_stage": "metrics"}
+            return {"success": True}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_independent_days_run_concurrently_with_separate_checkpoints(tmp_path: Path) -> None:
+    runner = _RecordingRunner(delay_s=0.05)
+
+    result = run_backfill("2026-02-01", "2026-02-06", work_dir=tmp_path, workers=3, run_day=runner)
+
+    assert result["success"] is True and result["succeeded"] == 6
+    assert runner.max_active > 1
+    checkpoints = {call["checkpoint_path"] for call in runner.calls}
+    assert len(checkpoints) == 6
+    first = next(call for call in runner.calls if call["dt"] == "2026-02-01")
+    assert first["run_id"] == "backfill-2026-02-01"
+    assert first["data_interval_end"] == "2026-02-02T00:00:00Z"
+
+
+def test_shared_conformal_state_orders_days_and_blocks_after_failure(tmp_path: Path) -> None:
+    runner = _RecordingRunner(fail={"2026-02-02"}, delay_s=0.01)
+
+    result = run_backfill(
+        "2026-02-01",
+        "2026-02-04",
+        work_dir=tmp_path,
+        workers=4,
+        state={"conformal_state_path": str(tmp_path / "conformal.json")},
+        run_day=runner,
+    )
+
+    assert [call["dt"] for call in runner.calls] == ["2026-02-01", "2026-02-02"]
+    assert runner.max_active == 1
+    days = result["days"]
+    assert days["2026-02-02"]["status"] == "failed"
+    assert days["2026-02-03"]["status"] == "blocked"
+    assert days["2026-02-04"]["blocked_by"] == ("2026-02-02", "2026-02-03")
+
+
+def test_explicit_day_dependencies_must_point_backwards(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="earlier backfill days"):
+        run_backfill(
+            "2026-02-01",
+            "2026-02-02",
+            work_dir=tmp_path,
+            day_dependencies={"2026-02-01": ["2026-02-02"]},
+            run_day=_RecordingRunner(),
+        )
+
+
+def test_cprofile_requires_serial_days(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="workers=1"):
+        run_backfill(
+            "2026-02-01",
+            "2026-02-02",
+            work_dir=tmp_path,
+            workers=2,
+            run_day=_RecordingRunner(),
+            report_dir=str(tmp_path / "reports"),
+            cprofile=True,
+        )
+
+
+def test_resume_only_reruns_unfinished_days(tmp_path: Path) -> None:
+    first = run_backfill(
+        "2026-02-01",
+        "2026-02-05",
+        work_dir=tmp_path,
+        workers=2,
+        day_dependencies={"2026-02-04": ["2026-02-03"]},
+        run_day=_RecordingRunner(fail={"2026-02-03"}),
+    )
+    assert first["succeeded"] == 3 and first["failed"] == 1 and first["blocked"] == 1
+
+    runner = _RecordingRunner()
+    resumed = run_backfill(
+        "2026-02-01",
+        "2026-02-05",
+        work_dir=tmp_path,
+        workers=2,
+        resume=True,
+        day_dependencies={"2026-02-04": ["2026-02-03"]},
+        run_day=runner,
+    )
+
+    assert sorted(call["dt"] for call in runner.calls) == ["2026-02-03", "2026-02-04"]
+    assert resumed["success"] is True and resumed["skipped"] == 3
+    manifest = json.loads(Path(resumed["manifest"]).read_text(encoding="utf-8"))
+    assert {entry["status"] for entry in manifest["days"].values()} == {"success"}
+
+
+def test_backfill_runs_daily_job_per_day(tmp_path: Path) -> None:
+    result = run_backfill(
+        "2026-02-20",
+        "2026-02-21",
+        work_dir=tmp_path,
+        workers=2,
+        state={"cutoff_snapshot_rows": cutoff_rows()},
+    )
+
+    assert result["success"] is True
+    assert (tmp_path / "days" / "2026-02-21.json").exists()
+    assert set(json.loads((tmp_path / "days" / "2026-02-20.json").read_text())["stages"]) == set(
+        daily_job.DAILY_STAGE_NAMES
+    )
+
+
+def test_trust_intelligence_days_serialize_on_shared_results_file(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    calls: list[str] = []
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def _run_day(**kwargs: Any) -> dict[str, Any]:
+        dt = kwargs["data_interval_start"][:10]
+        with lock:
+            calls.append(dt)
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        try:
+            # Without ordering the earlier day would finish last and win the shared file.
+            time.sleep(0.3 if dt == "2026-02-20" else 0.0)
+            return daily_job.run_daily_job(**kwargs)
+        finally:
+            with lock:
+                active["now"] -= 1
+
+    result = run_backfill(
+        "2026-02-20",
+        "2026-02-22",
+        work_dir=tmp_path / "work",
+        workers=3,
+        state={
+            "enable_trust_intelligence": True,
+            "trust_intelligence_pipeline_factory": stub_pipeline_factory,
+            "root_path": str(root),
+        },
+        day_state=lambda dt: {
+            "cutoff_snapshot_rows": [
+                {**row, "market_id": f"{dt}-{row['market_id']}"} for row in cutoff_rows(2, day=dt)
+            ]
+        },
+        run_day=_run_day,
+    )
+
+    assert result["success"] is True
+    assert calls == ["2026-02-20", "2026-02-21", "2026-02-22"]
+    assert active["max"] == 1
+    written = json.loads(daily_job.trust_intelligence_results_path(root).read_text(encoding="utf-8"))
+    assert sorted(row["market_id"] for row in written) == ["2026-02-22-m0", "2026-02-22-m1"]
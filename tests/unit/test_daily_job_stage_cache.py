@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import pipelines.daily_job as daily_job
+from pipelines.common import PipelineRunContext, PipelineStage
+from pipelines.stage_cache import StageCache, StateFingerprints, dataset_fingerprint, value_fingerprint
+from storage.writers import ParquetWriter
+from tests.helpers.daily_job_fixtures import cutoff_rows, stage_outputs
+
+
+def test_rerun_restores_unchanged_stages_from_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache_dir = str(tmp_path / "cache")
+    state = {"cutoff_snapshot_rows": cutoff_rows()}
+
+    first = daily_job.run_daily_job(run_id="daily-1", state=state, stage_cache_dir=cache_dir)
+
+    def _must_not_run(context: Any) -> dict[str, Any]:
+        raise AssertionError("cached stage was executed")
+
+    monkeypatch.setattr(daily_job, "_stage_features", _must_not_run)
+    monkeypatch.setattr(daily_job, "_stage_metrics", _must_not_run)
+    second = daily_job.run_daily_job(run_id="daily-2", state=state, stage_cache_dir=cache_dir)
+
+    assert first["stage_cache"]["hits"] == []
+    assert second["success"] is True
+    assert {"cutoff", "features", "metrics", "drift"} <= set(second["stage_cache"]["hits"])
+    assert second["stage_cache"]["uncacheable"] == ["ingest", "conformal", "publish"]
+    assert stage_outputs(second) == stage_outputs(first)
+
+
+def test_cached_rerun_rewrites_published_artifacts(tmp_path: Path) -> None:
+    cache_dir = str(tmp_path / "cache")
+    postmortem_root = tmp_path / "postmortems"
+    state = {
+        "cutoff_snapshot_rows": cutoff_rows(),
+        "event_rows": [{"market_id": "m1", "event_id": "e1", "title": "resolved"}],
+        "postmortem_root": str(postmortem_root),
+    }
+
+    first = daily_job.run_daily_job(run_id="daily-1", state=dict(state), stage_cache_dir=cache_dir)
+    written = sorted(postmortem_root.rglob("*.md"))
+    assert len(written) == 1
+    written[0].unlink()
+
+    second = daily_job.run_daily_job(run_id="daily-2", state=dict(state), stage_cache_dir=cache_dir)
+
+    assert "features" in second["stage_cache"]["hits"]
+    assert "publish" not in second["stage_cache"]["hits"]
+    assert written[0].is_file()
+    assert stage_outputs(second)["publish"]["postmortem_written_count"] == 1
+    assert stage_outputs(first)["publish"]["postmortem_written_count"] == 1
+
+
+def test_conformal_state_file_is_fingerprinted_by_content(tmp_path: Path) -> None:
+    cache = StageCache(tmp_path / "cache", version="v")
+    state_path = tmp_path / "conformal_state.json"
+    state_path.write_text("{}", encoding="utf-8")
+    stage = PipelineStage(name="drift", handler=lambda context: {}, inputs=("conformal_state_path",))  # type: ignore[arg-type]
+    context = PipelineRunContext(run_id="r", state={"conformal_state_path": str(state_path)})
+
+    before = daily_job._stage_fingerprint(cache, StateFingerprints(), context, stage)
+    state_path.write_text('{"coverage": 0.8}', encoding="utf-8")
+
+    assert daily_job._stage_fingerprint(cache, StateFingerprints(), context, stage) != before
+
+
+def test_changed_input_invalidates_only_downstream_stages(tmp_path: Path) -> None:
+    cache_dir = str(tmp_path / "cache")
+    daily_job.run_daily_job(run_id="daily-1", state={"cutoff_snapshot_rows": cutoff_rows()}, stage_cache_dir=cache_dir)
+
+    changed = daily_job.run_daily_job(
+        run_id="daily-2",
+        state={"cutoff_snapshot_rows": cutoff_rows(shift=0.05)},
+        stage_cache_dir=cache_dir,
+    )
+
+    cache = changed["stage_cache"]
+    assert cache["hits"] == ["discover", "normalize", "snapshots"]
+    assert {"cutoff", "features", "metrics", "drift"} <= set(cache["misses"])
+
+
+def test_config_edit_invalidates_metrics_but_not_features(tmp_path: Path) -> None:
+    cache_dir = str(tmp_path / "cache")
+    config = tmp_path / "trust.yaml"
+    config.write_text("trust_score:\n  weights:\n    liquidity_depth: 0.4\n", encoding="utf-8")
+    state = {"cutoff_snapshot_rows": cutoff_rows()}
+    daily_job.run_daily_job(run_id="daily-1", state=state, trust_config_path=str(config), stage_cache_dir=cache_dir)
+
+    config.write_text("trust_score:\n  weights:\n    liquidity_depth: 0.5\n", encoding="utf-8")
+    rerun = daily_job.run_daily_job(run_id="daily-2", state=state, trust_config_path=str(config), stage_cache_dir=cache_dir)
+
+    assert "features" in rerun["stage_cache"]["hits"]
+    assert "metrics" in rerun["stage_cache"]["misses"]
+
+
+def test_fingerprints_track_dataset_partitions_and_closures(tmp_path: Path) -> None:
+    writer = ParquetWriter(tmp_path)
+    writer.write([{"market_id": "m1", "p_yes": 0.5}], dataset="snapshots", dt="2026-02-20")
+    before = dataset_fingerprint(tmp_path, "snapshots", ("2026-02-20", "2026-02-20"))
+    writer.write([{"market_id": "m1", "p_yes": 0.5}], dataset="snapshots", dt="2026-02-21")
+    assert dataset_fingerprint(tmp_path, "snapshots", ("2026-02-20", "2026-02-20")) == before
+
+    writer.write([{"market_id": "m2", "p_yes": 0.6}], dataset="snapshots", dt="2026-02-20")
+    assert dataset_fingerprint(tmp_path, "snapshots", ("2026-02-20", "2026-02-20")) != before
+
+    captured = [1]
+    assert value_fingerprint(lambda context: captured) is None
+    assert value_fingerprint({"a": [1, 2]}) == value_fingerprint({"a": [1, 2]})
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+import pytest
+
+import pipelines.daily_job as daily_job
+from pipelines.common import load_checkpoint
+from tests.helpers.daily_job_fixtures import cutoff_rows
+
+
+def _must_not_run(context: Any) -> dict[str, Any]:
+    raise AssertionError("resume should skip already-success stages")
+
+
+def test_checkpoint_writes_small_index_and_per_stage_files(tmp_path: Path) -> None:
+    checkpoint_path = tmp_path / "daily-checkpoint.json"
+
+    result = daily_job.run_daily_job(
+        run_id="daily-index",
+        state={"cutoff_snapshot_rows": cutoff_rows(6)},
+        checkpoint_path=str(checkpoint_path),
+    )
+
+    index = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+    stage_dir = tmp_path / "daily-checkpoint.stages"
+    assert result["success"] is True
+    assert set(index["stages"]) == set(daily_job.DAILY_STAGE_NAMES)
+    assert all("output" not in entry for entry in index["stages"].values())
+    assert all(entry["state_complete"] for entry in index["stages"].values())
+    assert index["stages"]["features"]["state"]["feature_frame"]["format"] == "pandas"
+    # Feature rows carry pandas Timestamps, which Arrow would restore as datetimes.
+    assert index["stages"]["features"]["state"]["features"]["format"] == "pickle"
+    assert (stage_dir / "features.features.pkl").exists()
+    assert (stage_dir / "metrics.json").exists()
+
+    inflated = load_checkpoint(str(checkpoint_path))
+    assert inflated["run_id"] == "daily-index"
+    assert inflated["stages"]["metrics"]["output"] == {
+        stage["name"]: stage["output"] for stage in result["stages"]
+    }["metrics"]
+
+
+@pytest.mark.parametrize("arrow_state", [False, True])
+def test_resume_restores_state_tables_written_by_skipped_stages(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    arrow_state: bool,
+) -> None:
+    checkpoint_path = str(tmp_path / "daily-checkpoint.json")
+    state = {"cutoff_snapshot_rows": cutoff_rows(6)}
+    real_metrics = daily_job._stage_metrics
+
+    def failing_metrics(context: Any) -> dict[str, Any]:
+        return {"status": "failed", "reason": "scoreboard sink unavailable"}
+
+    monkeypatch.setattr(daily_job, "_stage_metrics", failing_metrics)
+    first = daily_job.run_daily_job(
+        run_id="daily-first",
+        state=state,
+        checkpoint_path=checkpoint_path,
+        arrow_state=arrow_state,
+    )
+    assert first["stopped_on_stage"] == "metrics"
+
+    captured: dict[str, Any] = {}
+
+    def checking_metrics(context: Any) -> dict[str, Any]:
+        captured["features"] = context.state["features"]
+        return real_metrics(context)
+
+    monkeypatch.setattr(daily_job, "_stage_metrics", checking_metrics)
+    monkeypatch.setattr(daily_job, "_stage_features", _must_not_run)
+    monkeypatch.setattr(daily_job, "_stage_cutoff", _must_not_run)
+    resumed = daily_job.run_daily_job(
+        run_id="daily-resume",
+        checkpoint_path=checkpoint_path,
+        resume_from_checkpoint=True,
+        arrow_state=arrow_state,
+    )
+
+    metrics = next(stage for stage in resumed["stages"] if stage["name"] == "metrics")
+    assert resumed["success"] is True
+    assert metrics["output"]["scoreboard_count"] == 6
+    assert isinstance(captured["features"], pa.Table) is arrow_state
+
+
+def test_resume_reads_single_document_checkpoints(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    checkpoint_path = tmp_path / "legacy.json"
+    checkpoint_path.write_text(
+        json.dumps(
+            {
+                "run_id": "daily-legacy",
+                "stages": {"discover": {"status": "success", "output": {"market_count": 3}, "error": None}},
+            }
+        ),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(daily_job, "_stage_discover", _must_not_run)
+
+    result = daily_job.run_daily_job(
+        run_id="daily-legacy-resume",
+        checkpoint_path=str(checkpoint_path),
+        resume_from_checkpoint=True,
+    )
+
+    assert result["success"] is True
+    assert result["stages"][0]["output"] == {"market_count": 3}
+
+
+def test_checkpoint_restores_heterogeneous_rows_exactly(tmp_path: Path) -> None:
+    from pipelines.stage_checkpoint import StageCheckpoint
+
+    uniform = [{"market_id": "m1", "p_yes": 0.4, "label": 1}, {"market_id": "m2", "p_yes": float("nan"), "label": 0}]
+    ragged = [
+        {"market_id": "m1", "label": 1},
+        {"market_id": "m2", "label": 1.0, "extra": ("a", 1)},
+        {"market_id": 3, "label": "1"},
+    ]
+    checkpoint = StageCheckpoint(tmp_path / "daily-checkpoint.json")
+    checkpoint.record("cutoff", status="success", output={}, error=None, state={"uniform": uniform, "ragged": ragged})
+
+    specs = checkpoint.stages()["cutoff"]["state"]
+    restored = StageCheckpoint(tmp_path / "daily-checkpoint.json")
+    restored.load()
+    state = restored.state("cutoff")
+
+    assert specs["uniform"]["format"] == "rows"
+    assert specs["ragged"]["format"] == "pickle"
+    assert state is not None
+    assert state["ragged"] == ragged
+    assert [type(row["label"]) for row in state["ragged"]] == [int, float, str]
+    assert list(state["uniform"][0]) == ["market_id", "p_yes", "label"]
+    assert state["uniform"][1]["p_yes"] != state["uniform"][1]["p_yes"]
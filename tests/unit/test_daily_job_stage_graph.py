@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import pipelines.daily_job as daily_job
+from pipelines.common import PipelineRunContext, PipelineStage
+from pipelines.stage_graph import critical_path, run_stage_graph, stage_dependencies
+from pipelines.tabular_state import ARROW_STATE_KEY
+from tests.helpers.daily_job_fixtures import cutoff_rows, stage_outputs
+
+
+def _stage(name: str, inputs: tuple[str, ...] = (), outputs: tuple[str, ...] = ()) -> PipelineStage:
+    return PipelineStage(name=name, handler=lambda context: {}, inputs=inputs, outputs=outputs)  # type: ignore[arg-type]
+
+
+def test_daily_stage_dependencies_follow_declared_state_keys() -> None:
+    dependencies = stage_dependencies(daily_job.build_daily_stages())
+
+    assert list(dependencies) == list(daily_job.DAILY_STAGE_NAMES)
+    assert dependencies["discover"] == ()
+    assert "metrics" in dependencies["trust_intelligence"]
+    assert "metrics" in dependencies["drift"]
+    assert "trust_intelligence" not in dependencies["drift"]
+    assert "drift" in dependencies["conformal"]
+    assert "trust_intelligence" not in dependencies["conformal"]
+    assert {"metrics", "trust_intelligence"} <= set(dependencies["publish"])
+    assert "drift" not in dependencies["publish"]
+
+
+def test_run_stage_graph_overlaps_independent_stages() -> None:
+    barrier = threading.Barrier(2, timeout=5)
+    order: list[str] = []
+    stages = [
+        _stage("discover", outputs=("a",)),
+        _stage("drift", inputs=("a",), outputs=("b",)),
+        _stage("trust_intelligence", inputs=("a",), outputs=("c",)),
+        _stage("publish", inputs=("b", "c")),
+    ]
+
+    def _run(stage: PipelineStage) -> bool:
+        if stage.name in {"drift", "trust_intelligence"}:
+            # Both stages must be running at once for the barrier to release.
+            barrier.wait()
+        order.append(stage.name)
+        return True
+
+    timings = run_stage_graph(stages, _run, max_workers=2)
+
+    assert set(timings) == {"discover", "drift", "trust_intelligence", "publish"}
+    assert order[0] == "discover"
+    assert order[-1] == "publish"
+
+
+def test_run_stage_graph_stops_scheduling_after_failure() -> None:
+    stages = [
+        _stage("discover", outputs=("a",)),
+        _stage("ingest", inputs=("a",), outputs=("b",)),
+        _stage("publish", inputs=("b",)),
+    ]
+
+    timings = run_stage_graph(stages, lambda stage: stage.name != "ingest", max_workers=4)
+
+    assert list(timings) == ["discover", "ingest"]
+
+
+def test_critical_path_picks_longest_weighted_chain() -> None:
+    dependencies = {"a": (), "b": ("a",), "c": ("a",), "d": ("b", "c")}
+
+    path, seconds = critical_path(dependencies, {"a": 1.0, "b": 5.0, "c": 2.0, "d": 1.0})
+
+    assert path == ["a", "b", "d"]
+    assert seconds == 7.0
+
+
+def test_parallel_daily_job_matches_sequential_run() -> None:
+    state = {"cutoff_snapshot_rows": cutoff_rows()}
+
+    sequential = daily_job.run_daily_job(run_id="daily-seq", state=state)
+    threaded = daily_job.run_daily_job(run_id="daily-par", state=state, max_parallel_stages=4)
+    processes = daily_job.run_daily_job(
+        run_id="daily-proc",
+        state=state,
+        max_parallel_stages=2,
+        stage_executor="process",
+    )
+
+    for result in (sequential, threaded, processes):
+        assert result["success"] is True
+        assert result["stage_order"] == list(daily_job.DAILY_STAGE_NAMES)
+    assert stage_outputs(threaded) == stage_outputs(sequential)
+    assert stage_outputs(processes) == stage_outputs(sequential)
+    schedule = threaded["schedule"]
+    assert schedule["max_parallel_stages"] == 4
+    assert schedule["critical_path"][0] == "discover"
+    assert schedule["critical_path"][-1] == "publish"
+    assert 0.0 <= schedule["critical_path_s"] <= schedule["wall_time_s"] + 1e-6
+
+
+def _record_arrow_mode(context: Any) -> dict[str, Any]:
+    context.state["arrow_mode"] = daily_job._arrow_state_enabled(context)
+    return {"stage": "features", "status": "success"}
+
+
+def test_process_executor_forwards_arrow_state_mode() -> None:
+    context = PipelineRunContext(run_id="daily-proc-arrow", state={ARROW_STATE_KEY: True, "features": []})
+    stage = PipelineStage(name="features", handler=_record_arrow_mode, inputs=("features",), outputs=("arrow_mode",))
+
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        daily_job._stage_runner(context, pool)(stage)
+
+    assert context.state["arrow_mode"] is True
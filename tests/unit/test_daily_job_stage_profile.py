@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+import pstats
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import pipelines.daily_job as daily_job
+from pipelines.stage_profile import StageProfile, render_prometheus
+from storage.io_stats import track_io
+from storage.writers import RawWriter
+from tests.helpers.daily_job_fixtures import cutoff_rows
+
+
+def test_run_report_profiles_every_stage_and_writes_exports(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    report_dir = tmp_path / "reports"
+    checkpoint_path = tmp_path / "daily-checkpoint.json"
+    raw_path: list[Path] = []
+
+    def writing_discover(context: Any) -> dict[str, Any]:
+        raw_path.append(RawWriter(tmp_path / "root").write([{"market_id": "m1"}], dataset="markets", dt="2026-02-20"))
+        return {"market_count": 1}
+
+    monkeypatch.setattr(daily_job, "_stage_discover", writing_discover)
+
+    result = daily_job.run_daily_job(
+        run_id="daily-profile",
+        state={"cutoff_snapshot_rows": cutoff_rows(6), "root_path": str(tmp_path / "root")},
+        checkpoint_path=str(checkpoint_path),
+        report_dir=str(report_dir),
+    )
+
+    profiled = result["profile"]["stages"]
+    assert result["success"] is True
+    assert [entry["stage"] for entry in profiled] == list(daily_job.DAILY_STAGE_NAMES)
+    assert all(entry["wall_s"] >= 0.0 and entry["cpu_s"] >= 0.0 for entry in profiled)
+    by_stage = {entry["stage"]: entry for entry in profiled}
+    assert by_stage["features"]["rows_in"] == 12
+    assert by_stage["features"]["rows_out"] > 0
+    assert by_stage["discover"]["bytes_written"] == raw_path[0].stat().st_size
+    assert by_stage["features"]["bytes_written"] == 0
+    assert all(set(stage) == {"name", "status", "output", "error"} for stage in result["stages"])
+
+    written = json.loads(Path(result["run_report"]["json"]).read_text(encoding="utf-8"))
+    assert written == json.loads(json.dumps(result["profile"]))
+    prom = Path(result["run_report"]["prometheus"]).read_text(encoding="utf-8")
+    assert '# TYPE pipeline_stage_wall_seconds gauge' in prom
+    assert 'pipeline_stage_rows_in{attempt="0",run_id="daily-profile",stage="features"} 12.0' in prom
+
+    index = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+    assert index["stages"]["features"]["profile"][0]["rows_in"] == 12
+
+
+def test_cprofile_dumps_one_stats_file_per_stage(tmp_path: Path) -> None:
+    report_dir = tmp_path / "reports"
+
+    result = daily_job.run_daily_job(
+        run_id="daily-cprofile",
+        state={"cutoff_snapshot_rows": cutoff_rows(6)},
+        report_dir=str(report_dir),
+        cprofile=True,
+    )
+
+    paths = [entry["profile_path"] for entry in result["profile"]["stages"]]
+    assert paths[0] == str(report_dir / "daily-cprofile" / "discover.attempt0.prof")
+    assert all(Path(path).exists() for path in paths)
+    assert pstats.Stats(paths[0]).total_calls > 0
+
+
+def test_cprofile_requires_report_dir() -> None:
+    with pytest.raises(ValueError, match="report_dir"):
+        daily_job.run_daily_job(run_id="daily-no-dir", cprofile=True)
+
+
+def test_cprofile_rejects_parallel_stages(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="max_parallel_stages=1"):
+        daily_job.run_daily_job(
+            run_id="daily-parallel-cprofile",
+            report_dir=str(tmp_path),
+            cprofile=True,
+            max_parallel_stages=4,
+        )
+
+
+def test_track_io_counts_writer_bytes_in_nested_blocks(tmp_path: Path) -> None:
+    writer = RawWriter(tmp_path)
+    with track_io() as outer:
+        with track_io() as inner:
+            path = writer.write([{"market_id": "m1"}], dataset="markets", dt="2026-02-20")
+    assert inner.bytes_written == outer.bytes_written == path.stat().st_size
+    assert outer.files_written == 1
+
+
+def test_render_prometheus_escapes_labels() -> None:
+    text = render_prometheus('run"1', [StageProfile(stage="discover", wall_s=1.5)])
+    assert 'pipeline_stage_wall_seconds{attempt="0",run_id="run\\"1",stage="discover"} 1.5' in text
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+import pytest
+
+import pipelines.daily_job as daily_job
+from pipelines.common import PipelineRunContext
+from pipelines.tabular_state import ROW_VIEWS_KEY, StateViews
+
+
+@dataclass
+class _Snapshot:
+    market_id: str
+    ts: str
+    category: str
+    p_yes: float
+    pred: float
+    label: int
+    volume_24h: float = 20_000.0
+    open_interest: float = 5_000.0
+
+
+def _snapshots() -> list[_Snapshot]:
+    return [
+        _Snapshot(
+            market_id=f"m{idx}",
+            ts=f"2026-02-20T0{step}:00:00Z",
+            category="crypto" if idx % 2 else "sports",
+            p_yes=0.2 + 0.1 * idx,
+            pred=0.2 + 0.1 * idx,
+            label=step % 2,
+        )
+        for idx in range(6)
+        for step in range(3)
+    ]
+
+
+@pytest.mark.parametrize("arrow_state", [False, True])
+def test_daily_job_converts_each_state_value_at_most_once(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    arrow_state: bool,
+) -> None:
+    converted: list[Any] = []
+    real_rows_to_dicts = daily_job._rows_to_dicts
+
+    def recording_rows_to_dicts(value: Any) -> list[dict[str, Any]]:
+        converted.append(value)  # keep the object alive so ids stay unique
+        return real_rows_to_dicts(value)
+
+    monkeypatch.setattr(daily_job, "_rows_to_dicts", recording_rows_to_dicts)
+    context = PipelineRunContext(
+        run_id="daily-views",
+        state={
+            "arrow_state": arrow_state,
+            "cutoff_snapshot_rows": _snapshots(),
+            "events": [{"event_id": "e1", "market_id": "m1"}],
+            "root_path": str(tmp_path),
+        },
+    )
+
+    for stage in daily_job.build_daily_stages():
+        stage.handler(context)
+
+    assert len(context.state["scoreboard_rows"]) == 6
+    repeated = [value for index, value in enumerate(converted) if any(value is seen for seen in converted[:index])]
+    assert repeated == []
+    views = context.state[ROW_VIEWS_KEY]
+    assert views.conversions["rows:list"] <= len(converted)
+
+
+def test_state_views_reuse_views_and_notice_appends() -> None:
+    views = StateViews()
+    calls: list[Any] = []
+
+    def convert(value: Any) -> list[dict[str, Any]]:
+        calls.append(value)
+        return [dict(row) for row in value]
+
+    source = [{"market_id": "m1"}]
+    rows = views.rows(source, convert)
+    assert views.rows(source, convert) is rows
+    assert views.rows(rows, convert) is rows
+    source.append({"market_id": "m2"})
+    assert len(views.rows(source, convert)) == 2
+    assert len(calls) == 2
+
+    table = pa.table({"market_id": ["m1", "m1", "m2"]})
+    assert views.market_ids(table, daily_job._infer_market_ids) == ["m1", "m2"]
+    assert views.market_ids(table, lambda value: pytest.fail("recomputed")) == ["m1", "m2"]
+    assert views.conversions == {"rows:list": 2, "market_ids:Table": 1}
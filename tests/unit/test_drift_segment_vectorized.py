@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from calibration.drift import REASON_INSUFFICIENT_SAMPLES, detect_segment_base_rate_drift
+from calibration.metrics import base_rate_drift
+
+FIELDS = ("category", "liquidity_bucket", "tte_bucket")
+
+
+def _key(row) -> str:
+    return "|".join(f"{field}={row.get(field, 'unknown')}" for field in FIELDS)
+
+
+def _rowwise_reference(rows, *, min_segment_rows: int = 20, n_windows: int = 4) -> dict[str, object]:
+    """The previous implementation: one base_rate_drift call per segment."""
+    grouped = defaultdict(list)
+    for row in rows:
+        grouped[_key(row)].append(row)
+    segments: dict[str, dict[str, object]] = {}
+    triggered: list[str] = []
+    for key, segment_rows in sorted(grouped.items()):
+        if len(segment_rows) < min_segment_rows:
+            segments[key] = {
+                "drift_detected": False,
+                "sample_size": len(segment_rows),
+                "reason": REASON_INSUFFICIENT_SAMPLES,
+            }
+            continue
+        drift = dict(base_rate_drift(segment_rows, time_key="ts", n_windows=n_windows))
+        drift["sample_size"] = len(segment_rows)
+        segments[key] = drift
+        if drift["drift_detected"]:
+            triggered.append(key)
+    return {
+        "evaluated_segment_count": sum(1 for value in segments.values() if value.get("reason") is None),
+        "triggered_segment_count": len(triggered),
+        "triggered_segments": triggered,
+        "segments": segments,
+    }
+
+
+def _assert_same(actual: object, expected: object) -> None:
+    if isinstance(expected, dict):
+        assert isinstance(actual, dict)
+        assert list(actual) == list(expected)
+        for key in expected:
+            _assert_same(actual[key], expected[key])
+    elif isinstance(expected, list):
+        assert isinstance(actual, list) and len(actual) == len(expected)
+        for left, right in zip(actual, expected):
+            _assert_same(left, right)
+    elif isinstance(expected, float):
+        assert type(actual) is float
+        assert actual == pytest.approx(expected, rel=1e-12, abs=1e-12)
+    else:
+        assert type(actual) is type(expected)
+        assert actual == expected
+
+
+def _rows(n: int, *, seed: int = 17, ts_kind: str = "iso") -> list[dict[str, object]]:
+    rng = np.random.default_rng(seed)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    offsets = rng.integers(0, 60 * 24, size=n)  # minutes; duplicates exercise tie order
+    categories = rng.choice(["politics", "sports", "crypto", "weather"], size=n)
+    liquidity = rng.choice(["low", "mid", "high"], size=n)
+    tte = rng.choice(["0_24h", "24_72h", "72h_plus"], size=n, p=[0.6, 0.3, 0.1])
+    drift = np.where(categories == "politics", offsets / (60 * 24), 0.5)
+    preds = rng.random(n)
+    labels = (rng.random(n) < drift).astype(int)
+    rows = []
+    for idx in range(n):
+        moment = base + timedelta(minutes=int(offsets[idx]))
+        ts: object = {
+            "iso": moment.isoformat().replace("+00:00", "Z"),
+            "epoch": int(moment.timestamp()),
+            "datetime": moment,
+        }[ts_kind]
+        row = {
+            "ts": ts,
+            "pred": float(preds[idx]),
+            "label": int(labels[idx]),
+            "category": str(categories[idx]),
+            "liquidity_bucket": str(liquidity[idx]),
+        }
+        if tte[idx] != "72h_plus":
+            row["tte_bucket"] = str(tte[idx])
+        rows.append(row)
+    return rows
+
+
+@pytest.mark.parametrize("ts_kind", ["iso", "epoch", "datetime"])
+def test_matches_rowwise_reference(ts_kind: str) -> None:
+    rows = _rows(3_000, ts_kind=ts_kind)
+    result = detect_segment_base_rate_drift(rows, min_segment_rows=40)
+
+    assert result["triggered_segment_count"] > 0
+    assert any(value.get("reason") for value in result["segments"].values())
+    _assert_same(result, _rowwise_reference(rows, min_segment_rows=40))
+
+
+def test_matches_reference_with_fewer_rows_than_windows() -> None:
+    rows = _rows(200, seed=3)
+    result = detect_segment_base_rate_drift(rows, min_segment_rows=1, n_windows=12)
+
+    _assert_same(result, _rowwise_reference(rows, min_segment_rows=1, n_windows=12))
+
+
+def test_invalid_rows_only_matter_in_evaluated_segments() -> None:
+    rows = _rows(400, seed=5)
+    rows.append({"ts": "2026-01-02T00:00:00Z", "pred": 1.7, "label": 1, "category": "rare"})
+    result = detect_segment_base_rate_drift(rows, min_segment_rows=20)
+    _assert_same(result, _rowwise_reference(rows, min_segment_rows=20))
+    assert result["segments"]["category=rare|liquidity_bucket=unknown|tte_bucket=unknown"]["sample_size"] == 1
+
+    evaluated = next(idx for idx, row in enumerate(rows) if result["segments"][_key(row)].get("reason") is None)
+    rows[evaluated] = {**rows[evaluated], "pred": "not-a-number"}
+    with pytest.raises(ValueError, match="Invalid numeric value"):
+        detect_segment_base_rate_drift(rows, min_segment_rows=20)
@@ -158,6 +158,36 @@ def test_stage_build_features_boundary_values_follow_low_inclusive_high_inclusiv
     assert feature_frame["liquidity_bucket"].tolist() == ["LOW", "MID", "MID", "HIGH"]
 
 
+def test_stage_build_features_reads_cutoff_snapshot_dataset(tmp_path: Path) -> None:
+    from storage.writers import ParquetWriter
+
+    ParquetWriter(tmp_path).write(
+        _default_snapshot_rows(),
+        dataset="cutoff_snapshots",
+        dt="2026-02-20",
+    )
+    # The data interval end is exclusive, so the next day's partition is not read.
+    ParquetWriter(tmp_path).write(
+        [{**row, "ts": row["ts"].replace("2026-02-20", "2026-02-21")} for row in _default_snapshot_rows()],
+        dataset="cutoff_snapshots",
+        dt="2026-02-21",
+    )
+    context = _Context(
+        state={
+            "market_ids": ["mkt-a"],
+            "root_path": str(tmp_path),
+            "cutoff_snapshot_dataset": "cutoff_snapshots",
+        }
+    )
+    context.data_interval_start = "2026-02-20T00:00:00Z"
+    context.data_interval_end = "2026-02-21T00:00:00Z"
+
+    summary = stage_build_features(context)
+
+    assert summary["feature_count"] == 2
+    assert set(context.state["feature_frame"]["market_id"]) == {"mkt-a"}
+
+
 def _default_snapshot_rows() -> list[dict[str, object]]:
     return [
         {
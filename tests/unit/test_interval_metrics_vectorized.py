@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pytest
+
+from calibration import interval_metrics
+from calibration.interval_metrics import (
+    compute_interval_metrics,
+    compute_interval_metrics_arrays,
+    compute_interval_metrics_grouped,
+    coverage_rate,
+    grouped_interval_summary,
+    grouped_pinball_loss,
+    interval_summary,
+    mean_interval_width,
+    pinball_loss,
+    pinball_loss_matrix,
+)
+
+
+def _rows(n: int, *, seed: int = 3) -> list[dict[str, object]]:
+    rng = random.Random(seed)
+    rows: list[dict[str, object]] = []
+    for idx in range(n):
+        center = rng.random()
+        half = 0.05 + 0.2 * rng.random()
+        row: dict[str, object] = {
+            "actual": rng.random(),
+            "q05": center - 1.4 * half,
+            "q10": center - half,
+            "q50": center,
+            "q90": center + half,
+            "q95": center + 1.4 * half,
+            "segment": ("politics", "sports", "crypto")[idx % 3],
+        }
+        if idx % 11 == 0:
+            row["q10"], row["q90"] = row["q90"], row["q10"]  # swapped bounds
+        rows.append(row)
+    return rows
+
+
+def _column(rows: list[dict[str, object]], key: str) -> list[float]:
+    return [float(row[key]) for row in rows]  # type: ignore[arg-type]
+
+
+def test_matrix_pinball_matches_scalar_per_quantile() -> None:
+    rows = _rows(2_000)
+    actuals = _column(rows, "actual")
+    keys = ["q05", "q10", "q50", "q90", "q95"]
+    levels = [0.05, 0.1, 0.5, 0.9, 0.95]
+    matrix = np.column_stack([_column(rows, key) for key in keys])
+
+    losses = pinball_loss_matrix(actuals, matrix, levels)
+    for col, (key, level) in enumerate(zip(keys, levels)):
+        expected = pinball_loss(actuals, [str(value) for value in _column(rows, key)], level)  # row loop
+        assert losses[col] == expected
+
+
+def test_interval_summary_matches_scalar_functions_and_winkler_definition() -> None:
+    rows = _rows(500)
+    actuals, lower, upper = _column(rows, "actual"), _column(rows, "q10"), _column(rows, "q90")
+    summary = interval_summary(actuals, lower, upper, alpha=0.2)
+
+    assert summary.samples == 500
+    assert summary.coverage == coverage_rate([str(v) for v in actuals], lower, upper)
+    assert summary.mean_width == mean_interval_width([str(v) for v in lower], upper)
+    expected_winkler = 0.0
+    for y, lo, hi in zip(actuals, lower, upper):
+        lo, hi = min(lo, hi), max(lo, hi)
+        expected_winkler += (hi - lo) + 10.0 * (max(lo - y, 0.0) + max(y - hi, 0.0))
+    assert summary.winkler == pytest.approx(expected_winkler / 500, rel=1e-12)
+
+    with pytest.raises(ValueError, match="alpha"):
+        interval_summary(actuals, lower, upper, alpha=0.0)
+
+
+def test_compute_interval_metrics_paths_agree_exactly(monkeypatch) -> None:
+    rows = _rows(1_000)
+    partial = rows + [{"actual": 0.5, "q10": 0.4, "q50": 0.5, "q90": 0.6}]
+    fast = compute_interval_metrics(rows)
+    fast_partial = compute_interval_metrics(partial)
+    columns = compute_interval_metrics_arrays(
+        *(np.array(_column(rows, key)) for key in ("actual", "q10", "q50", "q90", "q05", "q95"))
+    )
+    assert fast == columns
+    assert fast.winkler_90 is not None and fast.winkler_90 > 0
+    assert fast_partial.coverage_90 is None and fast_partial.winkler_90 is None
+
+    monkeypatch.setattr(interval_metrics, "_interval_columns", lambda rows: None)
+    assert compute_interval_metrics(rows) == fast
+    assert compute_interval_metrics(partial) == fast_partial
+
+
+def test_grouped_variants_match_per_group_calls() -> None:
+    rows = _rows(900)
+    segments = [row["segment"] for row in rows]
+    actuals = _column(rows, "actual")
+    matrix = np.column_stack([_column(rows, key) for key in ("q10", "q50", "q90")])
+
+    pinball = grouped_pinball_loss(actuals, matrix, [0.1, 0.5, 0.9], segments)
+    bands = grouped_interval_summary(actuals, matrix[:, 0], matrix[:, 2], segments, alpha=0.2)
+    metrics = compute_interval_metrics_grouped(
+        actuals,
+        matrix[:, 0],
+        matrix[:, 1],
+        matrix[:, 2],
+        segments,
+        q05=_column(rows, "q05"),
+        q95=_column(rows, "q95"),
+    )
+    assert list(pinball) == list(bands) == list(metrics) == ["politics", "sports", "crypto"]
+    for segment in pinball:
+        subset = [row for row in rows if row["segment"] == segment]
+        idx = [i for i, value in enumerate(segments) if value == segment]
+        np.testing.assert_array_equal(
+            pinball[segment], pinball_loss_matrix([actuals[i] for i in idx], matrix[idx], [0.1, 0.5, 0.9])
+        )
+        assert bands[segment] == interval_summary(
+            [actuals[i] for i in idx], matrix[idx, 0], matrix[idx, 2], alpha=0.2
+        )
+        assert metrics[segment] == compute_interval_metrics(subset)
+
+
+def test_invalid_values_keep_element_errors() -> None:
+    with pytest.raises(ValueError, match=r"Non-finite value for pred\[1\]"):
+        pinball_loss([0.1, 0.2], [0.1, float("nan")], 0.5)
+    with pytest.raises(ValueError, match=r"Invalid numeric value for q50\[1\]"):
+        compute_interval_metrics(
+            [
+                {"actual": 0.1, "q10": 0.0, "q50": 0.1, "q90": 0.2},
+                {"actual": 0.1, "q10": 0.0, "q50": "bad", "q90": 0.2},
+            ]
+        )
+    with pytest.raises(ValueError, match=r"Non-finite value for pred\[2,1\]"):
+        pinball_loss_matrix([0.1, 0.2, 0.3], [[0.1, 0.2], [0.1, 0.2], [0.1, np.inf]], [0.1, 0.9])
+    with pytest.raises(ValueError, match="one column per quantile"):
+        pinball_loss_matrix([0.1], [[0.1, 0.2]], [0.5])
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from agents.label_resolver import LabelStatus
+from calibration.labeling import (
+    binary_label_indices,
+    split_by_label_status,
+    split_by_label_status_indices,
+    to_binary_label_frame,
+    to_binary_label_rows,
+)
+
+_STATUSES = (
+    "RESOLVED_TRUE",
+    " resolved_false ",
+    "void",
+    "UNRESOLVED",
+    "",
+    None,
+    1,
+    LabelStatus.RESOLVED_TRUE,
+    LabelStatus.RESOLVED_FALSE,
+    LabelStatus.VOID,
+    ["unhashable"],
+)
+
+
+def _normalize(value: object) -> str | None:
+    if value is None:
+        return None
+    enum_value = getattr(value, "value", None)
+    if isinstance(enum_value, str):
+        value = enum_value
+    return str(value).strip().upper() or None
+
+
+def _is_multi(row: Mapping[str, object]) -> bool:
+    if row.get("is_multi_outcome") is True:
+        return True
+    count = row.get("outcome_count")
+    if isinstance(count, (int, float)) and not isinstance(count, bool) and count > 2:
+        return True
+    outcomes = row.get("outcomes")
+    if isinstance(outcomes, Sequence) and not isinstance(outcomes, (str, bytes, bytearray)):
+        return len(outcomes) > 2
+    return False
+
+
+def _reference_binary(rows: Sequence[object], status_key: str = "label_status", include_multi: bool = False):
+    converted = []
+    for row in rows:
+        if not isinstance(row, Mapping) or (not include_multi and _is_multi(row)):
+            continue
+        status = _normalize(row.get(status_key))
+        if status in {"RESOLVED_TRUE", "RESOLVED_FALSE"}:
+            converted.append({**row, "y": int(status == "RESOLVED_TRUE")})
+    return converted
+
+
+def _rows(n: int, *, seed: int = 4) -> list[object]:
+    rng = random.Random(seed)
+    rows: list[object] = []
+    for idx in range(n):
+        if idx % 97 == 0:
+            rows.append("not-a-row")
+            continue
+        row: dict[str, object] = {"id": idx, "label_status": rng.choice(_STATUSES)}
+        if rng.random() < 0.3:
+            row["is_multi_outcome"] = rng.choice([True, False, 1, "true", np.bool_(True), None])
+        if rng.random() < 0.3:
+            row["outcome_count"] = rng.choice([2, 3, 2.5, True, "5", None, np.float64(4.0), float("nan")])
+        if rng.random() < 0.3:
+            row["outcomes"] = rng.choice([["a", "b"], ("a", "b", "c"), "abc", {"a", "b", "c"}, None, []])
+        rows.append(row)
+    return rows
+
+
+def test_split_matches_row_by_row_grouping() -> None:
+    rows = _rows(3_000)
+    grouped = split_by_label_status(rows)
+    expected: dict[str, list[object]] = {"resolved_true": [], "resolved_false": [], "void": [], "unresolved": []}
+    for row in rows:
+        status = _normalize(row.get("label_status")) if isinstance(row, Mapping) else None
+        name = {"RESOLVED_TRUE": "resolved_true", "RESOLVED_FALSE": "resolved_false", "VOID": "void"}.get(
+            status or "", "unresolved"
+        )
+        expected[name].append(row)
+    assert grouped == expected
+    assert all(a is b for a, b in zip(grouped["void"], expected["void"]))  # rows are not copied
+
+    indices = split_by_label_status_indices(rows)
+    assert sorted(np.concatenate(list(indices.values())).tolist()) == list(range(len(rows)))
+
+
+def test_binary_rows_match_reference_for_every_option() -> None:
+    rows = _rows(3_000, seed=9)
+    for include_multi in (False, True):
+        assert to_binary_label_rows(rows, include_multi_outcome=include_multi) == _reference_binary(
+            rows, include_multi=include_multi
+        )
+    renamed = [{("status" if k == "label_status" else k): v for k, v in row.items()} for row in rows if isinstance(row, dict)]
+    assert to_binary_label_rows(renamed, status_key="status") == _reference_binary(renamed, status_key="status")
+
+    positions, labels = binary_label_indices(rows)
+    assert [rows[idx]["id"] for idx in positions] == [row["id"] for row in _reference_binary(rows)]
+    assert labels.tolist() == [row["y"] for row in _reference_binary(rows)]
+
+
+def test_binary_label_frame_filters_without_row_dicts() -> None:
+    frame = pd.DataFrame(
+        {
+            "id": range(6),
+            "label_status": pd.Categorical(
+                ["resolved_true", "RESOLVED_FALSE", None, "void", "RESOLVED_TRUE", "resolved_false"]
+            ),
+            "outcome_count": [2, 3, 2, 2, np.nan, 2],
+            "is_multi_outcome": [False, False, False, False, False, True],
+        }
+    )
+    result = to_binary_label_frame(frame)
+    expected = _reference_binary(frame.to_dict("records"))
+    assert result["id"].tolist() == [row["id"] for row in expected] == [0, 4]
+    assert result["y"].tolist() == [row["y"] for row in expected]
+
+    object_frame = frame.assign(label_status=frame["label_status"].astype(object), outcomes=[["a"]] * 5 + [["a", "b", "c"]])
+    assert to_binary_label_frame(object_frame, include_multi_outcome=True)["id"].tolist() == [0, 1, 4, 5]
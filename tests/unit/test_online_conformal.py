@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from calibration.conformal import _empirical_quantile, fit_conformal_adjustment
+from calibration.online_conformal import (
+    OnlineConformalCalibrator,
+    OrderStatisticIndex,
+    SegmentedOnlineConformal,
+)
+
+
+def _samples(n: int, *, seed: int = 9) -> tuple[list[dict[str, float]], list[float]]:
+    rng = random.Random(seed)
+    bands: list[dict[str, float]] = []
+    actuals: list[float] = []
+    for idx in range(n):
+        center = rng.random()
+        half = 0.02 + 0.1 * rng.random()
+        band = {"q10": center - half, "q50": center, "q90": center + half}
+        if idx % 7 == 0:
+            band.pop("q50")
+        bands.append(band)
+        # Bias drifts over time so the median residual keeps moving.
+        actuals.append(center + rng.gauss(0.05 * idx / n, 0.08))
+    return bands, actuals
+
+
+def test_order_statistic_index_matches_sorted_list() -> None:
+    rng = random.Random(1)
+    index = OrderStatisticIndex(load=4)
+    reference: list[float] = []
+    for _ in range(2_000):
+        if reference and rng.random() < 0.4:
+            value = rng.choice(reference)
+            reference.remove(value)
+            index.remove(value)
+        else:
+            value = float(rng.randint(0, 50))  # duplicates on purpose
+            reference.append(value)
+            index.add(value)
+        assert len(index) == len(reference)
+        if reference:
+            ordered = sorted(reference)
+            k = rng.randrange(len(ordered))
+            assert index.kth(k) == ordered[k]
+            q = rng.random()
+            assert index.quantile(q) == _empirical_quantile(reference, q)
+
+    with pytest.raises(ValueError, match="not in index"):
+        index.remove(1_000.0)
+
+
+def test_exact_mode_matches_refit_on_every_window() -> None:
+    bands, actuals = _samples(600)
+    calibrator = OnlineConformalCalibrator(window_size=150, target_coverage=0.9, rebase_tolerance=0.0)
+    for start in range(0, len(bands), 25):
+        calibrator.update(bands[start : start + 25], actuals[start : start + 25])
+        window_start = max(0, start + 25 - 150)
+        expected = fit_conformal_adjustment(
+            bands[window_start : start + 25], actuals[window_start : start + 25], target_coverage=0.9
+        )
+        assert calibrator.adjustment() == expected
+
+
+def test_tolerant_mode_rebases_rarely_and_keeps_coverage_close() -> None:
+    bands, actuals = _samples(3_000, seed=4)
+    calibrator = OnlineConformalCalibrator(window_size=500, target_coverage=0.8, rebase_tolerance=0.01)
+    for idx in range(len(bands)):
+        calibrator.update(bands[idx : idx + 1], actuals[idx : idx + 1])
+
+    exact = fit_conformal_adjustment(bands[-500:], actuals[-500:], target_coverage=0.8)
+    online = calibrator.adjustment()
+    assert calibrator.rebase_count < len(bands) / 20
+    assert abs(online.center_shift - exact.center_shift) <= 0.01
+    assert online.width_scale == pytest.approx(exact.width_scale, rel=0.1)
+    assert online.sample_size == 500
+
+
+def test_invalid_batch_leaves_window_unchanged() -> None:
+    calibrator = OnlineConformalCalibrator(window_size=10)
+    calibrator.update([{"q10": 0.1, "q50": 0.2, "q90": 0.3}], [0.25])
+    with pytest.raises(ValueError, match="actual\\[1\\]"):
+        calibrator.update([{"q10": 0.1, "q90": 0.3}, {"q10": 0.1, "q90": 0.3}], [0.2, "bad"])
+    assert len(calibrator) == 1
+
+
+def test_segments_and_state_round_trip() -> None:
+    bands, actuals = _samples(400, seed=2)
+    rows = [{**band, "category": "politics" if idx % 3 else "sports"} for idx, band in enumerate(bands)]
+    segmented = SegmentedOnlineConformal(
+        segment_fields=["category"], min_samples=100, window_size=200, rebase_tolerance=0.0
+    )
+    segmented.update(rows, actuals)
+
+    overall, by_segment = segmented.adjustments()
+    assert overall == fit_conformal_adjustment(rows[-200:], actuals[-200:])
+    politics = [idx for idx in range(len(rows)) if idx % 3][-200:]
+    assert set(by_segment) == {"category=politics", "category=sports"}
+    assert by_segment["category=politics"] == fit_conformal_adjustment(
+        [rows[idx] for idx in politics], [actuals[idx] for idx in politics]
+    )
+
+    restored = OnlineConformalCalibrator.from_dict(segmented.overall.to_dict())
+    assert restored.adjustment() == overall
+    restored.update(bands[:5], actuals[:5])
+    assert len(restored) == 200
@@ -10,6 +10,7 @@ from typing import Any
 
 import pipelines.realtime_ws_job as realtime_ws_job
 from pipelines.realtime_ws_job import run_realtime_ws_job, run_realtime_ws_job_sync
+from storage.readers import read_jsonl_target
 from storage.writers import RawWriter
 
 
@@ -384,3 +385,25 @@ def test_run_realtime_ws_job_writes_run_metrics_and_passthrough_last_stats(
             "last_stats": {"messages_seen": 2, "disconnects": 0},
         }
     ]
+
+
+def test_run_realtime_ws_job_append_segments_reports_jsonl_targets(tmp_path: Path) -> None:
+    writer = RawWriter(tmp_path)
+    for event_id, timestamp in (("s-1", "2026-02-20T12:00:10Z"), ("s-2", "2026-02-20T12:00:40Z")):
+        connector = FakeWSConnector(
+            [{"event_id": event_id, "market_id": "mkt-1", "timestamp": timestamp, "price": 0.4, "size": 1.0}]
+        )
+        summary = run_realtime_ws_job_sync(
+            ws_connector=connector,
+            raw_writer=writer,
+            url="wss://example.test/segments",
+            dt="2026-02-20",
+            append_segments=True,
+        )
+
+    partition = tmp_path / "raw" / "realtime_ticks" / "dt=2026-02-20"
+    assert summary["output_paths"]["realtime_ticks"] == str(partition / "data.jsonl")
+    assert all(path.endswith(".jsonl") for path in summary["output_paths"].values())
+    assert (partition / "data.segments").is_dir()
+    ticks = read_jsonl_target(Path(summary["output_paths"]["realtime_ticks"]))
+    assert [row["event_id"] for row in ticks] == ["s-1", "s-2"]
@@ -137,3 +137,52 @@ def test_build_scoreboard_rows_trust_weights_override_changes_score() -> None:
     )
     assert math.isclose(weighted_score, expected_weighted, rel_tol=0.0, abs_tol=1e-12)
     assert weighted_score != pytest.approx(default_score, rel=0, abs=1e-12)
+
+
+def test_grouped_scoreboard_matches_per_segment_and_per_market_summaries() -> None:
+    categories = ("politics", "sports", "crypto")
+    buckets = ("low", "mid", "high")
+    rows = []
+    for idx in range(600):
+        market = idx % 40
+        rows.append(
+            {
+                "market_id": f"mkt-{market}",
+                "category": categories[market % 3],
+                "liquidity_bucket": buckets[market % 3 - 1],
+                "tte_bucket": ("0-7d", "8-30d")[idx % 2] if idx % 5 else None,
+                "pred": ((idx * 37) % 101) / 100.0,
+                "label": int((idx * 13) % 7 < 3),
+            }
+        )
+    for row in rows:
+        if row["tte_bucket"] is None:
+            del row["tte_bucket"]
+
+    score_rows, summary_metrics = build_scoreboard_rows(rows)
+
+    by_category = summary_metrics["by_category"]
+    assert list(by_category) == ["politics", "sports", "crypto"]
+    for category, metrics in by_category.items():
+        members = [row for row in rows if row["category"] == category]
+        expected = summarize_metrics([row["pred"] for row in members], [row["label"] for row in members])
+        assert metrics.keys() == expected.keys()
+        for name, value in expected.items():
+            assert metrics[name] == pytest.approx(value, rel=0, abs=1e-12)
+    assert len(summary_metrics["by_category_liquidity_tte"]) == 9
+    for score_row in score_rows:
+        members = [row for row in rows if row["market_id"] == score_row["market_id"]]
+        expected = summarize_metrics([row["pred"] for row in members], [row["label"] for row in members])
+        assert score_row["sample_size"] == len(members)
+        for name in ("brier", "log_loss", "ece"):
+            assert score_row[name] == pytest.approx(expected[name], rel=0, abs=1e-12)
+
+
+def test_build_scoreboard_rows_reports_unhashable_segment_value_by_row() -> None:
+    rows = [
+        {"market_id": "mkt-1", "category": "politics", "liquidity_bucket": "high", "pred": 0.6, "label": 1},
+        {"market_id": "mkt-2", "category": ["sports"], "liquidity_bucket": "low", "pred": 0.3, "label": 0},
+    ]
+
+    with pytest.raises(ValueError, match=r"rows\[1\] segment value for 'category' must be hashable"):
+        build_scoreboard_rows(rows)
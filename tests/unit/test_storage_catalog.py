@@ -0,0 +1,197 @@
+import json
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+import storage.catalog as catalog_module
+from api.dependencies import LocalDerivedStore
+from storage.catalog import DatasetCatalog, rebuild_catalog, stats_may_match
+from storage.readers import ParquetReader, RawReader
+from storage.writers import ParquetWriter, RawWriter
+
+
+def _write_days(root: Path) -> None:
+    writer = ParquetWriter(root)
+    for day, markets in (("2026-02-18", ["m1", "m2"]), ("2026-02-19", ["m3"]), ("2026-02-20", ["m4", "m5"])):
+        writer.write(
+            [{"market_id": market_id, "p_yes": 0.5} for market_id in markets],
+            dataset="snapshots",
+            dt=day,
+        )
+
+
+def test_parquet_writer_records_rows_stats_and_schema(tmp_path: Path) -> None:
+    _write_days(tmp_path)
+
+    catalog = DatasetCatalog(tmp_path / "derived" / "snapshots")
+    entry = catalog.files("2026-02-20")["data.parquet"]
+
+    assert catalog.partitions() == ["2026-02-18", "2026-02-19", "2026-02-20"]
+    assert entry["format"] == "parquet"
+    assert entry["rows"] == 2
+    assert entry["bytes"] == (tmp_path / "derived" / "snapshots" / "dt=2026-02-20" / "data.parquet").stat().st_size
+    assert entry["stats"] == {"market_id": {"min": "m4", "max": "m5"}}
+    assert entry["schema_hash"] == catalog.files("2026-02-18")["data.parquet"]["schema_hash"]
+
+
+def test_raw_writer_accumulates_appends_and_compaction_counts(tmp_path: Path) -> None:
+    writer = RawWriter(tmp_path)
+    writer.append([{"market_id": "m2", "ts": 1}], dataset="ticks", dt="2026-02-20", dedupe_key="ts")
+    writer.append([{"market_id": "m1", "ts": 1}], dataset="ticks", dt="2026-02-20", dedupe_key="ts")
+
+    catalog = writer.catalog("ticks")
+    entry = catalog.files("2026-02-20")["data.jsonl"]
+    assert entry["rows"] == 2
+    assert entry["stats"]["market_id"] == {"min": "m1", "max": "m2"}
+
+    writer.compact(dataset="ticks", dt="2026-02-20")
+    assert catalog.files("2026-02-20")["data.jsonl"]["rows"] == 1
+
+    writer.write([{"market_id": "m9"}], dataset="ticks", dt="2026-02-20")
+    assert catalog.files("2026-02-20")["data.jsonl"]["rows"] == 1
+    assert catalog.files("2026-02-20")["data.jsonl"]["stats"]["market_id"] == {"min": "m9", "max": "m9"}
+
+
+def test_range_planning_lists_no_directories_for_a_current_catalog(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _write_days(tmp_path)
+    reader = ParquetReader(tmp_path)
+
+    def _no_listing(self: Path, pattern: str = ""):
+        raise AssertionError(f"unexpected listing: {self}/{pattern}")
+
+    monkeypatch.setattr(Path, "glob", _no_listing)
+    monkeypatch.setattr(Path, "iterdir", _no_listing)
+
+    planned = reader.plan_files(
+        "snapshots",
+        dt_range=("2026-02-19", None),
+        filters=[("market_id", "in", ["m4"])],
+    )
+    frame = reader.read_range(dataset="snapshots", dt_range=("2026-02-18", "2026-02-19"))
+
+    assert planned == [tmp_path / "derived" / "snapshots" / "dt=2026-02-20" / "data.parquet"]
+    assert sorted(frame["market_id"]) == ["m1", "m2", "m3"]
+
+
+def test_stats_may_match_prunes_only_provably_empty_files() -> None:
+    stats = {"market_id": {"min": "m1", "max": "m3"}, "ts": {"min": 10, "max": 20}}
+
+    assert stats_may_match(stats, [("market_id", "=", "m2")])
+    assert not stats_may_match(stats, [("market_id", "=", "m9")])
+    assert not stats_may_match(stats, [("ts", ">", 20)])
+    assert stats_may_match(stats, [[("ts", ">", 20)], [("market_id", "in", ["m0", "m1"])]])
+    assert stats_may_match(stats, [("category", "=", "crypto")])
+
+
+def test_missing_dts_and_rebuild_catalog_for_existing_tree(tmp_path: Path) -> None:
+    ParquetWriter(tmp_path, update_catalog=False).write(
+        [{"market_id": "m1"}, {"market_id": "m2"}], dataset="snapshots", dt="2026-02-18"
+    )
+    RawWriter(tmp_path, update_catalog=False).write([{"id": "a"}], dataset="gamma", dt="2026-02-18")
+    dataset_dir = tmp_path / "derived" / "snapshots"
+    assert not DatasetCatalog(dataset_dir).exists()
+
+    rebuilt = rebuild_catalog(dataset_dir)
+    raw_catalog = rebuild_catalog(tmp_path / "raw" / "gamma")
+
+    entry = rebuilt["partitions"]["2026-02-18"]["data.parquet"]
+    assert entry["rows"] == 2
+    assert entry["stats"] == {"market_id": {"min": "m1", "max": "m2"}}
+    assert raw_catalog["partitions"]["2026-02-18"]["data.jsonl"]["rows"] == 1
+    assert DatasetCatalog(dataset_dir).missing_dts("2026-02-17", "2026-02-19") == ["2026-02-17", "2026-02-19"]
+
+
+def test_local_derived_store_scans_catalogued_and_uncatalogued_partitions(tmp_path: Path) -> None:
+    metrics_root = tmp_path / "derived" / "metrics"
+    catalog = DatasetCatalog(metrics_root)
+    for day, market_id in (("2026-02-19", "m1"), ("2026-02-20", "m2")):
+        path = metrics_root / f"dt={day}" / "scoreboard.json"
+        path.parent.mkdir(parents=True)
+        path.write_text(json.dumps([{"market_id": market_id}]), encoding="utf-8")
+        catalog.record_file(day, "scoreboard.json", fmt="json", rows=1, size_bytes=path.stat().st_size)
+    stray = metrics_root / "dt=2026-02-21" / "scoreboard.json"
+    stray.parent.mkdir(parents=True)
+    stray.write_text(json.dumps([{"market_id": "uncatalogued"}]), encoding="utf-8")
+
+    store = LocalDerivedStore(derived_root=tmp_path / "derived")
+    records = store._scan_partition_records(root=metrics_root, filename="scoreboard.json")
+
+    assert [record["market_id"] for record in records] == ["uncatalogued", "m2", "m1"]
+
+
+def test_local_derived_store_keeps_json_artifacts_next_to_catalogued_parquet(tmp_path: Path) -> None:
+    path = tmp_path / "derived" / "metrics" / "dt=2026-02-20" / "scoreboard.json"
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps([{"market_id": "m1", "window": "90d"}]), encoding="utf-8")
+    store = LocalDerivedStore(derived_root=tmp_path / "derived")
+    assert len(store.load_scoreboard(window="90d")) == 1
+
+    ParquetWriter(tmp_path).write([{"market_id": "m1"}], dataset="metrics", dt="2026-02-20", filename="scoreboard.parquet")
+
+    assert DatasetCatalog(tmp_path / "derived" / "metrics").exists()
+    assert len(store.load_scoreboard(window="90d")) == 1
+
+
+def test_readers_keep_partitions_written_before_the_catalog(tmp_path: Path) -> None:
+    ParquetWriter(tmp_path, update_catalog=False).write([{"market_id": "m1"}], dataset="snapshots", dt="2026-02-19")
+    ParquetWriter(tmp_path).write([{"market_id": "m2"}], dataset="snapshots", dt="2026-02-20")
+    RawWriter(tmp_path, update_catalog=False).write([{"id": "a"}], dataset="gamma", dt="2026-02-20", filename="old")
+    RawWriter(tmp_path).write([{"id": "b"}], dataset="gamma", dt="2026-02-20")
+    reader = ParquetReader(tmp_path)
+
+    frame = reader.read_range(dataset="snapshots", dt_range=("2026-02-19", "2026-02-20"))
+    planned = reader.plan_files("snapshots", filters=[("market_id", "=", "m1")])
+
+    assert sorted(frame["market_id"]) == ["m1", "m2"]
+    assert [path.parent.name for path in planned] == ["dt=2026-02-19"]
+    assert sorted(row["id"] for row in RawReader(tmp_path).read_partition(dataset="gamma", dt="2026-02-20")) == ["a", "b"]
+
+
+def test_updates_are_journalled_and_compacted(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    catalog = DatasetCatalog(tmp_path / "ticks")
+    for idx in range(5):
+        catalog.record_file("2026-02-20", "data.jsonl", fmt="jsonl", rows=2, size_bytes=idx, append=True)
+
+    assert not catalog.path.exists()
+    assert len(catalog.journal_path.read_text(encoding="utf-8").splitlines()) == 5
+    assert catalog.files("2026-02-20")["data.jsonl"]["rows"] == 10
+
+    monkeypatch.setattr(catalog_module, "JOURNAL_COMPACT_BYTES", 1)
+    catalog.update_file("2026-02-20", "data.jsonl", rows=7)
+    catalog.record_file("2026-02-21", "data.jsonl", fmt="jsonl", rows=1, size_bytes=1)
+
+    snapshot = json.loads(catalog.path.read_text(encoding="utf-8"))
+    assert snapshot["partitions"]["2026-02-20"]["data.jsonl"]["rows"] == 7
+    assert len(catalog.journal_path.read_text(encoding="utf-8").splitlines()) == 1
+    # A journal left behind by a compaction interrupted before its rename is not replayed twice.
+    stale = [
+        {"seq": seq, "op": "append", "dt": "2026-02-20", "file": "data.jsonl", "entry": {"rows": 100}}
+        for seq in (snapshot["last_seq"] - 1, snapshot["last_seq"])
+    ]
+    catalog.journal_path.write_text("".join(json.dumps(line) + "\n" for line in stale), encoding="utf-8")
+    catalog.record_file("2026-02-20", "data.jsonl", fmt="jsonl", rows=1, size_bytes=1, append=True)
+    assert catalog.files("2026-02-20")["data.jsonl"]["rows"] == 8
+
+
+def _append_many(dataset_dir: str, worker: int) -> None:
+    catalog = DatasetCatalog(dataset_dir)
+    for idx in range(25):
+        catalog.record_file(f"2026-02-{10 + worker}", f"part-{idx}.jsonl", fmt="jsonl", rows=1, size_bytes=1)
+        catalog.record_file("2026-02-20", "data.jsonl", fmt="jsonl", rows=1, size_bytes=1, append=True)
+
+
+def test_concurrent_writer_processes_keep_every_entry(tmp_path: Path) -> None:
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_append_many, args=(str(tmp_path / "ticks"), worker)) for worker in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    catalog = DatasetCatalog(tmp_path / "ticks")
+    assert catalog.files("2026-02-20")["data.jsonl"]["rows"] == 100
+    assert all(len(catalog.files(f"2026-02-{10 + worker}")) == 25 for worker in range(4))
@@ -0,0 +1,102 @@
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as pa_ds
+import pytest
+
+from storage.readers import ParquetReader, read_parquet_files
+from storage.writers import ParquetWriter
+
+
+def _write_days(root: Path) -> None:
+    writer = ParquetWriter(root)
+    for day, offset in (("2026-02-18", 0), ("2026-02-19", 10), ("2026-02-20", 20)):
+        writer.write(
+            [
+                {"market_id": "m1", "p_yes": 0.1 + offset / 100, "category": "crypto", "volume": offset},
+                {"market_id": "m2", "p_yes": 0.2 + offset / 100, "category": "sports", "volume": offset + 1},
+            ],
+            dataset="snapshots",
+            dt=day,
+        )
+
+
+def test_read_partition_pushes_down_columns_and_dnf_filters(tmp_path: Path) -> None:
+    _write_days(tmp_path)
+    reader = ParquetReader(tmp_path)
+
+    frame = reader.read_partition(
+        dataset="snapshots",
+        dt="2026-02-19",
+        columns=["market_id", "p_yes"],
+        filters=[("market_id", "=", "m2")],
+    )
+
+    assert list(frame.columns) == ["market_id", "p_yes"]
+    assert frame["market_id"].tolist() == ["m2"]
+    assert frame["p_yes"].tolist() == [pytest.approx(0.30)]
+
+
+def test_read_range_limits_partitions_and_accepts_expressions(tmp_path: Path) -> None:
+    _write_days(tmp_path)
+    reader = ParquetReader(tmp_path)
+
+    frame = reader.read_range(
+        dataset="snapshots",
+        dt_range=("2026-02-19", None),
+        columns=["market_id", "volume"],
+        filters=pa_ds.field("category") == "crypto",
+    )
+
+    assert frame.to_dict(orient="records") == [
+        {"market_id": "m1", "volume": 10},
+        {"market_id": "m1", "volume": 20},
+    ]
+    assert reader.partition_files("snapshots", dt_range=(None, "2026-02-18")) == [
+        tmp_path / "derived" / "snapshots" / "dt=2026-02-18" / "data.parquet"
+    ]
+
+
+def test_read_can_return_arrow_table_and_ignores_unknown_columns(tmp_path: Path) -> None:
+    _write_days(tmp_path)
+    reader = ParquetReader(tmp_path)
+
+    table = reader.read(
+        dataset="snapshots",
+        dt="2026-02-20",
+        columns=["market_id", "not_a_column"],
+        as_table=True,
+    )
+
+    assert isinstance(table, pa.Table)
+    assert table.column_names == ["market_id"]
+    assert table.num_rows == 2
+
+
+def test_read_parquet_files_unifies_schemas_and_handles_empty_input(tmp_path: Path) -> None:
+    first = tmp_path / "a.parquet"
+    second = tmp_path / "b.parquet"
+    pd.DataFrame([{"market_id": "m1"}]).to_parquet(first, index=False)
+    pd.DataFrame([{"market_id": "m2", "extra": 1.5}]).to_parquet(second, index=False)
+
+    frame = read_parquet_files([first, second])
+
+    assert list(frame["market_id"]) == ["m1", "m2"]
+    assert frame["extra"].isna().tolist() == [True, False]
+    assert read_parquet_files([]).empty
+
+
+def test_read_range_promotes_column_types_that_differ_between_partitions(tmp_path: Path) -> None:
+    writer = ParquetWriter(tmp_path)
+    writer.write([{"market_id": "m1", "x": 1}], dataset="mixed", dt="2026-02-18")
+    writer.write([{"market_id": "m1", "x": 1.5}], dataset="mixed", dt="2026-02-19")
+    writer.write([{"market_id": "m1", "x": "high"}], dataset="labels", dt="2026-02-18")
+    writer.write([{"market_id": "m1", "x": 2}], dataset="labels", dt="2026-02-19")
+    reader = ParquetReader(tmp_path)
+
+    promoted = reader.read_range(dataset="mixed", dt_range=("2026-02-18", "2026-02-19"))
+    incompatible = reader.read_range(dataset="labels", dt_range=("2026-02-18", "2026-02-19"))
+
+    assert promoted["x"].tolist() == [1.0, 1.5]
+    assert incompatible["x"].tolist() == ["high", 2]
@@ -0,0 +1,166 @@
+import json
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from storage.readers import RawReader, read_jsonl_target
+from storage.segments import SegmentAppender, SegmentCompactor, load_segment_manifest
+from storage.writers import RawWriter
+
+
+def test_raw_writer_append_creates_segments_and_manifest(tmp_path: Path) -> None:
+    writer = RawWriter(tmp_path)
+
+    first = writer.append(
+        [{"id": "m1", "v": 1}, {"id": "m2", "v": 2}],
+        dataset="realtime_ticks",
+        dt="2026-02-20",
+        dedupe_key="id",
+    )
+    second = writer.append(
+        [{"id": "m1", "v": 3}],
+        dataset="realtime_ticks",
+        dt="2026-02-20",
+        dedupe_key="id",
+    )
+
+    assert first == second
+    assert first == tmp_path / "raw" / "realtime_ticks" / "dt=2026-02-20" / "data.jsonl"
+    assert read_jsonl_target(first) == [{"id": "m1", "v": 3}, {"id": "m2", "v": 2}]
+    manifest = load_segment_manifest(first.with_suffix(".segments"))
+    assert manifest is not None
+    assert manifest["dedupe_key"] == "id"
+    assert [entry["rows"] for entry in manifest["segments"]] == [2, 1]
+    assert all(entry["sealed"] for entry in manifest["segments"])
+
+    rows = RawReader(tmp_path).read(dataset="realtime_ticks", dt="2026-02-20")
+    assert rows == [{"id": "m1", "v": 3}, {"id": "m2", "v": 2}]
+
+
+def test_raw_reader_merges_legacy_file_with_segments(tmp_path: Path) -> None:
+    writer = RawWriter(tmp_path)
+    writer.write([{"id": "a"}], dataset="gamma", dt="2026-02-20", filename="markets")
+    writer.append([{"id": "b"}], dataset="gamma", dt="2026-02-20", filename="markets")
+    writer.write([{"id": "e"}], dataset="gamma", dt="2026-02-20", filename="events")
+
+    reader = RawReader(tmp_path)
+    assert reader.read(dataset="gamma", dt="2026-02-20", filename="markets") == [
+        {"id": "a"},
+        {"id": "b"},
+    ]
+    assert reader.read_partition(dataset="gamma", dt="2026-02-20") == [
+        {"id": "e"},
+        {"id": "a"},
+        {"id": "b"},
+    ]
+
+
+def test_full_write_supersedes_appended_segments(tmp_path: Path) -> None:
+    writer = RawWriter(tmp_path)
+    writer.append([{"id": "old"}], dataset="gamma", dt="2026-02-20")
+    writer.write([{"id": "new"}], dataset="gamma", dt="2026-02-20")
+
+    assert RawReader(tmp_path).read(dataset="gamma", dt="2026-02-20") == [{"id": "new"}]
+
+
+def test_reader_ignores_uncommitted_tail_bytes(tmp_path: Path) -> None:
+    segment_dir = tmp_path / "data.segments"
+    appender = SegmentAppender(segment_dir, batch_rows=10)
+    appender.append([{"id": "a"}])
+    appender.flush()
+    active = appender.active_segment
+    assert active is not None
+
+    with active.open("ab") as handle:
+        handle.write(b'{"id": "torn"')
+
+    assert read_jsonl_target(tmp_path / "data.jsonl") == [{"id": "a"}]
+    appender.close()
+
+
+def test_appender_batches_rows_until_flush(tmp_path: Path) -> None:
+    segment_dir = tmp_path / "data.segments"
+    with SegmentAppender(segment_dir, batch_rows=3) as appender:
+        appender.append([{"id": "a"}, {"id": "b"}])
+        assert load_segment_manifest(segment_dir)["segments"] == []
+        appender.append([{"id": "c"}])
+        manifest = load_segment_manifest(segment_dir)
+        assert manifest["segments"][0]["rows"] == 3
+        assert manifest["segments"][0]["sealed"] is False
+
+    assert load_segment_manifest(segment_dir)["segments"][0]["sealed"] is True
+
+
+def test_appender_rejects_conflicting_dedupe_key(tmp_path: Path) -> None:
+    segment_dir = tmp_path / "data.segments"
+    SegmentAppender(segment_dir, dedupe_key="id").close()
+    with pytest.raises(ValueError, match="dedupe_key"):
+        SegmentAppender(segment_dir, dedupe_key="event_id")
+
+
+def test_compaction_merges_small_segments_and_preserves_reads(tmp_path: Path) -> None:
+    writer = RawWriter(tmp_path)
+    for index in range(5):
+        writer.append(
+            [{"bar_id": f"b{index % 2}", "close": index}, {"bar_id": f"x{index}", "close": index}],
+            dataset="realtime_bars_1m",
+            dt="2026-02-20",
+            dedupe_key="bar_id",
+        )
+    reader = RawReader(tmp_path)
+    before = reader.read(dataset="realtime_bars_1m", dt="2026-02-20")
+
+    summary = writer.compact(dataset="realtime_bars_1m", dt="2026-02-20")
+
+    assert summary["segments_before"] == 5
+    assert summary["segments_after"] == 1
+    assert summary["rows_dropped"] == 3
+    assert reader.read(dataset="realtime_bars_1m", dt="2026-02-20") == before
+
+    segment_dir = tmp_path / "raw" / "realtime_bars_1m" / "dt=2026-02-20" / "data.segments"
+    manifest = load_segment_manifest(segment_dir)
+    on_disk = sorted(path.name for path in segment_dir.glob("seg-*.jsonl"))
+    assert on_disk == [entry["name"] for entry in manifest["segments"]]
+    lines = (segment_dir / on_disk[0]).read_text(encoding="utf-8").splitlines()
+    assert len([json.loads(line) for line in lines]) == 7
+
+
+def test_compaction_skips_unsealed_segments(tmp_path: Path) -> None:
+    writer = RawWriter(tmp_path)
+    writer.append([{"id": "a"}], dataset="gamma", dt="2026-02-20")
+    writer.append([{"id": "b"}], dataset="gamma", dt="2026-02-20")
+    live = writer.open_appender(dataset="gamma", dt="2026-02-20", batch_rows=1)
+    live.append([{"id": "c"}])
+
+    compactor = SegmentCompactor(tmp_path)
+    summaries = compactor.compact_once()
+
+    assert [summary["segments_after"] for summary in summaries] == [2]
+    live.close()
+    assert RawReader(tmp_path).read(dataset="gamma", dt="2026-02-20") == [
+        {"id": "a"},
+        {"id": "b"},
+        {"id": "c"},
+    ]
+
+
+def _append_rows(root: str, worker: int) -> None:
+    writer = RawWriter(root)
+    for index in range(25):
+        writer.append([{"id": f"w{worker}-{index}"}], dataset="realtime_ticks", dt="2026-02-20")
+
+
+def test_concurrent_appender_processes_keep_every_segment(tmp_path: Path) -> None:
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_append_rows, args=(str(tmp_path), worker)) for worker in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    target = tmp_path / "raw" / "realtime_ticks" / "dt=2026-02-20" / "data.jsonl"
+    rows = read_jsonl_target(target)
+    assert len(rows) == 100
+    assert len(load_segment_manifest(target.with_suffix(".segments"))["segments"]) == 100
@@ -4,7 +4,7 @@ from pathlib import Path
 import pandas as pd
 import pytest
 
-from storage.writers import ParquetWriter, RawWriter
+from storage.writers import DEFAULT_DICTIONARY_COLUMNS, DEFAULT_SORT_COLUMNS, ParquetWriter, RawWriter
 
 
 def test_raw_writer_creates_dt_partition_and_is_idempotent(tmp_path: Path) -> None:
@@ -92,3 +92,80 @@ def test_parquet_writer_raises_helpful_error_when_engine_is_missing(
             dt="2026-02-20",
             filename="snapshot",
         )
+
+
+def test_parquet_writer_sorts_sizes_row_groups_and_limits_dictionaries(tmp_path: Path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    frame = pd.DataFrame(
+        {
+            "market_id": ["m3", "m1", "m2", "m1", "m3", "m2"],
+            "ts": [2, 2, 1, 1, 1, 2],
+            "category": ["crypto", "sports", "crypto", "sports", "crypto", "crypto"],
+            "p_yes": [0.3, 0.1, 0.2, 0.15, 0.35, 0.25],
+        }
+    )
+    original = frame.copy()
+
+    writer = ParquetWriter(
+        tmp_path,
+        compression="zstd",
+        sort_by=DEFAULT_SORT_COLUMNS,
+        row_group_size=2,
+        dictionary_columns=DEFAULT_DICTIONARY_COLUMNS,
+        update_catalog=False,
+    )
+    output_path = writer.write(frame, dataset="features", dt="2026-02-20")
+
+    pd.testing.assert_frame_equal(frame, original)
+    written = pq.read_table(output_path).to_pandas()
+    assert list(zip(written["market_id"], written["ts"])) == [
+        ("m1", 1),
+        ("m1", 2),
+        ("m2", 1),
+        ("m2", 2),
+        ("m3", 1),
+        ("m3", 2),
+    ]
+
+    metadata = pq.read_metadata(output_path)
+    assert metadata.num_row_groups == 3
+    first_group = metadata.row_group(0)
+    assert first_group.column(0).compression == "ZSTD"
+    assert first_group.column(0).statistics.max == "m1"
+    encodings = {first_group.column(index).path_in_schema: first_group.column(index).encodings for index in range(4)}
+    assert any("DICTIONARY" in encoding for encoding in encodings["category"])
+    assert not any("DICTIONARY" in encoding for encoding in encodings["p_yes"])
+
+
+def test_parquet_writer_keeps_row_order_and_dictionaries_by_default(tmp_path: Path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    frame = pd.DataFrame(
+        {
+            "market_id": ["m3", "m1", "m2"],
+            "ts": [2, 1, 3],
+            "question": ["q3", "q1", "q2"],
+        }
+    )
+
+    output_path = ParquetWriter(tmp_path, update_catalog=False).write(frame, dataset="features", dt="2026-02-20")
+
+    written = pq.read_table(output_path).to_pandas()
+    assert written["market_id"].tolist() == ["m3", "m1", "m2"]
+    encodings = pq.read_metadata(output_path).row_group(0).column(2).encodings
+    assert any("DICTIONARY" in encoding for encoding in encodings)
+
+
+def test_parquet_writer_keeps_input_order_for_unorderable_sort_keys(tmp_path: Path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    # pyarrow stores these as structs, but pandas cannot order dicts.
+    frame = pd.DataFrame({"market_id": ["m2", "m1"], "ts": [{"h": 2}, {"h": 1}]})
+
+    writer = ParquetWriter(tmp_path, sort_by=DEFAULT_SORT_COLUMNS, update_catalog=False)
+    output_path = writer.write(frame, dataset="features", dt="2026-02-20")
+
+    assert pq.read_table(output_path).column("market_id").to_pylist() == ["m2", "m1"]
+
+
+def test_parquet_writer_rejects_unavailable_codec(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="compression"):
+        ParquetWriter(tmp_path, compression="not-a-codec")
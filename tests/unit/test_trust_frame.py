@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from calibration.trust_components import (
+    TRUST_FEATURE_KEYS,
+    TrustComponentConfig,
+    derive_trust_components,
+    derive_trust_components_frame,
+)
+from calibration.trust_score import compute_trust_score, compute_trust_score_frame
+from pipelines import build_scoreboard_artifacts
+from pipelines.build_scoreboard_artifacts import build_scoreboard_rows
+
+_ODD_VALUES = (None, float("nan"), float("inf"), "bad", "0.25", True, -3.0)
+
+
+def _feature_rows(n: int, *, seed: int = 5) -> list[dict[str, object]]:
+    rng = random.Random(seed)
+    rows: list[dict[str, object]] = []
+    for _ in range(n):
+        row: dict[str, object] = {}
+        for key in TRUST_FEATURE_KEYS:
+            roll = rng.random()
+            if roll < 0.2:
+                continue  # missing field
+            if key == "liquidity_bucket":
+                row[key] = rng.choice(["low", "MID", "High", "unknown", None, 3])
+            elif roll < 0.3:
+                row[key] = rng.choice(_ODD_VALUES)
+            else:
+                row[key] = rng.uniform(-0.5, 2.0) * (200_000.0 if key in {"volume_24h", "open_interest"} else 1.0)
+        rows.append(row)
+    return rows
+
+
+def _frame(rows: list[dict[str, object]]) -> dict[str, list[object]]:
+    return {key: [row.get(key) for row in rows] for key in TRUST_FEATURE_KEYS}
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        None,
+        TrustComponentConfig(liquidity_high=0.0, volatility_ceiling=0.0, oi_spike_threshold=0.0),
+        TrustComponentConfig(velocity_spike_threshold=-1.0),
+    ],
+)
+def test_frame_components_match_row_derivation(config) -> None:
+    rows = _feature_rows(3_000)
+    frame = derive_trust_components_frame(_frame(rows), config=config)
+    for idx, row in enumerate(rows):
+        expected = derive_trust_components(row, config=config)
+        assert {key: float(values[idx]) for key, values in frame.items()} == expected, row
+
+
+def test_frame_components_accept_dataframes_with_absent_columns() -> None:
+    df = pd.DataFrame({"vol": [0.15, np.nan, 0.6], "liquidity_bucket": ["HIGH", None, "low"]})
+    frame = derive_trust_components_frame(df)
+    for idx, row in enumerate(df.to_dict("records")):
+        assert {key: float(values[idx]) for key, values in frame.items()} == derive_trust_components(row)
+
+
+def test_trust_score_frame_matches_scalar_and_validates() -> None:
+    rng = random.Random(2)
+    components = {
+        key: [rng.uniform(-0.2, 1.2) for _ in range(500)]
+        for key in ("liquidity_depth", "stability", "question_quality", "manipulation_suspect")
+    }
+    weights = {"liquidity_depth": 2, "stability": 1, "question_quality": 0, "manipulation_suspect": 1}
+    scores = compute_trust_score_frame(components, weights=weights)
+    for idx in range(500):
+        row = {key: values[idx] for key, values in components.items()}
+        assert scores[idx] == compute_trust_score(row, weights=weights)
+
+    components["stability"][7] = "oops"
+    with pytest.raises(ValueError, match="Invalid numeric value for stability: oops"):
+        compute_trust_score_frame(components)
+    with pytest.raises(ValueError, match="Missing trust component: question_quality"):
+        compute_trust_score_frame({"liquidity_depth": [0.1], "stability": [0.1], "manipulation_suspect": [0.1]})
+
+
+def test_scoreboard_trust_columns_match_per_market_path(monkeypatch) -> None:
+    rng = random.Random(8)
+    rows: list[dict[str, object]] = []
+    for idx, features in enumerate(_feature_rows(600, seed=11)):
+        market = idx % 37
+        row: dict[str, object] = {
+            **features,
+            "market_id": f"m{market}",
+            "category": f"cat{market % 4}",
+            "liquidity_bucket": ("LOW", "MID", "HIGH")[market % 3],
+            "pred": rng.uniform(0.05, 0.95),
+            "label": rng.random() < 0.5,
+        }
+        if market % 5 == 0:
+            row["stability"] = rng.uniform(-0.1, 1.1)  # explicit components, others default
+        rows.append(row)
+    weights = {"liquidity_depth": 1, "stability": 3, "question_quality": 1, "manipulation_suspect": 2}
+
+    columnar, _ = build_scoreboard_rows(rows, trust_weights=weights)
+    monkeypatch.setattr(build_scoreboard_artifacts, "_market_trust_scores", lambda rows, **kwargs: None)
+    per_market, _ = build_scoreboard_rows(rows, trust_weights=weights)
+    assert columnar == per_market
+
+    rows[3]["stability"] = "not-a-number"
+    monkeypatch.undo()
+    with pytest.raises(ValueError, match="Invalid numeric value for stability"):
+        build_scoreboard_rows(rows)
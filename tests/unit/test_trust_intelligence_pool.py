@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pipelines.daily_job as daily_job
+from pipelines.trust_intelligence_pool import MarketTask, run_markets, stub_pipeline_factory
+from tests.helpers.daily_job_fixtures import cutoff_rows
+
+
+class _RecordingAuditLogger:
+    def __init__(self) -> None:
+        self.entries: list[tuple[dict[str, Any], Any]] = []
+
+    def record(self, inputs: dict[str, Any], result: Any) -> None:
+        self.entries.append((inputs, result))
+
+
+def _run_stage(tmp_path: Path, *, workers: int) -> tuple[dict[str, Any], _RecordingAuditLogger]:
+    config = tmp_path / f"trust-{workers}.yaml"
+    config.write_text(
+        f"trust_intelligence:\n  workers: {workers}\n  batch_size: 2\n",
+        encoding="utf-8",
+    )
+    audit = _RecordingAuditLogger()
+    result = daily_job.run_daily_job(
+        run_id=f"daily-ti-{workers}",
+        state={
+            "cutoff_snapshot_rows": cutoff_rows(7, base=0.1),
+            "enable_trust_intelligence": True,
+            "trust_intelligence_pipeline_factory": stub_pipeline_factory,
+            "trust_intelligence_audit_logger": audit,
+            "root_path": str(tmp_path / f"root-{workers}"),
+        },
+        trust_config_path=str(config),
+    )
+    return result, audit
+
+
+def _stage_output(result: dict[str, Any], name: str) -> dict[str, Any]:
+    return next(stage["output"] for stage in result["stages"] if stage["name"] == name)
+
+
+def test_sharded_stub_pipeline_matches_serial_run_and_audit_order(tmp_path: Path) -> None:
+    serial, serial_audit = _run_stage(tmp_path, workers=1)
+    sharded, sharded_audit = _run_stage(tmp_path, workers=3)
+
+    serial_output = _stage_output(serial, "trust_intelligence")
+    sharded_output = _stage_output(sharded, "trust_intelligence")
+    assert serial["success"] is True and sharded["success"] is True
+    assert serial_output["succeeded"] == sharded_output["succeeded"] == 7
+    assert sharded_output["failed"] == 0
+    assert sharded_output["workers"] == 3
+    assert _stage_output(sharded, "publish")["ti_written_count"] == 7
+    assert sharded_audit.entries == serial_audit.entries
+    assert sorted(inputs["market_id"] for inputs, _ in sharded_audit.entries) == [f"m{idx}" for idx in range(7)]
+
+
+def test_market_timeout_counts_as_failed() -> None:
+    tasks = [MarketTask(market_id=f"m{idx}", rows=[{"pred": 0.5}]) for idx in range(4)]
+
+    started = time.perf_counter()
+    outcomes = run_markets(
+        tasks,
+        factory=stub_pipeline_factory,
+        ti_config={"stub_delay_s": 5.0},
+        workers=2,
+        batch_size=1,
+        timeout_s=0.05,
+    )
+
+    assert time.perf_counter() - started < 4.0
+    assert [outcome.market_id for outcome in outcomes] == ["m0", "m1", "m2", "m3"]
+    assert {outcome.status for outcome in outcomes} == {"timeout"}
+    assert all(outcome.result is None for outcome in outcomes)
+
+
+def test_in_process_runner_returns_results_in_task_order() -> None:
+    tasks = [MarketTask(market_id=f"m{idx}", rows=[{"pred": 0.1 * idx}], v1_trust_score=50.0) for idx in range(3)]
+
+    outcomes = run_markets(tasks, factory=stub_pipeline_factory, ti_config={}, workers=1)
+
+    assert [outcome.status for outcome in outcomes] == ["success"] * 3
+    assert outcomes[2].result["uncertainty"]["prediction_probability"] == 0.2
+
+
+def test_market_timeout_applies_when_run_off_the_main_thread() -> None:
+    tasks = [MarketTask(market_id=f"m{idx}", rows=[{"pred": 0.5}]) for idx in range(2)]
+    outcomes: list[Any] = []
+
+    def _run() -> None:
+        outcomes.extend(
+            run_markets(
+                tasks,
+                factory=stub_pipeline_factory,
+                ti_config={"stub_delay_s": 5.0},
+                workers=1,
+                timeout_s=0.05,
+            )
+        )
+
+    started = time.perf_counter()
+    thread = threading.Thread(target=_run)
+    thread.start()
+    thread.join()
+
+    assert time.perf_counter() - started < 4.0
+    assert [outcome.market_id for outcome in outcomes] == ["m0", "m1"]
+    assert {outcome.status for outcome in outcomes} == {"timeout"}
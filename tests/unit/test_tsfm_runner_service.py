@@ -402,6 +402,37 @@ def test_tsfm_service_conformal_state_missing_keeps_default_behavior(tmp_path) -
     assert "conformal_last_step" not in response
 
 
+def test_tsfm_service_hot_reloads_conformal_state(tmp_path) -> None:
+    state_path = tmp_path / "conformal_state.json"
+
+    def _save(shift: float) -> None:
+        save_conformal_adjustment(
+            adjustment=ConformalAdjustment(
+                target_coverage=0.8,
+                quantile_level=0.9,
+                center_shift=shift,
+                width_scale=1.0,
+                sample_size=200,
+            ),
+            path=state_path,
+        )
+
+    _save(0.0)
+    config = TSFMServiceConfig(conformal_state_path=str(state_path), conformal_reload_interval_s=0.0)
+    service = TSFMRunnerService(adapter=_FakeAdapter(), config=config)
+    first = service.forecast(_request())
+    baseline_q50 = first["conformal_last_step"]["q50"]
+
+    _save(0.1)
+    reloaded = service.forecast(_request())
+    assert reloaded["meta"]["cache_hit"] is False
+    assert reloaded["conformal_last_step"]["q50"] == pytest.approx(baseline_q50 + 0.1)
+
+    state_path.write_text("{not json", encoding="utf-8")
+    kept = service.forecast({**_request(), "as_of_ts": "2026-02-20T00:05:00Z"})
+    assert kept["conformal_last_step"]["q50"] == pytest.approx(baseline_q50 + 0.1)
+
+
 def test_tsfm_service_runtime_config_builds_adapter_from_adapter_block(tmp_path) -> None:
     runtime_path = tmp_path / "tsfm_runtime.yaml"
     runtime_path.write_text(
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from calibration.conformal import fit_conformal_adjustment
+from calibration.conformal_state import load_conformal_adjustment, load_conformal_adjustments_by_segment
+from pipelines.update_conformal_calibration import _collect_samples, _iter_rows, _normalize_sample, run
+
+
+def _write_history(path: Path, n: int, *, seed: int = 21) -> list[dict[str, object]]:
+    rng = random.Random(seed)
+    rows: list[dict[str, object]] = []
+    for idx in range(n):
+        center = rng.random()
+        half = 0.02 + 0.1 * rng.random()
+        row: dict[str, object] = {
+            "q10": center - half,
+            "q50": center,
+            "q90": center + half,
+            "actual": center + rng.gauss(0.0, 0.07),
+            "category": rng.choice(["politics", "sports", "crypto"]),
+        }
+        if idx % 3:
+            row["liquidity_bucket"] = rng.choice(["low", "high"])
+        if idx % 11 == 0:
+            row.pop("actual")  # unusable sample, still counts for field detection
+        rows.append(row)
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n", encoding="utf-8")
+    return rows
+
+
+def _three_pass_reference(path: Path, *, window_size: int, segment_fields: list[str]):
+    """The previous implementation: sample, detect fields, then group in separate passes."""
+    samples = [parsed for row in _iter_rows(path) if (parsed := _normalize_sample(row)) is not None]
+    if window_size > 0:
+        samples = samples[-window_size:]
+    active = [field for field in segment_fields if any(field in row for row in _iter_rows(path))]
+    grouped: dict[str, list] = {}
+    if active:
+        for row in _iter_rows(path):
+            parsed = _normalize_sample(row)
+            if parsed is None:
+                continue
+            key = "|".join(f"{field}={row.get(field, 'unknown')}" for field in active)
+            grouped.setdefault(key, []).append(parsed)
+    if window_size > 0:
+        grouped = {key: values[-window_size:] for key, values in grouped.items()}
+    return samples, active, grouped
+
+
+@pytest.mark.parametrize("window_size", [0, 40])
+def test_single_pass_matches_three_pass_grouping(tmp_path: Path, window_size: int) -> None:
+    path = tmp_path / "history.jsonl"
+    _write_history(path, 600)
+    fields = ["category", "liquidity_bucket", "tte_bucket"]
+
+    expected = _three_pass_reference(path, window_size=window_size, segment_fields=fields)
+    samples, active, segments = _collect_samples(_iter_rows(path), window_size=window_size, segment_fields=fields)
+
+    assert samples == expected[0]
+    assert active == expected[1] == ["category", "liquidity_bucket"]
+    assert segments == expected[2]
+    assert list(segments) == list(expected[2])
+
+
+def test_run_writes_overall_and_parallel_segment_fits(tmp_path: Path) -> None:
+    path = tmp_path / "history.jsonl"
+    _write_history(path, 900)
+    state_path = tmp_path / "conformal_state.json"
+
+    code = run(
+        input_path=path,
+        state_path=state_path,
+        target_coverage=0.8,
+        window_size=300,
+        min_samples=60,
+        dry_run=False,
+        segment_fields=["category", "tte_bucket"],
+        workers=2,
+    )
+
+    assert code == 0
+    samples, _, segments = _three_pass_reference(path, window_size=300, segment_fields=["category", "tte_bucket"])
+    bands = [band for band, _ in samples]
+    actuals = [actual for _, actual in samples]
+    assert load_conformal_adjustment(state_path) == fit_conformal_adjustment(bands, actuals, target_coverage=0.8)
+    by_segment = load_conformal_adjustments_by_segment(state_path)
+    assert set(by_segment) == {"category=politics", "category=sports", "category=crypto"}
+    politics = segments["category=politics"]
+    assert by_segment["category=politics"] == fit_conformal_adjustment(
+        [band for band, _ in politics], [actual for _, actual in politics], target_coverage=0.8
+    )
+    assert json.loads(state_path.read_text(encoding="utf-8"))["segment_fields"] == ["category"]